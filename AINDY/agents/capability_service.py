@@ -11,11 +11,15 @@ from __future__ import annotations
 
 import hashlib
 import logging
+import threading
+import time
 import uuid
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 
 from AINDY.agents.tool_registry import TOOL_REGISTRY
+from AINDY.config import settings
 from AINDY.platform_layer.user_ids import parse_user_id, require_user_id
 
 logger = logging.getLogger(__name__)
@@ -175,6 +179,95 @@ def _get_trust(user_id: str, db) -> Optional[Any]:
         return None
 
 
+@dataclass(frozen=True)
+class CapabilityRow:
+    """Detached snapshot of a ``capabilities`` row."""
+
+    id: uuid.UUID
+    name: str
+    risk_level: str
+
+
+class CapabilityCatalogCache:
+    """
+    Process-wide snapshot of the capability catalogue.
+
+    Entries are tagged with a fingerprint of the registered capability
+    definitions, so registering or changing a definition forces a resync.
+    ``sync_capability_catalog`` invalidates the snapshot whenever it writes,
+    and a TTL bounds staleness for rows changed by other processes.
+    """
+
+    def __init__(self, *, ttl_seconds: float | None = None):
+        self.ttl_seconds = float(
+            ttl_seconds
+            if ttl_seconds is not None
+            else settings.AINDY_CAPABILITY_CATALOG_CACHE_TTL_SECONDS
+        )
+        self._rows: dict[str, CapabilityRow] | None = None
+        self._fingerprint: int | None = None
+        self._loaded_at = 0.0
+        self._loads = 0
+        self._lock = threading.Lock()
+
+    def get(self, fingerprint: int) -> dict[str, CapabilityRow] | None:
+        with self._lock:
+            if (
+                self._rows is None
+                or self._fingerprint != fingerprint
+                or (time.monotonic() - self._loaded_at) > self.ttl_seconds
+            ):
+                return None
+            return self._rows
+
+    def put(self, fingerprint: int, rows: dict[str, CapabilityRow]) -> None:
+        with self._lock:
+            self._rows = rows
+            self._fingerprint = fingerprint
+            self._loaded_at = time.monotonic()
+            self._loads += 1
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._rows = None
+            self._fingerprint = None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._rows = None
+            self._fingerprint = None
+            self._loads = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"capabilities": len(self._rows or {}), "loads": self._loads}
+
+
+_CATALOG_CACHE: CapabilityCatalogCache | None = None
+_CATALOG_CACHE_LOCK = threading.Lock()
+
+
+def get_capability_catalog_cache() -> CapabilityCatalogCache:
+    """Return the process-wide CapabilityCatalogCache."""
+    global _CATALOG_CACHE
+    if _CATALOG_CACHE is None:
+        with _CATALOG_CACHE_LOCK:
+            if _CATALOG_CACHE is None:
+                _CATALOG_CACHE = CapabilityCatalogCache()
+    return _CATALOG_CACHE
+
+
+def _definitions_fingerprint(definitions: dict[str, dict[str, Any]]) -> int:
+    return hash(
+        tuple(
+            sorted(
+                (name, meta.get("description"), meta.get("risk_level"))
+                for name, meta in definitions.items()
+            )
+        )
+    )
+
+
 def sync_capability_catalog(db) -> None:
     """Best-effort seed of the capability table."""
     try:
@@ -203,21 +296,66 @@ def sync_capability_catalog(db) -> None:
                 changed = True
         if changed:
             db.commit()
+            get_capability_catalog_cache().invalidate()
     except Exception as exc:
         logger.warning("[CapabilityService] sync_capability_catalog failed: %s", exc)
 
 
-def _get_capability_rows(db) -> dict[str, Any]:
+def _get_capability_rows(db) -> dict[str, CapabilityRow]:
     try:
         from AINDY.db.models.capability import Capability
 
+        definitions = _get_capability_definitions()
+        fingerprint = _definitions_fingerprint(definitions)
+        cache = get_capability_catalog_cache()
+        rows = cache.get(fingerprint)
+        if rows is not None:
+            return rows
+
         sync_capability_catalog(db)
-        return {row.name: row for row in db.query(Capability).all()}
+        rows = {
+            row.name: CapabilityRow(id=row.id, name=row.name, risk_level=row.risk_level)
+            for row in db.query(Capability).all()
+        }
+        if all(name in rows for name in definitions):
+            cache.put(fingerprint, rows)
+        return rows
     except Exception as exc:
         logger.warning("[CapabilityService] _get_capability_rows failed: %s", exc)
         return {}
 
 
+def _insert_capability_mappings(db, records: list[dict[str, Any]]) -> None:
+    """
+    Insert mapping rows, skipping any that already exist.
+
+    Relies on the partial unique indexes on agent_capability_mappings. Runs
+    in a savepoint so a failure never poisons the caller's transaction.
+    """
+    from AINDY.db.models.capability import AgentCapabilityMapping
+
+    table = AgentCapabilityMapping.__table__
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        from sqlalchemy import insert
+        from sqlalchemy.exc import IntegrityError
+
+        for record in records:
+            try:
+                with db.begin_nested():
+                    db.execute(insert(table), [record])
+            except IntegrityError:
+                pass
+        return
+
+    with db.begin_nested():
+        db.execute(dialect_insert(table).on_conflict_do_nothing(), records)
+
+
 def create_run_capability_mappings(
     run_id: str,
     agent_type: str,
@@ -226,46 +364,32 @@ def create_run_capability_mappings(
 ) -> None:
     """Best-effort persistence of run and agent-type capability mappings."""
     try:
-        from AINDY.db.models.capability import AgentCapabilityMapping
-
         rows = _get_capability_rows(db)
         if not rows:
             return
 
         run_uuid = parse_user_id(run_id)
-
-        existing = db.query(AgentCapabilityMapping).all()
-        existing_keys = {
-            (str(row.capability_id), str(row.agent_type or ""), str(row.agent_run_id or ""))
-            for row in existing
-        }
-
-        for capability_name in capability_names:
+        now = _now_utc()
+        records: list[dict[str, Any]] = []
+        for capability_name in sorted(set(capability_names)):
             capability_row = rows.get(capability_name)
             if not capability_row:
                 continue
+            if agent_type:
+                records.append({"capability_id": capability_row.id, "agent_type": agent_type, "agent_run_id": None})
+            if run_id:
+                records.append({"capability_id": capability_row.id, "agent_type": None, "agent_run_id": run_uuid or run_id})
+        if not records:
+            return
 
-            type_key = (str(capability_row.id), str(agent_type or ""), "")
-            if agent_type and type_key not in existing_keys:
-                db.add(
-                    AgentCapabilityMapping(
-                        capability_id=capability_row.id,
-                        agent_type=agent_type,
-                    )
-                )
-                existing_keys.add(type_key)
-
-            run_key = (str(capability_row.id), "", str(run_id))
-            if run_id and run_key not in existing_keys:
-                db.add(
-                    AgentCapabilityMapping(
-                        capability_id=capability_row.id,
-                        agent_run_id=run_uuid or run_id,
-                    )
-                )
-                existing_keys.add(run_key)
-
-        db.flush()
+        for record in records:
+            record.update(id=uuid.uuid4(), created_at=now, updated_at=now)
+        try:
+            _insert_capability_mappings(db, records)
+        except Exception:
+            # A cached capability id may point at a row that no longer exists.
+            get_capability_catalog_cache().invalidate()
+            raise
     except Exception as exc:
         logger.warning("[CapabilityService] create_run_capability_mappings failed: %s", exc)
 
@@ -43,6 +43,7 @@ Backward compatibility
 """
 from __future__ import annotations
 
+import logging
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any
@@ -53,6 +54,8 @@ from sqlalchemy.orm import Session
 
 from AINDY.db.database import get_db
 
+logger = logging.getLogger(__name__)
+
 # ---------------------------------------------------------------------------
 # Scope constants
 # ---------------------------------------------------------------------------
@@ -127,6 +130,7 @@ def get_authenticated_principal(
     JWT path:      identical to get_current_user() — no behavior change.
     API key path:  looks up the hashed key, checks active/not-expired/not-revoked,
                    updates last_used_at, returns an AuthPrincipal with the stored scopes.
+                   Valid keys may be served from auth/principal_cache.py.
     """
     if platform_key:
         return _resolve_api_key(platform_key, db)
@@ -151,10 +155,20 @@ def _resolve_jwt(token: str) -> AuthPrincipal:
 
 
 def _resolve_api_key(raw_key: str, db: Session) -> AuthPrincipal:
-    from AINDY.platform_layer.api_key_service import hash_key, touch_last_used
+    from AINDY.auth.principal_cache import API_KEY, get_principal_cache
+    from AINDY.platform_layer.api_key_service import hash_key, record_key_use, touch_last_used
     from AINDY.db.models.api_key import PlatformAPIKey
 
     key_hash = hash_key(raw_key)
+    cache = get_principal_cache()
+    cached = cache.get(API_KEY, key_hash)
+    if cached is not None and not _expired(cached["expires_at"]):
+        try:
+            record_key_use(cached["key_id"], db)
+        except Exception:
+            logger.warning("[api_key_auth] last_used_at stamp failed for key %s", cached["key_id"], exc_info=True)
+        return _api_key_principal(cached)
+
     record = db.query(PlatformAPIKey).filter(
         PlatformAPIKey.key_hash == key_hash
     ).first()
@@ -165,21 +179,39 @@ def _resolve_api_key(raw_key: str, db: Session) -> AuthPrincipal:
             detail="Invalid or revoked API key",
         )
 
+    resolved = {
+        "user_id": str(record.user_id),
+        "scopes": list(record.scopes or []),
+        "key_id": str(record.id),
+        "key_name": record.name,
+        "key_prefix": record.key_prefix,
+        "expires_at": record.expires_at,
+    }
+    cache.put(API_KEY, key_hash, resolved)
+
     # Non-blocking update — if it fails the request still succeeds
     try:
         touch_last_used(record, db)
     except Exception:
         pass
 
+    return _api_key_principal(resolved)
+
+
+def _api_key_principal(resolved: dict[str, Any]) -> AuthPrincipal:
     return AuthPrincipal(
-        user_id=str(record.user_id),
+        user_id=resolved["user_id"],
         auth_type="api_key",
-        scopes=list(record.scopes or []),
-        key_id=str(record.id),
-        metadata={"key_name": record.name, "key_prefix": record.key_prefix},
+        scopes=list(resolved["scopes"]),
+        key_id=resolved["key_id"],
+        metadata={"key_name": resolved["key_name"], "key_prefix": resolved["key_prefix"]},
     )
 
 
+def _expired(expires_at: datetime | None) -> bool:
+    return expires_at is not None and datetime.now(timezone.utc) > expires_at
+
+
 # ---------------------------------------------------------------------------
 # Scope-enforcement dependency factory
 # ---------------------------------------------------------------------------
@@ -0,0 +1,164 @@
+"""
+auth/principal_cache.py — Short-lived cache of resolved authentication principals.
+
+Every authenticated request re-resolves its caller: platform API keys SELECT
+the PlatformAPIKey row by hash, JWT requests SELECT the User row to check
+``token_version`` and ``is_active``. With ``AINDY_AUTH_PRINCIPAL_CACHE_TTL_SECONDS``
+set, the resolved fields are kept in a bounded in-process LRU:
+
+  ("api_key", key_hash)       — AuthPrincipal fields (auth/api_key_auth.py)
+  ("api_key_user", key_hash)  — get_current_user() dict for X-Platform-Key
+  ("user", user_id)           — User fields checked by the JWT path
+
+Only valid keys and active users are cached; a miss or any mismatch falls
+back to the database, so rejections always come from the database. A cached
+JWT user whose ``token_version`` differs from the token is treated as a miss.
+
+Invalidation
+------------
+``invalidate_api_key()`` (revocation) and ``invalidate_user()`` (logout,
+session invalidation, and any committed change to a cached User field or
+deletion of the user, see db/models/user.py) drop the entries locally and
+publish ``auth.principal.invalidated`` on the event bus so every other
+instance drops them too. If the bus is unavailable, other instances keep serving the entry
+until its TTL expires.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from AINDY.config import settings
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_EVENT = "auth.principal.invalidated"
+
+API_KEY = "api_key"
+API_KEY_USER = "api_key_user"
+USER = "user"
+
+
+class PrincipalCache:
+    """Entry-bounded LRU with a per-entry TTL."""
+
+    def __init__(self, *, max_entries: int | None = None, ttl_seconds: float | None = None):
+        self.max_entries = max(
+            1,
+            int(max_entries if max_entries is not None else settings.AINDY_AUTH_PRINCIPAL_CACHE_MAX_ENTRIES),
+        )
+        self.ttl_seconds = float(
+            ttl_seconds if ttl_seconds is not None else settings.AINDY_AUTH_PRINCIPAL_CACHE_TTL_SECONDS
+        )
+        self._entries: OrderedDict[tuple[str, str], tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def get(self, kind: str, key: str) -> Optional[dict[str, Any]]:
+        if not self.enabled:
+            return None
+        cache_key = (kind, str(key))
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(cache_key)
+                _record_lookup(kind, "hit")
+                return entry[1]
+            if entry is not None:
+                del self._entries[cache_key]
+        _record_lookup(kind, "miss")
+        return None
+
+    def put(self, kind: str, key: str, value: dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        cache_key = (kind, str(key))
+        with self._lock:
+            self._entries.pop(cache_key, None)
+            self._entries[cache_key] = (time.monotonic() + self.ttl_seconds, value)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, kind: str, key: str) -> None:
+        with self._lock:
+            self._entries.pop((kind, str(key)), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+# ── Invalidation ──────────────────────────────────────────────────────────────
+
+def _drop(target: str | None) -> None:
+    """Apply one invalidation target (``api_key:<hash>`` or ``user:<id>``)."""
+    if not target or _CACHE is None:
+        return
+    kind, _, key = target.partition(":")
+    if kind == API_KEY:
+        _CACHE.discard(API_KEY, key)
+        _CACHE.discard(API_KEY_USER, key)
+    elif kind == USER:
+        _CACHE.discard(USER, key)
+
+
+def _invalidate(target: str) -> None:
+    _drop(target)
+    if not settings.AINDY_AUTH_PRINCIPAL_CACHE_TTL_SECONDS:
+        return
+    try:
+        from AINDY.kernel.event_bus import get_event_bus
+
+        get_event_bus().publish(INVALIDATION_EVENT, correlation_id=target)
+    except Exception as exc:
+        logger.warning("[PrincipalCache] invalidation broadcast failed for %s: %s", target, exc)
+
+
+def invalidate_api_key(key_hash: str) -> None:
+    """Drop a revoked API key on this and every other instance."""
+    _invalidate(f"{API_KEY}:{key_hash}")
+
+
+def invalidate_user(user_id) -> None:
+    """Drop a user whose sessions or cached fields changed on this and every other instance."""
+    _invalidate(f"{USER}:{user_id}")
+
+
+def _record_lookup(kind: str, outcome: str) -> None:
+    try:
+        from AINDY.platform_layer.metrics import auth_principal_cache_requests_total
+
+        auth_principal_cache_requests_total.labels(kind=kind, outcome=outcome).inc()
+    except Exception:
+        pass
+
+
+# ── Module-level singleton ────────────────────────────────────────────────────
+
+_CACHE: PrincipalCache | None = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_principal_cache() -> PrincipalCache:
+    global _CACHE
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = PrincipalCache()
+                try:
+                    from AINDY.kernel.event_bus import get_event_bus
+
+                    get_event_bus().add_listener(INVALIDATION_EVENT, _drop)
+                except Exception as exc:
+                    logger.warning("[PrincipalCache] event bus listener unavailable: %s", exc)
+    return _CACHE
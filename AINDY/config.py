@@ -41,7 +41,41 @@ class Settings(BaseSettings):
     OPENAI_MAX_RETRIES: int = 3
     OPENAI_RETRY_BACKOFF_BASE_SECONDS: float = 1.0
     AINDY_EVENT_HANDLER_TIMEOUT_SECONDS: float = 5.0
+    # Webhook delivery engine (AINDY/platform_layer/webhook_delivery.py): one
+    # asyncio loop with a pooled httpx client; retries are timers, not sleeps.
+    AINDY_WEBHOOK_MAX_CONNECTIONS: int = 200
+    AINDY_WEBHOOK_PER_HOST_CONCURRENCY: int = 16
+    AINDY_WEBHOOK_TIMEOUT_SECONDS: float = 10.0
+    AINDY_WEBHOOK_MAX_ATTEMPTS: int = 3
+    AINDY_WEBHOOK_BACKOFF_SECONDS: float = 1.0
+    # Durable outbox (webhook_deliveries): outcomes are written every FLUSH_MS.
+    # An instance leases the pending rows it holds for RECOVERY_GRACE_SECONDS
+    # and renews the lease; rows whose lease lapsed are reclaimed by any
+    # instance. Delivered/failed rows older than RETENTION_HOURS are deleted
+    # (0 keeps them).
+    AINDY_WEBHOOK_OUTBOX_ENABLED: bool = True
+    AINDY_WEBHOOK_OUTBOX_FLUSH_MS: int = 500
+    AINDY_WEBHOOK_OUTBOX_RECOVERY_GRACE_SECONDS: int = 120
+    AINDY_WEBHOOK_OUTBOX_RETENTION_HOURS: int = 72
     FLOW_WAIT_TIMEOUT_MINUTES: int = 30
+    # Nodes between full FlowRun.state snapshots; in between only per-node
+    # output patches are written (see AINDY/runtime/flow_engine/checkpoint.py).
+    # Edits a node makes to state in place are only saved with the next snapshot.
+    AINDY_FLOW_CHECKPOINT_INTERVAL: int = 10
+    # Warm pool of nodus_worker.py --serve processes instead of one
+    # subprocess per script (see AINDY/runtime/nodus_worker_pool.py).
+    AINDY_NODUS_WORKER_POOL_ENABLED: bool = False
+    AINDY_NODUS_WORKER_POOL_SIZE: int = 4
+    AINDY_NODUS_WORKER_MAX_EXECUTIONS: int = 500
+    AINDY_NODUS_WORKER_MAX_RSS_MB: int = 512
+    # Sync handlers of pipeline routes on a shared event loop run on this
+    # bounded executor instead of blocking the loop (AINDY/core/execution_loop.py).
+    # Opt-in: handler Session use moves to the executor thread.
+    AINDY_PIPELINE_OFFLOAD_HANDLERS: bool = False
+    AINDY_PIPELINE_HANDLER_WORKERS: int = 32
+    # Fraction of read-only pipeline executions that still persist their
+    # ExecutionUnit, FlowRun and lifecycle events (0.0 = only on error).
+    AINDY_READ_ONLY_TRACE_SAMPLE_RATE: float = 0.0
     STUCK_RUN_THRESHOLD_MINUTES: int = 45
     AINDY_WATCHDOG_INTERVAL_MINUTES: int = 2
 
@@ -137,6 +171,59 @@ class Settings(BaseSettings):
     REDIS_URL: str | None = None
     AINDY_REQUIRE_REDIS: bool = False
     AINDY_CACHE_BACKEND: str = "redis"
+    # Quota leases (AINDY/kernel/resource_manager.py): with the Redis resource
+    # backend, per-EU CPU / syscall budget is reserved from Redis in slices of
+    # this size and spent locally; tenant concurrency is re-read at most every
+    # AINDY_QUOTA_TENANT_REFRESH_MS during mid-execution checks.
+    AINDY_QUOTA_LEASE_ENABLED: bool = False
+    AINDY_QUOTA_LEASE_SYSCALLS: int = 10
+    AINDY_QUOTA_LEASE_CPU_MS: int = 2000
+    AINDY_QUOTA_TENANT_REFRESH_MS: int = 500
+    # Authenticated principal cache (AINDY/auth/principal_cache.py): resolved
+    # API keys and JWT users are reused for this many seconds (0 disables).
+    # Revocation, session invalidation and committed user changes drop entries
+    # on every instance via the event bus; the TTL bounds staleness when the
+    # bus is unavailable.
+    AINDY_AUTH_PRINCIPAL_CACHE_TTL_SECONDS: float = 0.0
+    AINDY_AUTH_PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    # Coalesce API key last_used_at stamps into one bulk UPDATE every N seconds
+    # (0 flushes once per principal cache TTL when the cache is on, otherwise
+    # writes the stamp inline on each request).
+    AINDY_API_KEY_LAST_USED_FLUSH_SECONDS: float = 0.0
+
+    # Request metric rollups (AINDY/core/request_metric_rollups.py): the
+    # metric writer also keeps per-minute aggregates by path, status class and
+    # user, and observability queries read them. Raw request_metrics rows older
+    # than RETENTION_HOURS and rollups older than ROLLUP_RETENTION_DAYS are
+    # pruned hourly (0 keeps them).
+    AINDY_REQUEST_METRIC_ROLLUPS_ENABLED: bool = False
+    AINDY_REQUEST_METRIC_RETENTION_HOURS: int = 0
+    AINDY_REQUEST_METRIC_ROLLUP_RETENTION_DAYS: int = 0
+    # Streaming per-minute event/request aggregates for compute_current_state
+    # (AINDY/platform_layer/system_state_window.py) instead of loading the last
+    # hour of rows. The Redis tier (REDIS_URL) shares the window across workers.
+    AINDY_SYSTEM_STATE_STREAMING: bool = False
+    AINDY_SYSTEM_STATE_STREAMING_REDIS: bool = False
+    # Per-user task dependency DAGs (apps/tasks/services/task_graph_cache.py),
+    # updated in place on task create/status changes. Each read validates the
+    # cached graph with one aggregate query; the TTL is a staleness backstop.
+    AINDY_TASK_GRAPH_CACHE_ENABLED: bool = True
+    AINDY_TASK_GRAPH_CACHE_TTL_SECONDS: float = 300.0
+    AINDY_TASK_GRAPH_CACHE_MAX_USERS: int = 1024
+    # Map-reduce ARM analysis (apps/arm/services/deepseek/deepseek_code_analyzer.py):
+    # chunks of a large file are analyzed concurrently, at most MAX_CONCURRENCY
+    # at a time, and each chunk's result is cached by content hash
+    # (apps/arm/services/deepseek/chunk_result_cache.py) so re-analyzing an
+    # edited file only re-sends the chunks that changed.
+    AINDY_ARM_ANALYSIS_MAX_CONCURRENCY: int = 4
+    AINDY_ARM_CHUNK_CACHE_ENABLED: bool = True
+    AINDY_ARM_CHUNK_CACHE_MAX_ENTRIES: int = 2048
+    AINDY_ARM_CHUNK_CACHE_TTL_SECONDS: float = 86400.0
+    # Process-wide snapshot of the capabilities table used when minting agent
+    # run tokens (AINDY/agents/capability_service.py). Rebuilt when the
+    # registered definitions change or sync_capability_catalog writes; the
+    # TTL is a backstop for rows changed by other processes.
+    AINDY_CAPABILITY_CATALOG_CACHE_TTL_SECONDS: float = 300.0
 
     # --- Database connection pool defaults (non-SQLite only) ---
     DB_POOL_SIZE: int = 10
@@ -168,6 +255,57 @@ class Settings(BaseSettings):
     AINDY_ASYNC_JOB_WORKERS: int = 10
     AINDY_ASYNC_QUEUE_MAXSIZE: int = 100    # max pending jobs before rejection
     AINDY_MEMORY_INGEST_QUEUE_MAX: int = 500
+    # In-process embedding matrix used for semantic recall when pgvector
+    # ranking is unavailable (see AINDY/memory/vector_index.py).
+    AINDY_MEMORY_VECTOR_INDEX_ENABLED: bool = True
+    AINDY_MEMORY_VECTOR_INDEX_MAX_BYTES: int = 1024 * 1024 * 1024
+    AINDY_MEMORY_VECTOR_INDEX_TTL_SECONDS: int = 300
+    # Default recall-vs-latency trade-off for semantic search: "auto" switches
+    # from exact to approximate (HNSW / in-process IVF) search once a tenant
+    # has AINDY_MEMORY_ANN_MIN_ROWS embedded nodes.
+    AINDY_MEMORY_SEARCH_MODE: str = "auto"
+    AINDY_MEMORY_ANN_MIN_ROWS: int = 50_000
+    # Lexical recall: Postgres ranks with full-text search; elsewhere an
+    # in-process BM25 index serves it (see AINDY/memory/lexical_index.py).
+    # AINDY_MEMORY_HYBRID_LEXICAL_WEIGHT is the share of recall relevance
+    # taken from lexical rather than vector scores; 0 keeps recall semantic.
+    AINDY_MEMORY_LEXICAL_INDEX_ENABLED: bool = True
+    AINDY_MEMORY_LEXICAL_INDEX_MAX_DOCUMENTS: int = 500_000
+    AINDY_MEMORY_LEXICAL_INDEX_TTL_SECONDS: int = 300
+    AINDY_MEMORY_HYBRID_LEXICAL_WEIGHT: float = 0.0
+    # Memory capture merges near-duplicates (SimHash within MAX_DISTANCE
+    # bits of an existing node) into that node instead of storing them
+    # (see AINDY/memory/content_fingerprint.py). Exact duplicates are
+    # always merged.
+    AINDY_MEMORY_NEAR_DUPLICATE_ENABLED: bool = False
+    AINDY_MEMORY_NEAR_DUPLICATE_MAX_DISTANCE: int = 6
+    AINDY_MEMORY_NEAR_DUPLICATE_MAX_USERS: int = 1024
+    AINDY_MEMORY_NEAR_DUPLICATE_TTL_SECONDS: int = 600
+    # Pending-embedding sweep: texts per embeddings request, bounded by an
+    # estimated token budget (the endpoint caps a request at 2048 inputs).
+    AINDY_EMBEDDING_BATCH_MAX_TOKENS: int = 100_000
+    AINDY_EMBEDDING_BATCH_MAX_INPUTS: int = 256
+    # Query-embedding cache (see AINDY/memory/query_embedding_cache.py). The
+    # Redis tier is shared across instances and uses REDIS_URL.
+    AINDY_QUERY_EMBEDDING_CACHE_ENABLED: bool = True
+    AINDY_QUERY_EMBEDDING_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    AINDY_QUERY_EMBEDDING_CACHE_TTL_SECONDS: int = 3600
+    AINDY_QUERY_EMBEDDING_CACHE_REDIS: bool = False
+    # External call layer (see AINDY/platform_layer/external_call_service.py):
+    # identical in-flight calls share one provider request, and callers that
+    # opt in (temperature-0 completions) are served from a TTL/LRU cache.
+    # external.call.* events stay required unless the SystemEvent write-behind
+    # buffer is enabled; then they are batched unless EVENTS_REQUIRED is set.
+    AINDY_EXTERNAL_CALL_SINGLEFLIGHT: bool = True
+    AINDY_EXTERNAL_CALL_CACHE_ENABLED: bool = True
+    AINDY_EXTERNAL_CALL_CACHE_MAX_ENTRIES: int = 512
+    AINDY_EXTERNAL_CALL_CACHE_TTL_SECONDS: int = 3600
+    AINDY_EXTERNAL_CALL_EVENTS_REQUIRED: bool = False
+    # Write-behind persistence for non-required SystemEvents (see
+    # AINDY/core/system_event_buffer.py): flush at MAX_EVENTS or FLUSH_MS.
+    AINDY_SYSTEM_EVENT_WRITE_BEHIND: bool = False
+    AINDY_SYSTEM_EVENT_BUFFER_MAX_EVENTS: int = 200
+    AINDY_SYSTEM_EVENT_BUFFER_FLUSH_MS: int = 250
     AINDY_SHUTDOWN_TIMEOUT_SECONDS: int = 30
     AINDY_WORKER_HEALTH_PORT: int = 8001
     AINDY_WORKER_LIVENESS_TIMEOUT_SECONDS: int = 60
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
-import asyncio
 import logging
 from collections.abc import Callable
 from typing import Any
 
 from fastapi import Request
 
+from AINDY.core.execution_loop import (
+    run_blocking_handler,
+    run_on_thread_loop,
+    should_offload_handler,
+)
 from AINDY.core.execution_pipeline import ExecutionContext, ExecutionPipeline
 from AINDY.core.response_adapter import adapt_response
 from AINDY.platform_layer.trace_context import get_current_request
@@ -41,8 +45,14 @@ async def execute_with_pipeline(
     if active_request is not None:
         active_request.state.user_id = resolved_user_id
         active_request.state.execution_context = ctx
+    pipeline_handler = handler
+    if should_offload_handler(handler):
+        # Keep blocking handler bodies off the shared event loop.
+        async def pipeline_handler(ctx: ExecutionContext) -> Any:
+            return await run_blocking_handler(handler, ctx)
+
     pipeline = ExecutionPipeline()
-    result = await pipeline.run(ctx, handler)
+    result = await pipeline.run(ctx, pipeline_handler)
     if return_result:
         return result
     canonical = result.to_response()
@@ -64,7 +74,7 @@ def execute_with_pipeline_sync(
     success_status_code: int = 200,
     return_result: bool = False,
 ):
-    return asyncio.run(
+    return run_on_thread_loop(
         execute_with_pipeline(
             request=request,
             route_name=route_name,
@@ -0,0 +1,150 @@
+"""
+Event-loop plumbing for execute_with_pipeline.
+
+Sync route handlers run on Starlette's thread pool. Instead of building and
+closing a new event loop per request with ``asyncio.run()``,
+``run_on_thread_loop()`` keeps one loop per worker thread and reuses it.
+
+When the pipeline runs on a shared loop (async routes on the server loop),
+a sync handler body would block every other request on that loop while it
+waits on the database. ``run_blocking_handler()`` moves it to a bounded
+executor of ``AINDY_PIPELINE_HANDLER_WORKERS`` threads. This is opt-in
+(``AINDY_PIPELINE_OFFLOAD_HANDLERS``): the handler's ``Session`` use moves
+to the executor thread. The handler runs in a copy of the caller's
+contextvars, and any variable it sets is copied back into the caller's
+context afterwards, as if it had run inline. Queue wait and in-flight
+counts are recorded.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from collections.abc import Callable, Coroutine
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional, TypeVar
+
+from AINDY.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_thread_state = threading.local()
+
+
+# ── Per-thread loop for sync entry points ────────────────────────────────────
+
+
+def run_on_thread_loop(coro: Coroutine[Any, Any, T]) -> T:
+    """Drop-in for ``asyncio.run`` that reuses this thread's event loop."""
+    loop = getattr(_thread_state, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        _thread_state.loop = loop
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        _cancel_leftover_tasks(loop)
+
+
+def _cancel_leftover_tasks(loop: asyncio.AbstractEventLoop) -> None:
+    # asyncio.run() cancels whatever the request left behind; keep that.
+    pending = [task for task in asyncio.all_tasks(loop) if not task.done()]
+    if not pending:
+        return
+    for task in pending:
+        task.cancel()
+    loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+
+
+def is_thread_loop(loop: asyncio.AbstractEventLoop) -> bool:
+    return loop is getattr(_thread_state, "loop", None)
+
+
+# ── Bounded executor for blocking handler bodies ─────────────────────────────
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_handler_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=max(1, int(settings.AINDY_PIPELINE_HANDLER_WORKERS)),
+                    thread_name_prefix="pipeline-handler",
+                )
+    return _executor
+
+
+def shutdown_handler_executor(wait: bool = True) -> None:
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait, cancel_futures=True)
+
+
+def should_offload_handler(handler: Callable[..., Any]) -> bool:
+    """True when *handler* is sync and would otherwise run on a shared loop."""
+    if not settings.AINDY_PIPELINE_OFFLOAD_HANDLERS:
+        return False
+    if asyncio.iscoroutinefunction(handler):
+        return False
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return not is_thread_loop(loop)
+
+
+async def run_blocking_handler(handler: Callable[..., T], *args: Any) -> T:
+    """Run a blocking *handler* on the handler executor with the caller's context."""
+    context = contextvars.copy_context()
+    before = dict(context)
+    submitted = time.monotonic()
+
+    def _call() -> T:
+        _observe_queue_wait(time.monotonic() - submitted)
+        _track_inflight(1)
+        try:
+            return context.run(handler, *args)
+        finally:
+            _track_inflight(-1)
+
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(get_handler_executor(), _call)
+    finally:
+        _copy_back(context, before)
+
+
+def _copy_back(context: contextvars.Context, before: dict) -> None:
+    """Apply the variables the handler set in *context* to the current context."""
+    for var, value in context.items():
+        if var not in before or before[var] is not value:
+            var.set(value)
+
+
+def _observe_queue_wait(seconds: float) -> None:
+    try:
+        from AINDY.platform_layer.metrics import pipeline_handler_queue_wait_seconds
+
+        pipeline_handler_queue_wait_seconds.observe(seconds)
+    except Exception:
+        pass
+
+
+def _track_inflight(delta: int) -> None:
+    try:
+        from AINDY.platform_layer.metrics import pipeline_handler_inflight
+
+        pipeline_handler_inflight.inc(delta)
+    except Exception:
+        pass
@@ -1,7 +1,9 @@
 from AINDY.core.execution_pipeline.context import (
     ExecutionContext,
     ExecutionResult,
+    READ_ONLY_EXECUTION,
     _route_eu_type,
+    is_ephemeral_execution,
 )
 from AINDY.core.execution_pipeline.pipeline import ExecutionPipeline
 from AINDY.core.execution_pipeline.shared import (
@@ -15,9 +17,11 @@ __all__ = [
     "ExecutionContext",
     "ExecutionPipeline",
     "ExecutionResult",
+    "READ_ONLY_EXECUTION",
     "_METRICS_AVAILABLE",
     "_route_eu_type",
     "aindy_active_executions_total",
     "execution_duration_seconds",
     "execution_total",
+    "is_ephemeral_execution",
 ]
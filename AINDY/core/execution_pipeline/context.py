@@ -9,6 +9,23 @@ from AINDY.core.execution_pipeline.shared import (
 )
 
 
+# Declared via metadata={"execution_class": READ_ONLY_EXECUTION}. Unless the
+# execution is sampled (AINDY_READ_ONLY_TRACE_SAMPLE_RATE) or fails, it keeps
+# metrics, trace ids and quota accounting in memory and writes no
+# ExecutionUnit, FlowRun or lifecycle SystemEvent rows.
+READ_ONLY_EXECUTION = "read_only"
+
+
+def is_ephemeral_execution(ctx: Any = None) -> bool:
+    """True when *ctx* (default: the current pipeline context) skips durable writes."""
+    if ctx is None:
+        from AINDY.platform_layer.trace_context import get_current_execution_context
+
+        ctx = get_current_execution_context()
+    metadata = getattr(ctx, "metadata", None)
+    return isinstance(metadata, dict) and bool(metadata.get("ephemeral"))
+
+
 def _route_eu_type(route_name: str) -> str:
     from AINDY.platform_layer.registry import get_route_prefix
 
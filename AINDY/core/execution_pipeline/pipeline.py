@@ -10,8 +10,10 @@ from AINDY.core.execution_pipeline.resources import (
 from AINDY.core.execution_pipeline.runtime_state import (
     _handle_contract_violation,
     _inject_execution_envelope,
+    _record_read_only_execution,
     _record_side_effect,
     _requires_route_side_effects,
+    _resolve_execution_class,
     _safe_reset_current_execution_context,
     _safe_reset_parent_event,
     _safe_reset_pipeline_active,
@@ -51,6 +53,8 @@ from AINDY.core.execution_pipeline.waits import _detect_wait, _safe_transition_e
 class ExecutionPipeline:
     _record_side_effect = _record_side_effect
     _requires_route_side_effects = _requires_route_side_effects
+    _resolve_execution_class = _resolve_execution_class
+    _record_read_only_execution = staticmethod(_record_read_only_execution)
     _safe_set_parent_event = _safe_set_parent_event
     _safe_reset_parent_event = _safe_reset_parent_event
     _set_event_refs = _set_event_refs
@@ -85,6 +89,7 @@ class ExecutionPipeline:
 
         trace_id = str(ctx.request_id)
         ctx.metadata.setdefault("trace_id", trace_id)
+        ephemeral = self._resolve_execution_class(ctx)
         required_side_effects = self._requires_route_side_effects(ctx)
         started_event_id: str | None = None
         parent_token: Any = None
@@ -106,17 +111,20 @@ class ExecutionPipeline:
                 pass
 
         try:
-            started_event_id = self._safe_emit_event(
-                ctx,
-                event_type="execution.started",
-                payload={"route_name": ctx.route_name},
-                required=required_side_effects,
-            )
+            if not ephemeral:
+                started_event_id = self._safe_emit_event(
+                    ctx,
+                    event_type="execution.started",
+                    payload={"route_name": ctx.route_name},
+                    required=required_side_effects,
+                )
             parent_token = self._safe_set_parent_event(started_event_id)
             pipeline_token = self._safe_set_pipeline_active()
             execution_ctx_token = self._safe_set_current_execution_context(ctx)
             self._safe_require_eu(ctx)
             if not self._safe_check_quota(ctx, started_event_id):
+                if ephemeral:
+                    self._record_read_only_execution(ctx, "error")
                 return ExecutionResult(
                     success=False,
                     error="Tenant concurrency limit exceeded",
@@ -172,13 +180,17 @@ class ExecutionPipeline:
                     pass
             result = self._inject_execution_envelope(ctx, result, duration_ms)
 
-            completed_event_id = self._safe_emit_event(
-                ctx,
-                event_type="execution.completed",
-                parent_event_id=started_event_id,
-                required=required_side_effects,
-                payload={"route_name": ctx.route_name, "success": True},
-            )
+            if ephemeral:
+                completed_event_id = None
+                self._record_read_only_execution(ctx, "none")
+            else:
+                completed_event_id = self._safe_emit_event(
+                    ctx,
+                    event_type="execution.completed",
+                    parent_event_id=started_event_id,
+                    required=required_side_effects,
+                    payload={"route_name": ctx.route_name, "success": True},
+                )
             self._set_event_refs(ctx, started_event_id, terminal_event_id=completed_event_id, completed=True)
             self._safe_finalize_eu(ctx, "completed")
             logger.info("execution.completed", extra={"route": ctx.route_name, "success": True})
@@ -246,6 +258,8 @@ class ExecutionPipeline:
             )
             self._set_event_refs(ctx, started_event_id, terminal_event_id=failed_event_id, completed=False)
             self._safe_finalize_eu(ctx, "failed")
+            if ephemeral:
+                self._record_read_only_execution(ctx, "error")
             logger.info("execution.completed", extra={"route": ctx.route_name, "success": False})
             if metrics_available:
                 try:
@@ -267,6 +281,8 @@ class ExecutionPipeline:
             )
             self._set_event_refs(ctx, started_event_id, terminal_event_id=failed_event_id, completed=False)
             self._safe_finalize_eu(ctx, "failed")
+            if ephemeral:
+                self._record_read_only_execution(ctx, "error")
             logger.exception("execution.failed", extra={"route": ctx.route_name})
             if metrics_available:
                 try:
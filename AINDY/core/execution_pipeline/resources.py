@@ -2,9 +2,14 @@ from AINDY.core.execution_pipeline.context import _route_eu_type
 from AINDY.core.execution_pipeline.shared import logger
 
 
+def _tracks_quota(ctx) -> bool:
+    # Ephemeral executions have no EU; they still hold a tenant concurrency slot.
+    return bool(ctx.user_id) and bool(ctx.metadata.get("eu_id") or ctx.metadata.get("ephemeral"))
+
+
 def _safe_require_eu(self, ctx) -> str | None:
     db = ctx.metadata.get("db")
-    if db is None or not ctx.user_id:
+    if db is None or not ctx.user_id or ctx.metadata.get("ephemeral"):
         return None
     try:
         from AINDY.core.execution_gate import require_execution_unit
@@ -56,7 +61,7 @@ def _safe_require_eu(self, ctx) -> str | None:
 
 def _safe_check_quota(self, ctx, started_event_id: str | None = None) -> bool:
     eu_id = ctx.metadata.get("eu_id")
-    if not eu_id or not ctx.user_id:
+    if not _tracks_quota(ctx):
         return True
     try:
         from AINDY.kernel.resource_manager import get_resource_manager
@@ -87,7 +92,7 @@ def _safe_check_quota(self, ctx, started_event_id: str | None = None) -> bool:
 
 def _safe_rm_mark_started(self, ctx) -> None:
     eu_id = ctx.metadata.get("eu_id")
-    if not eu_id or not ctx.user_id:
+    if not _tracks_quota(ctx):
         return
     try:
         from AINDY.kernel.resource_manager import get_resource_manager
@@ -99,7 +104,7 @@ def _safe_rm_mark_started(self, ctx) -> None:
 
 def _safe_rm_mark_completed(self, ctx) -> None:
     eu_id = ctx.metadata.get("eu_id")
-    if not eu_id or not ctx.user_id:
+    if not _tracks_quota(ctx):
         return
     try:
         from AINDY.kernel.resource_manager import get_resource_manager
@@ -111,13 +116,14 @@ def _safe_rm_mark_completed(self, ctx) -> None:
 
 def _safe_rm_record_and_complete(self, ctx, duration_ms: float) -> None:
     eu_id = ctx.metadata.get("eu_id")
-    if not eu_id or not ctx.user_id:
+    if not _tracks_quota(ctx):
         return
     try:
         from AINDY.kernel.resource_manager import get_resource_manager
 
         rm = get_resource_manager()
-        rm.record_usage(eu_id, {"cpu_time_ms": int(duration_ms)})
+        if eu_id:
+            rm.record_usage(eu_id, {"cpu_time_ms": int(duration_ms)})
         rm.mark_completed(str(ctx.user_id), eu_id)
     except Exception:
         logger.warning("execution.rm_record_and_complete_failed (non-fatal)", exc_info=True)
@@ -1,8 +1,39 @@
+import random
+
 from AINDY.core.execution_pipeline.shared import Any, logger
 
 
 def _requires_route_side_effects(self, ctx) -> bool:
-    return ctx.metadata.get("db") is not None
+    return ctx.metadata.get("db") is not None and not ctx.metadata.get("ephemeral")
+
+
+def _resolve_execution_class(self, ctx) -> bool:
+    """Mark a read-only execution ephemeral unless it is sampled for persistence."""
+    from AINDY.core.execution_pipeline.context import READ_ONLY_EXECUTION
+
+    if ctx.metadata.get("execution_class") != READ_ONLY_EXECUTION:
+        ctx.metadata["ephemeral"] = False
+        return False
+    try:
+        from AINDY.config import settings
+
+        sample_rate = float(settings.AINDY_READ_ONLY_TRACE_SAMPLE_RATE or 0.0)
+    except Exception:
+        sample_rate = 0.0
+    sampled = sample_rate > 0 and random.random() < sample_rate
+    ctx.metadata["ephemeral"] = not sampled
+    if sampled:
+        _record_read_only_execution(ctx, "sampled")
+    return not sampled
+
+
+def _record_read_only_execution(ctx, persisted: str) -> None:
+    try:
+        from AINDY.platform_layer.metrics import read_only_executions_total
+
+        read_only_executions_total.labels(route=ctx.route_name, persisted=persisted).inc()
+    except Exception:
+        pass
 
 
 def _record_side_effect(self, ctx, name: str, *, status: str, required: bool, error: Any = None) -> None:
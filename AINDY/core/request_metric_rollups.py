@@ -0,0 +1,233 @@
+"""
+Per-minute request metric rollups, raw-row retention and rollup queries.
+
+With AINDY_REQUEST_METRIC_ROLLUPS_ENABLED the request metric writer folds
+each flushed batch into a ``RollupAccumulator`` and writes one
+``RequestMetricRollup`` row per (minute, path, status class, user) once the
+minute has closed. Dashboards then read a bounded number of rollup rows per
+window, independent of traffic, and percentiles come from the merged
+latency histograms (bucket upper bounds, not exact values). Time before
+the first rollup, such as history from before the flag was turned on, is
+summarized from the raw rows.
+
+``prune_request_metrics`` deletes raw rows older than
+AINDY_REQUEST_METRIC_RETENTION_HOURS and rollups older than
+AINDY_REQUEST_METRIC_ROLLUP_RETENTION_DAYS; 0 keeps them forever.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable
+
+from AINDY.config import settings
+from AINDY.platform_layer.system_state_window import (
+    LATENCY_BOUNDS_MS,
+    histogram_quantile,
+    latency_slot,
+)
+
+logger = logging.getLogger(__name__)
+
+_PRUNE_CHUNK = 10_000
+# RequestMetricRollup histogram columns, one per LATENCY_BOUNDS_MS slot.
+HISTOGRAM_COLUMNS = tuple(f"latency_le_{bound}" for bound in LATENCY_BOUNDS_MS) + (
+    f"latency_gt_{LATENCY_BOUNDS_MS[-1]}",
+)
+
+
+def rollups_enabled() -> bool:
+    return bool(settings.AINDY_REQUEST_METRIC_ROLLUPS_ENABLED)
+
+
+def _utc_naive(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _minute(value: datetime) -> datetime:
+    return _utc_naive(value).replace(second=0, microsecond=0)
+
+
+class RollupAccumulator:
+    """In-memory per-minute aggregates awaiting their minute to close."""
+
+    def __init__(self) -> None:
+        self._entries: dict[tuple, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, metrics: Iterable[Any]) -> None:
+        """Fold PendingMetric-like objects into their minute buckets."""
+        with self._lock:
+            for metric in metrics:
+                path = getattr(metric, "route", None) or metric.path
+                key = (
+                    _minute(metric.created_at),
+                    path,
+                    int(metric.status_code) // 100,
+                    metric.user_id,
+                )
+                entry = self._entries.get(key)
+                if entry is None:
+                    entry = self._entries[key] = {
+                        "request_count": 0,
+                        "duration_sum_ms": 0.0,
+                        "duration_max_ms": 0.0,
+                        **{column: 0 for column in HISTOGRAM_COLUMNS},
+                    }
+                duration = float(metric.duration_ms or 0.0)
+                entry["request_count"] += 1
+                entry["duration_sum_ms"] += duration
+                entry["duration_max_ms"] = max(entry["duration_max_ms"], duration)
+                entry[HISTOGRAM_COLUMNS[latency_slot(duration)]] += 1
+
+    def drain(self, before: datetime | None = None) -> list[dict[str, Any]]:
+        """Remove and return rollup rows for minutes before *before* (all if None)."""
+        cutoff = _minute(before) if before is not None else None
+        with self._lock:
+            keys = [key for key in self._entries if cutoff is None or key[0] < cutoff]
+            rows = []
+            for key in keys:
+                bucket_start, path, status_class, user_id = key
+                rows.append({
+                    "bucket_start": bucket_start,
+                    "path": path,
+                    "status_class": status_class,
+                    "user_id": user_id,
+                    **self._entries.pop(key),
+                })
+        return rows
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _raw_totals(db, *, user_id, since, until, path) -> list | None:
+    """Rollup-shaped totals from raw request_metrics rows; None if there are none."""
+    from sqlalchemy import and_, case, func
+
+    from AINDY.db.models.request_metric import RequestMetric
+
+    # Probe the created_at index first; once rollups cover all retained
+    # history this is the only query issued.
+    probe = db.query(RequestMetric.id).filter(RequestMetric.created_at < until)
+    if since is not None:
+        probe = probe.filter(RequestMetric.created_at >= _utc_naive(since))
+    if probe.limit(1).first() is None:
+        return None
+
+    duration = RequestMetric.duration_ms
+    slots = []
+    for index, bound in enumerate(LATENCY_BOUNDS_MS):
+        condition = duration <= bound
+        if index:
+            condition = and_(duration > LATENCY_BOUNDS_MS[index - 1], condition)
+        slots.append(func.sum(case((condition, 1), else_=0)))
+    slots.append(func.sum(case((duration > LATENCY_BOUNDS_MS[-1], 1), else_=0)))
+
+    query = db.query(
+        func.count(RequestMetric.id),
+        func.sum(case((RequestMetric.status_code >= 500, 1), else_=0)),
+        func.sum(duration),
+        func.max(duration),
+        *slots,
+    ).filter(RequestMetric.created_at < until)
+    if user_id is not None:
+        query = query.filter(RequestMetric.user_id == user_id)
+    if since is not None:
+        query = query.filter(RequestMetric.created_at >= _utc_naive(since))
+    if path is not None:
+        query = query.filter(RequestMetric.path == path)
+    return list(query.one())
+
+
+def summarize_request_rollups(
+    db,
+    *,
+    user_id: uuid.UUID | None = None,
+    since: datetime | None = None,
+    path: str | None = None,
+) -> dict[str, Any]:
+    """Request count, error rate, mean and percentile latency from rollups.
+
+    Rollups start at the first minute written after the flag was enabled;
+    any part of the range before that is read from the raw rows instead.
+    """
+    from sqlalchemy import case, func
+
+    from AINDY.db.models.request_metric import RequestMetricRollup
+
+    query = db.query(
+        func.sum(RequestMetricRollup.request_count),
+        func.sum(case((RequestMetricRollup.status_class == 5, RequestMetricRollup.request_count), else_=0)),
+        func.sum(RequestMetricRollup.duration_sum_ms),
+        func.max(RequestMetricRollup.duration_max_ms),
+        *(func.sum(getattr(RequestMetricRollup, column)) for column in HISTOGRAM_COLUMNS),
+    )
+    if user_id is not None:
+        query = query.filter(RequestMetricRollup.user_id == user_id)
+    if since is not None:
+        query = query.filter(RequestMetricRollup.bucket_start >= _minute(since))
+    if path is not None:
+        query = query.filter(RequestMetricRollup.path == path)
+    totals = list(query.one())
+
+    covered_from = db.query(func.min(RequestMetricRollup.bucket_start)).scalar()
+    if covered_from is None:
+        covered_from = _utc_naive(datetime.now(timezone.utc)) + timedelta(minutes=1)
+    if since is None or _minute(since) < covered_from:
+        raw = _raw_totals(db, user_id=user_id, since=since, until=covered_from, path=path)
+    else:
+        raw = None
+    if raw is not None:
+        totals = [
+            max(a or 0, b or 0) if index == 3 else (a or 0) + (b or 0)
+            for index, (a, b) in enumerate(zip(totals, raw))
+        ]
+
+    requests, errors, duration_sum, duration_max, *histogram = totals
+    requests, errors = int(requests or 0), int(errors or 0)
+    duration_sum, duration_max = float(duration_sum or 0.0), float(duration_max or 0.0)
+    histogram = [int(count or 0) for count in histogram]
+    return {
+        "requests": requests,
+        "errors": errors,
+        "error_rate_pct": round((errors / requests) * 100, 2) if requests else 0.0,
+        "avg_latency_ms": round(duration_sum / requests, 2) if requests else 0.0,
+        "max_latency_ms": round(duration_max, 2),
+        "p50_latency_ms": histogram_quantile(histogram, 0.50),
+        "p95_latency_ms": histogram_quantile(histogram, 0.95),
+        "p99_latency_ms": histogram_quantile(histogram, 0.99),
+    }
+
+
+def _delete_before(db, model, column, cutoff: datetime) -> int:
+    deleted = 0
+    while True:
+        ids = [row_id for (row_id,) in db.query(model.id).filter(column < cutoff).limit(_PRUNE_CHUNK)]
+        if not ids:
+            return deleted
+        deleted += db.query(model).filter(model.id.in_(ids)).delete(synchronize_session=False)
+        db.commit()
+
+
+def prune_request_metrics(db, *, now: datetime | None = None) -> dict[str, int]:
+    """Apply the raw and rollup retention windows; returns rows deleted."""
+    from AINDY.db.models.request_metric import RequestMetric, RequestMetricRollup
+
+    now = _utc_naive(now or datetime.now(timezone.utc))
+    result = {"raw_deleted": 0, "rollups_deleted": 0}
+    raw_hours = settings.AINDY_REQUEST_METRIC_RETENTION_HOURS
+    if raw_hours > 0:
+        result["raw_deleted"] = _delete_before(
+            db, RequestMetric, RequestMetric.created_at, now - timedelta(hours=raw_hours)
+        )
+    rollup_days = settings.AINDY_REQUEST_METRIC_ROLLUP_RETENTION_DAYS
+    if rollup_days > 0:
+        result["rollups_deleted"] = _delete_before(
+            db, RequestMetricRollup, RequestMetricRollup.bucket_start, now - timedelta(days=rollup_days)
+        )
+    return result
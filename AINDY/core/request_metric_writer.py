@@ -10,6 +10,8 @@ from typing import Optional
 
 from sqlalchemy import insert
 
+from AINDY.core.request_metric_rollups import RollupAccumulator, rollups_enabled
+
 logger = logging.getLogger(__name__)
 
 _QUEUE_MAX = 10_000
@@ -29,6 +31,8 @@ class PendingMetric:
     created_at: datetime = field(
         default_factory=lambda: datetime.now(timezone.utc)
     )
+    # Route template (e.g. "/tasks/{task_id}"); rollups group by it when set.
+    route: Optional[str] = None
 
 
 class RequestMetricWriter:
@@ -40,6 +44,7 @@ class RequestMetricWriter:
         self._stop_event = threading.Event()
         self._dropped = 0
         self._last_flush_monotonic = 0.0
+        self._rollups = RollupAccumulator()
 
     def start(self) -> None:
         if self._thread and self._thread.is_alive():
@@ -60,6 +65,7 @@ class RequestMetricWriter:
             self._thread.join(timeout=timeout)
         while not self._queue.empty():
             self._flush()
+        self._flush(drain_rollups=True)
         logger.info("[request_metric_writer] Background writer stopped.")
 
     def enqueue(self, metric: PendingMetric) -> bool:
@@ -86,7 +92,7 @@ class RequestMetricWriter:
             self._stop_event.wait(timeout=_FLUSH_INTERVAL)
             self._flush()
 
-    def _flush(self) -> None:
+    def _flush(self, drain_rollups: bool = False) -> None:
         batch: list[PendingMetric] = []
         try:
             while len(batch) < _BATCH_SIZE:
@@ -94,11 +100,19 @@ class RequestMetricWriter:
         except queue.Empty:
             pass
 
-        if not batch:
+        # Rollups are written once their minute has closed, so each process
+        # emits at most one row per (minute, path, status class, user).
+        if batch and rollups_enabled():
+            self._rollups.add(batch)
+        rollup_rows: list[dict] = []
+        if len(self._rollups):
+            rollup_rows = self._rollups.drain(None if drain_rollups else datetime.now(timezone.utc))
+
+        if not batch and not rollup_rows:
             return
 
         from AINDY.db.database import SessionLocal
-        from AINDY.db.models.request_metric import RequestMetric
+        from AINDY.db.models.request_metric import RequestMetric, RequestMetricRollup
 
         mappings = [
             {
@@ -117,9 +131,18 @@ class RequestMetricWriter:
         db = None
         try:
             db = SessionLocal()
-            db.execute(insert(RequestMetric), mappings)
+            if mappings:
+                db.execute(insert(RequestMetric), mappings)
+            if rollup_rows:
+                db.execute(insert(RequestMetricRollup), rollup_rows)
             db.commit()
             self._last_flush_monotonic = time.monotonic()
+            try:
+                from AINDY.platform_layer.system_state_window import record_request_metrics
+
+                record_request_metrics(batch)
+            except Exception as exc:
+                logger.debug("[request_metric_writer] state window update skipped: %s", exc)
         except Exception as exc:
             logger.warning(
                 "[request_metric_writer] Batch flush failed (%d rows): %s",
@@ -0,0 +1,319 @@
+"""
+Write-behind buffer for non-required SystemEvents.
+
+With ``AINDY_SYSTEM_EVENT_WRITE_BEHIND`` enabled, ``emit_system_event``
+hands events emitted with ``required=False`` to this buffer instead of
+writing them inline. Event ids are assigned up front, so callers can still
+use the returned id as a parent for later events. The buffer flushes when
+it holds ``AINDY_SYSTEM_EVENT_BUFFER_MAX_EVENTS`` rows or its oldest row is
+``AINDY_SYSTEM_EVENT_BUFFER_FLUSH_MS`` old. A flush writes all events with
+one multi-row INSERT and all parent edges with a second one. Parent
+references are checked against the batch itself, and only parents from
+outside the batch cost a SELECT.
+
+``flush()`` is the durable barrier: when it returns, every event buffered
+before the call is committed. Required events whose parent is still
+buffered call it before they are written.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from sqlalchemy import insert
+
+from AINDY.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PendingSystemEvent:
+    row: dict[str, Any]
+    relationship_type: str
+
+
+def _default_session_factory():
+    from AINDY.db.database import SessionLocal
+
+    return SessionLocal
+
+
+class SystemEventBuffer:
+    """Thread-safe write-behind buffer for SystemEvent rows and parent edges."""
+
+    def __init__(
+        self,
+        *,
+        max_events: int | None = None,
+        flush_interval_seconds: float | None = None,
+        session_factory: Callable[[], Any] | None = None,
+    ) -> None:
+        self.max_events = max(
+            1,
+            int(max_events if max_events is not None else settings.AINDY_SYSTEM_EVENT_BUFFER_MAX_EVENTS),
+        )
+        self.flush_interval_seconds = max(
+            0.0,
+            float(
+                flush_interval_seconds
+                if flush_interval_seconds is not None
+                else settings.AINDY_SYSTEM_EVENT_BUFFER_FLUSH_MS / 1000.0
+            ),
+        )
+        self._session_factory = session_factory
+        self._pending: list[PendingSystemEvent] = []
+        # Ids stay here until their batch is committed, including while a
+        # flush is in progress, so contains() never misses an unwritten event.
+        self._unwritten: set[uuid.UUID] = set()
+        self._oldest_monotonic: float | None = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._dropped = 0
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="system-event-writer",
+            daemon=True,
+        )
+        self._thread.start()
+        logger.info("[SystemEventBuffer] Background flusher started.")
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+        self.flush()
+        logger.info("[SystemEventBuffer] Background flusher stopped.")
+
+    def _run(self) -> None:
+        interval = self.flush_interval_seconds or 0.25
+        while not self._stop_event.wait(timeout=interval):
+            try:
+                self.flush()
+            except Exception:
+                logger.warning("[SystemEventBuffer] periodic flush failed", exc_info=True)
+
+    # ── Buffering ─────────────────────────────────────────────────────────────
+
+    def add(self, row: dict[str, Any], relationship_type: str) -> uuid.UUID:
+        """Buffer one SystemEvent row; returns its (pre-assigned) id."""
+        event_id = row["id"]
+        now = time.monotonic()
+        with self._lock:
+            self._pending.append(PendingSystemEvent(row=row, relationship_type=relationship_type))
+            self._unwritten.add(event_id)
+            if self._oldest_monotonic is None:
+                self._oldest_monotonic = now
+            due = len(self._pending) >= self.max_events or (
+                now - self._oldest_monotonic >= self.flush_interval_seconds
+            )
+            depth = len(self._pending)
+        _set_depth(depth)
+        if due:
+            self.flush()
+        return event_id
+
+    def contains(self, event_id) -> bool:
+        """True while *event_id* is buffered or being written."""
+        try:
+            normalized = event_id if isinstance(event_id, uuid.UUID) else uuid.UUID(str(event_id))
+        except (TypeError, ValueError):
+            return False
+        with self._lock:
+            return normalized in self._unwritten
+
+    def flush(self) -> int:
+        """Write everything buffered so far; returns the number of events committed."""
+        with self._flush_lock:
+            with self._lock:
+                batch = self._pending
+                self._pending = []
+                self._oldest_monotonic = None
+            _set_depth(0)
+            if not batch:
+                return 0
+            try:
+                return self._write(batch)
+            finally:
+                with self._lock:
+                    self._unwritten.difference_update(item.row["id"] for item in batch)
+
+    def snapshot(self) -> dict[str, int | bool]:
+        with self._lock:
+            depth = len(self._pending)
+        return {
+            "buffered": depth,
+            "dropped_total": int(self._dropped),
+            "worker_running": bool(self._thread and self._thread.is_alive()),
+        }
+
+    # ── Persistence ───────────────────────────────────────────────────────────
+
+    def _write(self, batch: list[PendingSystemEvent]) -> int:
+        from AINDY.db.models.event_edge import EventEdge
+        from AINDY.db.models.system_event import SystemEvent
+
+        factory = self._session_factory or _default_session_factory()
+        db = factory()
+        try:
+            rows, edges = self._resolve_parents(db, batch, SystemEvent)
+            db.execute(insert(SystemEvent.__table__), rows)
+            if edges:
+                db.execute(insert(EventEdge.__table__), edges)
+            db.commit()
+            _record_flush(len(rows), "batch")
+            return len(rows)
+        except Exception as exc:
+            try:
+                db.rollback()
+            except Exception:
+                pass
+            logger.warning(
+                "[SystemEventBuffer] batch flush failed (%d events); retrying one by one: %s",
+                len(batch),
+                exc,
+            )
+        finally:
+            db.close()
+        return self._write_individually(batch)
+
+    def _resolve_parents(self, db, batch: list[PendingSystemEvent], SystemEvent):
+        batch_ids = {item.row["id"] for item in batch}
+        outside = {
+            item.row["parent_event_id"]
+            for item in batch
+            if item.row.get("parent_event_id") and item.row["parent_event_id"] not in batch_ids
+        }
+        known = set(batch_ids)
+        if outside:
+            known.update(
+                event_id
+                for (event_id,) in db.query(SystemEvent.id).filter(SystemEvent.id.in_(outside)).all()
+            )
+
+        rows: list[dict[str, Any]] = []
+        edges: list[dict[str, Any]] = []
+        for item in batch:
+            row = dict(item.row)
+            parent_id = row.get("parent_event_id")
+            if parent_id and parent_id not in known:
+                logger.warning(
+                    "[SystemEvent] parent_event_id %s missing for %s; clearing parent reference",
+                    parent_id,
+                    row.get("type"),
+                )
+                row["parent_event_id"] = None
+                parent_id = None
+            rows.append(row)
+            if parent_id:
+                edges.append(
+                    {
+                        "id": uuid.uuid4(),
+                        "source_event_id": parent_id,
+                        "target_event_id": row["id"],
+                        "target_memory_node_id": None,
+                        "relationship_type": item.relationship_type,
+                        "weight": None,
+                        "created_at": row["timestamp"],
+                    }
+                )
+        return rows, edges
+
+    def _write_individually(self, batch: list[PendingSystemEvent]) -> int:
+        from AINDY.db.models.event_edge import EventEdge
+        from AINDY.db.models.system_event import SystemEvent
+
+        written = 0
+        factory = self._session_factory or _default_session_factory()
+        for item in batch:
+            db = factory()
+            try:
+                rows, edges = self._resolve_parents(db, [item], SystemEvent)
+                db.execute(insert(SystemEvent.__table__), rows)
+                if edges:
+                    db.execute(insert(EventEdge.__table__), edges)
+                db.commit()
+                written += 1
+            except Exception as exc:
+                try:
+                    db.rollback()
+                except Exception:
+                    pass
+                self._dropped += 1
+                _record_drop()
+                logger.warning(
+                    "[SystemEventBuffer] dropped %s id=%s: %s",
+                    item.row.get("type"),
+                    item.row.get("id"),
+                    exc,
+                )
+            finally:
+                db.close()
+        if written:
+            _record_flush(written, "individual")
+        return written
+
+
+def _set_depth(depth: int) -> None:
+    try:
+        from AINDY.platform_layer.metrics import system_event_buffer_depth
+
+        system_event_buffer_depth.set(depth)
+    except Exception:
+        pass
+
+
+def _record_flush(count: int, mode: str) -> None:
+    try:
+        from AINDY.platform_layer.metrics import system_event_buffer_flushed_total
+
+        system_event_buffer_flushed_total.labels(mode=mode).inc(count)
+    except Exception:
+        pass
+
+
+def _record_drop() -> None:
+    try:
+        from AINDY.platform_layer.metrics import system_event_buffer_dropped_total
+
+        system_event_buffer_dropped_total.inc()
+    except Exception:
+        pass
+
+
+_buffer: Optional[SystemEventBuffer] = None
+_buffer_lock = threading.Lock()
+
+
+def get_system_event_buffer() -> SystemEventBuffer:
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = SystemEventBuffer()
+                _buffer.start()
+    return _buffer
+
+
+def write_behind_enabled() -> bool:
+    return bool(settings.AINDY_SYSTEM_EVENT_WRITE_BEHIND)
+
+
+def flush_system_events() -> int:
+    """Durably write any buffered SystemEvents (no-op when nothing is buffered)."""
+    if _buffer is None:
+        return 0
+    return _buffer.flush()
@@ -4,6 +4,7 @@ from AINDY.db.models.job_log import JobLog
 
 import logging
 import os
+import time
 import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
@@ -53,6 +54,49 @@ def _fail_closed_in_current_mode() -> bool:
     return True
 
 
+def _normalize_parent_event_id(parent_event_id) -> uuid.UUID | None:
+    if not parent_event_id:
+        return None
+    try:
+        return uuid.UUID(str(parent_event_id))
+    except (ValueError, TypeError):
+        return None
+
+
+def _relationship_type(source: str | None) -> str:
+    if source == "async":
+        return "async_child"
+    if source == "agent":
+        return "derived"
+    if source == "memory":
+        return "memory_effect"
+    return "related_to"
+
+
+def _system_event_row(
+    *,
+    event_type: str,
+    user_id: str | uuid.UUID | None,
+    trace_id: str | None,
+    parent_event_id: str | uuid.UUID | None,
+    source: str | None,
+    agent_id: str | uuid.UUID | None,
+    payload: Optional[dict[str, Any]],
+) -> dict[str, Any]:
+    """Column values for a new SystemEvent; the parent is not validated."""
+    return {
+        "id": uuid.uuid4(),
+        "type": event_type,
+        "user_id": normalize_uuid(user_id) if user_id is not None else None,
+        "agent_id": normalize_uuid(agent_id) if agent_id is not None else None,
+        "trace_id": str(trace_id) if trace_id else None,
+        "parent_event_id": _normalize_parent_event_id(parent_event_id),
+        "source": source,
+        "payload": _json_safe(payload or {}),
+        "timestamp": datetime.now(timezone.utc),
+    }
+
+
 def _persist_system_event(
     *,
     db,
@@ -66,16 +110,26 @@ def _persist_system_event(
  ) -> uuid.UUID:
     from AINDY.db.models.system_event import SystemEvent
 
-    normalized_parent_event_id = None
-    if parent_event_id:
-        try:
-            normalized_parent_event_id = uuid.UUID(str(parent_event_id))
-        except (ValueError, TypeError):
-            normalized_parent_event_id = None
+    row = _system_event_row(
+        event_type=event_type,
+        user_id=user_id,
+        trace_id=trace_id,
+        parent_event_id=parent_event_id,
+        source=source,
+        agent_id=agent_id,
+        payload=payload,
+    )
+    normalized_parent_event_id = row["parent_event_id"]
 
     if normalized_parent_event_id:
-        from AINDY.db.models.system_event import SystemEvent
-
+        # A parent still sitting in the write-behind buffer must be durable
+        # before this row can reference it.
+        from AINDY.core.system_event_buffer import get_system_event_buffer, write_behind_enabled
+
+        if write_behind_enabled():
+            buffer = get_system_event_buffer()
+            if buffer.contains(normalized_parent_event_id):
+                buffer.flush()
         try:
             exists = (
                 db.query(SystemEvent.id)
@@ -90,40 +144,29 @@ def _persist_system_event(
                 normalized_parent_event_id,
                 event_type,
             )
-            normalized_parent_event_id = None
-
-    event = SystemEvent(
-        id=uuid.uuid4(),
-        type=event_type,
-        user_id=normalize_uuid(user_id) if user_id is not None else None,
-        agent_id=normalize_uuid(agent_id) if agent_id is not None else None,
-        trace_id=str(trace_id) if trace_id else None,
-        parent_event_id=normalized_parent_event_id,
-        source=source,
-        payload=_json_safe(payload or {}),
-        timestamp=datetime.now(timezone.utc),
-    )
+            row["parent_event_id"] = normalized_parent_event_id = None
+
+    event = SystemEvent(**row)
     db.add(event)
     db.flush()
-    event_id = event.id
+    event_id = row["id"]
     if normalized_parent_event_id:
-        relationship_type = "related_to"
-        if source == "async":
-            relationship_type = "async_child"
-        elif source == "agent":
-            relationship_type = "derived"
-        elif source == "memory":
-            relationship_type = "memory_effect"
         link_events(
             db=db,
             source_event_id=normalized_parent_event_id,
             target_event_id=event_id,
-            relationship_type=relationship_type,
+            relationship_type=_relationship_type(source),
         )
     db.commit()
     return event_id
 
 
+def _buffer_system_event(row: dict[str, Any]) -> uuid.UUID:
+    from AINDY.core.system_event_buffer import get_system_event_buffer
+
+    return get_system_event_buffer().add(row, _relationship_type(row.get("source")))
+
+
 def _emit_system_event_failure_fallback(
     *,
     db,
@@ -246,6 +289,24 @@ def _emit_feedback_signal(
     )
 
 
+_ABANDONMENT_SCAN_INTERVAL_SECONDS = 60.0
+_last_abandonment_scan_monotonic = float("-inf")
+
+
+def _abandonment_scan_due() -> bool:
+    """Rate-limit the stale JobLog scan on the write-behind path.
+
+    The scan is process-wide rather than per-event, so running it once a
+    minute finds the same abandoned jobs without a SELECT on every emit.
+    """
+    global _last_abandonment_scan_monotonic
+    now = time.monotonic()
+    if now - _last_abandonment_scan_monotonic < _ABANDONMENT_SCAN_INTERVAL_SECONDS:
+        return False
+    _last_abandonment_scan_monotonic = now
+    return True
+
+
 def _detect_behavioral_feedback_signals(
     *,
     db,
@@ -257,6 +318,7 @@ def _detect_behavioral_feedback_signals(
     source: str | None,
     agent_id,
     payload: Optional[dict[str, Any]],
+    buffered: bool = False,
 ) -> None:
     if _is_feedback_signal(event_type):
         return
@@ -352,6 +414,9 @@ def _detect_behavioral_feedback_signals(
                 },
             )
 
+    if buffered and not _abandonment_scan_due():
+        return
+
     try:
 
         stale_cutoff = datetime.now(timezone.utc) - timedelta(minutes=15)
@@ -463,18 +528,46 @@ def emit_system_event(
         sorted((payload or {}).keys()),
     )
     try:
-        event_id = _persist_system_event(
-            db=db,
-            event_type=event_type,
-            user_id=user_id,
-            trace_id=effective_trace_id,
-            parent_event_id=effective_parent_event_id,
-            source=source,
-            agent_id=agent_id,
-            payload=payload,
-        )
+        from AINDY.core.system_event_buffer import write_behind_enabled
+        from AINDY.memory.memory_capture_engine import AUTO_MEMORY_EVENT_TYPES
+
+        # Auto-captured events are written synchronously: the memory node and
+        # its causal edge reference the system_events row by foreign key.
+        captures_memory = not skip_memory_capture and event_type in AUTO_MEMORY_EVENT_TYPES
+        buffered = not required and not captures_memory and write_behind_enabled()
+        if buffered:
+            event_id = _buffer_system_event(
+                _system_event_row(
+                    event_type=event_type,
+                    user_id=user_id,
+                    trace_id=effective_trace_id,
+                    parent_event_id=effective_parent_event_id,
+                    source=source,
+                    agent_id=agent_id,
+                    payload=payload,
+                )
+            )
+        else:
+            event_id = _persist_system_event(
+                db=db,
+                event_type=event_type,
+                user_id=user_id,
+                trace_id=effective_trace_id,
+                parent_event_id=effective_parent_event_id,
+                source=source,
+                agent_id=agent_id,
+                payload=payload,
+            )
+        if event_id:
+            try:
+                from AINDY.platform_layer.system_state_window import record_system_event
+
+                record_system_event(event_type)
+            except Exception as window_exc:
+                logger.debug("[SystemEvent] state window update skipped: %s", window_exc)
         logger_method(
-            "[SystemEvent] Persisted %s id=%s trace=%s parent=%s user=%s",
+            "[SystemEvent] %s %s id=%s trace=%s parent=%s user=%s",
+            "Buffered" if buffered else "Persisted",
             event_type,
             event_id,
             effective_trace_id,
@@ -504,6 +597,7 @@ def emit_system_event(
             _detect_behavioral_feedback_signals(
                 db=db,
                 event_id=event_id,
+                buffered=buffered,
                 event_type=event_type,
                 user_id=user_id,
                 trace_id=effective_trace_id,
@@ -520,13 +614,22 @@ def emit_system_event(
                 signal_exc,
             )
         try:
-            if not skip_memory_capture:
+            if captures_memory and event_id and not buffered:
                 from AINDY.db.models.system_event import SystemEvent
                 from AINDY.memory.memory_capture_engine import capture_system_event_as_memory
 
-                persisted_event = db.query(SystemEvent).filter(SystemEvent.id == event_id).first()
-                if persisted_event:
-                    capture_system_event_as_memory(db, persisted_event)
+                # Transient copy of what was written; avoids re-reading the row.
+                capture_system_event_as_memory(
+                    db,
+                    SystemEvent(
+                        id=event_id,
+                        type=event_type,
+                        user_id=user_id,
+                        trace_id=effective_trace_id,
+                        source=source,
+                        payload=payload or {},
+                    ),
+                )
         except Exception as capture_exc:
             logger.warning(
                 "[SystemEvent] memory auto-capture skipped for %s id=%s: %s",
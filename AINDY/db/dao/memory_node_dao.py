@@ -9,14 +9,30 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 import logging
+import math
 import uuid
 from typing import List, Optional
 
-from sqlalchemy import or_
+import numpy as np
+from sqlalchemy import func, or_, select, text, union_all
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
+from AINDY.memory.lexical_index import (
+    get_memory_lexical_index,
+    lexical_index_enabled,
+    rank_documents,
+    tokenize,
+)
 from AINDY.memory.memory_persistence import MemoryNodeModel, MemoryLinkModel
+from AINDY.memory.vector_index import (
+    AnnProfile,
+    get_memory_vector_index,
+    normalize_rows,
+    normalize_vector,
+    resolve_search_mode,
+    vector_index_enabled,
+)
 from AINDY.platform_layer.trace_context import get_current_trace_id
 from AINDY.platform_layer.user_ids import parse_user_id, require_user_id
 
@@ -241,6 +257,7 @@ class MemoryNodeDAO:
             except SQLAlchemyError:
                 self.db.rollback()
 
+        self._index_text(db_node)
         if generate_embedding:
             self._enqueue_embedding(db_node)
 
@@ -282,6 +299,7 @@ class MemoryNodeDAO:
             self.db.add(db_node)
             self.db.commit()
             self.db.refresh(db_node)
+            self._index_text(db_node)
             if generate_embedding:
                 self._enqueue_embedding(db_node)
             return db_node
@@ -358,15 +376,20 @@ class MemoryNodeDAO:
         user_id: str = None,
         node_type: str = None,
         min_similarity: float = 0.0,
+        search_mode: str = None,
     ) -> list:
         """
         Find nodes similar to query_embedding using pgvector.
         Uses <=> cosine distance operator.
         Distance 0 = identical, 2 = opposite.
         Similarity = 1 - (distance / 2).
-        """
-        from AINDY.memory.embedding_service import cosine_similarity
 
+        search_mode trades recall for latency: "exact", "fast", "balanced",
+        "accurate", or "auto" (default; exact until the tenant reaches
+        AINDY_MEMORY_ANN_MIN_ROWS embedded nodes). Approximate modes let
+        Postgres walk the HNSW/IVFFlat index with a per-query ef_search /
+        probes and use the in-process IVF layer elsewhere.
+        """
         if not self._embedding_is_usable(query_embedding):
             logger.debug("[MemoryNodeDAO] semantic recall skipped: unusable query embedding")
             return []
@@ -390,24 +413,16 @@ class MemoryNodeDAO:
         if rows_after_filter == 0:
             return []
 
+        profile = resolve_search_mode(search_mode, rows_after_filter)
+
         try:
             if self._is_postgres():
-                from pgvector.sqlalchemy import Vector
-                from sqlalchemy import Float, cast
-
-                distance_expr = cast(
-                    MemoryNodeModel.embedding.op("<=>")(
-                        cast(query_embedding, Vector(1536))
-                    ),
-                    Float,
-                )
-
-                results = (
-                    self.db.query(MemoryNodeModel, distance_expr.label("distance"))
-                    .filter(MemoryNodeModel.id.in_(embedded_query.with_entities(MemoryNodeModel.id)))
-                    .order_by(distance_expr.asc())
-                    .limit(limit)
-                    .all()
+                results = self._pgvector_neighbours(
+                    embedded_query,
+                    query_embedding=query_embedding,
+                    limit=limit,
+                    profile=profile,
+                    rows_available=rows_after_filter,
                 )
 
                 output = []
@@ -429,19 +444,48 @@ class MemoryNodeDAO:
         except Exception as exc:
             logger.warning("[MemoryNodeDAO] pgvector similarity failed, using python fallback: %s", exc)
 
-        scored = []
-        embedded_rows = embedded_query.all()
-        for node in embedded_rows:
-            embedding = list(getattr(node, "embedding", None) or [])
-            if not self._embedding_is_usable(embedding):
+        indexed = self._find_similar_indexed(
+            embedded_query,
+            query_embedding=query_embedding,
+            limit=limit,
+            user_id=user_id,
+            node_type=node_type,
+            min_similarity=min_similarity,
+            expected_rows=rows_after_filter,
+            profile=profile,
+        )
+        if indexed is not None:
+            logger.debug(
+                "[MemoryNodeDAO] semantic similarities computed=%s scores=%s (vector index)",
+                len(indexed),
+                [item["similarity"] for item in indexed[:5]],
+            )
+            return indexed
+
+        query_vector = normalize_vector(query_embedding)
+        rows = []
+        vectors = []
+        for node in embedded_query.all():
+            embedding = getattr(node, "embedding", None)
+            if embedding is None or query_vector is None:
                 continue
-            similarity = cosine_similarity(query_embedding, embedding)
-            if similarity < min_similarity:
+            vector = np.asarray(embedding, dtype=np.float32).ravel()
+            if vector.shape != query_vector.shape:
                 continue
-            node_dict = self._node_to_dict(node)
-            node_dict["similarity"] = round(float(similarity), 4)
-            node_dict["distance"] = round(float(max(0.0, 1.0 - similarity)), 4)
-            scored.append(node_dict)
+            rows.append(node)
+            vectors.append(vector)
+
+        scored = []
+        if rows:
+            matrix, valid = normalize_rows(np.vstack(vectors))
+            similarities = matrix @ query_vector
+            for node, similarity, usable in zip(rows, similarities.tolist(), valid.tolist()):
+                if not usable or similarity < min_similarity:
+                    continue
+                node_dict = self._node_to_dict(node)
+                node_dict["similarity"] = round(float(similarity), 4)
+                node_dict["distance"] = round(float(max(0.0, 1.0 - similarity)), 4)
+                scored.append(node_dict)
 
         scored.sort(key=lambda item: item["similarity"], reverse=True)
         output = scored[:limit]
@@ -452,6 +496,115 @@ class MemoryNodeDAO:
         )
         return output
 
+    def _pgvector_neighbours(
+        self,
+        embedded_query,
+        *,
+        query_embedding: list,
+        limit: int,
+        profile: AnnProfile | None,
+        rows_available: int,
+    ) -> list:
+        """
+        Return (node, cosine distance) rows ranked by pgvector.
+
+        Exact mode orders by the distance cast to Float, which the planner
+        cannot serve from the vector index, so every candidate is scored.
+        ANN profiles order by the bare ``<=>`` expression so the HNSW (or
+        IVFFlat) index drives the scan, with ef_search / probes set for this
+        transaction only. The index filters after it walks the graph, so a
+        short result on a selective filter is retried exactly.
+        """
+        from pgvector.sqlalchemy import Vector
+        from sqlalchemy import Float, cast
+
+        distance = MemoryNodeModel.embedding.op("<=>")(cast(query_embedding, Vector(1536)))
+        if profile is not None:
+            self.db.execute(
+                text(
+                    "SELECT set_config('hnsw.ef_search', :ef_search, true), "
+                    "set_config('ivfflat.probes', :probes, true)"
+                ),
+                {"ef_search": str(max(profile.ef_search, limit)), "probes": str(profile.probes)},
+            )
+            results = (
+                embedded_query.add_columns(distance.label("distance"))
+                .order_by(distance)
+                .limit(limit)
+                .all()
+            )
+            if len(results) >= min(limit, rows_available):
+                return results
+            logger.debug(
+                "[MemoryNodeDAO] ANN search (%s) returned %s of %s rows; retrying exact",
+                profile.name,
+                len(results),
+                min(limit, rows_available),
+            )
+
+        distance_expr = cast(distance, Float)
+        return (
+            self.db.query(MemoryNodeModel, distance_expr.label("distance"))
+            .filter(MemoryNodeModel.id.in_(embedded_query.with_entities(MemoryNodeModel.id)))
+            .order_by(distance_expr.asc())
+            .limit(limit)
+            .all()
+        )
+
+    def _find_similar_indexed(
+        self,
+        embedded_query,
+        *,
+        query_embedding: list,
+        limit: int,
+        user_id: str | None,
+        node_type: str | None,
+        min_similarity: float,
+        expected_rows: int,
+        profile: AnnProfile | None = None,
+    ) -> list | None:
+        """
+        Serve find_similar() from the in-process embedding matrix.
+
+        Returns None when the index is disabled, cannot serve this query, or
+        returned ids that no longer match the database; the caller then
+        falls back to scoring the loaded rows.
+        """
+        if not vector_index_enabled():
+            return None
+        index = get_memory_vector_index()
+        hits = index.search(
+            self.db,
+            user_id=parse_user_id(user_id),
+            query_embedding=query_embedding,
+            limit=limit,
+            node_type=node_type,
+            min_similarity=min_similarity,
+            expected_rows=expected_rows,
+            profile=profile,
+        )
+        if hits is None:
+            return None
+        if not hits:
+            return []
+
+        hit_ids = [uuid.UUID(node_id) for node_id, _ in hits]
+        nodes = {
+            str(node.id): node
+            for node in embedded_query.filter(MemoryNodeModel.id.in_(hit_ids)).all()
+        }
+        if len(nodes) != len(hits):
+            index.invalidate(user_id)
+            return None
+
+        output = []
+        for node_id, similarity in hits:
+            node_dict = self._node_to_dict(nodes[node_id])
+            node_dict["similarity"] = round(float(similarity), 4)
+            node_dict["distance"] = round(float(max(0.0, 1.0 - similarity)), 4)
+            output.append(node_dict)
+        return output
+
     # ------------------------------------------------------------------
     # Graph query: get nodes linked to a given node
     # ------------------------------------------------------------------
@@ -531,20 +684,28 @@ class MemoryNodeDAO:
         user_id: str = None,
         node_type: str = None,
         expand_results: bool = False,
+        search_mode: str = None,
     ) -> list:
         """
         Retrieve most relevant memories using resonance scoring.
 
-        score = (semantic * 0.40) + (graph * 0.15) + (recency * 0.15)
+        score = (relevance * 0.40) + (graph * 0.15) + (recency * 0.15)
                 + (success_rate * 0.20) + (usage_freq * 0.10)
+        relevance = semantic * (1 - w) + lexical * w
         recency = exp(-age_days / 30.0)  # half-life 30 days
 
-        At least one of query or tags required.
+        w is AINDY_MEMORY_HYBRID_LEXICAL_WEIGHT when vector candidates exist
+        (lexical matches are then merged into the candidate set) and 1.0 when
+        recall falls back to text matching.
+
+        At least one of query or tags required. search_mode is passed to
+        find_similar() for the semantic candidates.
         """
+        from AINDY.config import settings
         from AINDY.memory.embedding_service import generate_query_embedding
-        import math
 
         candidates = []
+        lexical_weight = min(1.0, max(0.0, float(settings.AINDY_MEMORY_HYBRID_LEXICAL_WEIGHT or 0.0)))
 
         # Semantic path
         if query:
@@ -566,6 +727,7 @@ class MemoryNodeDAO:
                     limit=limit * 3,
                     user_id=user_id,
                     node_type=node_type,
+                    search_mode=search_mode,
                 )
                 for item in similar:
                     item["semantic_score"] = item.get("similarity", 0.0)
@@ -584,6 +746,8 @@ class MemoryNodeDAO:
                 )
 
             if not candidates and (embedding_rows_available == 0 or not query_embedding_ready):
+                # No vector scores to blend with: relevance is purely lexical.
+                lexical_weight = 1.0
                 text_matches = self._find_text_matches(
                     query=query,
                     limit=limit * 3,
@@ -593,6 +757,20 @@ class MemoryNodeDAO:
                 for item in text_matches:
                     item["semantic_score"] = 0.0
                     candidates.append(item)
+            elif candidates and lexical_weight > 0.0:
+                by_id = {item["id"]: item for item in candidates}
+                for item in self._find_text_matches(
+                    query=query,
+                    limit=limit * 3,
+                    user_id=user_id,
+                    node_type=node_type,
+                ):
+                    existing = by_id.get(item["id"])
+                    if existing is not None:
+                        existing["lexical_score"] = item["lexical_score"]
+                    else:
+                        item["semantic_score"] = 0.0
+                        candidates.append(item)
 
         # Tag path
         if tags:
@@ -611,87 +789,7 @@ class MemoryNodeDAO:
                     node_dict["semantic_score"] = 0.0
                     candidates.append(node_dict)
 
-        now = self._now_utc()
-        scored = []
-
-        for c in candidates:
-            # Signal 1: Semantic similarity (from find_similar)
-            semantic = c.get("semantic_score", 0.0)
-
-            # Signal 2: Graph connectivity
-            graph_score = 0.0
-            try:
-                graph_score = self.get_graph_connectivity_score(c["id"])
-            except Exception:
-                graph_score = 0.0
-
-            # Signal 3: Recency decay (half-life 30 days)
-            recency_score = 0.5
-            created_str = c.get("created_at")
-            if created_str:
-                try:
-                    if isinstance(created_str, str):
-                        created = datetime.fromisoformat(
-                            created_str.replace("Z", "+00:00")
-                        )
-                    else:
-                        created = created_str
-                    created = self._normalize_datetime(created)
-                    age_days = (now - created).days
-                    recency_score = math.exp(-age_days / 30.0)
-                except Exception:
-                    recency_score = 0.5
-
-            # Signal 4: Success rate (0.5 = no data, neutral prior)
-            success_rate = 0.5
-            adaptive_weight = 1.0
-            usage_freq = 0.0
-            node_obj = self._get_model_by_id(c["id"])
-            if node_obj:
-                success_rate = self.get_success_rate(node_obj)
-                adaptive_weight = node_obj.weight or 1.0
-                usage_freq = self.get_usage_frequency_score(node_obj)
-                c["success_count"] = node_obj.success_count or 0
-                c["failure_count"] = node_obj.failure_count or 0
-                c["usage_count"] = node_obj.usage_count or 0
-
-            # Signal 5: Usage frequency
-            usage_freq = usage_freq or 0.0
-
-            # Tag match (auxiliary — not in main formula)
-            tag_score = 0.0
-            if tags:
-                node_tags = set(c.get("tags") or [])
-                query_tags = set(tags)
-                if query_tags:
-                    tag_score = len(node_tags & query_tags) / len(query_tags)
-
-            impact_score = max(0.0, float(c.get("impact_score", 0.0) or 0.0))
-            impact_bonus = min(1.0, impact_score / 5.0) * 0.15
-
-            resonance = (
-                (semantic * 0.40)
-                + (graph_score * 0.15)
-                + (recency_score * 0.15)
-                + (success_rate * 0.20)
-                + (usage_freq * 0.10)
-                + impact_bonus
-            ) * adaptive_weight
-
-            resonance = min(1.0, resonance)
-            resonance = min(1.0, resonance + (tag_score * 0.1))
-
-            c["semantic_score"] = round(semantic, 4)
-            c["graph_score"] = round(graph_score, 4)
-            c["tag_score"] = round(tag_score, 4)
-            c["recency_score"] = round(recency_score, 4)
-            c["success_rate"] = round(success_rate, 4)
-            c["usage_frequency"] = round(usage_freq, 4)
-            c["adaptive_weight"] = round(adaptive_weight, 4)
-            c["impact_score"] = round(impact_score, 4)
-            c["impact_bonus"] = round(impact_bonus, 4)
-            c["resonance_score"] = round(resonance, 4)
-            scored.append(c)
+        scored = self._score_candidates(candidates, tags=tags, lexical_weight=lexical_weight)
 
         scored.sort(key=lambda x: x["resonance_score"], reverse=True)
 
@@ -722,6 +820,108 @@ class MemoryNodeDAO:
 
         return results
 
+    def _recency_score(self, created_at, now: datetime) -> float:
+        """Recency decay with a 30-day half-life; 0.5 when the age is unknown."""
+        if not created_at:
+            return 0.5
+        try:
+            if isinstance(created_at, str):
+                created = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+            else:
+                created = created_at
+            created = self._normalize_datetime(created)
+            age_days = (now - created).days
+            return math.exp(-age_days / 30.0)
+        except Exception:
+            return 0.5
+
+    def _score_candidates(
+        self,
+        candidates: list[dict],
+        tags: list | None = None,
+        lexical_weight: float = 0.0,
+    ) -> list[dict]:
+        """
+        Compute resonance scores for a whole candidate set.
+
+        Graph degree and feedback stats are fetched with one grouped query
+        each, so the number of round-trips does not depend on the number of
+        candidates. The formula itself is evaluated over NumPy arrays.
+        """
+        if not candidates:
+            return []
+
+        node_ids = [c["id"] for c in candidates]
+        try:
+            graph_by_id = self.get_graph_connectivity_scores(node_ids)
+        except Exception:
+            graph_by_id = {}
+        try:
+            stats_by_id = self._get_feedback_stats(node_ids)
+        except Exception:
+            stats_by_id = {}
+
+        now = self._now_utc()
+        query_tags = set(tags or [])
+        size = len(candidates)
+        semantic = np.zeros(size)
+        lexical = np.zeros(size)
+        graph = np.zeros(size)
+        recency = np.zeros(size)
+        success_rate = np.full(size, 0.5)
+        usage_freq = np.zeros(size)
+        adaptive_weight = np.ones(size)
+        impact = np.zeros(size)
+        tag_score = np.zeros(size)
+
+        for i, c in enumerate(candidates):
+            semantic[i] = c.get("semantic_score", 0.0) or 0.0
+            lexical[i] = c.get("lexical_score", 0.0) or 0.0
+            graph[i] = graph_by_id.get(c["id"], 0.0)
+            recency[i] = self._recency_score(c.get("created_at"), now)
+            impact[i] = max(0.0, float(c.get("impact_score", 0.0) or 0.0))
+            if query_tags:
+                tag_score[i] = len(set(c.get("tags") or []) & query_tags) / len(query_tags)
+
+            stats = stats_by_id.get(c["id"])
+            if stats is not None:
+                success_count, failure_count, usage_count, weight = stats
+                total = success_count + failure_count
+                success_rate[i] = success_count / total if total else 0.5
+                usage_freq[i] = min(1.0, usage_count / 100)
+                adaptive_weight[i] = weight or 1.0
+                c["success_count"] = success_count
+                c["failure_count"] = failure_count
+                c["usage_count"] = usage_count
+
+        impact_bonus = np.minimum(1.0, impact / 5.0) * 0.15
+        relevance = semantic * (1.0 - lexical_weight) + lexical * lexical_weight
+        resonance = (
+            (relevance * 0.40)
+            + (graph * 0.15)
+            + (recency * 0.15)
+            + (success_rate * 0.20)
+            + (usage_freq * 0.10)
+            + impact_bonus
+        ) * adaptive_weight
+        resonance = np.minimum(1.0, resonance)
+        resonance = np.minimum(1.0, resonance + (tag_score * 0.1))
+
+        for i, c in enumerate(candidates):
+            c["semantic_score"] = round(float(semantic[i]), 4)
+            c["lexical_score"] = round(float(lexical[i]), 4)
+            c["graph_score"] = round(float(graph[i]), 4)
+            c["tag_score"] = round(float(tag_score[i]), 4)
+            c["recency_score"] = round(float(recency[i]), 4)
+            c["success_rate"] = round(float(success_rate[i]), 4)
+            c["usage_frequency"] = round(float(usage_freq[i]), 4)
+            c["adaptive_weight"] = round(float(adaptive_weight[i]), 4)
+            c["impact_score"] = round(float(impact[i]), 4)
+            c["impact_bonus"] = round(float(impact_bonus[i]), 4)
+            c["resonance_score"] = round(float(resonance[i]), 4)
+
+        return list(candidates)
+
     def recall_from_agent(
         self,
         agent_namespace: str,
@@ -951,11 +1151,14 @@ class MemoryNodeDAO:
             node.embedding = None
             node.embedding_pending = True
             node.embedding_status = "pending"
+            get_memory_vector_index().discard(user_id=node.user_id, node_id=node.id)
 
         self.db.add(history)
         self.db.add(node)
         self.db.commit()
         self.db.refresh(node)
+        if "content" in changes or "node_type" in changes:
+            self._index_text(node)
         if "content" in changes and regenerate_embedding:
             self._enqueue_embedding(node)
         return node
@@ -981,31 +1184,175 @@ class MemoryNodeDAO:
         user_id: str | None,
         node_type: str | None,
     ) -> list[dict]:
+        """
+        Return nodes whose content matches *query*, best match first.
+
+        Postgres ranks with ``ts_rank_cd`` over the english tsvector GIN
+        index and keeps plain substring matches (served by the trigram
+        index) behind them. Elsewhere the in-process BM25 index ranks the
+        owner's nodes and substring matches it missed follow with a score of
+        0. Each dict carries ``lexical_score``, normalized so the best match
+        is 1.0.
+        """
         search_text = (query or "").strip()
         if not search_text:
             return []
 
+        base_query = self._embedded_query(user_id=user_id, node_type=node_type)
         like_pattern = f"%{search_text.lower()}%"
-        sql_query = self.db.query(MemoryNodeModel).filter(
-            MemoryNodeModel.content.ilike(like_pattern)
+        if self._is_postgres():
+            try:
+                with self.db.begin_nested():
+                    return self._full_text_matches(
+                        base_query, search_text=search_text, like_pattern=like_pattern, limit=limit
+                    )
+            except Exception as exc:
+                logger.warning("[MemoryNodeDAO] full-text search failed, using fallback: %s", exc)
+
+        indexed = self._find_text_matches_indexed(
+            search_text=search_text,
+            limit=limit,
+            user_id=user_id,
+            node_type=node_type,
         )
-        owner_user_id = parse_user_id(user_id)
-        if owner_user_id:
-            sql_query = sql_query.filter(MemoryNodeModel.user_id == owner_user_id)
-        else:
-            sql_query = sql_query.filter(MemoryNodeModel.visibility.in_(["shared", "global"]))
-        if node_type:
-            sql_query = sql_query.filter(MemoryNodeModel.node_type == node_type)
+        if indexed is not None and len(indexed) >= limit:
+            return indexed
+
+        substring_query = base_query.filter(MemoryNodeModel.content.ilike(like_pattern))
+        if indexed is not None:
+            # BM25 matches whole tokens only; keep substring matches ("deploy"
+            # in "deployment") behind its hits, as the Postgres path does.
+            hit_ids = [uuid.UUID(item["id"]) for item in indexed]
+            if hit_ids:
+                substring_query = substring_query.filter(MemoryNodeModel.id.notin_(hit_ids))
+            rows = (
+                substring_query.order_by(
+                    MemoryNodeModel.updated_at.desc().nullslast(),
+                    MemoryNodeModel.created_at.desc(),
+                )
+                .limit(limit - len(indexed))
+                .all()
+            )
+            for row in rows:
+                node_dict = self._node_to_dict(row)
+                node_dict["lexical_score"] = 0.0
+                indexed.append(node_dict)
+            return indexed
 
         rows = (
-            sql_query.order_by(
+            substring_query.order_by(
                 MemoryNodeModel.updated_at.desc().nullslast(),
                 MemoryNodeModel.created_at.desc(),
             )
             .limit(limit)
             .all()
         )
-        return [self._node_to_dict(row) for row in rows]
+        scores = dict(rank_documents(search_text, [row.content for row in rows]))
+        output = []
+        for index, row in enumerate(rows):
+            node_dict = self._node_to_dict(row)
+            node_dict["lexical_score"] = round(scores.get(index, 0.0), 4)
+            output.append(node_dict)
+        output.sort(key=lambda item: item["lexical_score"], reverse=True)
+        return output
+
+    def _full_text_matches(self, base_query, *, search_text: str, like_pattern: str, limit: int) -> list[dict]:
+        """Rank with Postgres full-text search; the expression matches ix_memory_nodes_content_fts."""
+        from sqlalchemy import literal, literal_column
+
+        document = func.to_tsvector(
+            literal_column("'english'::regconfig"),
+            func.coalesce(MemoryNodeModel.content, literal_column("''")),
+        )
+        matched = MemoryNodeModel.content.ilike(like_pattern)
+        rank = literal(0.0)
+        terms = tokenize(search_text, fold=False)
+        if terms:
+            ts_query = func.to_tsquery(literal_column("'english'::regconfig"), " | ".join(terms))
+            matched = or_(document.op("@@")(ts_query), matched)
+            rank = func.ts_rank_cd(document, ts_query)
+
+        rows = (
+            base_query.add_columns(rank.label("rank"))
+            .filter(matched)
+            .order_by(
+                rank.desc(),
+                MemoryNodeModel.updated_at.desc().nullslast(),
+                MemoryNodeModel.created_at.desc(),
+            )
+            .limit(limit)
+            .all()
+        )
+        best = max((float(row_rank or 0.0) for _, row_rank in rows), default=0.0)
+        output = []
+        for node, row_rank in rows:
+            node_dict = self._node_to_dict(node)
+            node_dict["lexical_score"] = round(float(row_rank or 0.0) / best, 4) if best > 0 else 0.0
+            output.append(node_dict)
+        return output
+
+    def _find_text_matches_indexed(
+        self,
+        *,
+        search_text: str,
+        limit: int,
+        user_id: str | None,
+        node_type: str | None,
+    ) -> list | None:
+        """
+        Serve _find_text_matches() from the in-process BM25 index.
+
+        Returns None when the index is disabled, cannot serve this query, or
+        returned ids that no longer match the database.
+        """
+        owner_user_id = parse_user_id(user_id)
+        if not lexical_index_enabled() or owner_user_id is None:
+            return None
+        index = get_memory_lexical_index()
+        expected_rows = int(
+            self.db.query(func.count(MemoryNodeModel.id))
+            .filter(MemoryNodeModel.user_id == owner_user_id)
+            .scalar()
+            or 0
+        )
+        hits = index.search(
+            self.db,
+            user_id=owner_user_id,
+            query=search_text,
+            limit=limit,
+            node_type=node_type,
+            expected_rows=expected_rows,
+        )
+        if not hits:
+            return hits
+
+        # Fetch by primary key alone and check the owner and type here:
+        # with the owner filter in SQL, SQLite scans the user_id index.
+        hit_ids = [uuid.UUID(node_id) for node_id, _ in hits]
+        nodes = {
+            str(node.id): node
+            for node in self.db.query(MemoryNodeModel).filter(MemoryNodeModel.id.in_(hit_ids))
+            if node.user_id == owner_user_id and (node_type is None or node.node_type == node_type)
+        }
+        if len(nodes) != len(hits):
+            index.invalidate(owner_user_id)
+            return None
+
+        output = []
+        for node_id, score in hits:
+            node_dict = self._node_to_dict(nodes[node_id])
+            node_dict["lexical_score"] = round(float(score), 4)
+            output.append(node_dict)
+        return output
+
+    def _index_text(self, node: MemoryNodeModel) -> None:
+        if lexical_index_enabled():
+            get_memory_lexical_index().upsert(
+                user_id=node.user_id,
+                node_id=node.id,
+                node_type=node.node_type,
+                content=node.content,
+            )
 
     def get_history(self, node_id: str, user_id: str, limit: int = 20) -> list[dict]:
         """
@@ -1142,6 +1489,77 @@ class MemoryNodeDAO:
         total_connections = outbound + inbound
         return min(1.0, total_connections / max(max_connections, 1))
 
+    @staticmethod
+    def _parse_node_uuids(node_ids: list[str]) -> list[uuid.UUID]:
+        parsed = []
+        for node_id in node_ids:
+            try:
+                parsed.append(uuid.UUID(str(node_id)))
+            except ValueError:
+                continue
+        return list(dict.fromkeys(parsed))
+
+    def get_graph_connectivity_scores(
+        self,
+        node_ids: list[str],
+        max_connections: int = 20,
+    ) -> dict[str, float]:
+        """
+        Batched get_graph_connectivity_score().
+
+        Counts inbound and outbound links for every node in one grouped
+        query and returns {node_id: score}. Nodes without links are omitted.
+        """
+        node_uuids = self._parse_node_uuids(node_ids)
+        if not node_uuids:
+            return {}
+
+        endpoints = union_all(
+            select(MemoryLinkModel.source_node_id.label("node_id")).where(
+                MemoryLinkModel.source_node_id.in_(node_uuids)
+            ),
+            select(MemoryLinkModel.target_node_id.label("node_id")).where(
+                MemoryLinkModel.target_node_id.in_(node_uuids)
+            ),
+        ).subquery()
+        rows = (
+            self.db.query(endpoints.c.node_id, func.count())
+            .group_by(endpoints.c.node_id)
+            .all()
+        )
+
+        cap = max(max_connections, 1)
+        return {
+            str(uuid.UUID(str(node_id))): min(1.0, int(count) / cap)
+            for node_id, count in rows
+        }
+
+    def _get_feedback_stats(self, node_ids: list[str]) -> dict[str, tuple[int, int, int, float]]:
+        """Return {node_id: (success_count, failure_count, usage_count, weight)} in one query."""
+        node_uuids = self._parse_node_uuids(node_ids)
+        if not node_uuids:
+            return {}
+        rows = (
+            self.db.query(
+                MemoryNodeModel.id,
+                MemoryNodeModel.success_count,
+                MemoryNodeModel.failure_count,
+                MemoryNodeModel.usage_count,
+                MemoryNodeModel.weight,
+            )
+            .filter(MemoryNodeModel.id.in_(node_uuids))
+            .all()
+        )
+        return {
+            str(row_id): (
+                int(success_count or 0),
+                int(failure_count or 0),
+                int(usage_count or 0),
+                float(weight or 1.0),
+            )
+            for row_id, success_count, failure_count, usage_count, weight in rows
+        }
+
     def traverse(
         self,
         start_node_id: str,
@@ -1650,8 +2068,16 @@ class MemoryNodeDAO:
                 candidates = [node] if node else []
             else:
                 candidates = self.walk_path(path_expr, user_id=user_id, limit=limit * 2)
+        elif query:
+            # No path filter: take ranked text matches, then filter by tags.
+            candidates = [
+                enrich_node_with_path(item)
+                for item in self._find_text_matches(
+                    query=query, limit=limit * 4, user_id=user_id, node_type=None
+                )
+            ]
         else:
-            # No path filter — fall through to tag/query filter below
+            # No path filter — fall through to tag filter below
             base_q = self.db.query(MemoryNodeModel)
             owner = parse_user_id(user_id)
             if owner:
@@ -1666,10 +2092,19 @@ class MemoryNodeDAO:
                 if self._tags_match(c.get("tags"), clean_tags, "AND")
             ]
 
-        # Filter by keyword (simple content search; semantic search via find_similar)
-        if query:
+        # Rank path candidates by keyword relevance (semantic search via
+        # find_similar). Substring matches the tokenizer misses are kept last.
+        if query and path_expr:
             q_lower = query.lower()
-            candidates = [c for c in candidates if q_lower in (c.get("content") or "").lower()]
+            scores = dict(rank_documents(query, [c.get("content") for c in candidates]))
+            ranked = []
+            for index, c in enumerate(candidates):
+                score = scores.get(index)
+                if score is None and q_lower not in (c.get("content") or "").lower():
+                    continue
+                c["lexical_score"] = round(score or 0.0, 4)
+                ranked.append(c)
+            candidates = sorted(ranked, key=lambda c: c["lexical_score"], reverse=True)
 
         return candidates[:limit]
 
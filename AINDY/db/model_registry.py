@@ -42,6 +42,7 @@ import AINDY.db.models.user  # noqa: F401
 import AINDY.db.models.user_identity  # noqa: F401
 import AINDY.db.models.waiting_flow_run  # noqa: F401
 import AINDY.db.models.webhook_subscription  # noqa: F401
+import AINDY.db.models.webhook_delivery  # noqa: F401
 
 
 def register_models(import_fn: Callable[[], Any]) -> Any:
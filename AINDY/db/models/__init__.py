@@ -7,7 +7,7 @@ from .memory_trace import MemoryTrace
 from .memory_trace_node import MemoryTraceNode
 from .system_health_log import SystemHealthLog
 from .system_state_snapshot import SystemStateSnapshot
-from .request_metric import RequestMetric
+from .request_metric import RequestMetric, RequestMetricRollup
 from .user import User
 from .user_identity import UserIdentity
 from .memory_node_history import MemoryNodeHistory
@@ -29,6 +29,7 @@ from .dynamic_flow import DynamicFlow
 from .dynamic_node import DynamicNode
 from .waiting_flow_run import WaitingFlowRun
 from .webhook_subscription import WebhookSubscription
+from .webhook_delivery import WebhookDelivery
 
 
 __all__ = [
@@ -36,6 +37,7 @@ __all__ = [
     "SystemHealthLog",
     "SystemStateSnapshot",
     "RequestMetric",
+    "RequestMetricRollup",
     "User",
     "UserIdentity",
     "MemoryNodeHistory",
@@ -65,4 +67,5 @@ __all__ = [
     "DynamicNode",
     "WaitingFlowRun",
     "WebhookSubscription",
+    "WebhookDelivery",
 ]
@@ -7,11 +7,14 @@ Capability:
 AgentCapabilityMapping:
   Maps a capability to either an agent_type or a specific AgentRun.
   At least one of agent_type / agent_run_id should be set by callers.
+  Partial unique indexes allow one row per (agent_type, capability) and one
+  per (agent_run_id, capability), so writers can INSERT ... ON CONFLICT DO
+  NOTHING instead of reading the table first.
 """
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import Column, DateTime, ForeignKey, Index, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, String, Text, text
 from sqlalchemy.dialects.postgresql import UUID
 
 from AINDY.db.database import Base
@@ -77,4 +80,20 @@ class AgentCapabilityMapping(Base):
             "agent_run_id",
             "capability_id",
         ),
+        Index(
+            "ux_agent_capability_mappings_type_capability",
+            "agent_type",
+            "capability_id",
+            unique=True,
+            postgresql_where=text("agent_run_id IS NULL"),
+            sqlite_where=text("agent_run_id IS NULL"),
+        ),
+        Index(
+            "ux_agent_capability_mappings_run_capability",
+            "agent_run_id",
+            "capability_id",
+            unique=True,
+            postgresql_where=text("agent_run_id IS NOT NULL"),
+            sqlite_where=text("agent_run_id IS NOT NULL"),
+        ),
     )
@@ -2,7 +2,9 @@
 FlowRun — persistent execution state.
 
 Every workflow execution creates a FlowRun.
-State is checkpointed to DB after each node.
+Each node appends a FlowHistory row carrying its output patch; the full
+state is snapshotted into FlowRun.state every few nodes and at every
+WAIT/terminal transition (see AINDY/runtime/flow_engine/checkpoint.py).
 WAIT states persist until the event arrives.
 Failed runs can be inspected and retried.
 """
@@ -15,6 +17,7 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     JSON,
     String,
@@ -35,6 +38,9 @@ class FlowRun(Base):
     workflow_type = Column(String, nullable=True)
     state = Column(JSON, nullable=False, default=dict)
     current_node = Column(String, nullable=True)
+    # Nodes executed so far, and how many of them are folded into ``state``.
+    node_seq = Column(Integer, nullable=False, default=0, server_default="0")
+    checkpoint_seq = Column(Integer, nullable=False, default=0, server_default="0")
     status = Column(String, nullable=False, default="running")
     waiting_for = Column(String, nullable=True)
     wait_deadline: Mapped[Optional[datetime]] = mapped_column(
@@ -70,6 +76,7 @@ class FlowHistory(Base):
         index=True,
     )
     node_name = Column(String, nullable=False)
+    seq = Column(Integer, nullable=True)
     status = Column(String, nullable=False)
     input_state = Column(JSON, nullable=True)
     output_patch = Column(JSON, nullable=True)
@@ -77,6 +84,10 @@ class FlowHistory(Base):
     execution_time_ms = Column(Integer, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        Index("ix_flow_history_flow_run_id_seq", "flow_run_id", "seq"),
+    )
+
 
 class EventOutcome(Base):
     __tablename__ = "event_outcomes"
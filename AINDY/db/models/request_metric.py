@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, String
 from sqlalchemy.dialects.postgresql import UUID
 
 from AINDY.db.database import Base
@@ -18,3 +18,44 @@ class RequestMetric(Base):
     status_code = Column(Integer, nullable=False)
     duration_ms = Column(Float, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+
+class RequestMetricRollup(Base):
+    """
+    Per-minute request aggregate for one (path, status class, user).
+
+    Rows are additive: each writer process emits at most one row per key and
+    minute, and readers sum every matching row. The ``latency_*`` columns
+    count requests per LATENCY_BOUNDS_MS bucket (see system_state_window),
+    so histograms merge with a plain SUM per column.
+    """
+
+    __tablename__ = "request_metric_rollups"
+
+    id = Column(Integer, primary_key=True)
+    bucket_start = Column(DateTime, nullable=False, index=True)
+    path = Column(String, nullable=False)
+    status_class = Column(Integer, nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+    request_count = Column(Integer, nullable=False, default=0)
+    duration_sum_ms = Column(Float, nullable=False, default=0.0)
+    duration_max_ms = Column(Float, nullable=False, default=0.0)
+    # Latency histogram: requests per LATENCY_BOUNDS_MS bucket (upper bound, ms).
+    latency_le_5 = Column(Integer, nullable=False, default=0)
+    latency_le_10 = Column(Integer, nullable=False, default=0)
+    latency_le_25 = Column(Integer, nullable=False, default=0)
+    latency_le_50 = Column(Integer, nullable=False, default=0)
+    latency_le_100 = Column(Integer, nullable=False, default=0)
+    latency_le_250 = Column(Integer, nullable=False, default=0)
+    latency_le_500 = Column(Integer, nullable=False, default=0)
+    latency_le_1000 = Column(Integer, nullable=False, default=0)
+    latency_le_2500 = Column(Integer, nullable=False, default=0)
+    latency_le_5000 = Column(Integer, nullable=False, default=0)
+    latency_le_10000 = Column(Integer, nullable=False, default=0)
+    latency_le_30000 = Column(Integer, nullable=False, default=0)
+    latency_gt_30000 = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_request_metric_rollups_user_bucket", "user_id", "bucket_start"),
+        Index("ix_request_metric_rollups_path_bucket", "path", "bucket_start"),
+    )
@@ -4,9 +4,9 @@ db/models/user.py — Persisted User model for A.I.N.D.Y. authentication.
 Phase 3 replacement for the in-memory _USERS dict in auth_router.py.
 """
 import uuid
-from sqlalchemy import Boolean, Column, DateTime, Integer, String
+from sqlalchemy import Boolean, Column, DateTime, Integer, String, event, inspect
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Session, object_session, relationship
 from sqlalchemy.sql import func
 
 from AINDY.db.database import Base
@@ -24,3 +24,43 @@ class User(Base):
     token_version = Column(Integer, default=0, nullable=False, server_default="0")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     api_keys = relationship("PlatformAPIKey", back_populates="user", cascade="all, delete-orphan")
+
+
+# Fields served from the cached principal (AINDY/auth/principal_cache.py).
+_PRINCIPAL_FIELDS = ("email", "username", "is_active", "is_admin", "token_version")
+_PENDING_INVALIDATIONS = "principal_cache_invalidations"
+
+
+def _queue_principal_invalidation(target) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_INVALIDATIONS, set()).add(str(target.id))
+
+
+@event.listens_for(User, "after_update")
+def queue_principal_invalidation_on_update(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in _PRINCIPAL_FIELDS):
+        _queue_principal_invalidation(target)
+
+
+@event.listens_for(User, "after_delete")
+def queue_principal_invalidation_on_delete(mapper, connection, target):
+    _queue_principal_invalidation(target)
+
+
+@event.listens_for(Session, "after_commit")
+def invalidate_changed_principals(session):
+    # After commit, so a concurrent request cannot re-cache the old row.
+    pending = session.info.pop(_PENDING_INVALIDATIONS, None)
+    if not pending:
+        return
+    from AINDY.auth.principal_cache import invalidate_user
+
+    for user_id in pending:
+        invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def discard_principal_invalidations(session):
+    session.info.pop(_PENDING_INVALIDATIONS, None)
@@ -0,0 +1,63 @@
+"""
+db/models/webhook_delivery.py — Durable outbox for webhook deliveries.
+
+One row per (event, subscription) delivery. The delivery engine in
+platform_layer/webhook_delivery.py inserts rows in batches before the first
+attempt and records each outcome, so a delivery that is pending when the
+process exits is retried after restart.
+
+status:
+  pending    — scheduled for next_attempt_at (or in flight)
+  delivered  — a 2xx response was received
+  failed     — attempts exhausted, or the subscription no longer exists
+
+The instance holding a pending row records itself in ``claimed_by`` and
+keeps ``lease_until`` in the future while the delivery is queued, in flight
+or waiting on a retry timer. Once the lease lapses (owner crashed or shut
+down) any instance may claim the row by bumping ``generation``. Rows
+written before leases existed (lease_until NULL) are claimable once
+next_attempt_at is older than the recovery grace period. Delivery is
+at-least-once — receivers deduplicate on event_id. Delivered and failed
+rows are deleted after AINDY_WEBHOOK_OUTBOX_RETENTION_HOURS.
+"""
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import UUID
+
+from AINDY.db.database import Base
+
+
+class WebhookDelivery(Base):
+    __tablename__ = "webhook_deliveries"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    subscription_id = Column(String(64), nullable=False, index=True)
+    event_id = Column(String(64), nullable=True)
+    event_type = Column(String(256), nullable=False)
+
+    # Serialized request body, signed at send time with the subscription secret
+    body = Column(Text, nullable=False)
+
+    status = Column(String(16), nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False)
+    generation = Column(Integer, nullable=False, default=0)
+    claimed_by = Column(String(64), nullable=True)
+    lease_until = Column(DateTime(timezone=True), nullable=True)
+    last_status_code = Column(Integer, nullable=True)
+    last_error = Column(String(512), nullable=True)
+
+    created_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
+    delivered_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_webhook_deliveries_status_next_attempt", "status", "next_attempt_at"),
+        Index("ix_webhook_deliveries_status_lease", "status", "lease_until"),
+        Index("ix_webhook_deliveries_status_created", "status", "created_at"),
+    )
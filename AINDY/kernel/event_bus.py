@@ -61,6 +61,7 @@ import os
 import socket
 import threading
 import time
+from typing import Callable
 
 logger = logging.getLogger(__name__)
 
@@ -126,6 +127,8 @@ class EventBus:
         # Pre-rehydration buffer: events received before _waiting is populated
         self._pre_rehydration_buffer: list[tuple[str, str | None]] = []
         self._buffer_lock = threading.Lock()
+        # Non-scheduler event types handled locally instead of notify_event()
+        self._listeners: dict[str, Callable[[str | None], None]] = {}
 
     # ── Publisher ─────────────────────────────────────────────────────────────
 
@@ -196,6 +199,15 @@ class EventBus:
                 self._pub_client = None
                 return False
 
+    def add_listener(self, event_type: str, callback: Callable[[str | None], None]) -> None:
+        """Route remote *event_type* messages to *callback(correlation_id)*.
+
+        Used for cross-instance cache invalidation: such events bypass the
+        scheduler entirely (no waiter ever matches them) and are never
+        buffered for rehydration.
+        """
+        self._listeners[event_type] = callback
+
     def _is_subscriber_running(self) -> bool:
         thread = self._subscriber_thread
         return bool(thread is not None and thread.is_alive())
@@ -387,6 +399,17 @@ class EventBus:
             event_type, correlation_id, source,
         )
 
+        listener = self._listeners.get(event_type)
+        if listener is not None:
+            try:
+                listener(correlation_id)
+            except Exception as exc:
+                logger.warning(
+                    "[EventBus] listener failed for event=%r (non-fatal): %s",
+                    event_type, exc,
+                )
+            return
+
         # ── Local notify (broadcast=False prevents re-publication) ─────────
         try:
             from AINDY.kernel.scheduler_engine import get_scheduler_engine  # noqa: PLC0415
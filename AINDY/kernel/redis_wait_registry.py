@@ -10,6 +10,7 @@ log = logging.getLogger(__name__)
 
 _KEY_PREFIX = "aindy:wait:"
 _DEFAULT_TTL = 86400
+_UNREGISTER_CHUNK = 500
 
 
 def _key(run_id: str) -> str:
@@ -100,6 +101,32 @@ class RedisWaitRegistry:
                 exc_info=True,
             )
 
+    def unregister_many(self, run_ids) -> int:
+        """Delete many wait keys with one pipelined round-trip per chunk.
+
+        Returns the number of keys that existed. Clients without pipeline
+        support fall back to one DELETE per key.
+        """
+        if self._redis is None:
+            return 0
+        keys = [_key(run_id) for run_id in dict.fromkeys(str(run_id) for run_id in run_ids)]
+        if not keys:
+            return 0
+        try:
+            if not hasattr(self._redis, "pipeline"):
+                return sum(int(self._redis.delete(key) or 0) for key in keys)
+            pipe = self._redis.pipeline(transaction=False)
+            for start in range(0, len(keys), _UNREGISTER_CHUNK):
+                pipe.delete(*keys[start : start + _UNREGISTER_CHUNK])
+            return sum(int(deleted or 0) for deleted in pipe.execute())
+        except Exception:
+            log.warning(
+                "RedisWaitRegistry.unregister_many failed for %d run(s)",
+                len(keys),
+                exc_info=True,
+            )
+            return 0
+
     def unregister_if_exists(self, run_id: str) -> bool:
         """Delete key and return True if it existed (claim succeeded)."""
         if self._redis is None:
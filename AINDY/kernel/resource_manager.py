@@ -58,6 +58,19 @@ logger = logging.getLogger(__name__)
 #
 # Per-EU usage tracking remains process-local by design. Only tenant
 # concurrent execution count is coordinated across instances.
+#
+# Quota leases (AINDY_QUOTA_LEASE_ENABLED, Redis backend only)
+# -------------------------------------------------------------
+# aindy:rm:eu:{eu_id}:cpu_ms / :syscalls then hold the budget *reserved* by
+# all processes rather than a running total. A process reserves a slice
+# (AINDY_QUOTA_LEASE_CPU_MS / AINDY_QUOTA_LEASE_SYSCALLS) in one script call
+# and spends it locally, so check_quota / record_usage touch Redis once per
+# slice instead of on every syscall. Like the per-call path, which rejects
+# only once usage is *above* the limit, the reservable budget is limit + 1
+# units, and reservations never exceed it; CPU already spent beyond a slice
+# is charged even past it, which is how an overrun becomes visible. Unspent
+# slices are refunded on mark_completed. Enforcement is therefore exact to
+# within one slice per process.
 
 # ── Quota constants ───────────────────────────────────────────────────────────
 
@@ -74,6 +87,8 @@ MAX_SYSCALLS_PER_EXECUTION: int = _int_env("AINDY_QUOTA_MAX_SYSCALLS", 100)
 MAX_CONCURRENT_PER_TENANT: int = _int_env("AINDY_QUOTA_MAX_CONCURRENT", 5)
 
 RESOURCE_LIMIT_EXCEEDED = "RESOURCE_LIMIT_EXCEEDED"
+_LOCK_STRIPES = 16
+_LEASED_RESOURCES = ("cpu_ms", "syscalls")
 EU_KEY_TTL_SECONDS = 3600
 TENANT_KEY_TTL_SECONDS = 86400
 
@@ -110,6 +125,15 @@ class UsageSnapshot:
         }
 
 
+@dataclass
+class _QuotaLease:
+    """Budget for one EU resource reserved from Redis and not yet spent."""
+
+    remaining: int = 0
+    reserved: int = 0
+    exhausted: bool = False
+
+
 class RedisResourceBackend:
     """Redis-backed resource quota state shared across processes."""
 
@@ -130,6 +154,26 @@ if (not current) or (tonumber(ARGV[1]) > tonumber(current)) then
 end
 redis.call('EXPIRE', KEYS[1], ARGV[2])
 return 1
+"""
+
+    # KEYS[1]=budget key; ARGV: charge, want, limit, ttl.
+    # Charge is usage that already happened (always added); then up to
+    # ``want`` more is granted without taking the total past ``limit``.
+    _LEASE_LUA = """
+local reserved = tonumber(redis.call('GET', KEYS[1]) or '0') + tonumber(ARGV[1])
+local grant = math.max(0, math.min(tonumber(ARGV[2]), tonumber(ARGV[3]) - reserved))
+reserved = reserved + grant
+redis.call('SET', KEYS[1], reserved)
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return {grant, reserved}
+"""
+
+    _REFUND_LUA = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local value = math.max(0, current - tonumber(ARGV[1]))
+redis.call('SET', KEYS[1], value)
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return value
 """
 
     def __init__(self, redis_url: str) -> None:
@@ -143,6 +187,8 @@ return 1
         )
         self._decr_floor = self._redis.register_script(self._DECR_FLOOR_LUA)
         self._set_if_greater = self._redis.register_script(self._SET_IF_GREATER_LUA)
+        self._lease_script = self._redis.register_script(self._LEASE_LUA)
+        self._refund_script = self._redis.register_script(self._REFUND_LUA)
 
     def _tenant_key(self, tenant_id: str) -> str:
         return f"aindy:rm:tenant:{tenant_id}:active"
@@ -197,6 +243,24 @@ return 1
             args=[str(bytes_used), str(EU_KEY_TTL_SECONDS)],
         )
 
+    def _budget_key(self, resource: str, eu_id: str) -> str:
+        return self._cpu_key(eu_id) if resource == "cpu_ms" else self._syscalls_key(eu_id)
+
+    def lease(self, resource: str, eu_id: str, *, charge: int, want: int, limit: int) -> tuple[int, int]:
+        """Charge spent units and reserve up to *want* more; returns (granted, reserved)."""
+        granted, reserved = self._lease_script(
+            keys=[self._budget_key(resource, eu_id)],
+            args=[str(charge), str(want), str(limit), str(EU_KEY_TTL_SECONDS)],
+        )
+        return int(granted), int(reserved)
+
+    def refund(self, resource: str, eu_id: str, amount: int) -> int:
+        value = self._refund_script(
+            keys=[self._budget_key(resource, eu_id)],
+            args=[str(amount), str(EU_KEY_TTL_SECONDS)],
+        )
+        return int(value)
+
     def delete_eu(self, eu_id: str) -> None:
         self._redis.delete(
             self._cpu_key(eu_id),
@@ -285,6 +349,20 @@ class ResourceManager:
         # eu_id → tenant_id (for cleanup on mark_completed with unknown eu_id)
         self._eu_tenant: dict[str, str] = {}
         self._pending_purge: set[str] = set()
+        # _usage entries and leases are guarded only by the stripe lock chosen
+        # by eu_id (never by _lock), so concurrent syscalls of different EUs do
+        # not contend and every writer of one EU's snapshot uses the same lock.
+        self._stripes = tuple(threading.Lock() for _ in range(_LOCK_STRIPES))
+        # (eu_id, resource) → budget leased from Redis
+        self._leases: dict[tuple[str, str], _QuotaLease] = {}
+        # tenant_id → (active count, monotonic time it was read)
+        self._tenant_active_seen: dict[str, tuple[int, float]] = {}
+
+    def _stripe(self, eu_id: str) -> threading.Lock:
+        return self._stripes[hash(eu_id) % _LOCK_STRIPES]
+
+    def _lease_mode(self) -> bool:
+        return self._backend is not None and bool(settings.AINDY_QUOTA_LEASE_ENABLED)
 
     def _concurrency_key(self, tenant_id: str) -> str:
         return f"aindy:quota:concurrent:{tenant_id}"
@@ -500,6 +578,48 @@ class ResourceManager:
                 return
             raise
 
+    def _backend_lease(
+        self,
+        resource: str,
+        eu_id: str,
+        *,
+        charge: int,
+        want: int,
+        limit: int,
+    ) -> tuple[int, int] | None:
+        if self._backend is None:
+            return None
+        try:
+            return self._backend.lease(resource, eu_id, charge=charge, want=want, limit=limit)
+        except Exception as exc:
+            import redis  # type: ignore[import]
+            if isinstance(exc, redis.RedisError):
+                logger.warning(
+                    "[ResourceManager] redis lease failed eu=%s resource=%s error=%s",
+                    eu_id,
+                    resource,
+                    exc,
+                )
+                return None
+            raise
+
+    def _backend_refund(self, resource: str, eu_id: str, amount: int) -> None:
+        if self._backend is None:
+            return
+        try:
+            self._backend.refund(resource, eu_id, amount)
+        except Exception as exc:
+            import redis  # type: ignore[import]
+            if isinstance(exc, redis.RedisError):
+                logger.warning(
+                    "[ResourceManager] redis refund failed eu=%s resource=%s error=%s",
+                    eu_id,
+                    resource,
+                    exc,
+                )
+                return
+            raise
+
     def _backend_reset_all(self) -> None:
         if self._backend is None:
             return
@@ -512,6 +632,18 @@ class ResourceManager:
                 return
             raise
 
+    def _drain_pending_purge(self) -> None:
+        """Drop the usage of EUs completed since the last check."""
+        if not self._pending_purge:
+            return
+        with self._lock:
+            purged, self._pending_purge = self._pending_purge, set()
+            for eid in purged:
+                self._eu_tenant.pop(eid, None)
+        for eid in purged:
+            with self._stripe(eid):
+                self._usage.pop(eid, None)
+
     # ── Pre-execution checks ──────────────────────────────────────────────────
 
     def can_execute(
@@ -532,12 +664,7 @@ class ResourceManager:
             (True, None) if execution is allowed.
             (False, reason_str) if a quota is exceeded.
         """
-        if self._pending_purge:
-            with self._lock:
-                for eid in list(self._pending_purge):
-                    self._usage.pop(eid, None)
-                    self._eu_tenant.pop(eid, None)
-                self._pending_purge.clear()
+        self._drain_pending_purge()
 
         if settings.is_testing:
             return True, None
@@ -588,16 +715,19 @@ class ResourceManager:
 
         eid = str(eu_id)
 
-        with self._lock:
+        with self._stripe(eid):
             snap = self._usage.get(eid)
             if snap is None:
                 return True, None
 
+        if self._lease_mode():
+            return self._check_leased_quota(eid, snap.tenant_id)
+
         can_run, concurrency_reason = self.can_execute(snap.tenant_id, eu_id)
         if not can_run:
             return False, concurrency_reason
 
-        with self._lock:
+        with self._stripe(eid):
             snap = self._usage.get(eid)
             if snap is None:
                 return True, None
@@ -630,6 +760,108 @@ class ResourceManager:
 
         return True, None
 
+    def _check_leased_quota(self, eu_id: str, tenant_id: str) -> tuple[bool, str | None]:
+        self._drain_pending_purge()
+        active = self._tenant_active_for_check(tenant_id)
+        if active >= self.MAX_CONCURRENT_PER_TENANT:
+            reason = (
+                f"{RESOURCE_LIMIT_EXCEEDED}: tenant {tenant_id!r} at "
+                f"concurrent limit ({active}/{self.MAX_CONCURRENT_PER_TENANT})"
+            )
+            logger.warning("[ResourceManager] %s eu=%s", reason, eu_id)
+            return False, reason
+
+        for resource, label, limit in (
+            ("cpu_ms", "cpu_time_ms", MAX_CPU_TIME_MS),
+            ("syscalls", "syscall_count", MAX_SYSCALLS_PER_EXECUTION),
+        ):
+            allowed = self._lease_allows(resource, eu_id, limit)
+            if allowed is None:
+                # Redis unavailable: fall back to this process's own usage.
+                used = self.get_usage(eu_id)[label]
+                allowed = used <= limit
+            if not allowed:
+                reason = (
+                    f"{RESOURCE_LIMIT_EXCEEDED}: eu {eu_id!r} exceeded "
+                    f"{label} limit (budget of {limit} exhausted)"
+                )
+                logger.warning("[ResourceManager] %s", reason)
+                return False, reason
+        return True, None
+
+    # ── Quota leases ──────────────────────────────────────────────────────────
+
+    def _lease_allows(self, resource: str, eu_id: str, limit: int) -> bool | None:
+        """True while budget is leased or leasable; None when Redis is unavailable."""
+        with self._stripe(eu_id):
+            lease = self._leases.get((eu_id, resource))
+            if lease is not None:
+                if lease.exhausted:
+                    return False
+                if lease.remaining > 0:
+                    return True
+        lease = self._refill_lease(resource, eu_id, limit)
+        if lease is None:
+            return None
+        return not lease.exhausted
+
+    def _spend_lease(self, resource: str, eu_id: str, amount: int, limit: int) -> None:
+        with self._stripe(eu_id):
+            lease = self._leases.setdefault((eu_id, resource), _QuotaLease())
+            lease.remaining -= amount
+            if lease.remaining >= 0:
+                return
+            charge = -lease.remaining
+            lease.remaining = 0
+        self._refill_lease(resource, eu_id, limit, charge=charge)
+
+    def _refill_lease(self, resource: str, eu_id: str, limit: int, *, charge: int = 0) -> _QuotaLease | None:
+        want = max(
+            1,
+            int(
+                settings.AINDY_QUOTA_LEASE_CPU_MS
+                if resource == "cpu_ms"
+                else settings.AINDY_QUOTA_LEASE_SYSCALLS
+            ),
+        )
+        budget = limit + 1  # usage == limit is still admitted, as on the per-call path
+        result = self._backend_lease(resource, eu_id, charge=charge, want=want, limit=budget)
+        if result is None:
+            return None
+        granted, reserved = result
+        with self._stripe(eu_id):
+            lease = self._leases.setdefault((eu_id, resource), _QuotaLease())
+            lease.remaining += granted
+            lease.reserved = max(lease.reserved, reserved)
+            lease.exhausted = reserved > budget or lease.remaining <= 0
+        _record_lease(resource, "granted" if granted else "exhausted")
+        return lease
+
+    def _release_leases(self, eu_id: str, *, refund: bool = True) -> None:
+        with self._stripe(eu_id):
+            released = [
+                (resource, self._leases.pop((eu_id, resource)))
+                for resource in _LEASED_RESOURCES
+                if (eu_id, resource) in self._leases
+            ]
+        if not refund:
+            return
+        for resource, lease in released:
+            if lease.remaining > 0:
+                self._backend_refund(resource, eu_id, lease.remaining)
+
+    def _tenant_active_for_check(self, tenant_id: str) -> int:
+        tid = str(tenant_id)
+        seen = self._tenant_active_seen.get(tid)
+        max_age = settings.AINDY_QUOTA_TENANT_REFRESH_MS / 1000.0
+        if seen is not None and time.monotonic() - seen[1] < max_age:
+            return seen[0]
+        return self._note_tenant_active(tid, self.get_tenant_active(tid))
+
+    def _note_tenant_active(self, tenant_id: str, active: int) -> int:
+        self._tenant_active_seen[tenant_id] = (int(active), time.monotonic())
+        return int(active)
+
     # ── Lifecycle hooks ───────────────────────────────────────────────────────
 
     def mark_started(self, tenant_id: str, eu_id: str | None = None) -> None:
@@ -646,7 +878,7 @@ class ResourceManager:
         if redis_client is not None:
             key = self._concurrency_key(tid)
             try:
-                redis_client.incr(key)
+                self._note_tenant_active(tid, redis_client.incr(key))
             except Exception as exc:
                 self._drop_redis_client(
                     "[resource_manager] Redis incr failed, using local: %s",
@@ -658,11 +890,11 @@ class ResourceManager:
             with self._lock:
                 self._active_counts[tid] = self._active_counts.get(tid, 0) + 1
 
-        with self._lock:
-            if eu_id:
-                eid = str(eu_id)
-                if eid not in self._usage:
-                    self._usage[eid] = UsageSnapshot(eu_id=eid, tenant_id=tid)
+        if eu_id:
+            eid = str(eu_id)
+            with self._stripe(eid):
+                self._usage.setdefault(eid, UsageSnapshot(eu_id=eid, tenant_id=tid))
+            with self._lock:
                 self._eu_tenant[eid] = tid
 
     def reset_tenant_quota(self, tenant_id: str) -> None:
@@ -743,6 +975,7 @@ class ResourceManager:
                 if count > 0:
                     self._active_counts[tid] = count - 1
                 effective_new_active = self._active_counts.get(tid, 0)
+        self._note_tenant_active(tid, effective_new_active)
 
         with self._lock:
             if eu_id:
@@ -752,6 +985,9 @@ class ResourceManager:
                 and effective_new_active < self.MAX_CONCURRENT_PER_TENANT
             )
 
+        if eu_id:
+            self._release_leases(str(eu_id))
+
         if capacity_freed:
             # ── Outside _lock — no re-entrant deadlock risk ───────────────
             try:
@@ -773,19 +1009,24 @@ class ResourceManager:
     def record_cpu(self, eu_id: str, ms: int) -> None:
         eid = str(eu_id)
         delta = int(ms)
-        with self._lock:
-            if eid not in self._usage:
-                self._usage[eid] = UsageSnapshot(eu_id=eid, tenant_id="")
-            self._usage[eid].cpu_time_ms += delta
-        self._backend_add_cpu_ms(eid, delta)
+        with self._stripe(eid):
+            snap = self._usage.setdefault(eid, UsageSnapshot(eu_id=eid, tenant_id=""))
+            snap.cpu_time_ms += delta
+        if delta <= 0:
+            return
+        if self._lease_mode():
+            self._spend_lease("cpu_ms", eid, delta, MAX_CPU_TIME_MS)
+        else:
+            self._backend_add_cpu_ms(eid, delta)
 
     def record_memory(self, eu_id: str, bytes_used: int) -> None:
         eid = str(eu_id)
         value = int(bytes_used)
-        with self._lock:
-            if eid not in self._usage:
-                self._usage[eid] = UsageSnapshot(eu_id=eid, tenant_id="")
-            self._usage[eid].memory_bytes = max(self._usage[eid].memory_bytes, value)
+        with self._stripe(eid):
+            snap = self._usage.setdefault(eid, UsageSnapshot(eu_id=eid, tenant_id=""))
+            if value <= snap.memory_bytes:
+                return
+            snap.memory_bytes = value
         self._backend_set_memory_if_greater(eid, value)
 
     def record_syscall(self, eu_id: str, count: int = 1) -> None:
@@ -793,10 +1034,12 @@ class ResourceManager:
         steps = max(0, int(count))
         if steps == 0:
             return
-        with self._lock:
-            if eid not in self._usage:
-                self._usage[eid] = UsageSnapshot(eu_id=eid, tenant_id="")
-            self._usage[eid].syscall_count += steps
+        with self._stripe(eid):
+            snap = self._usage.setdefault(eid, UsageSnapshot(eu_id=eid, tenant_id=""))
+            snap.syscall_count += steps
+        if self._lease_mode():
+            self._spend_lease("syscalls", eid, steps, MAX_SYSCALLS_PER_EXECUTION)
+            return
         for _ in range(steps):
             self._backend_increment_syscalls(eid)
 
@@ -822,8 +1065,9 @@ class ResourceManager:
 
         Returns an empty usage dict if *eu_id* is unknown.
         """
-        with self._lock:
-            snap = self._usage.get(str(eu_id))
+        eid = str(eu_id)
+        with self._stripe(eid):
+            snap = self._usage.get(eid)
             if snap is None:
                 return {"eu_id": eu_id, "cpu_time_ms": 0, "memory_bytes": 0, "syscall_count": 0}
             return snap.to_dict()
@@ -852,21 +1096,30 @@ class ResourceManager:
         tid = str(tenant_id)
         active_executions = self.get_tenant_active(tid)
         with self._lock:
-            snaps = [s for s in self._usage.values() if s.tenant_id == tid]
-            return {
-                "tenant_id": tid,
-                "active_executions": active_executions,
-                "execution_count": len(snaps),
-                "total_cpu_time_ms": sum(s.cpu_time_ms for s in snaps),
-                "peak_memory_bytes": max((s.memory_bytes for s in snaps), default=0),
-                "total_syscalls": sum(s.syscall_count for s in snaps),
-                "quota_limits": {
-                    "max_cpu_time_ms": MAX_CPU_TIME_MS,
-                    "max_memory_bytes": MAX_MEMORY_BYTES,
-                    "max_syscalls_per_execution": MAX_SYSCALLS_PER_EXECUTION,
-                    "max_concurrent_executions": MAX_CONCURRENT_PER_TENANT,
-                },
-            }
+            eu_ids = [eid for eid, owner in self._eu_tenant.items() if owner == tid]
+        # Each snapshot is read under its own EU's stripe, like its writers.
+        snaps = []
+        for eid in eu_ids:
+            with self._stripe(eid):
+                snap = self._usage.get(eid)
+                if snap is not None:
+                    snaps.append(
+                        (snap.cpu_time_ms, snap.memory_bytes, snap.syscall_count)
+                    )
+        return {
+            "tenant_id": tid,
+            "active_executions": active_executions,
+            "execution_count": len(snaps),
+            "total_cpu_time_ms": sum(cpu for cpu, _, _ in snaps),
+            "peak_memory_bytes": max((memory for _, memory, _ in snaps), default=0),
+            "total_syscalls": sum(syscalls for _, _, syscalls in snaps),
+            "quota_limits": {
+                "max_cpu_time_ms": MAX_CPU_TIME_MS,
+                "max_memory_bytes": MAX_MEMORY_BYTES,
+                "max_syscalls_per_execution": MAX_SYSCALLS_PER_EXECUTION,
+                "max_concurrent_executions": MAX_CONCURRENT_PER_TENANT,
+            },
+        }
 
     def purge_eu(self, eu_id: str) -> None:
         """Remove the UsageSnapshot for *eu_id* from memory.
@@ -874,9 +1127,11 @@ class ResourceManager:
         Safe to call at any point after ``mark_completed()``.
         """
         eid = str(eu_id)
-        with self._lock:
+        with self._stripe(eid):
             self._usage.pop(eid, None)
+        with self._lock:
             self._eu_tenant.pop(eid, None)
+        self._release_leases(eid, refund=False)
         self._backend_delete_eu(eid)
 
     def reset(self) -> None:
@@ -884,11 +1139,28 @@ class ResourceManager:
 
         For use in tests only. Never call in production.
         """
-        with self._lock:
+        for stripe in self._stripes:
+            stripe.acquire()
+        try:
             self._usage.clear()
+            self._leases.clear()
+        finally:
+            for stripe in self._stripes:
+                stripe.release()
+        with self._lock:
             self._active_counts.clear()
             self._eu_tenant.clear()
             self._pending_purge.clear()
+            self._tenant_active_seen.clear()
+
+
+def _record_lease(resource: str, outcome: str) -> None:
+    try:
+        from AINDY.platform_layer.metrics import quota_lease_requests_total
+
+        quota_lease_requests_total.labels(resource=resource, outcome=outcome).inc()
+    except Exception:
+        pass
 
 
 # ── Module-level singleton ────────────────────────────────────────────────────
@@ -18,6 +18,14 @@ class SchedulerCoreMixin:
         self._queues: dict[str, deque[ScheduledItem]] = {p: deque() for p in PRIORITY_ORDER}
         self._rr_cursor: dict[str, str | None] = {p: None for p in PRIORITY_ORDER}
         self._waiting: dict[str, dict] = {}
+        # Indexes over _waiting, maintained by SchedulerWaitMixin under _lock:
+        # event name -> correlation id (None = any) -> {run_id: registration seq}
+        self._event_index: dict[str, dict[str | None, dict[str, int]]] = {}
+        # (trigger timestamp, registration seq, run_id) min-heap; stale
+        # tuples are skipped lazily using _time_wait_seq.
+        self._time_heap: list[tuple[float, int, str]] = []
+        self._time_wait_seq: dict[str, int] = {}
+        self._wait_seq = 0
         self._seq = 0
         self._total_enqueued = 0
         self._total_dispatched = 0
@@ -72,13 +80,19 @@ class SchedulerCoreMixin:
         )
 
     def _unregister_redis_wait(self, run_id: str) -> None:
+        self._unregister_redis_waits([run_id])
+
+    def _unregister_redis_waits(self, run_ids) -> None:
+        run_ids = [str(run_id) for run_id in run_ids]
+        if not run_ids:
+            return
         try:
             from AINDY.kernel.redis_wait_registry import RedisWaitRegistry
             from AINDY.kernel.event_bus import get_redis_client
 
-            RedisWaitRegistry(get_redis_client()).unregister(str(run_id))
+            RedisWaitRegistry(get_redis_client()).unregister_many(run_ids)
         except Exception:
-            logger.debug("[Scheduler] Redis wait unregister skipped for run=%s", run_id, exc_info=True)
+            logger.debug("[Scheduler] Redis wait unregister skipped for %d run(s)", len(run_ids), exc_info=True)
 
     def enqueue(self, item: ScheduledItem) -> None:
         with self._lock:
@@ -129,6 +143,9 @@ class SchedulerCoreMixin:
             for q in self._queues.values():
                 q.clear()
             self._waiting.clear()
+            self._event_index.clear()
+            self._time_heap.clear()
+            self._time_wait_seq.clear()
             self._rr_cursor = {p: None for p in PRIORITY_ORDER}
             self._seq = 0
             self._total_enqueued = 0
@@ -137,5 +154,4 @@ class SchedulerCoreMixin:
             self._last_stale_wait_check_monotonic = 0.0
             self._pre_rehydration_buffer.clear()
             self._rehydration_complete.clear()
-        for run_id in cleared_run_ids:
-            self._unregister_redis_wait(run_id)
+        self._unregister_redis_waits(cleared_run_ids)
@@ -2,6 +2,9 @@ from __future__ import annotations
 
 from AINDY.kernel.scheduler.common import PRIORITY_NORMAL, _get_instance_id, _get_session_factory, logger
 
+# Bound the IN (...) list so one mass resume stays under driver parameter limits.
+_BACKUP_DELETE_CHUNK = 1000
+
 
 class SchedulerPersistenceMixin:
     def _persist_wait_backup(self, run_id: str) -> None:
@@ -73,20 +76,27 @@ class SchedulerPersistenceMixin:
                 db.close()
 
     def _delete_wait_backup(self, run_id: str) -> None:
+        self._delete_wait_backups([run_id])
+
+    def _delete_wait_backups(self, run_ids) -> None:
+        run_ids = list(dict.fromkeys(str(run_id) for run_id in run_ids))
+        if not run_ids:
+            return
         try:
             from AINDY.db.models.waiting_flow_run import WaitingFlowRun
         except Exception as exc:
-            logger.warning("[Scheduler] waiting backup delete init failed for run=%s (non-fatal): %s", run_id, exc)
+            logger.warning("[Scheduler] waiting backup delete init failed for %d run(s) (non-fatal): %s", len(run_ids), exc)
             return
 
         db = None
         try:
             db = _get_session_factory()()
-            (
-                db.query(WaitingFlowRun)
-                .filter(WaitingFlowRun.run_id == str(run_id))
-                .delete(synchronize_session=False)
-            )
+            for start in range(0, len(run_ids), _BACKUP_DELETE_CHUNK):
+                (
+                    db.query(WaitingFlowRun)
+                    .filter(WaitingFlowRun.run_id.in_(run_ids[start : start + _BACKUP_DELETE_CHUNK]))
+                    .delete(synchronize_session=False)
+                )
             db.commit()
         except Exception as exc:
             if db is not None:
@@ -94,7 +104,7 @@ class SchedulerPersistenceMixin:
                     db.rollback()
                 except Exception:
                     pass
-            logger.warning("[Scheduler] waiting backup delete failed for run=%s (non-fatal): %s", run_id, exc)
+            logger.warning("[Scheduler] waiting backup delete failed for %d run(s) (non-fatal): %s", len(run_ids), exc)
         finally:
             if db is not None:
                 db.close()
@@ -114,9 +114,10 @@ class SchedulerRecoveryMixin:
             return 0
 
         stale = [run_id for run_id in run_ids if run_id not in (waiting_flow_ids | waiting_eu_ids)]
+        with self._lock:
+            for run_id in stale:
+                self._remove_wait_locked(run_id)
+        self._delete_wait_backups(stale)
         for run_id in stale:
-            with self._lock:
-                self._waiting.pop(run_id, None)
-            self._delete_wait_backup(run_id)
             logger.info("[Scheduler] evicted stale wait run_id=%s", run_id)
         return len(stale)
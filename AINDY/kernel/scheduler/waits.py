@@ -1,10 +1,105 @@
 from __future__ import annotations
 
+import heapq
+from datetime import datetime, timezone
+
 from AINDY.kernel.scheduler.common import PRIORITY_NORMAL, _MAX_PRE_REHYDRATION_BUFFER, logger
 from AINDY.kernel.scheduler.cross_instance import _cross_instance_resume, _cross_instance_tick
 
 
+def _event_key(entry: dict) -> str | None:
+    """Event name an entry can be resumed by, or None if no event matches it."""
+    wc = entry.get("wait_condition") or {}
+    wc_type = wc.get("type")
+    wc_event = wc.get("event_name")
+    if wc_type == "time":
+        return None
+    if wc_event:
+        return wc_event if wc_type in ("event", "external") else None
+    return entry.get("wait_for")
+
+
+def _trigger_timestamp(entry: dict) -> float | None:
+    """UTC epoch seconds of a time wait's trigger, or None if it never fires."""
+    wc = entry.get("wait_condition") or {}
+    if wc.get("type") != "time":
+        return None
+    raw_trigger = wc.get("trigger_at")
+    if isinstance(raw_trigger, str):
+        try:
+            trigger_dt = datetime.fromisoformat(raw_trigger)
+        except ValueError:
+            return None
+    elif isinstance(raw_trigger, datetime):
+        trigger_dt = raw_trigger
+    else:
+        return None
+    if trigger_dt.tzinfo is None:
+        trigger_dt = trigger_dt.replace(tzinfo=timezone.utc)
+    return trigger_dt.timestamp()
+
+
 class SchedulerWaitMixin:
+    # ── Wait registry indexes ─────────────────────────────────────────────────
+    # _waiting stays the source of truth; these helpers keep _event_index and
+    # _time_heap in step with it so matching costs O(matches) and time firing
+    # O(log n) instead of a scan of every parked run. Callers hold _lock.
+
+    def _add_wait_locked(self, run_id: str, entry: dict) -> None:
+        if run_id in self._waiting:
+            self._remove_wait_locked(run_id)
+        self._wait_seq += 1
+        seq = self._wait_seq
+        self._waiting[run_id] = entry
+        event_name = _event_key(entry)
+        if event_name:
+            by_corr = self._event_index.setdefault(event_name, {})
+            by_corr.setdefault(entry.get("correlation_id") or None, {})[run_id] = seq
+        trigger_ts = _trigger_timestamp(entry)
+        if trigger_ts is not None:
+            self._time_wait_seq[run_id] = seq
+            heapq.heappush(self._time_heap, (trigger_ts, seq, run_id))
+
+    def _remove_wait_locked(self, run_id: str) -> dict | None:
+        entry = self._waiting.pop(run_id, None)
+        if entry is None:
+            return None
+        event_name = _event_key(entry)
+        if event_name:
+            by_corr = self._event_index.get(event_name)
+            corr = entry.get("correlation_id") or None
+            if by_corr is not None and corr in by_corr:
+                by_corr[corr].pop(run_id, None)
+                if not by_corr[corr]:
+                    del by_corr[corr]
+                if not by_corr:
+                    del self._event_index[event_name]
+        if self._time_wait_seq.pop(run_id, None) is not None:
+            # Heap tuples are dropped lazily; compact when mostly stale.
+            if len(self._time_heap) > 2 * len(self._time_wait_seq) + 64:
+                self._time_heap = [
+                    item for item in self._time_heap if self._time_wait_seq.get(item[2]) == item[1]
+                ]
+                heapq.heapify(self._time_heap)
+        return entry
+
+    def _match_event_locked(self, event_type: str, correlation_id: str | None) -> list[str]:
+        """Run ids resumed by *event_type*, in registration order."""
+        by_corr = self._event_index.get(event_type)
+        if not by_corr:
+            return []
+        emit_corr = correlation_id or None
+        if emit_corr is None:
+            buckets = list(by_corr.values())
+        else:
+            # Uncorrelated waits match any emission; correlated waits only
+            # their own correlation id.
+            buckets = [by_corr.get(None) or {}, by_corr.get(emit_corr) or {}]
+        matched = [(seq, run_id) for bucket in buckets for run_id, seq in bucket.items()]
+        if len(buckets) > 1:
+            matched.sort()
+        return [run_id for _, run_id in matched]
+
     def register_wait(
         self,
         run_id: str,
@@ -32,17 +127,20 @@ class SchedulerWaitMixin:
             }
 
         with self._lock:
-            self._waiting[str(run_id)] = {
-                "wait_for": wait_for_event,
-                "tenant_id": tenant_id,
-                "eu_id": eu_id,
-                "callback": resume_callback,
-                "priority": priority,
-                "correlation_id": correlation_id,
-                "trace_id": trace_id,
-                "eu_type": eu_type,
-                "wait_condition": wc_dict,
-            }
+            self._add_wait_locked(
+                str(run_id),
+                {
+                    "wait_for": wait_for_event,
+                    "tenant_id": tenant_id,
+                    "eu_id": eu_id,
+                    "callback": resume_callback,
+                    "priority": priority,
+                    "correlation_id": correlation_id,
+                    "trace_id": trace_id,
+                    "eu_type": eu_type,
+                    "wait_condition": wc_dict,
+                },
+            )
         try:
             from AINDY.kernel.resume_spec import RESUME_HANDLER_EU, ResumeSpec
             from AINDY.kernel.redis_wait_registry import RedisWaitRegistry
@@ -93,28 +191,15 @@ class SchedulerWaitMixin:
             logger.debug("[Scheduler] buffered event pre-rehydration: %s corr=%s", event_type, correlation_id)
             return 0
 
-        to_resume: list[tuple[str, dict]] = []
         with self._lock:
-            for run_id, entry in list(self._waiting.items()):
-                wc = entry.get("wait_condition") or {}
-                wc_type = wc.get("type")
-                wc_event = wc.get("event_name")
-                if wc_type == "time":
-                    continue
-                if wc_event:
-                    if wc_type not in ("event", "external") or wc_event != event_type:
-                        continue
-                elif entry.get("wait_for") != event_type:
-                    continue
-                entry_corr = entry.get("correlation_id") or None
-                emit_corr = correlation_id or None
-                if entry_corr and emit_corr and entry_corr != emit_corr:
-                    continue
-                to_resume.append((run_id, entry))
-
-            for run_id, _ in to_resume:
-                del self._waiting[run_id]
-                self._unregister_redis_wait(run_id)
+            to_resume = [
+                (run_id, self._remove_wait_locked(run_id))
+                for run_id in self._match_event_locked(event_type, correlation_id)
+            ]
+        # Redis and the backup table are cleaned up in bulk outside the lock
+        # so a broadcast that wakes thousands of runs does not stall it.
+        resumed_ids = [run_id for run_id, _ in to_resume]
+        self._unregister_redis_waits(resumed_ids)
 
         for run_id, entry in to_resume:
             self._enqueue_resume(run_id, entry["callback"], entry)
@@ -125,13 +210,13 @@ class SchedulerWaitMixin:
                 entry.get("eu_type", "flow"),
                 entry["priority"],
             )
-            self._delete_wait_backup(run_id)
+        self._delete_wait_backups(resumed_ids)
 
         cross_resumed = compat._cross_instance_resume(
             self,
             event_type,
             correlation_id,
-            {run_id for run_id, _ in to_resume},
+            set(resumed_ids),
         )
         if broadcast:
             try:
@@ -143,41 +228,24 @@ class SchedulerWaitMixin:
         return len(to_resume) + cross_resumed
 
     def tick_time_waits(self) -> int:
-        from datetime import datetime, timezone
         import AINDY.kernel.scheduler_engine as compat
 
-        now = datetime.now(timezone.utc)
+        now_ts = datetime.now(timezone.utc).timestamp()
         to_fire: list[tuple[str, dict]] = []
         with self._lock:
-            for run_id, entry in list(self._waiting.items()):
-                wc = entry.get("wait_condition") or {}
-                if wc.get("type") != "time":
+            # _remove_wait_locked may compact the heap, so re-read it each pass.
+            while self._time_heap and self._time_heap[0][0] <= now_ts:
+                _, seq, run_id = heapq.heappop(self._time_heap)
+                if self._time_wait_seq.get(run_id) != seq:
                     continue
-                raw_trigger = wc.get("trigger_at")
-                if raw_trigger is None:
-                    continue
-                if isinstance(raw_trigger, str):
-                    try:
-                        trigger_dt = datetime.fromisoformat(raw_trigger)
-                        if trigger_dt.tzinfo is None:
-                            trigger_dt = trigger_dt.replace(tzinfo=timezone.utc)
-                    except ValueError:
-                        continue
-                elif isinstance(raw_trigger, datetime):
-                    trigger_dt = raw_trigger if raw_trigger.tzinfo else raw_trigger.replace(tzinfo=timezone.utc)
-                else:
-                    continue
-                if trigger_dt <= now:
-                    to_fire.append((run_id, entry))
-
-            for run_id, _ in to_fire:
-                del self._waiting[run_id]
-                self._unregister_redis_wait(run_id)
+                to_fire.append((run_id, self._remove_wait_locked(run_id)))
+        fired_ids = [run_id for run_id, _ in to_fire]
+        self._unregister_redis_waits(fired_ids)
 
         for run_id, entry in to_fire:
             self._enqueue_resume(run_id, entry["callback"], entry)
             logger.info("[Scheduler] time-wait fired run=%s eu=%s priority=%s", run_id, entry["eu_id"], entry["priority"])
-            self._delete_wait_backup(run_id)
+        self._delete_wait_backups(fired_ids)
 
         return len(to_fire) + compat._cross_instance_tick(self)
 
@@ -185,25 +253,8 @@ class SchedulerWaitMixin:
         return self.tick_time_waits()
 
     def peek_matching_run_ids(self, event_type: str, *, correlation_id: str | None = None) -> list[str]:
-        matched: list[str] = []
         with self._lock:
-            for run_id, entry in self._waiting.items():
-                wc = entry.get("wait_condition") or {}
-                wc_type = wc.get("type")
-                wc_event = wc.get("event_name")
-                if wc_type == "time":
-                    continue
-                if wc_event:
-                    if wc_type not in ("event", "external") or wc_event != event_type:
-                        continue
-                elif entry.get("wait_for") != event_type:
-                    continue
-                entry_corr = entry.get("correlation_id") or None
-                emit_corr = correlation_id or None
-                if entry_corr and emit_corr and entry_corr != emit_corr:
-                    continue
-                matched.append(run_id)
-        return matched
+            return self._match_event_locked(event_type, correlation_id)
 
     def waiting_for(self, run_id: str) -> str | None:
         with self._lock:
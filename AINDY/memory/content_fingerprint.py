@@ -0,0 +1,253 @@
+"""
+Content fingerprints for memory capture deduplication.
+
+Every memory node stores two fingerprints of its content, set by a mapper
+listener in ``memory_persistence``:
+
+  content_hash     sha256 of the normalized text (whitespace collapsed,
+                   lower-cased); exact dedup is one lookup on
+                   ix_memory_nodes_user_content_hash
+  content_simhash  64-bit SimHash over word unigrams and bigrams; texts that
+                   differ in a word or two land a few bits apart
+
+``NearDuplicateIndex`` keeps each user's SimHashes in one contiguous uint64
+array, so finding the closest node is an XOR plus ``np.bitwise_count`` over
+the array (well under a millisecond per 100k nodes) rather than a table
+scan. A one-word edit of a typical event message moves its SimHash by
+roughly 5-10 bits; unrelated texts sit around 32 bits apart.
+
+Consistency model
+-----------------
+- A partition (node id and SimHash per node) is loaded lazily on the first
+  lookup for a user, with one query.
+- Every later lookup first fetches the user's rows created since the newest
+  row already seen, so nodes written by any process are found.
+- Partitions are reloaded after ``AINDY_MEMORY_NEAR_DUPLICATE_TTL_SECONDS`` to
+  drop deleted or edited nodes. Callers re-check a match against the
+  database before merging into it.
+- The index lock only guards the partition map. Catch-up fetches and
+  lookups hold the partition's own lock, and a cold load runs outside both
+  behind a per-user loading guard, so one user's load never stalls another
+  user's capture. An invalidate that arrives during a load marks it stale;
+  the loaded rows then answer that lookup but are not cached.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+
+from AINDY.config import settings
+from AINDY.memory.lexical_index import tokenize
+
+logger = logging.getLogger(__name__)
+
+SIMHASH_BITS = 64
+_MASK = (1 << SIMHASH_BITS) - 1
+_INITIAL_CAPACITY = 64
+_BIT_SHIFTS = np.arange(SIMHASH_BITS, dtype=np.uint64)
+
+
+def normalize_content(content: str | None) -> str:
+    return " ".join((content or "").split()).lower()
+
+
+def content_hash(content: str | None) -> str:
+    """Hex sha256 of the normalized content."""
+    return hashlib.sha256(normalize_content(content).encode("utf-8")).hexdigest()
+
+
+def _to_signed(value: int) -> int:
+    """Map an unsigned 64-bit value onto BigInteger's signed range."""
+    return value - (1 << SIMHASH_BITS) if value >= 1 << (SIMHASH_BITS - 1) else value
+
+
+def simhash(content: str | None) -> Optional[int]:
+    """Signed 64-bit SimHash of *content*; None when it has no word tokens."""
+    tokens = tokenize(content, fold=False)
+    if not tokens:
+        return None
+    features = Counter(tokens)
+    features.update(f"{left} {right}" for left, right in zip(tokens, tokens[1:]))
+    digests = np.fromiter(
+        (
+            int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+            for feature in features
+        ),
+        dtype=np.uint64,
+        count=len(features),
+    )
+    counts = np.fromiter(features.values(), dtype=np.int64, count=len(features))
+    bits = (digests[:, None] >> _BIT_SHIFTS) & np.uint64(1)
+    weights = counts @ (bits.astype(np.int64) * 2 - 1)
+    value = sum(1 << bit for bit in np.flatnonzero(weights > 0).tolist())
+    return _to_signed(value)
+
+
+def hamming_distance(left: int, right: int) -> int:
+    return bin((left ^ right) & _MASK).count("1")
+
+
+class _Partition:
+    __slots__ = ("ids", "positions", "hashes", "watermark", "loaded_at", "lock")
+
+    def __init__(self) -> None:
+        self.ids: list[str] = []
+        self.positions: dict[str, int] = {}
+        self.hashes = np.zeros(_INITIAL_CAPACITY, dtype=np.uint64)
+        self.watermark: Optional[datetime] = None
+        self.loaded_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def add(self, node_id: str, value: int, created_at: Optional[datetime]) -> None:
+        row = self.positions.get(node_id)
+        if row is None:
+            row = self.positions[node_id] = len(self.ids)
+            self.ids.append(node_id)
+            if row >= self.hashes.shape[0]:
+                grown = np.zeros(self.hashes.shape[0] * 2, dtype=np.uint64)
+                grown[:row] = self.hashes[:row]
+                self.hashes = grown
+        self.hashes[row] = value & _MASK
+        if created_at is not None and (self.watermark is None or created_at > self.watermark):
+            self.watermark = created_at
+
+    def nearest(self, value: int, max_distance: int) -> Optional[tuple[str, int]]:
+        if not self.ids:
+            return None
+        distances = np.bitwise_count(self.hashes[: len(self.ids)] ^ np.uint64(value & _MASK))
+        row = int(np.argmin(distances))
+        distance = int(distances[row])
+        return (self.ids[row], distance) if distance <= max_distance else None
+
+
+class NearDuplicateIndex:
+    """Process-wide, per-user SimHash arrays with LRU eviction."""
+
+    def __init__(self, *, max_users: int | None = None, ttl_seconds: float | None = None):
+        self.max_users = int(
+            max_users if max_users is not None else settings.AINDY_MEMORY_NEAR_DUPLICATE_MAX_USERS
+        )
+        self.ttl_seconds = float(
+            ttl_seconds if ttl_seconds is not None else settings.AINDY_MEMORY_NEAR_DUPLICATE_TTL_SECONDS
+        )
+        self._partitions: OrderedDict[str, _Partition] = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading: dict[str, threading.Event] = {}
+        self._stale_loads: set[str] = set()
+        self._loads = 0
+
+    def _fetch(self, db, user_id: uuid.UUID, since: Optional[datetime]):
+        from AINDY.memory.memory_persistence import MemoryNodeModel
+
+        query = db.query(
+            MemoryNodeModel.id, MemoryNodeModel.content_simhash, MemoryNodeModel.created_at
+        ).filter(
+            MemoryNodeModel.user_id == user_id,
+            MemoryNodeModel.content_simhash.isnot(None),
+        )
+        if since is not None:
+            # Inclusive: rows sharing the watermark's timestamp may be new.
+            query = query.filter(MemoryNodeModel.created_at >= since)
+        return query.yield_per(5000)
+
+    def _cached_partition(self, key: str) -> Optional[_Partition]:
+        """Return the user's live partition, or None once this caller owns the cold load."""
+        while True:
+            with self._lock:
+                partition = self._partitions.get(key)
+                if partition is not None:
+                    if (time.monotonic() - partition.loaded_at) <= self.ttl_seconds:
+                        self._partitions.move_to_end(key)
+                        return partition
+                    self._partitions.pop(key, None)
+                loading = self._loading.get(key)
+                if loading is None:
+                    self._loading[key] = threading.Event()
+                    self._stale_loads.discard(key)
+                    return None
+            # Another capture is loading this user; use its partition.
+            loading.wait()
+
+    def _load_partition(self, db, key: str, user_id) -> _Partition:
+        try:
+            partition = _Partition()
+            for node_id, value, created_at in self._fetch(db, user_id, None):
+                partition.add(str(node_id), int(value), created_at)
+            with self._lock:
+                self._loads += 1
+                if key in self._stale_loads:
+                    return partition
+                self._partitions[key] = partition
+                self._partitions.move_to_end(key)
+                while len(self._partitions) > self.max_users:
+                    self._partitions.popitem(last=False)
+            return partition
+        finally:
+            with self._lock:
+                loading = self._loading.pop(key)
+                self._stale_loads.discard(key)
+            loading.set()
+
+    def find(self, db, *, user_id, simhash_value: int, max_distance: int) -> Optional[tuple[str, int]]:
+        """Return ``(node_id, distance)`` of the user's closest node, or None."""
+        key = str(user_id)
+        partition = self._cached_partition(key)
+        if partition is None:
+            partition = self._load_partition(db, key, user_id)
+            with partition.lock:
+                return partition.nearest(simhash_value, max_distance)
+        with partition.lock:
+            for node_id, value, created_at in self._fetch(db, user_id, partition.watermark):
+                partition.add(str(node_id), int(value), created_at)
+            return partition.nearest(simhash_value, max_distance)
+
+    def invalidate(self, user_id=None) -> None:
+        with self._lock:
+            if user_id is None:
+                self._partitions.clear()
+                self._stale_loads.update(self._loading)
+                return
+            key = str(user_id)
+            self._partitions.pop(key, None)
+            if key in self._loading:
+                self._stale_loads.add(key)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._partitions.clear()
+            self._stale_loads.update(self._loading)
+            self._loads = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "partitions": len(self._partitions),
+                "nodes": sum(len(partition.ids) for partition in self._partitions.values()),
+                "loads": self._loads,
+            }
+
+
+_NEAR_DUPLICATE_INDEX: NearDuplicateIndex | None = None
+_NEAR_DUPLICATE_INDEX_LOCK = threading.Lock()
+
+
+def get_near_duplicate_index() -> NearDuplicateIndex:
+    """Return the process-wide NearDuplicateIndex."""
+    global _NEAR_DUPLICATE_INDEX
+    if _NEAR_DUPLICATE_INDEX is None:
+        with _NEAR_DUPLICATE_INDEX_LOCK:
+            if _NEAR_DUPLICATE_INDEX is None:
+                _NEAR_DUPLICATE_INDEX = NearDuplicateIndex()
+    return _NEAR_DUPLICATE_INDEX
+
+
+def near_duplicate_enabled() -> bool:
+    return bool(settings.AINDY_MEMORY_NEAR_DUPLICATE_ENABLED)
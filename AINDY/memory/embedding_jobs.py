@@ -5,6 +5,7 @@ import os
 import uuid
 from typing import Any
 
+from sqlalchemy import bindparam, update
 from sqlalchemy.orm import Session
 
 from AINDY.config import settings
@@ -12,14 +13,15 @@ from AINDY.core.execution_signal_helper import queue_system_event
 from AINDY.core.execution_dispatcher import dispatch_job
 from AINDY.db.database import SessionLocal
 from AINDY.core.system_event_types import SystemEventTypes
-from AINDY.memory.embedding_service import generate_embedding
+from AINDY.memory.embedding_service import generate_embedding, generate_embeddings
+from AINDY.memory.vector_index import get_memory_vector_index
 from AINDY.platform_layer.async_job_service import _INLINE_ACTIVE, register_async_job
 
 logger = logging.getLogger(__name__)
 
 EMBEDDING_JOB_NAME = "memory.generate_embedding"
 EMBEDDING_SWEEP_JOB_NAME = "memory.embedding_sweep"
-EMBEDDING_SWEEP_LIMIT = 25
+EMBEDDING_SWEEP_LIMIT = 500
 
 
 def enqueue_embedding(
@@ -110,6 +112,12 @@ def process_embedding_job(payload: dict[str, Any], db):
         db.add(memory_node)
         db.commit()
         db.refresh(memory_node)
+        get_memory_vector_index().upsert(
+            user_id=memory_node.user_id,
+            node_id=memory_node.id,
+            node_type=memory_node.node_type,
+            embedding=embedding,
+        )
 
         queue_system_event(
             db=db,
@@ -131,6 +139,7 @@ def process_embedding_job(payload: dict[str, Any], db):
         }
     except Exception as exc:
         logger.warning("[EmbeddingJobs] embedding deferred for %s: %s", memory_node.id, exc)
+        get_memory_vector_index().discard(user_id=memory_node.user_id, node_id=memory_node.id)
         memory_node.embedding_pending = True
         memory_node.embedding_status = "pending"
         db.add(memory_node)
@@ -144,40 +153,122 @@ def process_embedding_job(payload: dict[str, Any], db):
         }
 
 
+def _apply_embedding_batch(session, rows, vectors) -> tuple[list, list]:
+    """
+    Write every usable vector back in one executemany UPDATE.
+
+    Rows whose content changed or that were completed elsewhere since they
+    were read are skipped by the WHERE clause. Returns (completed, deferred)
+    rows; deferred rows are left untouched, i.e. still pending.
+    """
+    from AINDY.memory.memory_persistence import MemoryNodeModel
+
+    table = MemoryNodeModel.__table__
+    completed, deferred, params = [], [], []
+    for row, vector in zip(rows, vectors):
+        if isinstance(vector, Exception) or not vector or not any(float(value) != 0.0 for value in vector):
+            deferred.append(row)
+            continue
+        completed.append((row, vector))
+        params.append({"node_id": row.id, "node_content": row.content, "new_embedding": vector})
+
+    if params:
+        statement = (
+            update(table)
+            .where(
+                table.c.id == bindparam("node_id"),
+                table.c.content == bindparam("node_content"),
+                table.c.embedding_pending.is_(True),
+            )
+            .values(
+                embedding=bindparam("new_embedding"),
+                embedding_pending=False,
+                embedding_status="complete",
+            )
+        )
+        result = session.execute(statement, params)
+        session.commit()
+        if result.rowcount != len(params):
+            # Some rows were skipped (or the driver cannot count executemany
+            # rows); keep only the nodes that now hold this sweep's content.
+            expected = {row.id: row.content for row, _ in completed}
+            applied = {
+                node_id
+                for node_id, content in session.query(MemoryNodeModel.id, MemoryNodeModel.content).filter(
+                    MemoryNodeModel.id.in_(list(expected)),
+                    MemoryNodeModel.embedding_pending.is_(False),
+                )
+                if content == expected.get(node_id)
+            }
+            completed = [(row, vector) for row, vector in completed if row.id in applied]
+    return completed, deferred
+
+
 def process_pending_embeddings(*, limit: int = EMBEDDING_SWEEP_LIMIT, db: Session | None = None) -> dict[str, Any]:
+    """
+    Embed the oldest pending memory nodes in token-budgeted batches.
+
+    One embeddings request per batch (see generate_embeddings) and one bulk
+    UPDATE for the sweep replace the per-node request/commit of
+    process_embedding_job. Nodes whose embedding failed stay pending for the
+    next sweep.
+    """
     from AINDY.memory.memory_persistence import MemoryNodeModel
 
     owns_session = db is None
     session = db or SessionLocal()
     try:
+        # Plain column rows, so the commit below does not expire them.
         pending_rows = (
-            session.query(MemoryNodeModel)
+            session.query(
+                MemoryNodeModel.id,
+                MemoryNodeModel.user_id,
+                MemoryNodeModel.node_type,
+                MemoryNodeModel.content,
+                MemoryNodeModel.extra,
+                MemoryNodeModel.source_event_id,
+            )
             .filter(MemoryNodeModel.embedding_pending.is_(True))
             .order_by(MemoryNodeModel.created_at.asc(), MemoryNodeModel.id.asc())
             .limit(max(1, int(limit)))
             .all()
         )
-        processed = 0
-        completed = 0
-        deferred = 0
-        for row in pending_rows:
-            result = process_embedding_job(
-                {
+        if not pending_rows:
+            return {"job": EMBEDDING_SWEEP_JOB_NAME, "processed": 0, "completed": 0, "deferred": 0}
+
+        vectors = generate_embeddings([row.content or "" for row in pending_rows])
+        completed, deferred = _apply_embedding_batch(session, pending_rows, vectors)
+
+        index = get_memory_vector_index()
+        for row, vector in completed:
+            index.upsert(user_id=row.user_id, node_id=row.id, node_type=row.node_type, embedding=vector)
+            queue_system_event(
+                db=session,
+                event_type=SystemEventTypes.EMBEDDING_COMPLETED,
+                user_id=row.user_id,
+                trace_id=(row.extra or {}).get("trace_id") or str(row.id),
+                parent_event_id=str(row.source_event_id) if row.source_event_id else None,
+                source="memory",
+                payload={
                     "memory_id": str(row.id),
-                    "trace_id": (row.extra or {}).get("trace_id") or str(row.id),
+                    "dimensions": len(vector),
+                    "batch_size": len(pending_rows),
                 },
-                session,
+                required=True,
+            )
+        for row in deferred:
+            index.discard(user_id=row.user_id, node_id=row.id)
+        if deferred:
+            logger.warning(
+                "[EmbeddingJobs] %s of %s pending embeddings deferred to the next sweep",
+                len(deferred),
+                len(pending_rows),
             )
-            processed += 1
-            if result.get("embedding_pending"):
-                deferred += 1
-            else:
-                completed += 1
         return {
             "job": EMBEDDING_SWEEP_JOB_NAME,
-            "processed": processed,
-            "completed": completed,
-            "deferred": deferred,
+            "processed": len(pending_rows),
+            "completed": len(completed),
+            "deferred": len(deferred),
         }
     finally:
         if owns_session:
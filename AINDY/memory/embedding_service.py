@@ -3,7 +3,7 @@ Embedding Service
 
 Generates vector embeddings via OpenAI text-embedding-ada-002.
 Uses C++ kernel for cosine similarity when available.
-Falls back to pure Python.
+Falls back to NumPy.
 """
 import logging
 import os
@@ -12,6 +12,8 @@ import time
 from typing import Optional
 import threading
 
+import numpy as np
+
 from AINDY.config import settings
 from AINDY.kernel.circuit_breaker import CircuitOpenError
 from AINDY.platform_layer.external_call_service import perform_external_call
@@ -25,6 +27,7 @@ from AINDY.platform_layer.openai_client import get_openai_client
 
 EMBEDDING_MODEL = "text-embedding-ada-002"
 EMBEDDING_DIMENSIONS = 1536
+MAX_EMBEDDING_INPUT_CHARS = 32000
 _DEFAULT_PERFORM_EXTERNAL_CALL = perform_external_call
 logger = logging.getLogger(__name__)
 
@@ -53,28 +56,22 @@ def get_client():
     return _client
 
 
-def generate_embedding(text: str) -> list:
-    """
-    Generate a 1536-dim embedding for *text*.
-
-    Returns a zero vector immediately when *text* is empty — that is an
-    intentional no-op, not a failure.
-
-    Raises EmbeddingFailedError when the OpenAI API call fails after all
-    retry attempts, so callers (e.g. process_embedding_job) receive the
-    actual error and can keep the memory node pending for background retry.
-    """
-    if not text or not text.strip():
-        return [0.0] * EMBEDDING_DIMENSIONS
-    if (
+def _embeddings_stubbed() -> bool:
+    """True in test runs that have not injected a client or external-call shim."""
+    return (
         settings.is_testing
         and perform_external_call is _DEFAULT_PERFORM_EXTERNAL_CALL
         and _client is None
-    ):
-        return [0.0] * EMBEDDING_DIMENSIONS
+    )
 
-    text = text[:32000]
-    client = get_client()
+
+def _request_embeddings(client, payload: str | list[str], parse, *, purpose: str):
+    """
+    Call the embeddings endpoint with retries and return ``parse(response)``.
+
+    A parse error counts as a failed attempt. Raises EmbeddingFailedError
+    once every attempt has failed, or immediately when the circuit is open.
+    """
     last_exc: Exception | None = None
     started_at = time.perf_counter()
     max_attempts = max(1, int(settings.OPENAI_MAX_RETRIES or 1))
@@ -87,21 +84,20 @@ def generate_embedding(text: str) -> list:
                 endpoint="embeddings.create",
                 model=EMBEDDING_MODEL,
                 method="openai.embeddings",
-                extra={"purpose": "embedding_generation"},
+                extra={"purpose": purpose},
                 operation=lambda: create_embedding(
                     client,
-                    input=text,
+                    input=payload,
                     model=EMBEDDING_MODEL,
                     timeout=settings.OPENAI_EMBEDDING_TIMEOUT_SECONDS,
                 ),
             )
-            embedding = response.data[0].embedding
-            assert len(embedding) == EMBEDDING_DIMENSIONS
+            result = parse(response)
             if attempt:
                 embedding_generation_retries_total.inc(attempt)
             embedding_generation_total.labels(outcome="success").inc()
             embedding_generation_latency_seconds.observe(time.perf_counter() - started_at)
-            return embedding
+            return result
         except CircuitOpenError as e:
             embedding_generation_total.labels(outcome="failure").inc()
             embedding_generation_latency_seconds.observe(time.perf_counter() - started_at)
@@ -119,8 +115,6 @@ def generate_embedding(text: str) -> list:
             if attempt < max_attempts - 1:
                 time.sleep(backoff_base * (2 ** attempt))
 
-    # All 3 attempts failed — raise a typed error so callers can mark the
-    # node as failed rather than silently storing a zero vector.
     # All attempts failed: raise a typed error so callers can defer retry
     # rather than silently storing a zero vector.
     if max_attempts > 1:
@@ -137,20 +131,165 @@ def generate_embedding(text: str) -> list:
     ) from last_exc
 
 
+def _parse_single(response) -> list:
+    embedding = response.data[0].embedding
+    assert len(embedding) == EMBEDDING_DIMENSIONS
+    return embedding
+
+
+def generate_embedding(text: str) -> list:
+    """
+    Generate a 1536-dim embedding for *text*.
+
+    Returns a zero vector immediately when *text* is empty — that is an
+    intentional no-op, not a failure.
+
+    Raises EmbeddingFailedError when the OpenAI API call fails after all
+    retry attempts, so callers (e.g. process_embedding_job) receive the
+    actual error and can keep the memory node pending for background retry.
+    """
+    if not text or not text.strip():
+        return [0.0] * EMBEDDING_DIMENSIONS
+    if _embeddings_stubbed():
+        return [0.0] * EMBEDDING_DIMENSIONS
+
+    return _request_embeddings(
+        get_client(),
+        text[:MAX_EMBEDDING_INPUT_CHARS],
+        _parse_single,
+        purpose="embedding_generation",
+    )
+
+
+def estimate_embedding_tokens(text: str) -> int:
+    """Rough token count (4 characters per token) used for batch budgeting."""
+    return max(1, len(text) // 4)
+
+
+def token_budget_batches(
+    texts: list[str],
+    *,
+    max_tokens: int,
+    max_inputs: int,
+) -> list[list[int]]:
+    """
+    Group the indices of *texts*, in order, into batches that stay within
+    *max_tokens* estimated tokens and *max_inputs* inputs. A text larger than
+    the budget on its own gets a batch to itself.
+    """
+    batches: list[list[int]] = []
+    current: list[int] = []
+    current_tokens = 0
+    for index, text in enumerate(texts):
+        tokens = estimate_embedding_tokens(text)
+        if current and (current_tokens + tokens > max_tokens or len(current) >= max_inputs):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(index)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _batch_parser(count: int):
+    def _parse(response) -> list[list]:
+        vectors: list[list | None] = [None] * count
+        for position, item in enumerate(response.data):
+            index = getattr(item, "index", position)
+            if not isinstance(index, int):
+                index = position
+            vectors[index] = list(item.embedding)
+        if any(vector is None or len(vector) != EMBEDDING_DIMENSIONS for vector in vectors):
+            raise ValueError("embedding batch response is missing inputs or has wrong dimensions")
+        return vectors
+
+    return _parse
+
+
+def _embed_batch(client, texts: list[str]) -> list[list | EmbeddingFailedError]:
+    try:
+        return _request_embeddings(
+            client,
+            texts,
+            _batch_parser(len(texts)),
+            purpose="embedding_batch",
+        )
+    except EmbeddingFailedError as exc:
+        if len(texts) == 1 or isinstance(exc.__cause__, CircuitOpenError):
+            return [exc] * len(texts)
+        # The endpoint rejects a whole request for one bad input; split to
+        # isolate it so only the offending items stay pending.
+        # If the circuit opens meanwhile, the remaining halves fail fast.
+        middle = len(texts) // 2
+        return _embed_batch(client, texts[:middle]) + _embed_batch(client, texts[middle:])
+
+
+def generate_embeddings(texts: list[str]) -> list[list | EmbeddingFailedError]:
+    """
+    Embed many texts with as few API requests as the batch budget allows.
+
+    Texts are grouped by AINDY_EMBEDDING_BATCH_MAX_TOKENS (estimated) and
+    AINDY_EMBEDDING_BATCH_MAX_INPUTS, and each group is one request. The
+    result is aligned with *texts*: a vector, or the EmbeddingFailedError
+    for that text. A rejected request is split until the failing inputs are
+    isolated, so one bad text does not fail its neighbours. Empty texts get
+    a zero vector, as in generate_embedding().
+    """
+    results: list[list | EmbeddingFailedError | None] = [None] * len(texts)
+    payloads: list[str] = []
+    slots: list[int] = []
+    for index, text in enumerate(texts):
+        if not text or not text.strip() or _embeddings_stubbed():
+            results[index] = [0.0] * EMBEDDING_DIMENSIONS
+            continue
+        payloads.append(text[:MAX_EMBEDDING_INPUT_CHARS])
+        slots.append(index)
+    if not payloads:
+        return results
+
+    client = get_client()
+    batches = token_budget_batches(
+        payloads,
+        max_tokens=max(1, int(settings.AINDY_EMBEDDING_BATCH_MAX_TOKENS)),
+        max_inputs=max(1, int(settings.AINDY_EMBEDDING_BATCH_MAX_INPUTS)),
+    )
+    for batch in batches:
+        vectors = _embed_batch(client, [payloads[position] for position in batch])
+        for position, vector in zip(batch, vectors):
+            results[slots[position]] = vector
+    return results
+
+
 def generate_query_embedding(query: str) -> list:
     """
     Generate an embedding for a similarity query.
 
     Degrades gracefully: returns a zero vector when the API is unavailable
     so that search callers get empty results rather than a 500 error.
+
+    Successful embeddings are cached by query text (see
+    AINDY/memory/query_embedding_cache.py), so repeated queries skip the
+    API call.
     """
+    from AINDY.memory.query_embedding_cache import get_query_embedding_cache, query_cache_enabled
+
+    cache = get_query_embedding_cache() if query and query.strip() and query_cache_enabled() else None
+    cache_text = query[:MAX_EMBEDDING_INPUT_CHARS] if cache is not None else None
+    if cache is not None:
+        cached = cache.get(EMBEDDING_MODEL, cache_text)
+        if cached is not None:
+            return cached
     try:
-        return generate_embedding(query)
+        embedding = generate_embedding(query)
     except EmbeddingFailedError as exc:
         logging.warning(
             "Query embedding failed — returning zero vector for graceful degradation: %s", exc
         )
         return [0.0] * EMBEDDING_DIMENSIONS
+    if cache is not None:
+        cache.put(EMBEDDING_MODEL, cache_text, embedding)
+    return embedding
 
 
 def cosine_similarity_python(a: list, b: list) -> float:
@@ -165,21 +304,58 @@ def cosine_similarity_python(a: list, b: list) -> float:
     return dot / (mag_a * mag_b)
 
 
-def cosine_similarity(a: list, b: list) -> float:
-    """
-    Cosine similarity using C++ kernel if available.
-    Falls back to pure Python.
-    """
-    try:
-        _debug_path = os.path.join(
-            os.path.dirname(__file__),
-            "native", "memory_bridge_rs", "target", "debug"
+_native_bridge = None
+_native_probe_done = False
+_native_probe_lock = threading.Lock()
+
+
+def _load_native_bridge():
+    """Resolve memory_bridge_rs once per process; None when not built."""
+    global _native_bridge, _native_probe_done
+    if _native_probe_done:
+        return _native_bridge
+    with _native_probe_lock:
+        if _native_probe_done:
+            return _native_bridge
+        _debug_path = os.path.abspath(
+            os.path.join(
+                os.path.dirname(__file__),
+                "native", "memory_bridge_rs", "target", "debug"
+            )
         )
-        _debug_path = os.path.abspath(_debug_path)
         if _debug_path not in sys.path:
             sys.path.insert(0, _debug_path)
-        import memory_bridge_rs as _mbr
-        return _mbr.semantic_similarity(a, b)
-    except (ImportError, AttributeError, Exception):
-        return cosine_similarity_python(a, b)
+        try:
+            import memory_bridge_rs as _mbr
+
+            _native_bridge = _mbr if hasattr(_mbr, "semantic_similarity") else None
+        except Exception:
+            _native_bridge = None
+        _native_probe_done = True
+        return _native_bridge
 
+
+def cosine_similarity_numpy(a, b) -> float:
+    """Vectorized cosine similarity fallback."""
+    left = np.asarray(a, dtype=np.float64).ravel()
+    right = np.asarray(b, dtype=np.float64).ravel()
+    if left.size == 0 or left.shape != right.shape:
+        return 0.0
+    mag = float(np.linalg.norm(left) * np.linalg.norm(right))
+    if mag == 0.0:
+        return 0.0
+    return float(np.dot(left, right) / mag)
+
+
+def cosine_similarity(a: list, b: list) -> float:
+    """
+    Cosine similarity using C++ kernel if available.
+    Falls back to NumPy.
+    """
+    bridge = _load_native_bridge()
+    if bridge is not None:
+        try:
+            return bridge.semantic_similarity(a, b)
+        except Exception:
+            pass
+    return cosine_similarity_numpy(a, b)
@@ -0,0 +1,389 @@
+"""
+In-process BM25 inverted index for lexical memory recall.
+
+Without embeddings, MemoryNodeDAO used to find text matches with
+``content ILIKE '%query%'`` (a full scan that only matches the whole query as
+one substring, ordered by recency). On Postgres the DAO now ranks with
+``ts_rank_cd`` over the ``to_tsvector('english', content)`` GIN index. This
+module serves the same queries elsewhere (SQLite, or when the full-text path
+fails) from per-user postings lists scored with Okapi BM25.
+
+Consistency model
+-----------------
+Mirrors ``vector_index``:
+
+- A partition is loaded lazily on the first search for a user, with one query.
+- ``MemoryNodeDAO.save`` / ``update`` upsert documents into loaded partitions.
+- Each search passes the caller's current row count for the user. A mismatch
+  (for example rows written by another worker process) reloads the partition,
+  and every partition is reloaded after ``AINDY_MEMORY_LEXICAL_INDEX_TTL_SECONDS``.
+- Partitions are evicted least-recently-used once the resident documents
+  exceed ``AINDY_MEMORY_LEXICAL_INDEX_MAX_DOCUMENTS``.
+
+Scores are normalized so the best hit of a query is 1.0, which puts them on
+the same scale as cosine similarity for ``MemoryNodeDAO.recall``'s hybrid
+relevance.
+
+Usage
+-----
+    from AINDY.memory.lexical_index import get_memory_lexical_index
+
+    hits = get_memory_lexical_index().search(
+        db, user_id=user_id, query="deploy rollback", limit=5,
+    )
+    # -> [(node_id, score), ...] or None when the index cannot serve
+"""
+from __future__ import annotations
+
+import logging
+import math
+import re
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from typing import Iterable, Optional
+
+import numpy as np
+
+from AINDY.config import settings
+from AINDY.memory.vector_index import top_k
+
+logger = logging.getLogger(__name__)
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+_INITIAL_CAPACITY = 64
+_TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have i in is it its of on or that the "
+    "this to was were will with".split()
+)
+
+
+def _fold_plural(token: str) -> str:
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str | None, *, fold: bool = True) -> list[str]:
+    """Lower-cased word tokens without stopwords; plurals folded unless *fold* is False."""
+    tokens = [token for token in _TOKEN_RE.findall((text or "").lower()) if token not in _STOPWORDS]
+    return [_fold_plural(token) for token in tokens] if fold else tokens
+
+
+def normalize_scores(hits: list[tuple[str, float]]) -> list[tuple[str, float]]:
+    """Scale scores so the best hit is 1.0."""
+    best = max((score for _, score in hits), default=0.0)
+    if best <= 0.0:
+        return []
+    return [(node_id, score / best) for node_id, score in hits]
+
+
+class _Partition:
+    """Postings lists and document lengths for one user's memory nodes."""
+
+    __slots__ = (
+        "ids", "positions", "doc_terms", "lengths", "live", "type_codes", "type_lookup",
+        "postings", "_arrays", "total_length", "loaded_at",
+    )
+
+    def __init__(self, capacity: int = _INITIAL_CAPACITY):
+        capacity = max(1, capacity)
+        self.ids: list[str] = []
+        self.positions: dict[str, int] = {}
+        self.doc_terms: list[Optional[Counter]] = []
+        self.lengths = np.zeros(capacity, dtype=np.float32)
+        self.live = np.zeros(capacity, dtype=bool)
+        self.type_codes = np.zeros(capacity, dtype=np.int32)
+        self.type_lookup: dict[str | None, int] = {}
+        self.postings: dict[str, dict[int, int]] = {}
+        # term -> (rows, term frequencies); dropped when the term's postings change.
+        self._arrays: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        self.total_length = 0
+        self.loaded_at = time.monotonic()
+
+    @property
+    def size(self) -> int:
+        return len(self.positions)
+
+    def _type_code(self, node_type: str | None) -> int:
+        code = self.type_lookup.get(node_type)
+        if code is None:
+            code = len(self.type_lookup)
+            self.type_lookup[node_type] = code
+        return code
+
+    def _ensure_capacity(self, rows: int) -> None:
+        capacity = self.lengths.shape[0]
+        if rows <= capacity:
+            return
+        new_capacity = max(rows, capacity * 2)
+        for name, dtype in (("lengths", np.float32), ("live", bool), ("type_codes", np.int32)):
+            grown = np.zeros(new_capacity, dtype=dtype)
+            grown[:capacity] = getattr(self, name)
+            setattr(self, name, grown)
+
+    def upsert(self, node_id: str, node_type: str | None, content: str | None) -> None:
+        self.discard(node_id)
+        terms = Counter(tokenize(content))
+        self._add_terms(node_id, node_type, terms)
+        for term in terms:
+            self._arrays.pop(term, None)
+
+    def discard(self, node_id: str) -> None:
+        row = self.positions.pop(node_id, None)
+        if row is None:
+            return
+        terms = self.doc_terms[row]
+        self.doc_terms[row] = None
+        self.live[row] = False
+        self.total_length -= int(self.lengths[row])
+        for term in terms:
+            postings = self.postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(row, None)
+            if not postings:
+                del self.postings[term]
+            self._arrays.pop(term, None)
+        # Compact once tombstones outnumber live documents.
+        if len(self.ids) > 2 * _INITIAL_CAPACITY and len(self.ids) > 2 * self.size:
+            self._compact()
+
+    def _compact(self) -> None:
+        types = {code: node_type for node_type, code in self.type_lookup.items()}
+        documents = [
+            (node_id, types[int(self.type_codes[row])], self.doc_terms[row])
+            for node_id, row in self.positions.items()
+        ]
+        loaded_at = self.loaded_at
+        self.__init__(capacity=max(_INITIAL_CAPACITY, len(documents)))
+        for node_id, node_type, terms in documents:
+            self._add_terms(node_id, node_type, terms)
+        self.loaded_at = loaded_at
+
+    def _add_terms(self, node_id: str, node_type: str | None, terms: Counter) -> None:
+        row = len(self.ids)
+        self._ensure_capacity(row + 1)
+        self.ids.append(node_id)
+        self.doc_terms.append(terms)
+        self.positions[node_id] = row
+        length = sum(terms.values())
+        self.lengths[row] = length
+        self.live[row] = True
+        self.type_codes[row] = self._type_code(node_type)
+        self.total_length += length
+        for term, frequency in terms.items():
+            self.postings.setdefault(term, {})[row] = frequency
+
+    def load(self, rows: Iterable[tuple[str, str | None, str | None]]) -> None:
+        for node_id, node_type, content in rows:
+            self._add_terms(node_id, node_type, Counter(tokenize(content)))
+        self._arrays.clear()
+        self.loaded_at = time.monotonic()
+
+    def _term_arrays(self, term: str) -> Optional[tuple[np.ndarray, np.ndarray]]:
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            postings = self.postings.get(term)
+            if not postings:
+                return None
+            rows = np.fromiter(postings.keys(), dtype=np.int64, count=len(postings))
+            frequencies = np.fromiter(postings.values(), dtype=np.float32, count=len(postings))
+            arrays = self._arrays[term] = (rows, frequencies)
+        return arrays
+
+    def search(self, query: str, *, limit: int, node_type: str | None) -> list[tuple[str, float]]:
+        documents = self.size
+        if documents == 0 or limit <= 0:
+            return []
+        average_length = max(self.total_length / documents, 1.0)
+        scores = np.zeros(len(self.ids), dtype=np.float32)
+        matched = False
+        for term in set(tokenize(query)):
+            arrays = self._term_arrays(term)
+            if arrays is None:
+                continue
+            rows, frequencies = arrays
+            idf = math.log(1.0 + (documents - rows.size + 0.5) / (rows.size + 0.5))
+            norm = BM25_K1 * (1.0 - BM25_B + BM25_B * self.lengths[rows] / average_length)
+            scores[rows] += idf * frequencies * (BM25_K1 + 1.0) / (frequencies + norm)
+            matched = True
+        if not matched:
+            return []
+        keep = self.live[: len(self.ids)]
+        if node_type is not None:
+            code = self.type_lookup.get(node_type)
+            if code is None:
+                return []
+            keep = keep & (self.type_codes[: len(self.ids)] == code)
+        scores = np.where(keep & (scores > 0.0), scores, 0.0)
+        order = top_k(scores, min(limit, int(np.count_nonzero(scores))))
+        return [(self.ids[int(row)], float(scores[row])) for row in order]
+
+
+def rank_documents(query: str, documents: list[str | None]) -> list[tuple[int, float]]:
+    """BM25-rank an ad-hoc list of texts; returns ``(index, normalized score)`` for matches."""
+    partition = _Partition(capacity=max(_INITIAL_CAPACITY, len(documents)))
+    partition.load((str(index), None, text) for index, text in enumerate(documents))
+    hits = normalize_scores(partition.search(query, limit=len(documents), node_type=None))
+    return [(int(index), score) for index, score in hits]
+
+
+class MemoryLexicalIndex:
+    """Process-wide, per-user BM25 postings with LRU eviction."""
+
+    def __init__(self, *, max_documents: int | None = None, ttl_seconds: float | None = None):
+        self.max_documents = int(
+            max_documents
+            if max_documents is not None
+            else settings.AINDY_MEMORY_LEXICAL_INDEX_MAX_DOCUMENTS
+        )
+        self.ttl_seconds = float(
+            ttl_seconds if ttl_seconds is not None else settings.AINDY_MEMORY_LEXICAL_INDEX_TTL_SECONDS
+        )
+        self._partitions: OrderedDict[str, _Partition] = OrderedDict()
+        self._lock = threading.RLock()
+        self._loads = 0
+
+    @staticmethod
+    def _key(user_id) -> Optional[str]:
+        if user_id in (None, ""):
+            return None
+        try:
+            return str(uuid.UUID(str(user_id)))
+        except (TypeError, ValueError):
+            return None
+
+    def _load_rows(self, db, user_key: str) -> list[tuple[str, str | None, str | None]]:
+        from AINDY.memory.memory_persistence import MemoryNodeModel
+
+        rows = (
+            db.query(MemoryNodeModel.id, MemoryNodeModel.node_type, MemoryNodeModel.content)
+            .filter(MemoryNodeModel.user_id == uuid.UUID(user_key))
+            .yield_per(5000)
+        )
+        return [(str(node_id), node_type, content) for node_id, node_type, content in rows]
+
+    def _evict_locked(self) -> None:
+        total = sum(partition.size for partition in self._partitions.values())
+        while len(self._partitions) > 1 and total > self.max_documents:
+            _, evicted = self._partitions.popitem(last=False)
+            total -= evicted.size
+
+    def _partition_for_search(self, db, user_key: str, *, expected_rows: int | None) -> Optional[_Partition]:
+        partition = self._partitions.get(user_key)
+        if partition is not None:
+            stale = (time.monotonic() - partition.loaded_at) > self.ttl_seconds
+            if not stale and expected_rows is not None:
+                stale = partition.size != int(expected_rows)
+            if not stale:
+                self._partitions.move_to_end(user_key)
+                return partition
+            self._partitions.pop(user_key, None)
+
+        if expected_rows is not None and expected_rows > self.max_documents:
+            return None
+
+        rows = self._load_rows(db, user_key)
+        partition = _Partition(capacity=max(_INITIAL_CAPACITY, len(rows)))
+        partition.load(rows)
+        self._loads += 1
+        self._partitions[user_key] = partition
+        self._evict_locked()
+        return partition
+
+    def search(
+        self,
+        db,
+        *,
+        user_id,
+        query: str,
+        limit: int,
+        node_type: str | None = None,
+        expected_rows: int | None = None,
+    ) -> Optional[list[tuple[str, float]]]:
+        """
+        Return up to *limit* ``(node_id, score)`` pairs, best first, with
+        scores normalized to the best hit.
+
+        Returns None when the index cannot serve the query (no owning user or
+        a partition larger than the document budget) so the caller can fall
+        back to its own scan.
+        """
+        user_key = self._key(user_id)
+        if user_key is None:
+            return None
+        with self._lock:
+            partition = self._partition_for_search(db, user_key, expected_rows=expected_rows)
+            if partition is None:
+                return None
+            hits = partition.search(query, limit=max(0, int(limit)), node_type=node_type)
+        return normalize_scores(hits)
+
+    def upsert(self, *, user_id, node_id, node_type: str | None, content: str | None) -> None:
+        """Apply a saved or edited node to an already-loaded partition."""
+        user_key = self._key(user_id)
+        if user_key is None:
+            return
+        with self._lock:
+            partition = self._partitions.get(user_key)
+            if partition is not None:
+                partition.upsert(str(node_id), node_type, content)
+                self._evict_locked()
+
+    def discard(self, *, user_id, node_id) -> None:
+        user_key = self._key(user_id)
+        if user_key is None:
+            return
+        with self._lock:
+            partition = self._partitions.get(user_key)
+            if partition is not None:
+                partition.discard(str(node_id))
+
+    def invalidate(self, user_id=None) -> None:
+        with self._lock:
+            if user_id is None:
+                self._partitions.clear()
+                return
+            user_key = self._key(user_id)
+            if user_key is not None:
+                self._partitions.pop(user_key, None)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._partitions.clear()
+            self._loads = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "partitions": len(self._partitions),
+                "documents": sum(partition.size for partition in self._partitions.values()),
+                "terms": sum(len(partition.postings) for partition in self._partitions.values()),
+                "loads": self._loads,
+            }
+
+
+# ── Module-level singleton ────────────────────────────────────────────────────
+
+_LEXICAL_INDEX: MemoryLexicalIndex | None = None
+_LEXICAL_INDEX_LOCK = threading.Lock()
+
+
+def get_memory_lexical_index() -> MemoryLexicalIndex:
+    """Return the process-wide MemoryLexicalIndex."""
+    global _LEXICAL_INDEX
+    if _LEXICAL_INDEX is None:
+        with _LEXICAL_INDEX_LOCK:
+            if _LEXICAL_INDEX is None:
+                _LEXICAL_INDEX = MemoryLexicalIndex()
+    return _LEXICAL_INDEX
+
+
+def lexical_index_enabled() -> bool:
+    return bool(settings.AINDY_MEMORY_LEXICAL_INDEX_ENABLED)
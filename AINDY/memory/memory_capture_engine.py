@@ -16,9 +16,9 @@ from __future__ import annotations
 import logging
 import os
 import uuid
+from datetime import datetime, timezone
 from typing import Optional
 
-from sqlalchemy import text
 from AINDY.config import settings
 from AINDY.core.execution_signal_helper import queue_memory_capture, queue_system_event
 emit_system_event = queue_system_event
@@ -28,6 +28,7 @@ from AINDY.core.system_event_service import emit_error_event
 from AINDY.core.system_event_types import SystemEventTypes
 from AINDY.platform_layer.registry import get_memory_policy, get_memory_significance_rule
 from AINDY.platform_layer.trace_context import get_current_trace_id
+from AINDY.platform_layer.user_ids import parse_user_id
 
 logger = logging.getLogger(__name__)
 
@@ -406,39 +407,80 @@ class MemoryCaptureEngine:
 
     def _is_duplicate(self, content: str) -> bool:
         """
-        Check if very similar content already exists.
-        Simple check: exact content match in recent nodes.
-        Phase 2: use embedding similarity for fuzzy dedup.
+        Check whether this user already holds the same memory.
+
+        Exact duplicates are found by normalized content hash
+        (ix_memory_nodes_user_content_hash). With
+        AINDY_MEMORY_NEAR_DUPLICATE_ENABLED, near-duplicates are found by
+        SimHash distance through the near-duplicate index. Either way
+        the capture is merged into the existing node instead of stored.
+        The merge is flushed inside a savepoint, not committed.
         """
+        from AINDY.memory.content_fingerprint import (
+            content_hash,
+            get_near_duplicate_index,
+            hamming_distance,
+            near_duplicate_enabled,
+            simhash,
+        )
+        from AINDY.memory.memory_persistence import MemoryNodeModel
+
+        owner_user_id = parse_user_id(self.user_id)
+        if owner_user_id is None:
+            return False
         try:
-            existing = self.db.execute(
-                text(
-                    "SELECT id FROM memory_nodes "
-                    "WHERE user_id = :uid "
-                    "AND content = :content "
-                    "LIMIT 1"
-                ),
-                {"uid": self.user_id, "content": content},
-            ).fetchone()
-
-            if existing is None:
-                return False
-            if existing.__class__.__module__ == "unittest.mock":
-                return False
-            if isinstance(existing, dict):
-                return bool(existing.get("id"))
-            mapping = getattr(existing, "_mapping", None)
-            if mapping is not None and mapping.__class__.__module__ != "unittest.mock":
-                return True
-            if isinstance(existing, (list, tuple)):
-                return len(existing) > 0
-            try:
-                return len(existing) > 0
-            except Exception:
-                return False
-        except Exception:
+            # A savepoint keeps a failed lookup or merge from poisoning the
+            # caller's transaction; committing is left to the caller.
+            with self.db.begin_nested():
+                existing = (
+                    self.db.query(MemoryNodeModel)
+                    .filter(
+                        MemoryNodeModel.user_id == owner_user_id,
+                        MemoryNodeModel.content_hash == content_hash(content),
+                    )
+                    .first()
+                )
+                if not isinstance(existing, MemoryNodeModel):
+                    existing = None
+                if existing is None and near_duplicate_enabled():
+                    value = simhash(content)
+                    max_distance = int(settings.AINDY_MEMORY_NEAR_DUPLICATE_MAX_DISTANCE)
+                    match = (
+                        get_near_duplicate_index().find(
+                            self.db,
+                            user_id=owner_user_id,
+                            simhash_value=value,
+                            max_distance=max_distance,
+                        )
+                        if value is not None
+                        else None
+                    )
+                    if match is not None:
+                        candidate = self.dao._get_model_by_id(match[0], user_id=str(owner_user_id))
+                        # The index may predate an edit; re-check the stored hash.
+                        if (
+                            isinstance(candidate, MemoryNodeModel)
+                            and candidate.content_simhash is not None
+                            and hamming_distance(candidate.content_simhash, value) <= max_distance
+                        ):
+                            existing = candidate
+                if existing is None:
+                    return False
+                self._merge_duplicate(existing)
+            return True
+        except Exception as exc:
+            logger.debug("[MemoryCapture] duplicate check failed: %s", exc)
             return False  # on error, allow capture
 
+    def _merge_duplicate(self, node) -> None:
+        """Record a repeated capture on the node it duplicates."""
+        extra = dict(node.extra or {})
+        extra["duplicate_count"] = int(extra.get("duplicate_count") or 0) + 1
+        extra["last_duplicate_at"] = datetime.now(timezone.utc).isoformat()
+        node.extra = extra
+        self.db.add(node)
+        self.db.flush()
+
     def _classify_node_type(
         self,
         event_type: str,
@@ -4,7 +4,7 @@ from datetime import datetime
 import uuid
 from typing import List, Optional
 
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Index, func, or_, event, Integer, Float, Boolean
+from sqlalchemy import BigInteger, Column, String, DateTime, Text, ForeignKey, Index, func, or_, event, Integer, Float, Boolean
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
@@ -52,9 +52,14 @@ class MemoryNodeModel(Base):
     namespace = Column(String(128), nullable=True, index=True)
     addr_type = Column(String(128), nullable=True, index=True)
     parent_path = Column(String(512), nullable=True, index=True)
+    # Capture dedup fingerprints (see AINDY/memory/content_fingerprint.py)
+    content_hash = Column(String(64), nullable=True)
+    content_simhash = Column(BigInteger, nullable=True)
 
 
 Index("ix_memory_nodes_tags_gin", MemoryNodeModel.tags, postgresql_using="gin")
+Index("ix_memory_nodes_user_content_hash", MemoryNodeModel.user_id, MemoryNodeModel.content_hash)
+Index("ix_memory_nodes_user_created_at", MemoryNodeModel.user_id, MemoryNodeModel.created_at)
 
 
 @event.listens_for(MemoryNodeModel, "before_insert")
@@ -72,6 +77,19 @@ def validate_node_type(mapper, connection, target):
         )
 
 
+@event.listens_for(MemoryNodeModel, "before_insert")
+@event.listens_for(MemoryNodeModel, "before_update")
+def set_content_fingerprints(mapper, connection, target):
+    from sqlalchemy import inspect as sa_inspect
+
+    from AINDY.memory.content_fingerprint import content_hash, simhash
+
+    content_changed = sa_inspect(target).attrs.content.history.has_changes()
+    if target.content is not None and (content_changed or target.content_hash is None):
+        target.content_hash = content_hash(target.content)
+        target.content_simhash = simhash(target.content)
+
+
 class MemoryLinkModel(Base):
     __tablename__ = "memory_links"
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -0,0 +1,213 @@
+"""
+Cache for query embeddings.
+
+``generate_query_embedding`` runs on every semantic recall, and agents and
+users repeat the same prompts and search terms, so the same text is
+re-embedded over and over. This cache keys embeddings by a SHA-256 of the
+model name and query text and keeps them in two tiers:
+
+- an in-process LRU bounded by bytes (``AINDY_QUERY_EMBEDDING_CACHE_MAX_BYTES``)
+  with a per-entry TTL (``AINDY_QUERY_EMBEDDING_CACHE_TTL_SECONDS``);
+- an optional Redis tier (``AINDY_QUERY_EMBEDDING_CACHE_REDIS``) shared by
+  every instance, storing raw float32 bytes under ``aindy:qemb:<hash>``.
+
+Vectors are held as float32, so a cached embedding can differ from the API
+response in the 8th significant digit; cosine ranking is unaffected. Zero
+vectors (failed or stubbed generation) are never cached.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from AINDY.config import settings
+from AINDY.platform_layer.metrics import (
+    query_embedding_cache_bytes,
+    query_embedding_cache_evictions_total,
+    query_embedding_cache_hits_total,
+    query_embedding_cache_misses_total,
+)
+
+logger = logging.getLogger(__name__)
+
+_REDIS_PREFIX = "aindy:qemb:"
+# Key, OrderedDict node and tuple overhead per entry, roughly.
+_ENTRY_OVERHEAD_BYTES = 200
+
+
+def query_cache_key(model: str, text: str) -> str:
+    return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+
+class QueryEmbeddingCache:
+    """Byte-bounded LRU with TTL, backed by an optional shared Redis tier."""
+
+    _REDIS_CHECK_INTERVAL = 30.0
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int | None = None,
+        ttl_seconds: float | None = None,
+        redis_enabled: bool | None = None,
+    ):
+        self.max_bytes = int(
+            max_bytes if max_bytes is not None else settings.AINDY_QUERY_EMBEDDING_CACHE_MAX_BYTES
+        )
+        self.ttl_seconds = float(
+            ttl_seconds if ttl_seconds is not None else settings.AINDY_QUERY_EMBEDDING_CACHE_TTL_SECONDS
+        )
+        self.redis_enabled = bool(
+            redis_enabled if redis_enabled is not None else settings.AINDY_QUERY_EMBEDDING_CACHE_REDIS
+        )
+        self._entries: OrderedDict[str, tuple[float, np.ndarray]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._redis = None
+        self._redis_last_check = float("-inf")
+
+    # ── Redis tier ────────────────────────────────────────────────────────────
+
+    def _get_redis(self):
+        if not self.redis_enabled:
+            return None
+        now = time.monotonic()
+        if (now - self._redis_last_check) <= self._REDIS_CHECK_INTERVAL:
+            return self._redis
+        self._redis_last_check = now
+        redis_url = settings.REDIS_URL or os.getenv("REDIS_URL")
+        if not redis_url:
+            self._redis = None
+            return None
+        try:
+            import redis as _redis_lib
+
+            self._redis = _redis_lib.from_url(
+                redis_url,
+                socket_connect_timeout=1,
+                socket_timeout=1,
+            )
+        except Exception as exc:
+            logger.warning("[QueryEmbeddingCache] Redis tier unavailable: %s", exc)
+            self._redis = None
+        return self._redis
+
+    def _redis_get(self, key: str) -> Optional[np.ndarray]:
+        client = self._get_redis()
+        if client is None:
+            return None
+        try:
+            raw = client.get(_REDIS_PREFIX + key)
+        except Exception as exc:
+            logger.warning("[QueryEmbeddingCache] Redis get failed: %s", exc)
+            self._redis = None
+            return None
+        if not raw:
+            return None
+        return np.frombuffer(raw, dtype=np.float32).copy()
+
+    def _redis_set(self, key: str, vector: np.ndarray) -> None:
+        client = self._get_redis()
+        if client is None:
+            return
+        try:
+            client.setex(_REDIS_PREFIX + key, max(1, int(self.ttl_seconds)), vector.tobytes())
+        except Exception as exc:
+            logger.warning("[QueryEmbeddingCache] Redis set failed: %s", exc)
+            self._redis = None
+
+    # ── In-process tier ───────────────────────────────────────────────────────
+
+    @staticmethod
+    def _entry_bytes(vector: np.ndarray) -> int:
+        return int(vector.nbytes) + _ENTRY_OVERHEAD_BYTES
+
+    def _drop_locked(self, key: str, reason: str) -> None:
+        _, vector = self._entries.pop(key)
+        self._bytes -= self._entry_bytes(vector)
+        query_embedding_cache_evictions_total.labels(reason=reason).inc()
+
+    def _store_locked(self, key: str, vector: np.ndarray) -> None:
+        size = self._entry_bytes(vector)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            _, previous = self._entries.pop(key)
+            self._bytes -= self._entry_bytes(previous)
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, vector)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            self._drop_locked(next(iter(self._entries)), "capacity")
+        query_embedding_cache_bytes.set(self._bytes)
+
+    # ── Public API ────────────────────────────────────────────────────────────
+
+    def get(self, model: str, text: str) -> Optional[list]:
+        """Return the cached embedding for *text*, or None on a miss."""
+        key = query_cache_key(model, text)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, vector = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    query_embedding_cache_hits_total.labels(tier="memory").inc()
+                    return vector.tolist()
+                self._drop_locked(key, "expired")
+                query_embedding_cache_bytes.set(self._bytes)
+
+        vector = self._redis_get(key)
+        if vector is not None:
+            with self._lock:
+                self._store_locked(key, vector)
+            query_embedding_cache_hits_total.labels(tier="redis").inc()
+            return vector.tolist()
+
+        query_embedding_cache_misses_total.inc()
+        return None
+
+    def put(self, model: str, text: str, embedding) -> None:
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        if vector.size == 0 or not np.any(vector):
+            return
+        key = query_cache_key(model, text)
+        with self._lock:
+            self._store_locked(key, vector)
+        self._redis_set(key, vector)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            query_embedding_cache_bytes.set(0)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes}
+
+
+# ── Module-level singleton ────────────────────────────────────────────────────
+
+_QUERY_CACHE: QueryEmbeddingCache | None = None
+_QUERY_CACHE_LOCK = threading.Lock()
+
+
+def get_query_embedding_cache() -> QueryEmbeddingCache:
+    """Return the process-wide QueryEmbeddingCache."""
+    global _QUERY_CACHE
+    if _QUERY_CACHE is None:
+        with _QUERY_CACHE_LOCK:
+            if _QUERY_CACHE is None:
+                _QUERY_CACHE = QueryEmbeddingCache()
+    return _QUERY_CACHE
+
+
+def query_cache_enabled() -> bool:
+    return bool(settings.AINDY_QUERY_EMBEDDING_CACHE_ENABLED)
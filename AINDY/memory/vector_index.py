@@ -0,0 +1,664 @@
+"""
+In-process embedding matrix for semantic recall without pgvector.
+
+When the database cannot rank by vector distance (SQLite, Postgres without
+the pgvector operator, or a failed pgvector query), MemoryNodeDAO.find_similar
+used to load every embedded row and score it one by one in Python. This
+module keeps one contiguous float32 matrix of L2-normalized embeddings per
+user instead, so a top-k query is one matrix-vector product plus
+``np.argpartition``.
+
+Consistency model
+-----------------
+- A partition is loaded lazily on the first search for a user, with one query.
+- ``process_embedding_job`` upserts rows as embeddings complete, and
+  ``MemoryNodeDAO.update`` discards rows whose content changed.
+- Each search passes the caller's current row count. A mismatch (for example
+  rows embedded by another worker process) reloads the partition, and every
+  partition is reloaded after ``AINDY_MEMORY_VECTOR_INDEX_TTL_SECONDS``.
+- Partitions are evicted least-recently-used once the resident matrices
+  exceed ``AINDY_MEMORY_VECTOR_INDEX_MAX_BYTES``.
+- The index lock only guards the partition map. Scans and row updates hold
+  the partition's own lock, and a cold load runs outside both behind a
+  per-user loading guard, so one user's load never stalls another's recall.
+  Updates that arrive while a load is in flight mark it stale; the loaded
+  rows then answer that search but are not cached.
+
+Approximate search
+------------------
+Callers pick a recall-vs-latency trade-off with a search mode (see
+``resolve_search_mode``). The approximate profiles map to pgvector's
+``hnsw.ef_search`` / ``ivfflat.probes`` on Postgres and, here, to an IVF
+layer over the partition matrix: spherical k-means centroids (about
+sqrt(rows) lists) trained on a sample. Training reorders the partition so
+each list is one contiguous block of rows, and a query scores only the
+blocks of its closest lists; gathering scattered rows would cost nearly as
+much as the full product. Rows added or moved after training are "loose"
+and scored individually. The IVF layer is built lazily on the first
+approximate query against a large partition and rebuilt once the partition
+has doubled or halved, or too many rows are loose.
+
+Usage
+-----
+    from AINDY.memory.vector_index import get_memory_vector_index
+
+    hits = get_memory_vector_index().search(
+        db, user_id=user_id, query_embedding=vector, limit=5,
+    )
+    # -> [(node_id, similarity), ...] or None when the index cannot serve
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+
+import numpy as np
+
+from AINDY.config import settings
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_DIMENSIONS = 1536
+_INITIAL_CAPACITY = 64
+# Below this many rows a full matrix product is already cheaper than IVF.
+_IVF_MIN_ROWS = 4096
+_IVF_SAMPLE_PER_LIST = 32
+_IVF_TRAIN_ITERATIONS = 6
+_IVF_ASSIGN_CHUNK = 8192
+
+
+@dataclass(frozen=True)
+class AnnProfile:
+    """Knobs for one approximate search mode."""
+
+    name: str
+    ef_search: int  # pgvector hnsw.ef_search
+    probes: int  # pgvector ivfflat.probes
+    probe_fraction: float  # share of in-process IVF lists scanned
+
+
+SEARCH_MODES = ("auto", "exact", "fast", "balanced", "accurate")
+ANN_PROFILES = {
+    "fast": AnnProfile("fast", ef_search=40, probes=4, probe_fraction=0.05),
+    "balanced": AnnProfile("balanced", ef_search=100, probes=10, probe_fraction=0.12),
+    "accurate": AnnProfile("accurate", ef_search=400, probes=32, probe_fraction=0.30),
+}
+
+
+def resolve_search_mode(mode: str | None, rows: int) -> Optional[AnnProfile]:
+    """
+    Map a search mode to its ANN profile; None means exact search.
+
+    ``auto`` (the default) stays exact until a tenant has
+    ``AINDY_MEMORY_ANN_MIN_ROWS`` candidate rows and then uses ``balanced``.
+    """
+    name = (mode or settings.AINDY_MEMORY_SEARCH_MODE or "auto").strip().lower()
+    if name not in SEARCH_MODES:
+        raise ValueError(f"Unknown search_mode {mode!r}; expected one of {', '.join(SEARCH_MODES)}")
+    if name == "exact":
+        return None
+    if name == "auto":
+        if rows < int(settings.AINDY_MEMORY_ANN_MIN_ROWS):
+            return None
+        return ANN_PROFILES["balanced"]
+    return ANN_PROFILES[name]
+
+
+def normalize_rows(matrix: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return (row-normalized float32 matrix, boolean mask of non-zero rows)."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1)
+    valid = norms > 0.0
+    safe = np.where(valid, norms, 1.0).astype(np.float32)
+    return matrix / safe[:, None], valid
+
+
+def normalize_vector(vector: Iterable[float]) -> Optional[np.ndarray]:
+    """Return the L2-normalized float32 vector, or None for a zero vector."""
+    array = np.asarray(vector, dtype=np.float32).ravel()
+    norm = float(np.linalg.norm(array))
+    if norm == 0.0 or not np.isfinite(norm):
+        return None
+    return array / norm
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the *k* highest scores, best first."""
+    if k <= 0 or scores.size == 0:
+        return np.empty(0, dtype=np.int64)
+    if k >= scores.size:
+        return np.argsort(-scores, kind="stable")
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+class _Partition:
+    """Growable row store for one user's complete embeddings."""
+
+    __slots__ = (
+        "dimensions", "matrix", "valid", "type_codes", "type_lookup", "ids", "positions", "loaded_at",
+        "centroids", "assignments", "loose", "list_bounds", "ivf_rows", "lock",
+    )
+
+    def __init__(self, dimensions: int, capacity: int = _INITIAL_CAPACITY):
+        self.dimensions = dimensions
+        capacity = max(1, capacity)
+        self.matrix = np.zeros((capacity, dimensions), dtype=np.float32)
+        self.valid = np.zeros(capacity, dtype=bool)
+        self.type_codes = np.zeros(capacity, dtype=np.int32)
+        self.type_lookup: dict[str | None, int] = {}
+        self.ids: list[str] = []
+        self.positions: dict[str, int] = {}
+        self.loaded_at = time.monotonic()
+        self.centroids: Optional[np.ndarray] = None
+        self.assignments = np.full(capacity, -1, dtype=np.int32)
+        self.loose = np.zeros(capacity, dtype=bool)
+        self.list_bounds: Optional[np.ndarray] = None
+        self.ivf_rows = 0
+        self.lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        total = (
+            self.matrix.nbytes
+            + self.valid.nbytes
+            + self.type_codes.nbytes
+            + self.assignments.nbytes
+            + self.loose.nbytes
+        )
+        if self.centroids is not None:
+            total += self.centroids.nbytes
+        return int(total)
+
+    def _type_code(self, node_type: str | None) -> int:
+        code = self.type_lookup.get(node_type)
+        if code is None:
+            code = len(self.type_lookup)
+            self.type_lookup[node_type] = code
+        return code
+
+    def _ensure_capacity(self, rows: int) -> None:
+        capacity = self.matrix.shape[0]
+        if rows <= capacity:
+            return
+        new_capacity = max(rows, capacity * 2)
+        matrix = np.zeros((new_capacity, self.dimensions), dtype=np.float32)
+        matrix[: self.size] = self.matrix[: self.size]
+        valid = np.zeros(new_capacity, dtype=bool)
+        valid[: self.size] = self.valid[: self.size]
+        type_codes = np.zeros(new_capacity, dtype=np.int32)
+        type_codes[: self.size] = self.type_codes[: self.size]
+        assignments = np.full(new_capacity, -1, dtype=np.int32)
+        assignments[: self.size] = self.assignments[: self.size]
+        loose = np.zeros(new_capacity, dtype=bool)
+        loose[: self.size] = self.loose[: self.size]
+        self.matrix = matrix
+        self.valid = valid
+        self.type_codes = type_codes
+        self.assignments = assignments
+        self.loose = loose
+
+    def load(self, rows: list[tuple[str, str | None, Any]]) -> None:
+        self._ensure_capacity(len(rows))
+        for index, (_node_id, _node_type, embedding) in enumerate(rows):
+            vector = np.asarray(embedding, dtype=np.float32).ravel()
+            self.matrix[index] = vector if vector.shape[0] == self.dimensions else 0.0
+        normalized, valid = normalize_rows(self.matrix[: len(rows)])
+        self.matrix[: len(rows)] = normalized
+        self.valid[: len(rows)] = valid
+        self.type_codes[: len(rows)] = [self._type_code(node_type) for _, node_type, _ in rows]
+        self.ids = [node_id for node_id, _, _ in rows]
+        self.positions = {node_id: index for index, node_id in enumerate(self.ids)}
+        self.loaded_at = time.monotonic()
+        self.drop_ivf()
+
+    def upsert(self, node_id: str, node_type: str | None, embedding: Any) -> None:
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        if vector.shape[0] != self.dimensions:
+            self.discard(node_id)
+            return
+        normalized = normalize_vector(vector)
+        position = self.positions.get(node_id)
+        appended = position is None
+        if appended:
+            position = self.size
+            self._ensure_capacity(position + 1)
+            self.ids.append(node_id)
+            self.positions[node_id] = position
+        self.type_codes[position] = self._type_code(node_type)
+        if normalized is None:
+            self.matrix[position] = 0.0
+            self.valid[position] = False
+        else:
+            self.matrix[position] = normalized
+            self.valid[position] = True
+        if self.centroids is not None:
+            label = self._assign(self.matrix[position : position + 1])[0]
+            # A row stays in its block only if its list did not change.
+            if appended or label != self.assignments[position]:
+                self.loose[position] = True
+            self.assignments[position] = label
+
+    def discard(self, node_id: str) -> None:
+        position = self.positions.pop(node_id, None)
+        if position is None:
+            return
+        last = self.size - 1
+        if position != last:
+            moved_id = self.ids[last]
+            self.matrix[position] = self.matrix[last]
+            self.valid[position] = self.valid[last]
+            self.type_codes[position] = self.type_codes[last]
+            self.assignments[position] = self.assignments[last]
+            self.loose[position] = self.centroids is not None
+            self.ids[position] = moved_id
+            self.positions[moved_id] = position
+        self.matrix[last] = 0.0
+        self.valid[last] = False
+        self.assignments[last] = -1
+        self.loose[last] = False
+        self.ids.pop()
+
+    # ── IVF layer ─────────────────────────────────────────────────────────────
+
+    def drop_ivf(self) -> None:
+        self.centroids = None
+        self.list_bounds = None
+        self.assignments[:] = -1
+        self.loose[:] = False
+        self.ivf_rows = 0
+
+    def ivf_current(self) -> bool:
+        if self.centroids is None:
+            return False
+        if not self.ivf_rows // 2 <= self.size <= self.ivf_rows * 2:
+            return False
+        return int(np.count_nonzero(self.loose[: self.size])) <= max(256, self.size // 10)
+
+    def _permute(self, order: np.ndarray) -> None:
+        size = self.size
+        self.matrix[:size] = self.matrix[order]
+        self.valid[:size] = self.valid[order]
+        self.type_codes[:size] = self.type_codes[order]
+        self.assignments[:size] = self.assignments[order]
+        self.ids = [self.ids[int(index)] for index in order]
+        self.positions = {node_id: index for index, node_id in enumerate(self.ids)}
+
+    def _assign(self, rows: np.ndarray) -> np.ndarray:
+        labels = np.empty(rows.shape[0], dtype=np.int32)
+        for start in range(0, rows.shape[0], _IVF_ASSIGN_CHUNK):
+            chunk = rows[start : start + _IVF_ASSIGN_CHUNK]
+            labels[start : start + chunk.shape[0]] = np.argmax(chunk @ self.centroids.T, axis=1)
+        return labels
+
+    def build_ivf(self, *, seed: int = 0) -> bool:
+        """Train IVF centroids on a sample of live rows and regroup rows by list."""
+        live = np.flatnonzero(self.valid[: self.size])
+        if live.size < _IVF_MIN_ROWS:
+            self.drop_ivf()
+            return False
+        lists = int(np.clip(np.sqrt(live.size), 8, 1024))
+        rng = np.random.default_rng(seed)
+        sample_size = min(live.size, lists * _IVF_SAMPLE_PER_LIST)
+        sample = self.matrix[np.sort(rng.choice(live, sample_size, replace=False))]
+        centroids = sample[rng.choice(sample_size, lists, replace=False)].copy()
+        for _ in range(_IVF_TRAIN_ITERATIONS):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            order = np.argsort(labels, kind="stable")
+            counts = np.bincount(labels, minlength=lists)
+            occupied = np.flatnonzero(counts)
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[occupied]
+            sums = np.add.reduceat(sample[order], starts, axis=0)
+            # Empty lists keep their previous centroid.
+            centroids[occupied] = normalize_rows(sums)[0]
+        self.centroids = centroids
+        self.assignments[: self.size] = self._assign(self.matrix[: self.size])
+        self._permute(np.argsort(self.assignments[: self.size], kind="stable"))
+        counts = np.bincount(self.assignments[: self.size], minlength=lists)
+        self.list_bounds = np.concatenate(([0], np.cumsum(counts)))
+        self.loose[:] = False
+        self.ivf_rows = self.size
+        return True
+
+    def row_mask(self, node_type: str | None) -> Optional[np.ndarray]:
+        """Boolean mask of rows with *node_type*; None means every row matches."""
+        if node_type is None:
+            return None
+        code = self.type_lookup.get(node_type)
+        if code is None:
+            return np.zeros(self.size, dtype=bool)
+        return self.type_codes[: self.size] == code
+
+    def count(self, node_type: str | None) -> int:
+        mask = self.row_mask(node_type)
+        return self.size if mask is None else int(mask.sum())
+
+    def search(
+        self,
+        query: np.ndarray,
+        *,
+        limit: int,
+        node_type: str | None,
+        min_similarity: float,
+        profile: AnnProfile | None = None,
+    ) -> list[tuple[str, float]]:
+        if self.size == 0:
+            return []
+        keep = self.valid[: self.size]
+        mask = self.row_mask(node_type)
+        if mask is not None:
+            keep = keep & mask
+        wanted = min(limit, int(keep.sum()))
+
+        if profile is not None and self.size >= _IVF_MIN_ROWS:
+            if not self.ivf_current():
+                self.build_ivf()
+            if self.centroids is not None:
+                hits = self._search_ivf(query, keep=keep, wanted=wanted, profile=profile)
+                # A selective node_type filter can leave the probed lists
+                # short; answer those queries exactly rather than truncate.
+                if len(hits) >= wanted:
+                    return [(node_id, score) for node_id, score in hits if score >= min_similarity]
+
+        # Score every row with one contiguous product, then knock out rows
+        # that are filtered; that is cheaper than gathering a sub-matrix.
+        scores = self.matrix[: self.size] @ query
+        scores = np.where(keep, scores, -np.inf)
+        order = top_k(scores, wanted)
+        return [
+            (self.ids[int(index)], float(scores[index]))
+            for index in order
+            if float(scores[index]) >= min_similarity
+        ]
+
+    def _search_ivf(
+        self,
+        query: np.ndarray,
+        *,
+        keep: np.ndarray,
+        wanted: int,
+        profile: AnnProfile,
+    ) -> list[tuple[str, float]]:
+        size = self.size
+        lists = self.centroids.shape[0]
+        probes = max(1, int(np.ceil(profile.probe_fraction * lists)))
+        probed_lists = top_k(self.centroids @ query, probes)
+        in_block = keep & ~self.loose[:size]
+        row_parts, score_parts = [], []
+        for label in probed_lists:
+            start = int(self.list_bounds[label])
+            stop = min(int(self.list_bounds[label + 1]), size)
+            if start >= stop:
+                continue
+            block_scores = self.matrix[start:stop] @ query
+            hits = np.flatnonzero(in_block[start:stop])
+            row_parts.append(hits + start)
+            score_parts.append(block_scores[hits])
+
+        probed = np.zeros(lists, dtype=bool)
+        probed[probed_lists] = True
+        loose_rows = np.flatnonzero(self.loose[:size] & keep)
+        loose_rows = loose_rows[probed[self.assignments[loose_rows]]]
+        if loose_rows.size:
+            row_parts.append(loose_rows)
+            score_parts.append(self.matrix[loose_rows] @ query)
+        if not row_parts:
+            return []
+
+        rows = np.concatenate(row_parts)
+        scores = np.concatenate(score_parts)
+        order = top_k(scores, min(wanted, rows.size))
+        return [(self.ids[int(rows[index])], float(scores[index])) for index in order]
+
+
+class MemoryVectorIndex:
+    """Process-wide, per-user embedding matrices with LRU eviction."""
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int | None = None,
+        ttl_seconds: float | None = None,
+        dimensions: int = EMBEDDING_DIMENSIONS,
+    ):
+        self.max_bytes = int(
+            max_bytes if max_bytes is not None else settings.AINDY_MEMORY_VECTOR_INDEX_MAX_BYTES
+        )
+        self.ttl_seconds = float(
+            ttl_seconds if ttl_seconds is not None else settings.AINDY_MEMORY_VECTOR_INDEX_TTL_SECONDS
+        )
+        self.dimensions = dimensions
+        self._partitions: OrderedDict[str, _Partition] = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading: dict[str, threading.Event] = {}
+        self._stale_loads: set[str] = set()
+        self._loads = 0
+
+    @staticmethod
+    def _key(user_id) -> Optional[str]:
+        if user_id in (None, ""):
+            return None
+        try:
+            return str(uuid.UUID(str(user_id)))
+        except (TypeError, ValueError):
+            return None
+
+    def _load_rows(self, db, user_key: str) -> list[tuple[str, str | None, Any]]:
+        from AINDY.memory.memory_persistence import MemoryNodeModel
+
+        rows = (
+            db.query(MemoryNodeModel.id, MemoryNodeModel.node_type, MemoryNodeModel.embedding)
+            .filter(
+                MemoryNodeModel.user_id == uuid.UUID(user_key),
+                MemoryNodeModel.embedding.isnot(None),
+                MemoryNodeModel.embedding_pending.is_(False),
+                MemoryNodeModel.embedding_status == "complete",
+            )
+            .all()
+        )
+        return [(str(node_id), node_type, embedding) for node_id, node_type, embedding in rows]
+
+    def _evict_locked(self) -> None:
+        total = sum(partition.nbytes for partition in self._partitions.values())
+        while self._partitions and total > self.max_bytes:
+            _, evicted = self._partitions.popitem(last=False)
+            total -= evicted.nbytes
+
+    def _fresh(self, partition: _Partition, *, node_type: str | None, expected_rows: int | None) -> bool:
+        if (time.monotonic() - partition.loaded_at) > self.ttl_seconds:
+            return False
+        if expected_rows is None:
+            return True
+        with partition.lock:
+            return partition.count(node_type) == int(expected_rows)
+
+    def _partition_for_search(
+        self,
+        db,
+        user_key: str,
+        *,
+        node_type: str | None,
+        expected_rows: int | None,
+    ) -> Optional[_Partition]:
+        while True:
+            with self._lock:
+                partition = self._partitions.get(user_key)
+                if partition is not None:
+                    self._partitions.move_to_end(user_key)
+            if partition is not None and self._fresh(
+                partition, node_type=node_type, expected_rows=expected_rows
+            ):
+                return partition
+            with self._lock:
+                if self._partitions.get(user_key) is not partition:
+                    continue
+                self._partitions.pop(user_key, None)
+                loading = self._loading.get(user_key)
+                if loading is None:
+                    loading = self._loading[user_key] = threading.Event()
+                    self._stale_loads.discard(user_key)
+                    break
+            # Another search is loading this user; use its partition.
+            loading.wait()
+
+        try:
+            if expected_rows is not None and node_type is None:
+                estimated = expected_rows * self.dimensions * 4
+                if estimated > self.max_bytes:
+                    return None
+
+            rows = self._load_rows(db, user_key)
+            partition = _Partition(self.dimensions, capacity=max(_INITIAL_CAPACITY, len(rows)))
+            partition.load(rows)
+            with self._lock:
+                self._loads += 1
+                if user_key in self._stale_loads:
+                    return partition
+                if partition.nbytes > self.max_bytes:
+                    logger.info(
+                        "[MemoryVectorIndex] partition for %s exceeds budget (%s bytes); not cached",
+                        user_key,
+                        partition.nbytes,
+                    )
+                    return partition
+                self._partitions[user_key] = partition
+                self._evict_locked()
+            return partition
+        finally:
+            with self._lock:
+                self._loading.pop(user_key, None)
+                self._stale_loads.discard(user_key)
+            loading.set()
+
+    def search(
+        self,
+        db,
+        *,
+        user_id,
+        query_embedding,
+        limit: int,
+        node_type: str | None = None,
+        min_similarity: float = 0.0,
+        expected_rows: int | None = None,
+        profile: AnnProfile | None = None,
+    ) -> Optional[list[tuple[str, float]]]:
+        """
+        Return up to *limit* ``(node_id, cosine_similarity)`` pairs, best first.
+
+        With an ANN *profile* large partitions are searched through the IVF
+        layer, trading a little recall for scanning only the nearest lists.
+
+        Returns None when the index cannot serve the query (no owning user,
+        unusable query vector, or a partition too large for the budget) so
+        the caller can fall back to its own scan.
+        """
+        user_key = self._key(user_id)
+        if user_key is None:
+            return None
+        query = normalize_vector(query_embedding)
+        if query is None or query.shape[0] != self.dimensions:
+            return None
+        partition = self._partition_for_search(
+            db,
+            user_key,
+            node_type=node_type,
+            expected_rows=expected_rows,
+        )
+        if partition is None:
+            return None
+        with partition.lock:
+            return partition.search(
+                query,
+                limit=max(0, int(limit)),
+                node_type=node_type,
+                min_similarity=min_similarity,
+                profile=profile,
+            )
+
+    def upsert(self, *, user_id, node_id, node_type: str | None, embedding) -> None:
+        """Apply a completed embedding to an already-loaded partition."""
+        user_key = self._key(user_id)
+        if user_key is None or embedding is None:
+            return
+        with self._lock:
+            self._mark_loading_stale(user_key)
+            partition = self._partitions.get(user_key)
+        if partition is None:
+            return
+        with partition.lock:
+            partition.upsert(str(node_id), node_type, embedding)
+        with self._lock:
+            self._evict_locked()
+
+    def discard(self, *, user_id, node_id) -> None:
+        user_key = self._key(user_id)
+        if user_key is None:
+            return
+        with self._lock:
+            self._mark_loading_stale(user_key)
+            partition = self._partitions.get(user_key)
+        if partition is not None:
+            with partition.lock:
+                partition.discard(str(node_id))
+
+    def _mark_loading_stale(self, user_key: str) -> None:
+        if user_key in self._loading:
+            self._stale_loads.add(user_key)
+
+    def invalidate(self, user_id=None) -> None:
+        with self._lock:
+            if user_id is None:
+                self._partitions.clear()
+                self._stale_loads.update(self._loading)
+                return
+            user_key = self._key(user_id)
+            if user_key is not None:
+                self._partitions.pop(user_key, None)
+                self._mark_loading_stale(user_key)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._partitions.clear()
+            self._stale_loads.update(self._loading)
+            self._loads = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "partitions": len(self._partitions),
+                "rows": sum(partition.size for partition in self._partitions.values()),
+                "bytes": sum(partition.nbytes for partition in self._partitions.values()),
+                "loads": self._loads,
+                "ivf_partitions": sum(
+                    1 for partition in self._partitions.values() if partition.centroids is not None
+                ),
+            }
+
+
+# ── Module-level singleton ────────────────────────────────────────────────────
+
+_VECTOR_INDEX: MemoryVectorIndex | None = None
+_VECTOR_INDEX_LOCK = threading.Lock()
+
+
+def get_memory_vector_index() -> MemoryVectorIndex:
+    """Return the process-wide MemoryVectorIndex."""
+    global _VECTOR_INDEX
+    if _VECTOR_INDEX is None:
+        with _VECTOR_INDEX_LOCK:
+            if _VECTOR_INDEX is None:
+                _VECTOR_INDEX = MemoryVectorIndex()
+    return _VECTOR_INDEX
+
+
+def vector_index_enabled() -> bool:
+    return bool(settings.AINDY_MEMORY_VECTOR_INDEX_ENABLED)
@@ -123,6 +123,7 @@ async def log_requests(request, call_next):
         if not settings.is_testing and not os.getenv("PYTEST_CURRENT_TEST"):
             from AINDY.core.request_metric_writer import PendingMetric, get_writer
 
+            route_path = getattr(request.scope.get("route"), "path", None)
             get_writer().enqueue(
                 PendingMetric(
                     request_id=trace_id,
@@ -132,6 +133,7 @@ async def log_requests(request, call_next):
                     path=request.url.path,
                     status_code=response.status_code,
                     duration_ms=duration_ms,
+                    route=route_path if isinstance(route_path, str) else None,
                 )
             )
         return response
@@ -13,6 +13,13 @@ Key lifecycle
   revoke_api_key()   â€” sets revoked_at to now(); ownership-checked.
   list_api_keys()    â€” returns safe public metadata (no hash, no plaintext).
   touch_last_used()  â€” non-blocking last_used_at stamp called from auth path.
+  record_key_use()   â€” same stamp by key id, for principals served from cache.
+
+With AINDY_API_KEY_LAST_USED_FLUSH_SECONDS > 0, or the principal cache
+enabled, both stamp functions hand the key id to LastUsedBuffer, which keeps
+the latest time per key and writes all of them with one bulk UPDATE per
+interval instead of a commit per request. Without an explicit flush interval
+the buffer flushes once per principal cache TTL.
 
 Scopes are free-form strings validated against auth.api_key_auth.Scopes.ALL by the
 caller (platform_router.py) before calling create_api_key().
@@ -20,13 +27,20 @@ caller (platform_router.py) before calling create_api_key().
 from __future__ import annotations
 
 import hashlib
+import logging
 import secrets
+import threading
 import uuid
 from datetime import datetime, timezone
 from typing import Optional
 
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
+from AINDY.config import settings
+
+logger = logging.getLogger(__name__)
+
 _KEY_PREFIX = "aindy_"
 _KEY_TOKEN_BYTES = 32  # 32 bytes â†’ 43-char url-safe base64 (without padding)
 
@@ -112,6 +126,10 @@ def revoke_api_key(key_id: str, user_id: str, db: Session) -> bool:
     record.revoked_at = datetime.now(timezone.utc)
     record.is_active = False
     db.commit()
+
+    from AINDY.auth.principal_cache import invalidate_api_key
+
+    invalidate_api_key(record.key_hash)
     return True
 
 
@@ -140,14 +158,161 @@ def get_api_key(key_id: str, user_id: str, db: Session) -> dict | None:
 
 def touch_last_used(record: "PlatformAPIKey", db: Session) -> None:
     """Stamp last_used_at on *record*.  Called from the auth hot-path; must be fast."""
+    if last_used_coalescing_enabled():
+        get_last_used_buffer().touch(record.id)
+        return
     record.last_used_at = datetime.now(timezone.utc)
     db.commit()
 
 
+def record_key_use(key_id, db: Session) -> None:
+    """Stamp last_used_at for *key_id* without a loaded record (cached principal)."""
+    if last_used_coalescing_enabled():
+        get_last_used_buffer().touch(key_id)
+        return
+    from AINDY.db.models.api_key import PlatformAPIKey
+
+    db.query(PlatformAPIKey).filter(PlatformAPIKey.id == _as_uuid(key_id)).update(
+        {PlatformAPIKey.last_used_at: datetime.now(timezone.utc)},
+        synchronize_session=False,
+    )
+    db.commit()
+
+
+# ---------------------------------------------------------------------------
+# Coalesced last_used_at writes
+# ---------------------------------------------------------------------------
+
+class LastUsedBuffer:
+    """Latest last_used_at per key id, written by a background bulk UPDATE."""
+
+    def __init__(self, *, flush_interval_seconds: float | None = None, session_factory=None) -> None:
+        self.flush_interval_seconds = float(
+            flush_interval_seconds
+            if flush_interval_seconds is not None
+            else _last_used_flush_seconds()
+        )
+        self._session_factory = session_factory
+        self._pending: dict[uuid.UUID, datetime] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="api-key-last-used-writer",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+        self.flush()
+
+    def _run(self) -> None:
+        interval = self.flush_interval_seconds or 1.0
+        while not self._stop_event.wait(timeout=interval):
+            try:
+                self.flush()
+            except Exception:
+                logger.warning("[LastUsedBuffer] periodic flush failed", exc_info=True)
+
+    def touch(self, key_id) -> None:
+        stamp = datetime.now(timezone.utc)
+        with self._lock:
+            self._pending[_as_uuid(key_id)] = stamp
+
+    def flush(self) -> int:
+        """Write every pending stamp with one bulk UPDATE; returns the number of keys."""
+        from AINDY.db.models.api_key import PlatformAPIKey
+
+        with self._flush_lock:
+            with self._lock:
+                batch = self._pending
+                self._pending = {}
+            if not batch:
+                return 0
+            if self._session_factory is None:
+                from AINDY.db.database import SessionLocal
+
+                self._session_factory = SessionLocal
+            db = self._session_factory()
+            try:
+                db.execute(
+                    update(PlatformAPIKey),
+                    [{"id": key_id, "last_used_at": stamp} for key_id, stamp in batch.items()],
+                )
+                db.commit()
+            except Exception as exc:
+                db.rollback()
+                # last_used_at is advisory; drop the batch rather than grow unbounded.
+                logger.warning("[LastUsedBuffer] dropped %d last_used_at stamps: %s", len(batch), exc)
+                return 0
+            finally:
+                db.close()
+        _record_last_used_flush(len(batch))
+        return len(batch)
+
+
+def _record_last_used_flush(count: int) -> None:
+    try:
+        from AINDY.platform_layer.metrics import api_key_last_used_flushed_total
+
+        api_key_last_used_flushed_total.inc(count)
+    except Exception:
+        pass
+
+
+_last_used_buffer: Optional[LastUsedBuffer] = None
+_last_used_lock = threading.Lock()
+
+
+def _last_used_flush_seconds() -> float:
+    # A cached principal skips the key SELECT; an inline stamp would put the
+    # per-request write back, so the cache implies coalescing.
+    return float(
+        settings.AINDY_API_KEY_LAST_USED_FLUSH_SECONDS
+        or settings.AINDY_AUTH_PRINCIPAL_CACHE_TTL_SECONDS
+        or 0
+    )
+
+
+def last_used_coalescing_enabled() -> bool:
+    return _last_used_flush_seconds() > 0
+
+
+def get_last_used_buffer() -> LastUsedBuffer:
+    global _last_used_buffer
+    if _last_used_buffer is None:
+        with _last_used_lock:
+            if _last_used_buffer is None:
+                _last_used_buffer = LastUsedBuffer()
+                _last_used_buffer.start()
+    return _last_used_buffer
+
+
+def flush_last_used() -> int:
+    """Write any coalesced last_used_at stamps (no-op when nothing is pending)."""
+    if _last_used_buffer is None:
+        return 0
+    return _last_used_buffer.flush()
+
+
 # ---------------------------------------------------------------------------
 # Internal helpers
 # ---------------------------------------------------------------------------
 
+def _as_uuid(value) -> uuid.UUID:
+    return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+
+
 def _public_meta(record: "PlatformAPIKey") -> dict:
     return {
         "id": str(record.id),
@@ -10,32 +10,41 @@ Subscription matching:
   "execution.*"           â€” prefix wildcard (any event starting with "execution.")
   "*"                     â€” global wildcard (every event)
 
-Delivery:
-  - Dispatched in a background daemon thread â€” never blocks the event path.
-  - Up to 3 attempts with exponential back-off: 1 s â†’ 2 s â†’ 4 s.
-  - Per-attempt timeout: 10 seconds.
+Delivery (see webhook_delivery.py):
+  - Handed to the asyncio delivery engine â€” never blocks the event path.
+  - Pooled keep-alive connections with a per-host concurrency cap, so a slow
+    subscriber only delays its own deliveries.
+  - Up to AINDY_WEBHOOK_MAX_ATTEMPTS attempts with exponential back-off
+    (1 s â†’ 2 s â†’ ...) scheduled as timers, not sleeps.
+  - Per-attempt timeout: AINDY_WEBHOOK_TIMEOUT_SECONDS.
+  - Pending deliveries are kept in the webhook_deliveries outbox and are
+    retried after a restart.
   - Requests are HMAC-SHA256 signed when a secret is configured
     (X-AINDY-Signature: sha256=<hex>).
   - All delivery failures are logged and swallowed â€” a failing webhook
     never affects event persistence or the flow that emitted the event.
+  - Per-subscription latency and outcomes are exported as
+    aindy_webhook_delivery_duration_seconds / aindy_webhook_deliveries_total.
 
 Thread safety:
-  _webhook_lock protects writes to _SUBSCRIPTIONS.
-  ThreadPoolExecutor caps the maximum number of concurrent delivery threads.
+  _webhook_lock protects writes to _SUBSCRIPTIONS and _INTERNAL_HANDLERS.
+  Matching never takes the lock: both registries are compiled into an
+  immutable _DispatchIndex (exact dict + segment trie for "prefix.*"),
+  republished copy-on-write after any change, so the emit path costs
+  O(segments) regardless of how many patterns are registered.
 """
 from __future__ import annotations
 
-import hashlib
-import hmac
 import json
 import logging
 import threading
 import time
 import uuid
 import concurrent.futures as _futures
-from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Any, Callable
+from itertools import chain
+from operator import itemgetter
+from typing import Any, Callable, Iterable
 
 from sqlalchemy.orm import Session
 
@@ -53,18 +62,56 @@ logger = logging.getLogger(__name__)
 
 _webhook_lock = threading.Lock()
 
-# subscription_id â†’ metadata dict
-_SUBSCRIPTIONS: dict[str, dict[str, Any]] = {}
 
-_INTERNAL_HANDLERS: dict[str, list[Callable[[dict[str, Any]], Any]]] = {}
+class _VersionedRegistry(dict):
+    """dict that counts its mutations so compiled indexes can spot staleness."""
+
+    version = 0
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.version += 1
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.version += 1
+
+    def __ior__(self, other):
+        result = super().__ior__(other)
+        self.version += 1
+        return result
+
+    def pop(self, *args):
+        result = super().pop(*args)
+        self.version += 1
+        return result
+
+    def popitem(self):
+        result = super().popitem()
+        self.version += 1
+        return result
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self.version += 1
+        return super().setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.version += 1
 
-# Bounded pool â€” prevents thread explosion under bursts of events
-_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="aindy-webhook")
+    def clear(self):
+        super().clear()
+        self.version += 1
 
-# Delivery tuning
-_MAX_ATTEMPTS = 3
-_BASE_BACKOFF_SECONDS = 1.0   # doubles on each retry: 1 s, 2 s, 4 s
-_ATTEMPT_TIMEOUT = 10         # seconds per HTTP attempt
+
+# subscription_id â†’ metadata dict
+_SUBSCRIPTIONS: dict[str, dict[str, Any]] = _VersionedRegistry()
+
+_INTERNAL_HANDLERS: dict[str, list[Callable[[dict[str, Any]], Any]]] = _VersionedRegistry()
+
+# "handlers" / "webhooks" â†’ compiled _DispatchIndex currently published
+_INDEXES: dict[str, "_DispatchIndex"] = {}
 
 
 # ---------------------------------------------------------------------------
@@ -87,6 +134,109 @@ def _matches(pattern: str, event_type: str) -> bool:
     return pattern == event_type
 
 
+class _TrieNode:
+    __slots__ = ("items", "children")
+
+    def __init__(self) -> None:
+        self.items: Any = []
+        self.children: dict[str, _TrieNode] = {}
+
+    def freeze(self) -> None:
+        self.items = tuple(self.items)
+        for child in self.children.values():
+            child.freeze()
+
+
+class _DispatchIndex:
+    """
+    Immutable compiled form of a pattern registry, equivalent to _matches.
+
+    Exact patterns are looked up in a dict. "prefix.*" patterns sit on the
+    trie node for their prefix segments and "*" on the root, so an event
+    "a.b.c" collects the root, "a" and "a.b" nodes. Entries keep their
+    registration order, which is the order callers receive them in.
+    """
+
+    __slots__ = ("source", "version", "_exact", "_root")
+
+    def __init__(self, source: dict, version: int, entries: Iterable[tuple[str, Any]]):
+        self.source = source
+        self.version = version
+        exact: dict[str, list] = {}
+        root = _TrieNode()
+        for order, (pattern, value) in enumerate(entries):
+            item = (order, value)
+            if pattern == "*":
+                root.items.append(item)
+            elif pattern.endswith(".*"):
+                node = root
+                for segment in pattern[:-2].split("."):
+                    node = node.children.setdefault(segment, _TrieNode())
+                node.items.append(item)
+            else:
+                exact.setdefault(pattern, []).append(item)
+        root.freeze()
+        self._exact = {pattern: tuple(items) for pattern, items in exact.items()}
+        self._root = root
+
+    def match(self, event_type: str) -> list[Any]:
+        buckets = []
+        exact = self._exact.get(event_type)
+        if exact:
+            buckets.append(exact)
+        node = self._root
+        if node.items:
+            buckets.append(node.items)
+        for segment in event_type.split(".")[:-1]:
+            node = node.children.get(segment)
+            if node is None:
+                break
+            if node.items:
+                buckets.append(node.items)
+        if not buckets:
+            return []
+        if len(buckets) == 1:
+            return [value for _, value in buckets[0]]
+        return [value for _, value in sorted(chain.from_iterable(buckets), key=itemgetter(0))]
+
+
+def _current_index(
+    name: str,
+    source: dict,
+    entries: Callable[[], Iterable[tuple[str, Any]]],
+) -> _DispatchIndex:
+    """Return the compiled index for *source*, recompiling if it changed."""
+    index = _INDEXES.get(name)
+    if index is not None and index.source is source and index.version == getattr(source, "version", 0):
+        return index
+    with _webhook_lock:
+        index = _DispatchIndex(source, getattr(source, "version", 0), entries())
+        _INDEXES[name] = index
+    return index
+
+
+def _handler_index() -> _DispatchIndex:
+    handlers = _INTERNAL_HANDLERS
+    return _current_index(
+        "handlers",
+        handlers,
+        lambda: [
+            (pattern, handler)
+            for pattern, pattern_handlers in handlers.items()
+            for handler in pattern_handlers
+        ],
+    )
+
+
+def _webhook_index() -> _DispatchIndex:
+    subscriptions = _SUBSCRIPTIONS
+    return _current_index(
+        "webhooks",
+        subscriptions,
+        lambda: [(sub["event_type"], sub) for sub in subscriptions.values()],
+    )
+
+
 # ---------------------------------------------------------------------------
 # Internal event handlers
 # ---------------------------------------------------------------------------
@@ -104,6 +254,7 @@ def register_event_handler(
         handlers = _INTERNAL_HANDLERS.setdefault(event_type, [])
         if handler not in handlers:
             handlers.append(handler)
+            _INDEXES.pop("handlers", None)
 
 
 def dispatch_internal_event_handlers(
@@ -117,13 +268,7 @@ def dispatch_internal_event_handlers(
     source: str | None,
 ) -> int:
     """Dispatch a SystemEvent to registered in-process handlers."""
-    with _webhook_lock:
-        handlers = [
-            handler
-            for pattern, pattern_handlers in _INTERNAL_HANDLERS.items()
-            if _matches(pattern, event_type)
-            for handler in pattern_handlers
-        ]
+    handlers = _handler_index().match(event_type)
 
     if not handlers:
         return 0
@@ -434,80 +579,18 @@ def _build_request_body(
     return json.dumps(body, default=str).encode("utf-8")
 
 
-def _send_with_retry(
-    *,
-    subscription_id: str,
-    url: str,
-    body_bytes: bytes,
-    secret: str | None,
-    max_attempts: int,
-    timeout: int,
-) -> bool:
-    """
-    Attempt delivery up to max_attempts times with exponential back-off.
-
-    Returns True if any attempt succeeds (HTTP 2xx), False otherwise.
-    Never raises â€” all exceptions are caught and logged.
-    """
-    import urllib.error
-    import urllib.request
-
-    headers: dict[str, str] = {
-        "Content-Type": "application/json",
-        "User-Agent": "AINDY-EventDispatcher/1.0",
-    }
-    if secret:
-        sig = hmac.new(
-            secret.encode("utf-8"), body_bytes, hashlib.sha256
-        ).hexdigest()
-        headers["X-AINDY-Signature"] = f"sha256={sig}"
-
-    for attempt in range(1, max_attempts + 1):
-        try:
-            req = urllib.request.Request(
-                url, data=body_bytes, headers=headers, method="POST"
-            )
-            with urllib.request.urlopen(req, timeout=timeout) as resp:
-                status_code = resp.status
-            if 200 <= status_code < 300:
-                logger.debug(
-                    "webhook delivered: sub=%s attempt=%d status=%d",
-                    subscription_id, attempt, status_code,
-                )
-                return True
-            logger.warning(
-                "webhook non-2xx: sub=%s attempt=%d status=%d",
-                subscription_id, attempt, status_code,
-            )
-        except Exception as exc:
-            logger.warning(
-                "webhook error: sub=%s attempt=%d error=%s",
-                subscription_id, attempt, exc,
-            )
-
-        if attempt < max_attempts:
-            backoff = _BASE_BACKOFF_SECONDS * (2 ** (attempt - 1))
-            time.sleep(backoff)
-
-    return False
+def webhook_target(subscription_id: str) -> tuple[str, str | None] | None:
+    """Return (callback_url, secret) for a live subscription, or None."""
+    sub = _SUBSCRIPTIONS.get(subscription_id)
+    if sub is None:
+        return None
+    return sub["callback_url"], sub.get("_secret")
 
 
-def _deliver_one(
-    sub: dict[str, Any],
-    body_bytes: bytes,
-) -> None:
-    """Deliver to one subscription and update its stats in-place."""
-    sub_id = sub["id"]
-    success = _send_with_retry(
-        subscription_id=sub_id,
-        url=sub["callback_url"],
-        body_bytes=body_bytes,
-        secret=sub.get("_secret"),
-        max_attempts=_MAX_ATTEMPTS,
-        timeout=_ATTEMPT_TIMEOUT,
-    )
+def record_delivery_result(subscription_id: str, success: bool) -> None:
+    """Update a subscription's delivery stats once a delivery is final."""
     with _webhook_lock:
-        live = _SUBSCRIPTIONS.get(sub_id)
+        live = _SUBSCRIPTIONS.get(subscription_id)
         if live is None:
             return   # subscription was deleted while we were delivering
         live["delivery_attempts"] = (live.get("delivery_attempts") or 0) + 1
@@ -530,38 +613,41 @@ def dispatch_webhooks(
     source: str | None,
 ) -> int:
     """
-    Dispatch event to all matching subscriptions synchronously.
+    Queue event delivery to all matching subscriptions.
 
-    Returns the count of matching subscriptions dispatched to.
-    Each delivery runs its own retry loop; failures are isolated.
-    Intended to be called from a background thread â€” never call from the
-    hot request path directly.
+    Returns the count of matching subscriptions dispatched to. Delivery,
+    retries and outbox bookkeeping happen on the webhook delivery engine;
+    this call only serializes the bodies and hands them over.
     """
-    matches = [
-        sub for sub in list(_SUBSCRIPTIONS.values())
-        if _matches(sub["event_type"], event_type)
-    ]
+    from AINDY.platform_layer.webhook_delivery import (
+        PendingDelivery,
+        get_webhook_delivery_engine,
+    )
+
+    matches = _webhook_index().match(event_type)
     if not matches:
         return 0
 
-    for sub in matches:
-        body_bytes = _build_request_body(
-            event_type=event_type,
-            event_id=event_id,
-            payload=payload,
-            user_id=user_id,
-            trace_id=trace_id,
-            source=source,
+    deliveries = [
+        PendingDelivery(
             subscription_id=sub["id"],
+            url=sub["callback_url"],
+            secret=sub.get("_secret"),
+            body=_build_request_body(
+                event_type=event_type,
+                event_id=event_id,
+                payload=payload,
+                user_id=user_id,
+                trace_id=trace_id,
+                source=source,
+                subscription_id=sub["id"],
+            ),
+            event_type=event_type,
+            event_id=str(event_id) if event_id is not None else None,
         )
-        try:
-            _deliver_one(sub, body_bytes)
-        except Exception as exc:
-            logger.warning(
-                "webhook dispatch error: sub=%s event=%s error=%s",
-                sub["id"], event_type, exc,
-            )
-
+        for sub in matches
+    ]
+    get_webhook_delivery_engine().submit(deliveries)
     return len(matches)
 
 
@@ -575,7 +661,7 @@ def dispatch_webhooks_async(
     source: str | None,
 ) -> None:
     """
-    Fire-and-forget: submit webhook dispatches to the background thread pool.
+    Fire-and-forget: queue webhook deliveries on the delivery engine.
 
     Returns immediately â€” caller is never blocked by delivery.
     """
@@ -583,8 +669,7 @@ def dispatch_webhooks_async(
         return   # fast path: no subscriptions registered
 
     try:
-        _executor.submit(
-            dispatch_webhooks,
+        dispatch_webhooks(
             event_type=event_type,
             event_id=event_id,
             payload=payload or {},
@@ -592,8 +677,5 @@ def dispatch_webhooks_async(
             trace_id=trace_id,
             source=source,
         )
-    except RuntimeError:
-        # Executor was shut down (e.g. during test teardown) â€” log and skip
-        logger.debug("webhook executor shut down; skipping dispatch for %s", event_type)
     except Exception as exc:
         logger.warning("webhook async submit failed: %s", exc)
@@ -1,11 +1,40 @@
+"""
+Wrapper for every outbound provider call (OpenAI, DeepSeek, HTTP APIs).
+
+``perform_external_call`` runs the caller's ``operation`` and records
+``external.call.*`` telemetry. Callers that pass a ``dedupe_key`` (see
+``external_call_key``) also get:
+
+- singleflight: concurrent calls with the same service and key share one
+  provider request; waiters receive the leader's response or exception;
+- an optional response cache (``cache=True``, meant for deterministic
+  temperature-0 completions), an in-process LRU bounded by
+  ``AINDY_EXTERNAL_CALL_CACHE_MAX_ENTRIES`` with a per-entry TTL of
+  ``AINDY_EXTERNAL_CALL_CACHE_TTL_SECONDS``. Responses are SDK objects and
+  are shared, not copied, so callers must treat them as read-only.
+
+Telemetry events are required, as every SystemEvent used to be, unless the
+SystemEvent write-behind buffer is enabled. With the buffer on they are
+emitted with ``required=AINDY_EXTERNAL_CALL_EVENTS_REQUIRED`` (off by
+default) so they can be batched, and no session is opened for callers
+without one. Counts and latencies are always recorded in Prometheus.
+"""
 from __future__ import annotations
 
+import hashlib
+import json
+import logging
+import threading
 import time
+from collections import OrderedDict
 from typing import Any, Callable
 
+from AINDY.config import settings
 from AINDY.core.system_event_service import emit_error_event, emit_system_event
 from AINDY.platform_layer.trace_context import get_current_trace_id
 
+logger = logging.getLogger(__name__)
+
 
 def external_metadata(
     *,
@@ -32,6 +61,132 @@ def external_metadata(
     return payload
 
 
+def external_call_key(**request: Any) -> str:
+    """SHA-256 of a request's parameters (model, messages, temperature, ...)."""
+    encoded = json.dumps(request, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class _InFlightCall:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Runs one operation per key at a time; concurrent callers share its outcome."""
+
+    def __init__(self) -> None:
+        self._calls: dict[str, _InFlightCall] = {}
+        self._lock = threading.Lock()
+
+    def begin(self, key: str) -> tuple[_InFlightCall, bool]:
+        """Return ``(call, is_leader)``; the leader must call ``finish``."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                return call, False
+            call = self._calls[key] = _InFlightCall()
+            return call, True
+
+    def finish(self, key: str, call: _InFlightCall, *, result: Any = None, error: BaseException | None = None) -> None:
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+        call.result = result
+        call.error = error
+        call.done.set()
+
+    @staticmethod
+    def wait(call: _InFlightCall) -> Any:
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+class ExternalCallCache:
+    """Entry-bounded LRU of provider responses with a per-entry TTL."""
+
+    def __init__(self, *, max_entries: int | None = None, ttl_seconds: float | None = None):
+        self.max_entries = int(
+            max_entries if max_entries is not None else settings.AINDY_EXTERNAL_CALL_CACHE_MAX_ENTRIES
+        )
+        self.ttl_seconds = float(
+            ttl_seconds if ttl_seconds is not None else settings.AINDY_EXTERNAL_CALL_CACHE_TTL_SECONDS
+        )
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """Return ``(hit, response)``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, response = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, response
+
+    def put(self, key: str, response: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries)}
+
+
+_SINGLE_FLIGHT = SingleFlight()
+_CALL_CACHE: ExternalCallCache | None = None
+_CALL_CACHE_LOCK = threading.Lock()
+
+
+def get_external_call_cache() -> ExternalCallCache:
+    """Return the process-wide ExternalCallCache."""
+    global _CALL_CACHE
+    if _CALL_CACHE is None:
+        with _CALL_CACHE_LOCK:
+            if _CALL_CACHE is None:
+                _CALL_CACHE = ExternalCallCache()
+    return _CALL_CACHE
+
+
+def _record_call(service_name: str, outcome: str, latency_ms: float | None = None) -> None:
+    try:
+        from AINDY.platform_layer.metrics import (
+            external_call_duration_seconds,
+            external_call_total,
+        )
+
+        external_call_total.labels(service=service_name, outcome=outcome).inc()
+        if latency_ms is not None:
+            external_call_duration_seconds.labels(service=service_name).observe(latency_ms / 1000.0)
+    except Exception:
+        pass
+
+
 def perform_external_call(
     *,
     service_name: str,
@@ -42,71 +197,80 @@ def perform_external_call(
     model: str | None = None,
     method: str | None = None,
     extra: dict[str, Any] | None = None,
+    dedupe_key: str | None = None,
+    cache: bool = False,
 ):
+    from AINDY.core.system_event_buffer import write_behind_enabled
     from AINDY.db.database import SessionLocal
 
-    owned_db = db is None
-    active_db = db or SessionLocal()
+    required = bool(settings.AINDY_EXTERNAL_CALL_EVENTS_REQUIRED) or not write_behind_enabled()
+    owned_db = db is None and required
+    active_db = SessionLocal() if owned_db else db
     trace_id = get_current_trace_id()
-    started_payload = external_metadata(
-        service_name=service_name,
-        endpoint=endpoint,
-        model=model,
-        method=method,
-        status="started",
-        extra=extra,
-    )
-    emit_system_event(
-        db=active_db,
-        event_type="external.call.started",
-        user_id=user_id,
-        trace_id=trace_id,
-        payload=started_payload,
-        required=True,
-    )
 
-    started_at = time.perf_counter()
-    try:
-        result = operation()
-        latency_ms = round((time.perf_counter() - started_at) * 1000, 2)
-        completed_payload = external_metadata(
-            service_name=service_name,
-            endpoint=endpoint,
-            model=model,
-            method=method,
-            status="success",
-            latency_ms=latency_ms,
-            extra=extra,
-        )
+    def _emit(event_type: str, payload: dict[str, Any]) -> None:
         emit_system_event(
             db=active_db,
-            event_type="external.call.completed",
+            event_type=event_type,
             user_id=user_id,
             trace_id=trace_id,
-            payload=completed_payload,
-            required=True,
+            payload=payload,
+            required=required,
         )
-        return result
-    except Exception as exc:
-        latency_ms = round((time.perf_counter() - started_at) * 1000, 2)
-        failed_payload = external_metadata(
+
+    def _metadata(**fields) -> dict[str, Any]:
+        return external_metadata(
             service_name=service_name,
             endpoint=endpoint,
             model=model,
             method=method,
-            status="failure",
-            latency_ms=latency_ms,
-            error=str(exc),
             extra=extra,
+            **fields,
         )
-        emit_system_event(
-            db=active_db,
-            event_type="external.call.failed",
-            user_id=user_id,
-            trace_id=trace_id,
-            payload=failed_payload,
-            required=True,
-        )
+
+    flight_key = f"{service_name}:{dedupe_key}" if dedupe_key else None
+    use_cache = bool(flight_key and cache and settings.AINDY_EXTERNAL_CALL_CACHE_ENABLED)
+    started_at = time.perf_counter()
+    try:
+        if use_cache:
+            hit, response = get_external_call_cache().get(flight_key)
+            if hit:
+                latency_ms = round((time.perf_counter() - started_at) * 1000, 2)
+                _record_call(service_name, "cache_hit", latency_ms)
+                _emit("external.call.completed", _metadata(status="cache_hit", latency_ms=latency_ms))
+                return response
+
+        flight, leader = (None, True)
+        if flight_key and settings.AINDY_EXTERNAL_CALL_SINGLEFLIGHT:
+            flight, leader = _SINGLE_FLIGHT.begin(flight_key)
+        if not leader:
+            result = SingleFlight.wait(flight)
+            latency_ms = round((time.perf_counter() - started_at) * 1000, 2)
+            _record_call(service_name, "coalesced", latency_ms)
+            _emit("external.call.completed", _metadata(status="coalesced", latency_ms=latency_ms))
+            return result
+
+        try:
+            _emit("external.call.started", _metadata(status="started"))
+            result = operation()
+        except BaseException as exc:
+            if flight is not None:
+                _SINGLE_FLIGHT.finish(flight_key, flight, error=exc)
+            raise
+        if use_cache:
+            get_external_call_cache().put(flight_key, result)
+        if flight is not None:
+            _SINGLE_FLIGHT.finish(flight_key, flight, result=result)
+
+        latency_ms = round((time.perf_counter() - started_at) * 1000, 2)
+        _record_call(service_name, "success", latency_ms)
+        _emit("external.call.completed", _metadata(status="success", latency_ms=latency_ms))
+        return result
+    except Exception as exc:
+        latency_ms = round((time.perf_counter() - started_at) * 1000, 2)
+        failed_payload = _metadata(status="failure", latency_ms=latency_ms, error=str(exc))
+        _record_call(service_name, "failure", latency_ms)
+        _emit("external.call.failed", failed_payload)
         emit_error_event(
             db=active_db,
             error_type="external_call",
@@ -114,10 +278,9 @@ def perform_external_call(
             user_id=user_id,
             trace_id=trace_id,
             payload=failed_payload,
-            required=True,
+            required=required,
         )
         raise
     finally:
         if owned_db:
             active_db.close()
-
@@ -338,3 +338,131 @@ infinity_score_write_failures_total = Counter(
     ["reason"],
     registry=REGISTRY,
 )
+
+query_embedding_cache_hits_total = Counter(
+    "aindy_query_embedding_cache_hits_total",
+    "Query embeddings served from cache, by tier",
+    ["tier"],  # memory | redis
+    registry=REGISTRY,
+)
+
+query_embedding_cache_misses_total = Counter(
+    "aindy_query_embedding_cache_misses_total",
+    "Query embeddings not found in any cache tier",
+    registry=REGISTRY,
+)
+
+query_embedding_cache_evictions_total = Counter(
+    "aindy_query_embedding_cache_evictions_total",
+    "Query embeddings dropped from the in-process cache",
+    ["reason"],  # capacity | expired
+    registry=REGISTRY,
+)
+
+query_embedding_cache_bytes = Gauge(
+    "aindy_query_embedding_cache_bytes",
+    "Bytes held by the in-process query embedding cache",
+    registry=REGISTRY,
+)
+
+external_call_total = Counter(
+    "aindy_external_call_total",
+    "Outbound provider calls by service and outcome",
+    ["service", "outcome"],  # success | failure | cache_hit | coalesced
+    registry=REGISTRY,
+)
+
+external_call_duration_seconds = Histogram(
+    "aindy_external_call_duration_seconds",
+    "Outbound provider call latency as seen by the caller, in seconds",
+    ["service"],
+    buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0],
+    registry=REGISTRY,
+)
+
+system_event_buffer_depth = Gauge(
+    "aindy_system_event_buffer_depth",
+    "SystemEvents waiting in the write-behind buffer",
+    registry=REGISTRY,
+)
+
+system_event_buffer_flushed_total = Counter(
+    "aindy_system_event_buffer_flushed_total",
+    "SystemEvents written by the write-behind buffer",
+    ["mode"],  # batch | individual
+    registry=REGISTRY,
+)
+
+system_event_buffer_dropped_total = Counter(
+    "aindy_system_event_buffer_dropped_total",
+    "Buffered SystemEvents that could not be written",
+    registry=REGISTRY,
+)
+
+pipeline_handler_inflight = Gauge(
+    "aindy_pipeline_handler_inflight",
+    "Pipeline handler bodies running on the handler executor",
+    registry=REGISTRY,
+)
+
+pipeline_handler_queue_wait_seconds = Histogram(
+    "aindy_pipeline_handler_queue_wait_seconds",
+    "Time a pipeline handler waited for a handler executor thread",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+    registry=REGISTRY,
+)
+
+nodus_worker_recycled_total = Counter(
+    "aindy_nodus_worker_recycled_total",
+    "Pooled Nodus worker processes retired",
+    ["reason"],  # max_executions | memory | timeout | error | died
+    registry=REGISTRY,
+)
+
+read_only_executions_total = Counter(
+    "aindy_read_only_executions_total",
+    "Read-only pipeline executions by persistence outcome",
+    ["route", "persisted"],  # persisted: none | sampled | error
+    registry=REGISTRY,
+)
+
+quota_lease_requests_total = Counter(
+    "aindy_quota_lease_requests_total",
+    "Quota budget slices requested from Redis",
+    ["resource", "outcome"],  # resource: cpu_ms | syscalls; outcome: granted | exhausted
+    registry=REGISTRY,
+)
+
+auth_principal_cache_requests_total = Counter(
+    "aindy_auth_principal_cache_requests_total",
+    "Authenticated principal cache lookups",
+    ["kind", "outcome"],  # kind: api_key | api_key_user | user; outcome: hit | miss
+    registry=REGISTRY,
+)
+
+api_key_last_used_flushed_total = Counter(
+    "aindy_api_key_last_used_flushed_total",
+    "Coalesced API key last_used_at stamps written by bulk UPDATE",
+    registry=REGISTRY,
+)
+
+webhook_deliveries_total = Counter(
+    "aindy_webhook_deliveries_total",
+    "Webhook delivery attempts by subscription and outcome",
+    ["subscription_id", "outcome"],  # success | retry | failed
+    registry=REGISTRY,
+)
+
+webhook_delivery_duration_seconds = Histogram(
+    "aindy_webhook_delivery_duration_seconds",
+    "Webhook HTTP attempt latency by subscription",
+    ["subscription_id"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+    registry=REGISTRY,
+)
+
+webhook_deliveries_inflight = Gauge(
+    "aindy_webhook_deliveries_inflight",
+    "Webhook deliveries scheduled or in flight on this instance",
+    registry=REGISTRY,
+)
@@ -207,6 +207,16 @@ def _register_system_jobs(scheduler: BackgroundScheduler) -> None:
         replace_existing=True,
     )
 
+    scheduler.add_job(
+        _prune_request_metrics,
+        trigger=IntervalTrigger(hours=1),
+        id="prune_request_metrics",
+        name="Prune request metrics past retention",
+        replace_existing=True,
+        coalesce=True,
+        max_instances=1,
+    )
+
     scheduler.add_job(
         _process_deferred_async_jobs,
         trigger=IntervalTrigger(minutes=1),
@@ -364,6 +374,35 @@ def _cleanup_stale_logs() -> None:
         logger.warning("Stale log cleanup failed: %s", exc)
 
 
+def _prune_request_metrics() -> None:
+    """Drop request metric rows and rollups past their retention windows."""
+    from AINDY.config import settings
+
+    if (
+        settings.AINDY_REQUEST_METRIC_RETENTION_HOURS <= 0
+        and settings.AINDY_REQUEST_METRIC_ROLLUP_RETENTION_DAYS <= 0
+    ):
+        return
+    db = None
+    try:
+        from AINDY.core.request_metric_rollups import prune_request_metrics
+        from AINDY.db.database import SessionLocal
+
+        db = SessionLocal()
+        result = prune_request_metrics(db)
+        if result["raw_deleted"] or result["rollups_deleted"]:
+            logger.info(
+                "Pruned %d request metrics and %d rollups",
+                result["raw_deleted"],
+                result["rollups_deleted"],
+            )
+    except Exception as exc:
+        logger.warning("Request metric pruning failed: %s", exc)
+    finally:
+        if db is not None:
+            db.close()
+
+
 
 
 # Job execution
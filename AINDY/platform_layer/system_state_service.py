@@ -13,6 +13,7 @@ from AINDY.db.models.request_metric import RequestMetric
 from AINDY.db.models.system_event import SystemEvent
 from AINDY.db.models.system_health_log import SystemHealthLog
 from AINDY.db.models.system_state_snapshot import SystemStateSnapshot
+from AINDY.platform_layer.system_state_window import get_system_state_window
 
 logger = logging.getLogger(__name__)
 
@@ -38,17 +39,43 @@ def compute_current_state(db, *, force_refresh: bool = False, persist_snapshot:
 
     window_start = now - timedelta(hours=1)
     previous_window_start = now - timedelta(hours=2)
-    recent_events = (
-        db.query(SystemEvent)
-        .filter(SystemEvent.timestamp >= window_start)
-        .order_by(SystemEvent.timestamp.desc())
-        .all()
-    )
-    previous_event_count = (
-        db.query(SystemEvent)
-        .filter(SystemEvent.timestamp >= previous_window_start, SystemEvent.timestamp < window_start)
-        .count()
-    )
+    window = get_system_state_window()
+    if window is not None:
+        # Streaming aggregates: O(buckets), plus the 20 newest events for display.
+        summary = window.summary(db)
+        event_counts = summary["event_counts"]
+        recent_event_count = summary["event_total"]
+        previous_event_count = summary["previous_event_total"]
+        avg_request_duration = summary["avg_request_ms"]
+        request_p95_ms = summary["request_p95_ms"]
+        recent_events = (
+            db.query(SystemEvent)
+            .filter(SystemEvent.timestamp >= window_start)
+            .order_by(SystemEvent.timestamp.desc())
+            .limit(20)
+            .all()
+        )
+    else:
+        recent_events = (
+            db.query(SystemEvent)
+            .filter(SystemEvent.timestamp >= window_start)
+            .order_by(SystemEvent.timestamp.desc())
+            .all()
+        )
+        previous_event_count = (
+            db.query(SystemEvent)
+            .filter(SystemEvent.timestamp >= previous_window_start, SystemEvent.timestamp < window_start)
+            .count()
+        )
+        event_counts = Counter(event.type for event in recent_events)
+        recent_event_count = len(recent_events)
+        request_metrics = (
+            db.query(RequestMetric)
+            .filter(RequestMetric.created_at >= window_start.replace(tzinfo=None))
+            .all()
+        )
+        avg_request_duration = _avg([row.duration_ms for row in request_metrics])
+        request_p95_ms = None
 
     active_flow_runs = (
         db.query(FlowRun)
@@ -69,16 +96,11 @@ def compute_current_state(db, *, force_refresh: bool = False, persist_snapshot:
     )
     active_runs = active_flow_runs + active_agent_runs
 
-    request_metrics = (
-        db.query(RequestMetric)
-        .filter(RequestMetric.created_at >= window_start.replace(tzinfo=None))
-        .all()
-    )
-    avg_request_duration = _avg([row.duration_ms for row in request_metrics])
-
     flow_durations = [
-        _duration_ms(row.created_at, row.completed_at or row.updated_at)
-        for row in db.query(FlowRun).filter(FlowRun.created_at >= window_start).all()
+        _duration_ms(created_at, completed_at or updated_at)
+        for created_at, completed_at, updated_at in db.query(
+            FlowRun.created_at, FlowRun.completed_at, FlowRun.updated_at
+        ).filter(FlowRun.created_at >= window_start)
     ]
     _agent_dur_result = dispatch_syscall(
         "sys.v1.agent.list_recent_durations",
@@ -102,18 +124,17 @@ def compute_current_state(db, *, force_refresh: bool = False, persist_snapshot:
     ]
     avg_execution_time = round(_avg(flow_durations + agent_durations + [avg_request_duration]), 2)
 
-    failure_events = [
-        event for event in recent_events
-        if ".failed" in event.type or event.type.startswith("error.")
-    ]
-    failure_rate = round(len(failure_events) / max(1, len(recent_events)), 4)
+    failure_counts = Counter(
+        {event_type: count for event_type, count in event_counts.items() if _is_failure_type(event_type)}
+    )
+    failure_rate = round(sum(failure_counts.values()) / max(1, recent_event_count), 4)
 
     dominant_event_types = [
         {"type": event_type, "count": count}
-        for event_type, count in Counter(event.type for event in recent_events).most_common(5)
+        for event_type, count in event_counts.most_common(5)
     ]
-    repeated_failures = _count_repeated_failures(failure_events)
-    spike_detected = int(len(recent_events) > max(previous_event_count * 1.5, 25))
+    repeated_failures = _count_repeated_failures(failure_counts)
+    spike_detected = int(recent_event_count > max(previous_event_count * 1.5, 25))
     unusual_patterns = _detect_unusual_patterns(
         repeated_failures=repeated_failures,
         spike_detected=bool(spike_detected),
@@ -125,7 +146,7 @@ def compute_current_state(db, *, force_refresh: bool = False, persist_snapshot:
             1.0,
             (active_runs / 12.0) * 0.4
             + min(1.0, avg_execution_time / 5000.0) * 0.35
-            + min(1.0, len(recent_events) / 150.0) * 0.25,
+            + min(1.0, recent_event_count / 150.0) * 0.25,
         ),
         4,
     )
@@ -143,7 +164,7 @@ def compute_current_state(db, *, force_refresh: bool = False, persist_snapshot:
         "active_runs": active_runs,
         "failure_rate": failure_rate,
         "avg_execution_time": avg_execution_time,
-        "recent_event_count": len(recent_events),
+        "recent_event_count": recent_event_count,
         "system_load": system_load,
         "dominant_event_types": dominant_event_types,
         "health_status": health_status,
@@ -152,6 +173,8 @@ def compute_current_state(db, *, force_refresh: bool = False, persist_snapshot:
         "spike_detected": bool(spike_detected),
         "unusual_patterns": unusual_patterns,
     }
+    if request_p95_ms is not None:
+        snapshot["request_p95_ms"] = request_p95_ms
 
     _STATE_CACHE["value"] = snapshot
     _STATE_CACHE["expires_at"] = now + timedelta(seconds=_CACHE_TTL_SECONDS)
@@ -202,9 +225,12 @@ def _classify_health(
     return "healthy"
 
 
-def _count_repeated_failures(failure_events: list[SystemEvent]) -> int:
-    counts = Counter(event.type for event in failure_events)
-    return sum(count for count in counts.values() if count >= 3)
+def _is_failure_type(event_type: str) -> bool:
+    return ".failed" in event_type or event_type.startswith("error.")
+
+
+def _count_repeated_failures(failure_counts: Counter[str]) -> int:
+    return sum(count for count in failure_counts.values() if count >= 3)
 
 
 def _detect_unusual_patterns(
@@ -0,0 +1,372 @@
+"""
+Rolling per-minute aggregates behind ``compute_current_state``.
+
+``compute_current_state`` used to load every SystemEvent and RequestMetric
+row from the last hour on each refresh. With AINDY_SYSTEM_STATE_STREAMING
+enabled, ``emit_system_event`` and the request metric writer feed this
+window instead, and a refresh reads at most 120 one-minute buckets:
+
+  events      count per event type
+  requests    count, latency sum and a fixed-bound latency histogram
+
+Buckets older than two hours are dropped (the previous hour backs spike
+detection). On first read the window seeds itself once from the database,
+counting only rows written before it started streaming, so a restarted
+process does not report an empty hour.
+
+In-process buckets only see this process's writes. For multi-worker
+deployments set AINDY_SYSTEM_STATE_STREAMING_REDIS: every process then also
+writes its increments to per-minute Redis hashes (``aindy:sysstate:<minute>``)
+and reads the combined window from there, falling back to the local buckets
+when Redis is unavailable. ``aindy:sysstate:meta`` records when the shared
+window started streaming and whether it was seeded; it expires with the
+buckets, so only one process seeds it, and only with rows no process
+streamed.
+"""
+from __future__ import annotations
+
+import bisect
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Iterable
+
+from AINDY.config import settings
+
+logger = logging.getLogger(__name__)
+
+BUCKET_SECONDS = 60
+WINDOW_BUCKETS = 60
+RETAINED_BUCKETS = 2 * WINDOW_BUCKETS
+# Upper bounds (ms) of the request latency histogram; the last bucket is open.
+LATENCY_BOUNDS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+_REDIS_PREFIX = "aindy:sysstate:"
+_REDIS_META_KEY = "aindy:sysstate:meta"
+_REDIS_TTL_SECONDS = (RETAINED_BUCKETS + 5) * BUCKET_SECONDS
+
+
+def _epoch(value: datetime | None) -> float | None:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class _Bucket:
+    __slots__ = ("events", "requests", "request_ms", "histogram")
+
+    def __init__(self) -> None:
+        self.events: Counter[str] = Counter()
+        self.requests = 0
+        self.request_ms = 0.0
+        self.histogram = [0] * (len(LATENCY_BOUNDS_MS) + 1)
+
+
+class SystemStateWindow:
+    """Per-minute event and request aggregates over the last two hours."""
+
+    _REDIS_CHECK_INTERVAL = 30.0
+
+    def __init__(self, *, redis_enabled: bool | None = None, clock=time.time):
+        self.redis_enabled = bool(
+            redis_enabled if redis_enabled is not None else settings.AINDY_SYSTEM_STATE_STREAMING_REDIS
+        )
+        self._clock = clock
+        self._buckets: dict[int, _Bucket] = {}
+        self._lock = threading.Lock()
+        self.started_at = clock()
+        self._seeded = False
+        self._redis = None
+        self._redis_last_check = float("-inf")
+
+    # -- Recording ---------------------------------------------------------
+
+    def _bucket(self, minute: int) -> _Bucket:
+        bucket = self._buckets.get(minute)
+        if bucket is None:
+            bucket = self._buckets[minute] = _Bucket()
+            floor = minute - RETAINED_BUCKETS
+            for stale in [key for key in self._buckets if key <= floor]:
+                del self._buckets[stale]
+        return bucket
+
+    def record_event(self, event_type: str, at: float | None = None) -> None:
+        minute = int((at if at is not None else self._clock()) // BUCKET_SECONDS)
+        with self._lock:
+            self._bucket(minute).events[event_type] += 1
+        self._redis_incr(minute, {f"e:{event_type}": 1})
+
+    def record_requests(self, durations: Iterable[tuple[float, float]]) -> None:
+        """Record ``(epoch_seconds, duration_ms)`` pairs."""
+        increments: dict[int, dict[str, float]] = {}
+        with self._lock:
+            for at, duration_ms in durations:
+                minute = int(at // BUCKET_SECONDS)
+                slot = latency_slot(duration_ms)
+                bucket = self._bucket(minute)
+                bucket.requests += 1
+                bucket.request_ms += float(duration_ms)
+                bucket.histogram[slot] += 1
+                fields = increments.setdefault(minute, {})
+                fields["r:n"] = fields.get("r:n", 0) + 1
+                fields["r:ms"] = fields.get("r:ms", 0.0) + float(duration_ms)
+                fields[f"h:{slot}"] = fields.get(f"h:{slot}", 0) + 1
+        for minute, fields in increments.items():
+            self._redis_incr(minute, fields)
+
+    # -- Reading -----------------------------------------------------------
+
+    def summary(self, db=None) -> dict[str, Any]:
+        """Aggregates for the last hour and the hour before it."""
+        if db is not None and not self._seeded:
+            self.seed(db)
+        now_minute = int(self._clock() // BUCKET_SECONDS)
+        minutes = range(now_minute - RETAINED_BUCKETS + 1, now_minute + 1)
+        buckets = self._redis_read(minutes)
+        if buckets is None:
+            with self._lock:
+                buckets = {
+                    minute: self._buckets[minute] for minute in minutes if minute in self._buckets
+                }
+                return self._summarize(buckets, now_minute)
+        return self._summarize(buckets, now_minute)
+
+    @staticmethod
+    def _summarize(buckets: dict[int, _Bucket], now_minute: int) -> dict[str, Any]:
+        window_floor = now_minute - WINDOW_BUCKETS
+        events: Counter[str] = Counter()
+        previous_events = 0
+        requests = 0
+        request_ms = 0.0
+        histogram = [0] * (len(LATENCY_BOUNDS_MS) + 1)
+        for minute, bucket in buckets.items():
+            if minute <= window_floor:
+                previous_events += sum(bucket.events.values())
+                continue
+            events.update(bucket.events)
+            requests += bucket.requests
+            request_ms += bucket.request_ms
+            for slot, count in enumerate(bucket.histogram):
+                histogram[slot] += count
+        return {
+            "event_counts": events,
+            "event_total": sum(events.values()),
+            "previous_event_total": previous_events,
+            "request_count": requests,
+            "avg_request_ms": request_ms / requests if requests else 0.0,
+            "request_p95_ms": histogram_quantile(histogram, 0.95),
+        }
+
+    # -- Seeding -----------------------------------------------------------
+
+    def seed(self, db) -> None:
+        """Backfill the window once from rows written before streaming began."""
+        with self._lock:
+            if self._seeded:
+                return
+            self._seeded = True
+        streaming_since = self._redis_claim_seed()
+        if streaming_since is None:
+            return
+        from AINDY.db.models.request_metric import RequestMetric
+        from AINDY.db.models.system_event import SystemEvent
+
+        started = datetime.fromtimestamp(streaming_since, tz=timezone.utc)
+        floor = datetime.fromtimestamp(
+            (int(streaming_since // BUCKET_SECONDS) - RETAINED_BUCKETS + 1) * BUCKET_SECONDS,
+            tz=timezone.utc,
+        )
+        try:
+            rows = (
+                db.query(SystemEvent.timestamp, SystemEvent.type)
+                .filter(SystemEvent.timestamp >= floor, SystemEvent.timestamp < started)
+                .yield_per(5000)
+            )
+            per_minute: dict[int, Counter[str]] = {}
+            for timestamp, event_type in rows:
+                minute = int(_epoch(timestamp) // BUCKET_SECONDS)
+                per_minute.setdefault(minute, Counter())[event_type] += 1
+            for minute, counts in per_minute.items():
+                with self._lock:
+                    self._bucket(minute).events.update(counts)
+                self._redis_incr(minute, {f"e:{event_type}": count for event_type, count in counts.items()})
+            request_rows = (
+                db.query(RequestMetric.created_at, RequestMetric.duration_ms)
+                .filter(
+                    RequestMetric.created_at >= floor.replace(tzinfo=None),
+                    RequestMetric.created_at < started.replace(tzinfo=None),
+                )
+                .yield_per(5000)
+            )
+            self.record_requests(
+                [(_epoch(created_at), float(duration_ms or 0.0)) for created_at, duration_ms in request_rows]
+            )
+        except Exception as exc:
+            logger.warning("[SystemStateWindow] seed from database failed: %s", exc)
+
+    # -- Redis tier --------------------------------------------------------
+
+    def _get_redis(self):
+        if not self.redis_enabled:
+            return None
+        now = time.monotonic()
+        if (now - self._redis_last_check) <= self._REDIS_CHECK_INTERVAL:
+            return self._redis
+        self._redis_last_check = now
+        redis_url = settings.REDIS_URL or os.getenv("REDIS_URL")
+        if not redis_url:
+            self._redis = None
+            return None
+        try:
+            import redis as _redis_lib
+
+            self._redis = _redis_lib.from_url(
+                redis_url,
+                socket_connect_timeout=1,
+                socket_timeout=1,
+            )
+        except Exception as exc:
+            logger.warning("[SystemStateWindow] Redis tier unavailable: %s", exc)
+            self._redis = None
+        return self._redis
+
+    def _redis_incr(self, minute: int, fields: dict[str, float]) -> None:
+        client = self._get_redis()
+        if client is None:
+            return
+        key = f"{_REDIS_PREFIX}{minute}"
+        try:
+            pipe = client.pipeline(transaction=False)
+            for field, amount in fields.items():
+                if isinstance(amount, float):
+                    pipe.hincrbyfloat(key, field, amount)
+                else:
+                    pipe.hincrby(key, field, amount)
+            pipe.expire(key, _REDIS_TTL_SECONDS)
+            # Rows before the first streamed bucket are left to the seed.
+            pipe.hsetnx(_REDIS_META_KEY, "since", minute * BUCKET_SECONDS)
+            pipe.expire(_REDIS_META_KEY, _REDIS_TTL_SECONDS)
+            pipe.execute()
+        except Exception as exc:
+            logger.warning("[SystemStateWindow] Redis increment failed: %s", exc)
+            self._redis = None
+
+    def _redis_read(self, minutes: range) -> dict[int, _Bucket] | None:
+        client = self._get_redis()
+        if client is None:
+            return None
+        try:
+            pipe = client.pipeline(transaction=False)
+            for minute in minutes:
+                pipe.hgetall(f"{_REDIS_PREFIX}{minute}")
+            raw_buckets = pipe.execute()
+        except Exception as exc:
+            logger.warning("[SystemStateWindow] Redis read failed: %s", exc)
+            self._redis = None
+            return None
+        buckets: dict[int, _Bucket] = {}
+        for minute, raw in zip(minutes, raw_buckets):
+            if not raw:
+                continue
+            bucket = buckets[minute] = _Bucket()
+            for field, value in raw.items():
+                field = field.decode() if isinstance(field, bytes) else field
+                kind, _, name = field.partition(":")
+                if kind == "e":
+                    bucket.events[name] = int(value)
+                elif field == "r:n":
+                    bucket.requests = int(value)
+                elif field == "r:ms":
+                    bucket.request_ms = float(value)
+                elif kind == "h":
+                    bucket.histogram[int(name)] = int(value)
+        return buckets
+
+    def _redis_claim_seed(self) -> float | None:
+        """Claim the seed; return the time before which rows need seeding.
+
+        Local-only windows always seed up to their own start. The shared
+        window is seeded once, by the first claimant, up to the time any
+        process first streamed into it; everything later is already in the
+        Redis buckets. None means another process has seeded it.
+        """
+        client = self._get_redis()
+        if client is None:
+            return self.started_at
+        try:
+            pipe = client.pipeline(transaction=True)
+            pipe.hsetnx(_REDIS_META_KEY, "since", self.started_at)
+            pipe.hsetnx(_REDIS_META_KEY, "seeded", 1)
+            pipe.hget(_REDIS_META_KEY, "since")
+            pipe.expire(_REDIS_META_KEY, _REDIS_TTL_SECONDS)
+            _, claimed, since, _ = pipe.execute()
+        except Exception as exc:
+            logger.warning("[SystemStateWindow] Redis seed claim failed: %s", exc)
+            return self.started_at
+        if not claimed:
+            return None
+        return min(float(since), self.started_at)
+
+
+def latency_slot(duration_ms: float) -> int:
+    """Index of the LATENCY_BOUNDS_MS histogram bucket holding *duration_ms*."""
+    return bisect.bisect_left(LATENCY_BOUNDS_MS, duration_ms)
+
+
+def histogram_quantile(histogram: list[int], q: float) -> float:
+    """Upper bound of the bucket holding quantile *q* (the last bound if open-ended)."""
+    total = sum(histogram)
+    if not total:
+        return 0.0
+    target = q * total
+    running = 0
+    for slot, count in enumerate(histogram):
+        running += count
+        if running >= target:
+            return float(LATENCY_BOUNDS_MS[min(slot, len(LATENCY_BOUNDS_MS) - 1)])
+    return float(LATENCY_BOUNDS_MS[-1])
+
+
+_window: SystemStateWindow | None = None
+_window_lock = threading.Lock()
+
+
+def get_system_state_window() -> SystemStateWindow | None:
+    """Return the process-wide window, or None when streaming is disabled."""
+    global _window
+    if not settings.AINDY_SYSTEM_STATE_STREAMING:
+        return None
+    if _window is None:
+        with _window_lock:
+            if _window is None:
+                _window = SystemStateWindow()
+    return _window
+
+
+def reset_system_state_window() -> None:
+    global _window
+    with _window_lock:
+        _window = None
+
+
+def record_system_event(event_type: str) -> None:
+    window = get_system_state_window()
+    if window is not None:
+        window.record_event(event_type)
+
+
+def record_request_metrics(metrics: Iterable[Any]) -> None:
+    """Feed persisted request metrics (anything with created_at/duration_ms)."""
+    window = get_system_state_window()
+    if window is not None:
+        window.record_requests(
+            [
+                (_epoch(metric.created_at) or time.time(), float(metric.duration_ms or 0.0))
+                for metric in metrics
+            ]
+        )
@@ -0,0 +1,748 @@
+"""
+webhook_delivery.py — Asynchronous webhook delivery engine with a durable outbox.
+
+event_service.dispatch_webhooks() turns each (event, subscription) match
+into a PendingDelivery and hands it to the process-wide engine:
+
+  - One asyncio loop on a daemon thread ("aindy-webhook-loop") drives every
+    delivery through a shared httpx.AsyncClient. Connections are pooled and
+    kept alive per origin (AINDY_WEBHOOK_MAX_CONNECTIONS overall), and each
+    host gets at most AINDY_WEBHOOK_PER_HOST_CONCURRENCY requests in flight,
+    so a slow subscriber only queues its own deliveries.
+  - Failed attempts are retried with exponential back-off
+    (AINDY_WEBHOOK_BACKOFF_SECONDS * 2**n, up to AINDY_WEBHOOK_MAX_ATTEMPTS)
+    by scheduling a timer on the loop — nothing sleeps while holding a slot.
+  - With AINDY_WEBHOOK_OUTBOX_ENABLED, deliveries are inserted into
+    webhook_deliveries in batches before their first attempt, and outcomes
+    are written back every AINDY_WEBHOOK_OUTBOX_FLUSH_MS with one bulk
+    UPDATE. Each instance leases the pending rows it holds (queued behind a
+    host limit, in flight, or waiting on a retry timer) for
+    AINDY_WEBHOOK_OUTBOX_RECOVERY_GRACE_SECONDS and renews the lease while
+    it holds them. Rows whose lease lapsed (process exit, crash) are claimed
+    and retried by whichever instance sees them first; a clean shutdown
+    hands rows waiting on a timer back at their next_attempt_at. Delivery
+    is at-least-once.
+  - Delivered and failed rows older than AINDY_WEBHOOK_OUTBOX_RETENTION_HOURS
+    are deleted in batches by a retention sweep.
+
+All outbox IO runs on one dedicated thread so the loop never blocks on the
+database and outbox writes are serialized.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional
+from urllib.parse import urlsplit
+
+import httpx
+from sqlalchemy import and_, delete, insert, or_, update
+
+from AINDY.config import settings
+
+logger = logging.getLogger(__name__)
+
+_USER_AGENT = "AINDY-EventDispatcher/1.0"
+_RECOVERY_BATCH = 500
+_LEASE_BATCH = 500
+_RETENTION_BATCH = 1000
+_RETENTION_INTERVAL_SECONDS = 600.0
+
+
+@dataclass
+class PendingDelivery:
+    subscription_id: str
+    url: str
+    secret: str | None
+    body: bytes
+    event_type: str
+    event_id: str | None = None
+    id: uuid.UUID = field(default_factory=uuid.uuid4)
+    attempts: int = 0
+
+
+def _request_headers(body: bytes, secret: str | None) -> dict[str, str]:
+    headers = {
+        "Content-Type": "application/json",
+        "User-Agent": _USER_AGENT,
+    }
+    if secret:
+        sig = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+        headers["X-AINDY-Signature"] = f"sha256={sig}"
+    return headers
+
+
+# ---------------------------------------------------------------------------
+# Outbox
+# ---------------------------------------------------------------------------
+
+class WebhookOutbox:
+    """webhook_deliveries persistence. Every method swallows and logs DB errors."""
+
+    def __init__(self, session_factory: Callable[[], Any] | None = None) -> None:
+        self._session_factory = session_factory
+
+    def _session(self):
+        if self._session_factory is None:
+            from AINDY.db.database import SessionLocal
+
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    def insert(self, deliveries: list[PendingDelivery], *, owner: str, lease_until: datetime) -> bool:
+        from AINDY.db.models.webhook_delivery import WebhookDelivery
+
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                "id": d.id,
+                "subscription_id": d.subscription_id,
+                "event_id": d.event_id,
+                "event_type": d.event_type,
+                "body": d.body.decode("utf-8"),
+                "status": "pending",
+                "attempts": d.attempts,
+                "next_attempt_at": now,
+                "generation": 0,
+                "claimed_by": owner,
+                "lease_until": lease_until,
+                "created_at": now,
+            }
+            for d in deliveries
+        ]
+        db = self._session()
+        try:
+            db.execute(insert(WebhookDelivery.__table__), rows)
+            db.commit()
+            return True
+        except Exception as exc:
+            db.rollback()
+            logger.warning("[WebhookOutbox] insert of %d deliveries failed: %s", len(rows), exc)
+            return False
+        finally:
+            db.close()
+
+    def record(self, outcomes: list[dict[str, Any]]) -> None:
+        """Apply outcome rows (keyed by id) with one bulk UPDATE."""
+        from AINDY.db.models.webhook_delivery import WebhookDelivery
+
+        db = self._session()
+        try:
+            db.execute(update(WebhookDelivery), outcomes)
+            db.commit()
+        except Exception as exc:
+            db.rollback()
+            logger.warning("[WebhookOutbox] outcome update of %d rows failed: %s", len(outcomes), exc)
+        finally:
+            db.close()
+
+    def claim_stale(
+        self,
+        *,
+        now: datetime,
+        older_than: datetime,
+        limit: int,
+        owner: str,
+        lease_until: datetime,
+        exclude: set[uuid.UUID] | frozenset = frozenset(),
+    ) -> list[dict[str, Any]]:
+        """Claim pending rows whose lease lapsed; returns the claimed rows.
+
+        Rows without a lease (written before leases existed) are claimable
+        once next_attempt_at is older than *older_than*. Ids in *exclude*
+        (this instance's own deliveries) are never claimed.
+        """
+        from AINDY.db.models.webhook_delivery import WebhookDelivery as WD
+
+        db = self._session()
+        claimed: list[dict[str, Any]] = []
+        try:
+            candidates = (
+                db.query(WD.id, WD.subscription_id, WD.event_id, WD.event_type, WD.body, WD.attempts, WD.generation)
+                .filter(
+                    WD.status == "pending",
+                    or_(
+                        WD.lease_until < now,
+                        and_(WD.lease_until.is_(None), WD.next_attempt_at < older_than),
+                    ),
+                )
+                .order_by(WD.next_attempt_at)
+                .limit(limit)
+                .all()
+            )
+            for row in candidates:
+                if row.id in exclude:
+                    continue
+                result = db.execute(
+                    update(WD)
+                    .where(WD.id == row.id, WD.generation == row.generation, WD.status == "pending")
+                    .values(
+                        generation=row.generation + 1,
+                        next_attempt_at=now,
+                        claimed_by=owner,
+                        lease_until=lease_until,
+                    )
+                )
+                if result.rowcount == 1:
+                    claimed.append(row._asdict())
+            db.commit()
+        except Exception as exc:
+            db.rollback()
+            logger.warning("[WebhookOutbox] stale delivery claim failed: %s", exc)
+            return []
+        finally:
+            db.close()
+        return claimed
+
+    def renew(self, ids: list[uuid.UUID], *, owner: str, lease_until: datetime) -> int:
+        """Extend this owner's lease on pending *ids*; returns rows renewed."""
+        return self._update_owned(ids, owner=owner, values={"lease_until": lease_until})
+
+    def release(self, ids: list[uuid.UUID], *, owner: str) -> int:
+        """Hand pending *ids* back: they become claimable at next_attempt_at."""
+        from AINDY.db.models.webhook_delivery import WebhookDelivery as WD
+
+        return self._update_owned(
+            ids, owner=owner, values={"lease_until": WD.next_attempt_at, "claimed_by": None}
+        )
+
+    def _update_owned(self, ids: list[uuid.UUID], *, owner: str, values: dict[str, Any]) -> int:
+        from AINDY.db.models.webhook_delivery import WebhookDelivery as WD
+
+        if not ids:
+            return 0
+        db = self._session()
+        updated = 0
+        try:
+            for start in range(0, len(ids), _LEASE_BATCH):
+                result = db.execute(
+                    update(WD)
+                    .where(
+                        WD.id.in_(ids[start : start + _LEASE_BATCH]),
+                        WD.claimed_by == owner,
+                        WD.status == "pending",
+                    )
+                    .values(**values)
+                    .execution_options(synchronize_session=False)
+                )
+                updated += result.rowcount or 0
+            db.commit()
+        except Exception as exc:
+            db.rollback()
+            logger.warning("[WebhookOutbox] lease update of %d rows failed: %s", len(ids), exc)
+            return 0
+        finally:
+            db.close()
+        return updated
+
+    def purge_finished(self, *, older_than: datetime, batch_size: int = _RETENTION_BATCH) -> int:
+        """Delete delivered/failed rows created before *older_than*; returns the count."""
+        from AINDY.db.models.webhook_delivery import WebhookDelivery as WD
+
+        db = self._session()
+        deleted = 0
+        try:
+            while True:
+                ids = [
+                    row.id
+                    for row in db.query(WD.id)
+                    .filter(WD.status.in_(("delivered", "failed")), WD.created_at < older_than)
+                    .limit(batch_size)
+                    .all()
+                ]
+                if not ids:
+                    break
+                db.execute(
+                    delete(WD).where(WD.id.in_(ids)).execution_options(synchronize_session=False)
+                )
+                db.commit()
+                deleted += len(ids)
+                if len(ids) < batch_size:
+                    break
+        except Exception as exc:
+            db.rollback()
+            logger.warning("[WebhookOutbox] retention purge failed: %s", exc)
+        finally:
+            db.close()
+        return deleted
+
+
+# ---------------------------------------------------------------------------
+# Engine
+# ---------------------------------------------------------------------------
+
+class WebhookDeliveryEngine:
+    """Pooled asyncio delivery with timer-scheduled retries."""
+
+    def __init__(
+        self,
+        *,
+        resolve_target: Callable[[str], Optional[tuple[str, str | None]]],
+        on_result: Callable[[str, bool], None] | None = None,
+        outbox: WebhookOutbox | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        max_connections: int | None = None,
+        per_host_concurrency: int | None = None,
+        timeout_seconds: float | None = None,
+        max_attempts: int | None = None,
+        backoff_seconds: float | None = None,
+        flush_interval_seconds: float | None = None,
+        recovery_grace_seconds: float | None = None,
+        retention_hours: float | None = None,
+    ) -> None:
+        self._resolve_target = resolve_target
+        self._on_result = on_result
+        self._outbox = outbox
+        self._transport = transport
+        self.max_connections = max(1, int(max_connections or settings.AINDY_WEBHOOK_MAX_CONNECTIONS))
+        self.per_host_concurrency = max(
+            1, int(per_host_concurrency or settings.AINDY_WEBHOOK_PER_HOST_CONCURRENCY)
+        )
+        self.timeout_seconds = float(timeout_seconds or settings.AINDY_WEBHOOK_TIMEOUT_SECONDS)
+        self.max_attempts = max(1, int(max_attempts or settings.AINDY_WEBHOOK_MAX_ATTEMPTS))
+        self.backoff_seconds = float(
+            backoff_seconds if backoff_seconds is not None else settings.AINDY_WEBHOOK_BACKOFF_SECONDS
+        )
+        self.flush_interval_seconds = float(
+            flush_interval_seconds
+            if flush_interval_seconds is not None
+            else settings.AINDY_WEBHOOK_OUTBOX_FLUSH_MS / 1000.0
+        )
+        self.recovery_grace_seconds = float(
+            recovery_grace_seconds
+            if recovery_grace_seconds is not None
+            else settings.AINDY_WEBHOOK_OUTBOX_RECOVERY_GRACE_SECONDS
+        )
+        self.retention_hours = float(
+            retention_hours
+            if retention_hours is not None
+            else settings.AINDY_WEBHOOK_OUTBOX_RETENTION_HOURS
+        )
+        # Outbox lease owner; unique per engine instance.
+        self.instance_id = f"{socket.gethostname()[:40]}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ready = threading.Event()
+        self._io: Optional[ThreadPoolExecutor] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_limits: dict[str, asyncio.Semaphore] = {}
+        self._incoming: list[PendingDelivery] = []
+        self._draining = False
+        self._outcomes: dict[uuid.UUID, dict[str, Any]] = {}
+        self._timers: dict[uuid.UUID, asyncio.TimerHandle] = {}
+        self._tasks: set[asyncio.Task] = set()
+        # Deliveries this engine holds a lease on: queued, in flight or on a timer.
+        self._owned: set[uuid.UUID] = set()
+        self._background: list[asyncio.Task] = []
+        self._scheduled = 0
+        self._stopping = False
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._ready.clear()
+            self._stopping = False
+            self._io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="webhook-outbox")
+            self._thread = threading.Thread(target=self._run, name="aindy-webhook-loop", daemon=True)
+            self._thread.start()
+        self._ready.wait(timeout=5.0)
+
+    def _run(self) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            ),
+            timeout=httpx.Timeout(self.timeout_seconds),
+            transport=self._transport,
+        )
+        if self._outbox is not None:
+            self._background = [
+                loop.create_task(self._flush_loop()),
+                loop.create_task(self._lease_loop()),
+                loop.create_task(self._recovery_loop()),
+            ]
+            if self.retention_hours > 0:
+                self._background.append(loop.create_task(self._retention_loop()))
+        self._ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            try:
+                loop.run_until_complete(self._client.aclose())
+            except Exception:
+                pass
+            loop.close()
+            self._loop = None
+            self._host_limits.clear()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Let in-flight attempts finish, flush outcomes and stop the loop.
+
+        Retries still waiting on a timer stay pending in the outbox; their
+        leases are released so any instance retries them when they are due.
+        """
+        loop = self._loop
+        thread = self._thread
+        if loop is None or thread is None or not thread.is_alive():
+            return
+        future = asyncio.run_coroutine_threadsafe(self._shutdown(timeout), loop)
+        try:
+            future.result(timeout=timeout + 1.0)
+        except Exception as exc:
+            logger.warning("[WebhookDelivery] shutdown did not complete cleanly: %s", exc)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=timeout)
+        if self._io is not None:
+            self._io.shutdown(wait=True)
+        logger.info("[WebhookDelivery] engine stopped.")
+
+    async def _shutdown(self, timeout: float) -> None:
+        self._stopping = True
+        for task in self._background:
+            task.cancel()
+        for handle in self._timers.values():
+            handle.cancel()
+        self._scheduled -= len(self._timers)
+        waiting = list(self._timers)
+        if self._timers:
+            logger.info(
+                "[WebhookDelivery] %d scheduled retries left to outbox recovery",
+                len(self._timers),
+            )
+        self._timers.clear()
+        if self._tasks:
+            await asyncio.wait(set(self._tasks), timeout=timeout)
+        await self._flush_outcomes()
+        if self._outbox is not None and waiting:
+            await self._io_call(self._outbox.release, waiting, owner=self.instance_id)
+        self._owned.clear()
+
+    # ── Submission ────────────────────────────────────────────────────────────
+
+    def submit(self, deliveries: list[PendingDelivery]) -> None:
+        """Thread-safe: queue *deliveries* for persistence and immediate attempt."""
+        if not deliveries:
+            return
+        self.start()
+        loop = self._loop
+        if loop is None:
+            logger.warning("[WebhookDelivery] engine not running; dropped %d deliveries", len(deliveries))
+            return
+        loop.call_soon_threadsafe(self._accept, deliveries)
+
+    def _accept(self, deliveries: list[PendingDelivery]) -> None:
+        self._owned.update(delivery.id for delivery in deliveries)
+        self._incoming.extend(deliveries)
+        if not self._draining:
+            self._draining = True
+            self._track(asyncio.get_running_loop().create_task(self._drain_incoming()))
+
+    async def _drain_incoming(self) -> None:
+        try:
+            while self._incoming:
+                batch, self._incoming = self._incoming, []
+                if self._outbox is not None:
+                    await self._io_call(
+                        self._outbox.insert,
+                        batch,
+                        owner=self.instance_id,
+                        lease_until=self._lease_deadline(),
+                    )
+                for delivery in batch:
+                    self._schedule(delivery, 0.0)
+        finally:
+            self._draining = False
+
+    # ── Attempts ──────────────────────────────────────────────────────────────
+
+    def _schedule(self, delivery: PendingDelivery, delay: float) -> None:
+        self._scheduled += 1
+        _set_inflight(self._scheduled)
+        if delay <= 0:
+            self._spawn(delivery)
+            return
+        self._timers[delivery.id] = asyncio.get_running_loop().call_later(delay, self._spawn, delivery)
+
+    def _spawn(self, delivery: PendingDelivery) -> None:
+        self._timers.pop(delivery.id, None)
+        self._track(asyncio.get_running_loop().create_task(self._attempt(delivery)))
+
+    def _track(self, task: asyncio.Task) -> None:
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = self._host_limits[host] = asyncio.Semaphore(self.per_host_concurrency)
+        return limit
+
+    async def _attempt(self, delivery: PendingDelivery) -> None:
+        status_code: int | None = None
+        error: str | None = None
+        async with self._host_limit(delivery.url):
+            started = time.perf_counter()
+            try:
+                response = await self._client.post(
+                    delivery.url,
+                    content=delivery.body,
+                    headers=_request_headers(delivery.body, delivery.secret),
+                )
+                status_code = response.status_code
+            except Exception as exc:
+                error = str(exc) or type(exc).__name__
+            elapsed = time.perf_counter() - started
+        delivery.attempts += 1
+        self._scheduled -= 1
+        _set_inflight(self._scheduled)
+        _observe_latency(delivery.subscription_id, elapsed)
+
+        if status_code is not None and 200 <= status_code < 300:
+            logger.debug(
+                "webhook delivered: sub=%s attempt=%d status=%d",
+                delivery.subscription_id, delivery.attempts, status_code,
+            )
+            self._finish(delivery, "delivered", status_code, None)
+            return
+
+        logger.warning(
+            "webhook attempt failed: sub=%s attempt=%d status=%s error=%s",
+            delivery.subscription_id, delivery.attempts, status_code, error,
+        )
+        if delivery.attempts >= self.max_attempts:
+            self._finish(delivery, "failed", status_code, error)
+            return
+        delay = self.backoff_seconds * (2 ** (delivery.attempts - 1))
+        self._record(
+            delivery,
+            "pending",
+            status_code,
+            error,
+            next_attempt_at=datetime.now(timezone.utc) + timedelta(seconds=delay),
+        )
+        _count(delivery.subscription_id, "retry")
+        if not self._stopping:
+            self._schedule(delivery, delay)
+
+    def _finish(self, delivery: PendingDelivery, status: str, status_code: int | None, error: str | None) -> None:
+        self._owned.discard(delivery.id)
+        self._record(delivery, status, status_code, error)
+        _count(delivery.subscription_id, "success" if status == "delivered" else "failed")
+        if self._on_result is not None:
+            try:
+                self._on_result(delivery.subscription_id, status == "delivered")
+            except Exception:
+                logger.debug("[WebhookDelivery] result callback failed", exc_info=True)
+
+    # ── Outbox bookkeeping ────────────────────────────────────────────────────
+
+    def _record(
+        self,
+        delivery: PendingDelivery,
+        status: str,
+        status_code: int | None,
+        error: str | None,
+        *,
+        next_attempt_at: datetime | None = None,
+    ) -> None:
+        if self._outbox is None:
+            return
+        now = datetime.now(timezone.utc)
+        self._outcomes[delivery.id] = {
+            "id": delivery.id,
+            "status": status,
+            "attempts": delivery.attempts,
+            "next_attempt_at": next_attempt_at or now,
+            "last_status_code": status_code,
+            "last_error": error[:512] if error else None,
+            "delivered_at": now if status == "delivered" else None,
+        }
+
+    async def _flush_outcomes(self) -> None:
+        if self._outbox is None or not self._outcomes:
+            return
+        batch = list(self._outcomes.values())
+        self._outcomes = {}
+        await self._io_call(self._outbox.record, batch)
+
+    async def _flush_loop(self) -> None:
+        interval = self.flush_interval_seconds or 0.5
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self._flush_outcomes()
+            except Exception:
+                logger.warning("[WebhookDelivery] outcome flush failed", exc_info=True)
+
+    def _lease_deadline(self) -> datetime:
+        return datetime.now(timezone.utc) + timedelta(seconds=self.recovery_grace_seconds)
+
+    async def _lease_loop(self) -> None:
+        # Renew well inside the lease so one slow round trip cannot lapse it.
+        interval = max(1.0, self.recovery_grace_seconds / 3)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.renew_leases()
+            except Exception:
+                logger.warning("[WebhookDelivery] outbox lease renewal failed", exc_info=True)
+
+    async def renew_leases(self) -> int:
+        """Extend the lease on every delivery this engine still holds."""
+        if self._outbox is None or not self._owned:
+            return 0
+        return await self._io_call(
+            self._outbox.renew,
+            list(self._owned),
+            owner=self.instance_id,
+            lease_until=self._lease_deadline(),
+        )
+
+    async def _retention_loop(self) -> None:
+        while True:
+            try:
+                await self.purge_finished()
+            except Exception:
+                logger.warning("[WebhookDelivery] outbox retention sweep failed", exc_info=True)
+            await asyncio.sleep(_RETENTION_INTERVAL_SECONDS)
+
+    async def purge_finished(self) -> int:
+        """Delete delivered/failed outbox rows past the retention window."""
+        if self._outbox is None or self.retention_hours <= 0:
+            return 0
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=self.retention_hours)
+        deleted = await self._io_call(self._outbox.purge_finished, older_than=cutoff)
+        if deleted:
+            logger.info("[WebhookDelivery] purged %d finished deliveries from the outbox", deleted)
+        return deleted
+
+    async def _recovery_loop(self) -> None:
+        while True:
+            try:
+                await self.recover_stale()
+            except Exception:
+                logger.warning("[WebhookDelivery] outbox recovery failed", exc_info=True)
+            await asyncio.sleep(max(1.0, self.recovery_grace_seconds / 2))
+
+    async def recover_stale(self) -> int:
+        """Claim pending outbox rows whose lease lapsed and schedule them; returns the count."""
+        now = datetime.now(timezone.utc)
+        rows = await self._io_call(
+            self._outbox.claim_stale,
+            now=now,
+            older_than=now - timedelta(seconds=self.recovery_grace_seconds),
+            limit=_RECOVERY_BATCH,
+            owner=self.instance_id,
+            lease_until=self._lease_deadline(),
+            exclude=frozenset(self._owned),
+        )
+        for row in rows or []:
+            delivery = PendingDelivery(
+                id=row["id"],
+                subscription_id=row["subscription_id"],
+                url="",
+                secret=None,
+                body=row["body"].encode("utf-8"),
+                event_type=row["event_type"],
+                event_id=row["event_id"],
+                attempts=int(row["attempts"] or 0),
+            )
+            self._owned.add(delivery.id)
+            target = self._resolve_target(delivery.subscription_id)
+            if target is None or delivery.attempts >= self.max_attempts:
+                self._finish(delivery, "failed", None, "subscription removed" if target is None else None)
+                continue
+            delivery.url, delivery.secret = target
+            self._schedule(delivery, 0.0)
+        if rows:
+            logger.info("[WebhookDelivery] recovered %d pending deliveries from the outbox", len(rows))
+        return len(rows or [])
+
+    async def _io_call(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._io, lambda: fn(*args, **kwargs))
+
+    def snapshot(self) -> dict[str, int | bool]:
+        return {
+            "scheduled": self._scheduled,
+            "retry_timers": len(self._timers),
+            "worker_running": bool(self._thread and self._thread.is_alive()),
+        }
+
+
+def _set_inflight(value: int) -> None:
+    try:
+        from AINDY.platform_layer.metrics import webhook_deliveries_inflight
+
+        webhook_deliveries_inflight.set(value)
+    except Exception:
+        pass
+
+
+def _observe_latency(subscription_id: str, seconds: float) -> None:
+    try:
+        from AINDY.platform_layer.metrics import webhook_delivery_duration_seconds
+
+        webhook_delivery_duration_seconds.labels(subscription_id=subscription_id).observe(seconds)
+    except Exception:
+        pass
+
+
+def _count(subscription_id: str, outcome: str) -> None:
+    try:
+        from AINDY.platform_layer.metrics import webhook_deliveries_total
+
+        webhook_deliveries_total.labels(subscription_id=subscription_id, outcome=outcome).inc()
+    except Exception:
+        pass
+
+
+# ---------------------------------------------------------------------------
+# Module-level singleton
+# ---------------------------------------------------------------------------
+
+_engine: Optional[WebhookDeliveryEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_webhook_delivery_engine() -> WebhookDeliveryEngine:
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                from AINDY.platform_layer.event_service import (
+                    record_delivery_result,
+                    webhook_target,
+                )
+
+                _engine = WebhookDeliveryEngine(
+                    resolve_target=webhook_target,
+                    on_result=record_delivery_result,
+                    outbox=WebhookOutbox() if settings.AINDY_WEBHOOK_OUTBOX_ENABLED else None,
+                )
+    return _engine
+
+
+def shutdown_webhook_delivery(timeout: float = 10.0) -> None:
+    """Stop the engine if it was started (no-op otherwise)."""
+    if _engine is not None:
+        _engine.stop(timeout=timeout)
@@ -8,6 +8,7 @@ Public endpoints (no auth required):
 Phase 3: Uses PostgreSQL User model via DB session (replaced in-memory store).
 """
 from fastapi import APIRouter, Depends, HTTPException, Request
+from AINDY.auth.principal_cache import invalidate_user
 from AINDY.core.execution_signal_helper import queue_system_event
 from sqlalchemy.orm import Session
 from AINDY.core.execution_helper import execute_with_pipeline_sync
@@ -132,6 +133,7 @@ def logout(
             if user:
                 user.token_version = (int(getattr(user, "token_version", 0)) + 1) % 32767
                 db.commit()
+                invalidate_user(user.id)
         return {"status": "logged_out"}
 
     return execute_with_pipeline_sync(
@@ -171,6 +173,7 @@ def admin_invalidate_sessions(
 
         user.token_version = (int(getattr(user, "token_version", 0)) + 1) % 32767
         db.commit()
+        invalidate_user(user.id)
         return {"status": "sessions_invalidated", "user_id": str(target_id)}
 
     return execute_with_pipeline_sync(
@@ -7,6 +7,7 @@ import logging
 
 from AINDY.core.execution_gate import to_envelope
 from AINDY.core.execution_helper import execute_with_pipeline
+from AINDY.core.execution_pipeline import READ_ONLY_EXECUTION
 from AINDY.db.database import get_db
 from AINDY.platform_layer.rate_limiter import limiter
 from AINDY.runtime.nodus_security import NodusSecurityError
@@ -16,6 +17,7 @@ router = APIRouter(prefix="/memory", tags=["Memory"])
 logger = logging.getLogger(__name__)
 
 NodeType = Literal["decision", "outcome", "insight", "relationship"]
+SearchMode = Literal["auto", "exact", "fast", "balanced", "accurate"]
 
 
 def _flow_failure(result: dict) -> str:
@@ -95,6 +97,7 @@ class SimilaritySearchRequest(BaseModel):
     limit: Optional[int] = 5
     node_type: Optional[NodeType] = None
     min_similarity: Optional[float] = 0.0
+    search_mode: Optional[SearchMode] = None
 
 
 class RecallRequest(BaseModel):
@@ -102,6 +105,7 @@ class RecallRequest(BaseModel):
     tags: Optional[List[str]] = None
     limit: Optional[int] = 5
     node_type: Optional[NodeType] = None
+    search_mode: Optional[SearchMode] = None
 
 
 class CreateLinkRequest(BaseModel):
@@ -124,6 +128,7 @@ class RecallV3Request(BaseModel):
     limit: Optional[int] = 5
     node_type: Optional[NodeType] = None
     expand_results: Optional[bool] = False
+    search_mode: Optional[SearchMode] = None
 
 
 class FederatedRecallRequest(BaseModel):
@@ -199,13 +204,17 @@ async def _execute_memory(
     current_user,
     input_payload=None,
     success_status_code: int = 200,
+    read_only: bool = False,
 ):
+    metadata = {"db": db}
+    if read_only:
+        metadata["execution_class"] = READ_ONLY_EXECUTION
     return await execute_with_pipeline(
         request=request,
         route_name=route_name,
         handler=handler,
         user_id=str(current_user["sub"]),
-        metadata={"db": db},
+        metadata=metadata,
         input_payload=input_payload,
         success_status_code=success_status_code,
     )
@@ -270,7 +279,7 @@ async def get_node(
     def handler(ctx):
         return _mem_run_flow("memory_node_get", {"node_id": node_id}, db, str(current_user["sub"]))
 
-    return await _execute_memory(request, "memory.nodes.get", handler, db=db, current_user=current_user)
+    return await _execute_memory(request, "memory.nodes.get", handler, db=db, current_user=current_user, read_only=True)
 @router.put("/nodes/{node_id}")
 @limiter.limit("30/minute")
 async def update_node(
@@ -299,7 +308,7 @@ async def get_node_history(
     def handler(ctx):
         return _mem_run_flow("memory_node_history", {"node_id": node_id, "limit": limit}, db, str(current_user["sub"]))
 
-    return await _execute_memory(request, "memory.nodes.history", handler, db=db, current_user=current_user)
+    return await _execute_memory(request, "memory.nodes.history", handler, db=db, current_user=current_user, read_only=True)
 @router.get("/nodes/{node_id}/links")
 @limiter.limit("60/minute")
 async def get_linked_nodes(
@@ -312,7 +321,7 @@ async def get_linked_nodes(
     def handler(ctx):
         return _mem_run_flow("memory_node_links", {"node_id": node_id, "direction": direction}, db, str(current_user["sub"]))
 
-    return await _execute_memory(request, "memory.nodes.links", handler, db=db, current_user=current_user)
+    return await _execute_memory(request, "memory.nodes.links", handler, db=db, current_user=current_user, read_only=True)
 @router.get("/nodes")
 @limiter.limit("60/minute")
 async def search_nodes_by_tags(
@@ -333,7 +342,7 @@ async def search_nodes_by_tags(
             user_id,
         )
 
-    return await _execute_memory(request, "memory.nodes.search_tags", handler, db=db, current_user=current_user)
+    return await _execute_memory(request, "memory.nodes.search_tags", handler, db=db, current_user=current_user, read_only=True)
 @router.post("/links", status_code=201)
 @limiter.limit("30/minute")
 async def create_link(
@@ -398,7 +407,7 @@ async def traverse_from_node(
             "link_type": link_type, "min_strength": min_strength,
         }, db, str(current_user["sub"]))
 
-    return await _execute_memory(request, "memory.nodes.traverse", handler, db=db, current_user=current_user)
+    return await _execute_memory(request, "memory.nodes.traverse", handler, db=db, current_user=current_user, read_only=True)
 @router.post("/nodes/expand")
 @limiter.limit("30/minute")
 async def expand_nodes(
@@ -434,6 +443,7 @@ async def search_similar_nodes(
             user_id=str(current_user["sub"]),
             node_type=body.node_type,
             min_similarity=body.min_similarity,
+            search_mode=body.search_mode,
         )
         return {
             "query": body.query,
@@ -469,6 +479,7 @@ async def recall_memories(
             limit=body.limit,
             user_id=str(current_user["sub"]),
             node_type=body.node_type,
+            search_mode=body.search_mode,
         )
         return {
             "query": body.query,
@@ -502,6 +513,7 @@ async def recall_v3(
         return _mem_run_flow("memory_recall_v3", {
             "query": body.query, "tags": body.tags, "limit": body.limit,
             "node_type": body.node_type, "expand_results": body.expand_results,
+            "search_mode": body.search_mode,
         }, db, str(current_user["sub"]))
 
     return await _execute_memory(request, "memory.recall.v3", handler, db=db, current_user=current_user, input_payload=body.model_dump())
@@ -530,7 +542,7 @@ async def list_agents(
     def handler(ctx):
         return _mem_run_flow("memory_agents_list", {}, db, str(current_user["sub"]))
 
-    return await _execute_memory(request, "memory.agents.list", handler, db=db, current_user=current_user)
+    return await _execute_memory(request, "memory.agents.list", handler, db=db, current_user=current_user, read_only=True)
 @router.post("/nodes/{node_id}/share")
 @limiter.limit("30/minute")
 async def share_memory_node(
@@ -581,7 +593,7 @@ async def get_node_performance(
     def handler(ctx):
         return _mem_run_flow("memory_node_performance", {"node_id": node_id}, db, str(current_user["sub"]))
 
-    return await _execute_memory(request, "memory.nodes.performance", handler, db=db, current_user=current_user)
+    return await _execute_memory(request, "memory.nodes.performance", handler, db=db, current_user=current_user, read_only=True)
 @router.post("/suggest")
 @limiter.limit("30/minute")
 async def get_suggestions(
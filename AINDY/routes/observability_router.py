@@ -5,6 +5,7 @@ from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
 from AINDY.core.execution_helper import execute_with_pipeline_sync
+from AINDY.core.execution_pipeline import READ_ONLY_EXECUTION
 from AINDY.db.database import get_db
 from AINDY.platform_layer.rate_limiter import limiter
 from AINDY.services.auth_service import get_current_user, require_platform_admin_access
@@ -35,14 +36,27 @@ def _run_flow_observability(flow_name: str, payload: dict, db: Session, user_id:
     return result.get("data")
 
 
-def _execute_observability(request: Request, route_name: str, handler, *, db: Session, user_id: str, input_payload=None):
+def _execute_observability(
+    request: Request,
+    route_name: str,
+    handler,
+    *,
+    db: Session,
+    user_id: str,
+    input_payload=None,
+    read_only: bool = False,
+):
+    metadata = {"db": db, "disable_memory_capture": True}
+    if read_only:
+        # Dashboard polling must not write EU / FlowRun / event rows per read.
+        metadata["execution_class"] = READ_ONLY_EXECUTION
     return execute_with_pipeline_sync(
         request=request,
         route_name=route_name,
         handler=handler,
         user_id=user_id,
         input_payload=input_payload,
-        metadata={"db": db, "disable_memory_capture": True},
+        metadata=metadata,
     )
 
 
@@ -72,7 +86,7 @@ def get_llm_status(
             },
         }
 
-    return _execute_observability(request, "observability_llm_status", handler, db=db, user_id=user_id)
+    return _execute_observability(request, "observability_llm_status", handler, db=db, user_id=user_id, read_only=True)
 
 
 @router.get("/rippletrace/status")
@@ -102,6 +116,7 @@ def get_rippletrace_status(
         handler,
         db=db,
         user_id=user_id,
+        read_only=True,
     )
 
 
@@ -184,7 +199,7 @@ def get_scheduler_status(
         }
         return result
 
-    return _execute_observability(request, "observability_scheduler_status", handler, db=db, user_id=user_id)
+    return _execute_observability(request, "observability_scheduler_status", handler, db=db, user_id=user_id, read_only=True)
 
 
 # ------------------------------
@@ -207,7 +222,7 @@ def get_request_metrics(
             {"limit": limit, "error_limit": error_limit, "window_hours": window_hours},
             db, user_id,
         )
-    return _execute_observability(request, "observability_requests", handler, db=db, user_id=user_id)
+    return _execute_observability(request, "observability_requests", handler, db=db, user_id=user_id, read_only=True)
 
 
 # ------------------------------
@@ -232,7 +247,7 @@ def get_observability_dashboard(
             {"window_hours": window_hours, "request_limit": request_limit, "event_limit": event_limit},
             db, user_id,
         )
-    return _execute_observability(request, "observability_dashboard", handler, db=db, user_id=user_id)
+    return _execute_observability(request, "observability_dashboard", handler, db=db, user_id=user_id, read_only=True)
 
 
 # ------------------------------
@@ -250,7 +265,7 @@ def get_execution_graph(
     def handler(ctx):
         return _run_flow_observability("observability_execution_graph", {"trace_id": trace_id}, db, user_id)
     return _execute_observability(request, "observability_execution_graph", handler, db=db, user_id=user_id,
-                                  input_payload={"trace_id": trace_id})
+                                  input_payload={"trace_id": trace_id}, read_only=True)
 
 
 @router.get("/queue/metrics")
@@ -278,6 +293,7 @@ def get_queue_metrics(
         handler,
         db=db,
         user_id=user_id,
+        read_only=True,
     )
 
 
@@ -305,6 +321,7 @@ def list_dead_letter(
         db=db,
         user_id=caller_user_id,
         input_payload={"limit": limit, "user_id": user_id},
+        read_only=True,
     )
 
 
@@ -337,6 +354,7 @@ def get_dead_letter_run(
         db=db,
         user_id=caller_user_id,
         input_payload={"flow_run_id": flow_run_id},
+        read_only=True,
     )
 
 
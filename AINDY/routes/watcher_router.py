@@ -18,6 +18,7 @@ from sqlalchemy.orm import Session
 
 from AINDY.core.execution_gate import to_envelope
 from AINDY.core.execution_helper import execute_with_pipeline_sync
+from AINDY.core.execution_pipeline import READ_ONLY_EXECUTION
 from AINDY.db.database import get_db
 from AINDY.platform_layer.rate_limiter import limiter
 from AINDY.services.auth_service import verify_api_key
@@ -196,7 +197,7 @@ def list_signals(
         route_name="watcher.signals.list",
         handler=handler,
         user_id=user_id,
-        metadata={"db": db},
+        metadata={"db": db, "execution_class": READ_ONLY_EXECUTION},
         input_payload={
             "session_id": session_id,
             "signal_type": signal_type,
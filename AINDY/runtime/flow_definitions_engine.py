@@ -53,6 +53,7 @@ def flow_run_get_node(state, context):
     try:
         from uuid import UUID
         from AINDY.db.models.flow_run import FlowRun
+        from AINDY.runtime.flow_engine.checkpoint import load_run_state
 
         db = context.get("db")
         user_id = UUID(str(context.get("user_id")))
@@ -68,7 +69,7 @@ def flow_run_get_node(state, context):
             "trace_id": run.trace_id,
             "current_node": run.current_node,
             "waiting_for": run.waiting_for,
-            "state": run.state,
+            "state": load_run_state(db, run),
             "error_message": run.error_message,
             "created_at": run.created_at.isoformat() if run.created_at else None,
             "updated_at": run.updated_at.isoformat() if run.updated_at else None,
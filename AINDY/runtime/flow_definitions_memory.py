@@ -196,6 +196,7 @@ def memory_nodes_search_similar_node(state, context):
             user_id=user_id,
             node_type=state.get("node_type"),
             min_similarity=state.get("min_similarity", 0.0),
+            search_mode=state.get("search_mode"),
         )
         return {"status": "SUCCESS", "output_patch": {"memory_nodes_search_similar_result": {"query": query, "results": results, "count": len(results)}}}
     except Exception as e:
@@ -212,7 +213,7 @@ def memory_recall_node(state, context):
         tags = state.get("tags")
         if not query and not tags:
             return {"status": "FAILURE", "error": "HTTP_400:Provide at least one of: query, tags"}
-        metadata = {"tags": tags, "node_type": state.get("node_type"), "limit": state.get("limit", 5)}
+        metadata = {"tags": tags, "node_type": state.get("node_type"), "limit": state.get("limit", 5), "search_mode": state.get("search_mode")}
         if state.get("node_type") is None:
             metadata["node_types"] = []
         orchestrator = MemoryOrchestrator(MemoryNodeDAO)
@@ -233,7 +234,7 @@ def memory_recall_v3_node(state, context):
         tags = state.get("tags")
         if not query and not tags:
             return {"status": "FAILURE", "error": "HTTP_400:Provide at least one of: query, tags"}
-        metadata = {"tags": tags, "node_type": state.get("node_type"), "limit": state.get("limit", 5)}
+        metadata = {"tags": tags, "node_type": state.get("node_type"), "limit": state.get("limit", 5), "search_mode": state.get("search_mode")}
         if state.get("node_type") is None:
             metadata["node_types"] = []
         orchestrator = MemoryOrchestrator(MemoryNodeDAO)
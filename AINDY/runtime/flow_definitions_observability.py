@@ -60,6 +60,7 @@ def observability_dashboard_node(state, context):
         from collections import Counter
         from datetime import datetime, timedelta, timezone
         from sqlalchemy import func
+        from AINDY.core.request_metric_rollups import rollups_enabled, summarize_request_rollups
         from AINDY.db.models import AgentEvent
         from AINDY.db.models.flow_run import FlowRun
         from AINDY.db.models.request_metric import RequestMetric
@@ -75,9 +76,15 @@ def observability_dashboard_node(state, context):
         request_window_start = datetime.now(timezone.utc) - timedelta(hours=window_hours)
         event_window_start = datetime.now(timezone.utc) - timedelta(hours=window_hours)
         req_q = db.query(RequestMetric).filter(RequestMetric.user_id == user_id)
-        avg_latency = db.query(func.avg(RequestMetric.duration_ms)).filter(RequestMetric.user_id == user_id, RequestMetric.created_at >= request_window_start).scalar()
-        window_requests = req_q.filter(RequestMetric.created_at >= request_window_start).count()
-        window_errors = req_q.filter(RequestMetric.created_at >= request_window_start, RequestMetric.status_code >= 500).count()
+        latency_percentiles = {}
+        if rollups_enabled():
+            rollup = summarize_request_rollups(db, user_id=user_id, since=request_window_start)
+            avg_latency, window_requests, window_errors = rollup["avg_latency_ms"], rollup["requests"], rollup["errors"]
+            latency_percentiles = {key: rollup[key] for key in ("p50_latency_ms", "p95_latency_ms", "p99_latency_ms")}
+        else:
+            avg_latency = db.query(func.avg(RequestMetric.duration_ms)).filter(RequestMetric.user_id == user_id, RequestMetric.created_at >= request_window_start).scalar()
+            window_requests = req_q.filter(RequestMetric.created_at >= request_window_start).count()
+            window_errors = req_q.filter(RequestMetric.created_at >= request_window_start, RequestMetric.status_code >= 500).count()
         recent_requests = req_q.order_by(RequestMetric.created_at.desc()).limit(20).all()
         recent_request_errors = req_q.filter(RequestMetric.status_code >= 500).order_by(RequestMetric.created_at.desc()).limit(20).all()
         system_events = db.query(SystemEvent).filter(SystemEvent.user_id == user_id, SystemEvent.timestamp >= event_window_start).order_by(SystemEvent.timestamp.desc()).limit(event_limit).all()
@@ -92,6 +99,7 @@ def observability_dashboard_node(state, context):
             "summary": {
                 "window_hours": window_hours,
                 "avg_latency_ms": round(avg_latency or 0.0, 2),
+                **latency_percentiles,
                 "window_requests": window_requests,
                 "window_errors": window_errors,
                 "error_rate_pct": round((window_errors / window_requests) * 100, 2) if window_requests else 0.0,
@@ -122,6 +130,7 @@ def observability_requests_node(state, context):
         import uuid as _uuid
         from datetime import datetime, timedelta, timezone
         from sqlalchemy import func
+        from AINDY.core.request_metric_rollups import rollups_enabled, summarize_request_rollups
         from AINDY.db.models.request_metric import RequestMetric
 
         db = context.get("db")
@@ -131,18 +140,26 @@ def observability_requests_node(state, context):
         window_hours = state.get("window_hours", 24)
         window_start = datetime.now(timezone.utc) - timedelta(hours=window_hours)
         base = db.query(RequestMetric).filter(RequestMetric.user_id == user_id)
-        total = base.count()
-        window_total = base.filter(RequestMetric.created_at >= window_start).count()
-        error_total = base.filter(RequestMetric.status_code >= 500).count()
-        window_error_total = base.filter(RequestMetric.created_at >= window_start, RequestMetric.status_code >= 500).count()
-        avg_latency = db.query(func.avg(RequestMetric.duration_ms)).filter(RequestMetric.user_id == user_id).scalar()
+        latency_percentiles = {}
+        if rollups_enabled():
+            overall = summarize_request_rollups(db, user_id=user_id)
+            window = summarize_request_rollups(db, user_id=user_id, since=window_start)
+            total, error_total, avg_latency = overall["requests"], overall["errors"], overall["avg_latency_ms"]
+            window_total, window_error_total = window["requests"], window["errors"]
+            latency_percentiles = {key: window[key] for key in ("p50_latency_ms", "p95_latency_ms", "p99_latency_ms")}
+        else:
+            total = base.count()
+            window_total = base.filter(RequestMetric.created_at >= window_start).count()
+            error_total = base.filter(RequestMetric.status_code >= 500).count()
+            window_error_total = base.filter(RequestMetric.created_at >= window_start, RequestMetric.status_code >= 500).count()
+            avg_latency = db.query(func.avg(RequestMetric.duration_ms)).filter(RequestMetric.user_id == user_id).scalar()
         recent = base.order_by(RequestMetric.created_at.desc()).limit(limit).all()
         recent_errors = base.filter(RequestMetric.status_code >= 500).order_by(RequestMetric.created_at.desc()).limit(error_limit).all()
 
         def _s(row):
             return {"request_id": row.request_id, "trace_id": row.trace_id, "method": row.method, "path": row.path, "status_code": row.status_code, "duration_ms": row.duration_ms, "created_at": row.created_at}
 
-        return {"status": "SUCCESS", "output_patch": {"observability_requests_result": {"summary": {"total_requests": total, "window_hours": window_hours, "window_requests": window_total, "total_errors": error_total, "window_errors": window_error_total, "avg_latency_ms": round(avg_latency or 0.0, 2)}, "recent": [_s(r) for r in recent], "recent_errors": [_s(r) for r in recent_errors]}}}
+        return {"status": "SUCCESS", "output_patch": {"observability_requests_result": {"summary": {"total_requests": total, "window_hours": window_hours, "window_requests": window_total, "total_errors": error_total, "window_errors": window_error_total, "avg_latency_ms": round(avg_latency or 0.0, 2), **latency_percentiles}, "recent": [_s(r) for r in recent], "recent_errors": [_s(r) for r in recent_errors]}}}
     except Exception as e:
         return {"status": "FAILURE", "error": str(e)}
 
@@ -1,5 +1,6 @@
 import sys
 
+from AINDY.runtime.flow_engine.checkpoint import load_run_state
 from AINDY.runtime.flow_engine.entrypoints import (
     _execute_intent_direct,
     _run_flow_direct,
@@ -8,6 +9,7 @@ from AINDY.runtime.flow_engine.entrypoints import (
     generate_plan_from_intent,
     run_flow,
 )
+from AINDY.runtime.flow_engine.ephemeral import run_flow_ephemeral
 from AINDY.runtime.flow_engine.event_router import record_outcome, route_event
 from AINDY.runtime.flow_engine.node_executor import (
     POLICY,
@@ -0,0 +1,112 @@
+"""
+Delta checkpoints for FlowRun state.
+
+Each executed node appends a FlowHistory row with its ``seq`` and output
+patch. FlowRun.state is rewritten in full only every
+``AINDY_FLOW_CHECKPOINT_INTERVAL`` nodes and at WAIT/terminal transitions;
+``checkpoint_seq`` records how many nodes that snapshot covers. The state
+at any point is the snapshot plus the SUCCESS patches with a higher seq, in
+seq order, which is exactly how the runner builds it in memory
+(``state.update(patch)`` on SUCCESS). FlowHistory rows do not copy a node's
+input state for the same reason.
+
+Nodes must report changes through ``output_patch``. An edit made to
+``state`` in place leaves nothing to replay and only becomes durable with
+the next snapshot.
+
+During the run loop the counters live in a ``RunCheckpoint`` and are
+written with targeted UPDATEs, so the commit after each node never has to
+reload the FlowRun.
+"""
+from __future__ import annotations
+
+from AINDY.runtime.flow_engine.serialization import _json_safe
+from AINDY.runtime.flow_engine.shared import settings
+
+
+def _seq(run, name: str) -> int:
+    value = getattr(run, name, 0)
+    return value if isinstance(value, int) else 0
+
+
+def checkpoint_interval() -> int:
+    return max(1, int(getattr(settings, "AINDY_FLOW_CHECKPOINT_INTERVAL", 10) or 1))
+
+
+def snapshot_state(run, state: dict) -> None:
+    """Write the full *state* into the run and mark every executed node as folded in."""
+    run.state = _json_safe(state)
+    run.checkpoint_seq = _seq(run, "node_seq")
+
+
+class RunCheckpoint:
+    """Checkpoint counters of one run, tracked outside the ORM instance."""
+
+    _COLUMNS = ("state", "current_node", "node_seq", "checkpoint_seq")
+
+    def __init__(self, db, run):
+        self.db = db
+        self.run = run
+        self.run_id = run.id
+        self.node_seq = _seq(run, "node_seq")
+        self.checkpoint_seq = _seq(run, "checkpoint_seq")
+
+    def next_node_seq(self) -> int:
+        """Claim the seq for the node that just ran."""
+        self.node_seq += 1
+        return self.node_seq
+
+    def snapshot_due(self) -> bool:
+        return self.node_seq - self.checkpoint_seq >= checkpoint_interval()
+
+    def write(self, *, state: dict | None = None, **values) -> bool:
+        """UPDATE node_seq and *values* on the run; False if the row is gone.
+
+        With *state*, also write a snapshot covering every node claimed so far.
+        """
+        from AINDY.db.models.flow_run import FlowRun
+
+        values["node_seq"] = self.node_seq
+        if state is not None:
+            self.checkpoint_seq = self.node_seq
+            values["state"] = _json_safe(state)
+            values["checkpoint_seq"] = self.checkpoint_seq
+        updated = (
+            self.db.query(FlowRun)
+            .filter(FlowRun.id == self.run_id)
+            .update(values, synchronize_session=False)
+        )
+        # WAIT/terminal paths go back through the ORM instance; make them
+        # read these columns from the row rather than a stale copy.
+        self.db.expire(self.run, [name for name in self._COLUMNS if name in values])
+        return updated == 1
+
+
+def load_run_state(db, run) -> dict:
+    """Rebuild a run's current state from its snapshot and pending patches."""
+    state = run.state or {}
+    if not isinstance(state, dict):
+        return state
+    state = dict(state)
+    node_seq = _seq(run, "node_seq")
+    checkpoint_seq = _seq(run, "checkpoint_seq")
+    if node_seq <= checkpoint_seq:
+        return state
+
+    from AINDY.db.models.flow_run import FlowHistory
+
+    patches = (
+        db.query(FlowHistory.output_patch)
+        .filter(
+            FlowHistory.flow_run_id == run.id,
+            FlowHistory.seq > checkpoint_seq,
+            FlowHistory.seq <= node_seq,
+            FlowHistory.status == "SUCCESS",
+        )
+        .order_by(FlowHistory.seq.asc())
+        .all()
+    )
+    for (patch,) in patches:
+        if isinstance(patch, dict):
+            state.update(patch)
+    return state
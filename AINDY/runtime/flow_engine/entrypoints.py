@@ -1,3 +1,4 @@
+from AINDY.runtime.flow_engine.ephemeral import run_flow_ephemeral
 from AINDY.runtime.flow_engine.registry import FLOW_REGISTRY, _registry_flow_plan
 from AINDY.runtime.flow_engine.runner import PersistentFlowRunner
 from AINDY.runtime.flow_engine.shared import Session, logger, normalize_uuid
@@ -125,6 +126,16 @@ def run_flow(flow_name: str, state: dict, db: Session = None, user_id: str = Non
     from AINDY.runtime import enforce_engine_boundary
 
     enforce_engine_boundary(entrypoint="flow.run", flow_name=str(flow_name))
+    from AINDY.core.execution_pipeline import is_ephemeral_execution
+
+    if is_ephemeral_execution():
+        flow = FLOW_REGISTRY.get(flow_name)
+        if not flow:
+            raise KeyError(
+                f"Flow '{flow_name}' not registered. "
+                f"Available: {sorted(FLOW_REGISTRY.keys())}"
+            )
+        return run_flow_ephemeral(flow, flow_name, state or {}, db, user_id)
     if not user_id:
         logger.debug(
             "[run_flow] no user_id - executing '%s' directly "
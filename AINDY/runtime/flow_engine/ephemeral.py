@@ -0,0 +1,122 @@
+"""
+In-memory flow execution for read-only pipeline routes.
+
+PersistentFlowRunner records every run as a FlowRun with FlowHistory rows,
+an ExecutionUnit and lifecycle SystemEvents. When the current pipeline
+execution is ephemeral (a read-only route that was not sampled, see
+``is_ephemeral_execution``), ``run_flow`` walks the same registered nodes
+here instead: same node registry, retry policy and response shape, with the
+per-node trace kept in the response ``events`` rather than written out.
+
+A node that returns WAIT cannot be resumed without a FlowRun, so it fails
+the run; read-only flows are not expected to wait.
+"""
+from AINDY.runtime.flow_engine.node_executor import resolve_next_node
+from AINDY.runtime.flow_engine.serialization import (
+    _extract_execution_result,
+    _extract_next_action,
+    _format_execution_response,
+)
+from AINDY.runtime.flow_engine.shared import (
+    _resolve_retry_policy,
+    datetime,
+    ensure_trace_id,
+    logger,
+    normalize_uuid,
+    timezone,
+)
+
+
+def run_flow_ephemeral(
+    flow: dict,
+    flow_name: str,
+    state: dict,
+    db=None,
+    user_id: str = None,
+    workflow_type: str = None,
+) -> dict:
+    from AINDY.runtime import flow_engine as flow_engine_module
+
+    state = dict(state or {})
+    workflow_type = workflow_type or flow_name
+    trace_id = ensure_trace_id(state.get("trace_id"))
+    state.setdefault("trace_id", trace_id)
+    context = {
+        "run_id": None,
+        "trace_id": trace_id,
+        "user_id": normalize_uuid(user_id) if user_id is not None else None,
+        "workflow_type": workflow_type,
+        "flow_name": flow_name,
+        "attempts": {},
+        "db": db,
+        "ephemeral": True,
+    }
+    events: list[dict] = []
+
+    def _respond(status: str, result) -> dict:
+        return _format_execution_response(
+            status=status,
+            trace_id=trace_id,
+            result=result,
+            events=events,
+            next_action=_extract_next_action(result) if status == "SUCCESS" else None,
+            run_id=None,
+            state=state,
+        )
+
+    def _fail(error: str, node: str) -> dict:
+        logger.info("[EphemeralFlow] %s failed at %s: %s", flow_name, node, error)
+        return _respond("FAILED", {"error": error, "failed_node": node})
+
+    current_node = flow["start"]
+    while True:
+        try:
+            result = flow_engine_module.execute_node(current_node, state, context)
+        except Exception as exc:
+            events.append(_node_event(current_node, "FAILURE", None, str(exc)))
+            return _fail(str(exc), current_node)
+
+        node_status = result.get("status", "")
+        events.append(
+            _node_event(
+                current_node,
+                node_status,
+                result.get("_execution_time_ms"),
+                result.get("error"),
+            )
+        )
+        if node_status == "RETRY":
+            attempts = context["attempts"].get(current_node, 0)
+            node_cfg = flow.get("node_configs", {}).get(current_node, {})
+            policy = _resolve_retry_policy(
+                execution_type="flow",
+                node_max_retries=node_cfg.get("max_retries"),
+            )
+            if attempts < policy.max_attempts:
+                continue
+            return _fail(f"Node {current_node} failed after {attempts} retries", current_node)
+        if node_status == "FAILURE":
+            return _fail(result.get("error", f"Node {current_node} failed"), current_node)
+        if node_status == "WAIT":
+            return _fail(f"Node {current_node} cannot WAIT in a read-only execution", current_node)
+        if node_status == "SUCCESS":
+            state.update(result.get("output_patch", {}))
+
+        if current_node in flow.get("end", []):
+            return _respond("SUCCESS", _extract_execution_result(workflow_type, state))
+
+        next_node = resolve_next_node(current_node, state, flow)
+        if not next_node:
+            return _fail(f"No next node from {current_node} - flow graph incomplete", current_node)
+        current_node = next_node
+
+
+def _node_event(node: str, status: str, execution_time_ms, error) -> dict:
+    return {
+        "type": "flow.node",
+        "node": node,
+        "status": status,
+        "execution_time_ms": execution_time_ms,
+        "error": error,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
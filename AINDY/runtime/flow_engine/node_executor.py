@@ -42,7 +42,8 @@ def execute_node(node_name: str, state: dict, context: dict) -> dict:
         outcome = "failure"
     else:
         outcome = "neutral"
-    record_execution_feedback(context, outcome)
+    if not context.get("ephemeral"):
+        record_execution_feedback(context, outcome)
     return result
 
 
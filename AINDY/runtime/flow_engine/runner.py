@@ -1,3 +1,10 @@
+from sqlalchemy.orm.exc import ObjectDeletedError, StaleDataError
+
+from AINDY.runtime.flow_engine.checkpoint import (
+    RunCheckpoint,
+    load_run_state,
+    snapshot_state,
+)
 from AINDY.runtime.flow_engine.runner_completion import (
     capture_flow_completion,
 )
@@ -29,6 +36,7 @@ from AINDY.runtime.flow_engine.shared import (
     reset_trace_id,
     set_parent_event_id,
     set_trace_id,
+    system_event_write_behind_enabled,
     uuid,
 )
 
@@ -246,13 +254,12 @@ class PersistentFlowRunner:
             finally:
                 deactivate_async_execution_context(async_token)
 
-        def _reload_run() -> FlowRun | None:
-            return self.db.query(FlowRun).filter(FlowRun.id == db_run_id).first()
-
-        state = run.state or {}
+        # The run stays attached to this session for the whole loop; state
+        # is rebuilt once from the last snapshot plus later node patches.
+        state = load_run_state(self.db, run)
         if isinstance(state, dict) and not state.get("trace_id"):
             state["trace_id"] = run.trace_id or get_trace_id() or str(run.id)
-            run.state = _json_safe(state)
+            snapshot_state(run, state)
             if not run.trace_id:
                 run.trace_id = state["trace_id"]
             self.db.commit()
@@ -274,36 +281,30 @@ class PersistentFlowRunner:
             "attempts": {},
             "db": self.db,
         }
+        run_trace_id = run.trace_id or db_run_id
         self._current_run = run
         self._current_state = state
         self._root_event_id = root_event_id
+        self._checkpoint = checkpoint = RunCheckpoint(self.db, run)
 
         try:
             while True:
-                run = _reload_run()
-                if not run:
-                    return _format_execution_response(
-                        status="FAILED",
-                        trace_id=db_run_id,
-                        result={"error": f"FlowRun {db_run_id} disappeared during execution"},
-                        events=[],
-                        next_action=None,
-                        run_id=db_run_id,
-                    )
-                input_snapshot = dict(state)
+                # FlowHistory is the durable per-node record, so node lifecycle
+                # events may go through the write-behind buffer when enabled.
+                node_events_required = not system_event_write_behind_enabled()
                 node_started_event_id = queue_system_event(
                     db=self.db,
                     event_type=SystemEventTypes.FLOW_NODE_STARTED,
                     user_id=self.user_id,
-                    trace_id=run.trace_id or str(run.id),
+                    trace_id=run_trace_id,
                     parent_event_id=root_event_id,
                     source="flow",
                     payload={
-                        "run_id": str(run.id),
+                        "run_id": db_run_id,
                         "workflow_type": self.workflow_type,
                         "node": current_node,
                     },
-                    required=True,
+                    required=node_events_required,
                 )
 
                 execute_response = self._execute_current_node(
@@ -316,8 +317,29 @@ class PersistentFlowRunner:
                 if execute_response.get("final_response") is not None:
                     return execute_response["final_response"]
 
-                run = _reload_run()
-                if not run:
+                result = execute_response["result"]
+                node_status = result["status"]
+                patch = result.get("output_patch", {})
+                exec_ms = result.get("_execution_time_ms", 0) or execute_response["exec_ms"]
+
+                try:
+                    node_seq = checkpoint.next_node_seq()
+                    self.db.add(
+                        FlowHistory(
+                            flow_run_id=db_run_id,
+                            seq=node_seq,
+                            node_name=current_node,
+                            status=node_status,
+                            output_patch=_json_safe(patch),
+                            execution_time_ms=exec_ms,
+                            error_message=result.get("error"),
+                        )
+                    )
+                    if not checkpoint.write():
+                        raise StaleDataError(f"FlowRun {db_run_id} not found")
+                    self.db.commit()
+                except (ObjectDeletedError, StaleDataError):
+                    self.db.rollback()
                     return _format_execution_response(
                         status="FAILED",
                         trace_id=db_run_id,
@@ -326,24 +348,6 @@ class PersistentFlowRunner:
                         next_action=None,
                         run_id=db_run_id,
                     )
-
-                result = execute_response["result"]
-                node_status = result["status"]
-                patch = result.get("output_patch", {})
-                exec_ms = result.get("_execution_time_ms", 0) or execute_response["exec_ms"]
-
-                self.db.add(
-                    FlowHistory(
-                        flow_run_id=run.id,
-                        node_name=current_node,
-                        status=node_status,
-                        input_state=_json_safe(input_snapshot),
-                        output_patch=_json_safe(patch),
-                        execution_time_ms=exec_ms,
-                        error_message=result.get("error"),
-                    )
-                )
-                self.db.commit()
                 queue_system_event(
                     db=self.db,
                     event_type=(
@@ -352,18 +356,18 @@ class PersistentFlowRunner:
                         else SystemEventTypes.FLOW_NODE_FAILED
                     ),
                     user_id=self.user_id,
-                    trace_id=run.trace_id or str(run.id),
+                    trace_id=run_trace_id,
                     parent_event_id=node_started_event_id,
                     source="flow",
                     payload={
-                        "run_id": str(run.id),
+                        "run_id": db_run_id,
                         "workflow_type": self.workflow_type,
                         "node": current_node,
                         "status": node_status,
                         "execution_time_ms": exec_ms,
                         "error": result.get("error"),
                     },
-                    required=True,
+                    required=node_events_required,
                 )
 
                 node_response = self._handle_node_status(
@@ -1,3 +1,4 @@
+from AINDY.runtime.flow_engine.checkpoint import snapshot_state
 from AINDY.runtime.flow_engine.serialization import (
     _extract_async_handoff,
     _extract_execution_result,
@@ -36,6 +37,7 @@ def maybe_finalize_completion(
                     {
                         type(run).status: handoff["status"].lower(),
                         type(run).state: _json_safe(state),
+                        type(run).checkpoint_seq: type(run).node_seq,
                         type(run).current_node: current_node,
                         type(run).waiting_for: None,
                         type(run).wait_deadline: None,
@@ -68,7 +70,7 @@ def maybe_finalize_completion(
 
         runner._capture_flow_completion(run, state)
         run.status = "success"
-        run.state = _json_safe(state)
+        snapshot_state(run, state)
         run.waiting_for = None
         run.wait_deadline = None
         run.completed_at = datetime.now(timezone.utc)
@@ -1,9 +1,9 @@
+from AINDY.runtime.flow_engine.checkpoint import snapshot_state
 from AINDY.runtime.flow_engine.node_executor import resolve_next_node
 from AINDY.runtime.flow_engine.registry import FLOW_REGISTRY
 from AINDY.runtime.flow_engine.runner_completion import maybe_finalize_completion
 from AINDY.runtime.flow_engine.serialization import (
     _format_execution_response,
-    _json_safe,
     _serialize_flow_events,
 )
 from AINDY.runtime.flow_engine.shared import (
@@ -160,7 +160,7 @@ def _check_resources(self, run, state: dict, current_node: str, node_started_eve
             _timeout = _get_flow_wait_timeout(run.flow_name)
             run.wait_deadline = _default_wait_deadline(_timeout)
             run.current_node = current_node
-            run.state = _json_safe(state)
+            snapshot_state(run, state)
             self.db.commit()
             try:
                 from AINDY.core.wait_condition import WaitCondition
@@ -287,7 +287,7 @@ def _handle_node_status(
         run.waiting_for = wait_for
         _timeout = _get_flow_wait_timeout(run.flow_name)
         run.wait_deadline = _default_wait_deadline(_timeout)
-        run.state = _json_safe(state)
+        snapshot_state(run, state)
         run.current_node = current_node
         self.db.commit()
         try:
@@ -362,7 +362,20 @@ def _advance_to_next_node(
             failed_node=current_node,
             parent_event_id=str(node_started_event_id) if node_started_event_id else None,
         )
-    run.current_node = next_node
-    run.state = _json_safe(state)
+    checkpoint = self._checkpoint
+    written = checkpoint.write(
+        current_node=next_node,
+        state=state if checkpoint.snapshot_due() else None,
+    )
+    if not written:
+        self.db.rollback()
+        return _format_execution_response(
+            status="FAILED",
+            trace_id=str(checkpoint.run_id),
+            result={"error": f"FlowRun {checkpoint.run_id} disappeared before {next_node}"},
+            events=[],
+            next_action=None,
+            run_id=str(checkpoint.run_id),
+        )
     self.db.commit()
     return next_node
@@ -11,6 +11,7 @@ from AINDY.core.execution_envelope import error as execution_error
 from AINDY.core.execution_envelope import success as execution_success
 from AINDY.core.execution_signal_helper import queue_memory_capture, queue_system_event
 from AINDY.core.retry_policy import resolve_retry_policy as _resolve_retry_policy
+from AINDY.core.system_event_buffer import write_behind_enabled as system_event_write_behind_enabled
 from AINDY.core.system_event_service import emit_error_event
 from AINDY.core.system_event_types import SystemEventTypes
 from AINDY.platform_layer.registry import emit_event
@@ -45,6 +45,7 @@ class MemoryOrchestrator:
             tags = request.metadata.get("tags") if request.metadata else None
             override_node_type = request.metadata.get("node_type") if request.metadata else None
             override_node_types = request.metadata.get("node_types") if request.metadata else None
+            search_mode = request.metadata.get("search_mode") if request.metadata else None
             if override_node_type:
                 strategy.node_types = [override_node_type]
             if override_node_types is not None:
@@ -62,6 +63,7 @@ class MemoryOrchestrator:
                 tags=tags,
                 node_types=strategy.node_types,
                 limit=retrieval_limit,
+                search_mode=search_mode,
             )
 
             scored = self.scorer.score(candidates, request)
@@ -94,23 +96,24 @@ class MemoryOrchestrator:
         tags: Optional[list],
         node_types: List[str],
         limit: int,
+        search_mode: Optional[str] = None,
     ) -> List[dict]:
         dao = self.dao(db) if callable(self.dao) else self.dao
         if not dao:
             return []
 
         if not node_types:
-            return _safe_recall(dao, query, tags, limit, user_id, None)
+            return _safe_recall(dao, query, tags, limit, user_id, None, search_mode)
 
         if len(node_types) == 1:
-            return _safe_recall(dao, query, tags, limit, user_id, node_types[0])
+            return _safe_recall(dao, query, tags, limit, user_id, node_types[0], search_mode)
 
         per_type = max(1, int(limit / len(node_types)))
         results: List[dict] = []
         seen = set()
 
         for node_type in node_types:
-            chunk = _safe_recall(dao, query, tags, per_type, user_id, node_type)
+            chunk = _safe_recall(dao, query, tags, per_type, user_id, node_type, search_mode)
             for item in chunk:
                 item_id = item.get("id")
                 if item_id and item_id in seen:
@@ -157,14 +160,16 @@ def _empty_context() -> MemoryContext:
     return MemoryContext(items=[], total_tokens=0, metadata={"fallback": True}, formatted="")
 
 
-def _safe_recall(dao, query, tags, limit, user_id, node_type) -> List[dict]:
+def _safe_recall(dao, query, tags, limit, user_id, node_type, search_mode=None) -> List[dict]:
     try:
+        kwargs = {"search_mode": search_mode} if search_mode else {}
         results = dao.recall(
             query=query,
             tags=tags,
             limit=limit,
             user_id=user_id,
             node_type=node_type,
+            **kwargs,
         )
         if isinstance(results, dict):
             return results.get("results", [])
@@ -101,22 +101,20 @@ class NodusRuntimeAdapter:
         if isinstance(context.state, dict):
             trace_id = str(context.state.get("trace_id") or "")
 
-        payload = json.dumps(
-            {
-                "script": script,
-                "state": context.state or {},
-                "memory_context": context.memory_context or {},
-                "input_payload": context.input_payload or {},
-                "allowed_operations": list(context.allowed_operations or []),
-                "max_execution_ms": max_execution_ms,
-                "context": {
-                    "user_id": str(context.user_id or ""),
-                    "execution_unit_id": str(context.execution_unit_id or ""),
-                    "trace_id": trace_id or str(context.execution_unit_id or ""),
-                    "filename": filename,
-                },
-            }
-        )
+        request = {
+            "script": script,
+            "state": context.state or {},
+            "memory_context": context.memory_context or {},
+            "input_payload": context.input_payload or {},
+            "allowed_operations": list(context.allowed_operations or []),
+            "max_execution_ms": max_execution_ms,
+            "context": {
+                "user_id": str(context.user_id or ""),
+                "execution_unit_id": str(context.execution_unit_id or ""),
+                "trace_id": trace_id or str(context.execution_unit_id or ""),
+                "filename": filename,
+            },
+        }
 
         logger.info(
             "[NodusRuntimeAdapter] Executing '%s' in worker eu=%s user=%s",
@@ -125,10 +123,15 @@ class NodusRuntimeAdapter:
             context.user_id,
         )
 
+        from AINDY.runtime.nodus_worker_pool import worker_pool_enabled
+
+        if worker_pool_enabled():
+            return self._execute_pooled(request, filename, context, max_execution_ms)
+
         try:
             proc = subprocess.run(
                 [sys.executable, str(worker_path)],
-                input=payload,
+                input=json.dumps(request),
                 capture_output=True,
                 text=True,
                 timeout=timeout_s,
@@ -173,6 +176,47 @@ class NodusRuntimeAdapter:
                 raw_result={"stdout": proc.stdout, "stderr": proc.stderr},
             )
 
+        return self._apply_worker_result(result, context, max_execution_ms)
+
+    def _execute_pooled(
+        self,
+        request: dict[str, Any],
+        filename: str,
+        context: NodusExecutionContext,
+        max_execution_ms: int,
+    ) -> NodusExecutionResult:
+        from AINDY.runtime.nodus_worker_pool import (
+            NodusWorkerTimeout,
+            get_nodus_worker_pool,
+        )
+
+        try:
+            result = get_nodus_worker_pool().execute(request, max_execution_ms / 1000.0)
+        except NodusWorkerTimeout:
+            return NodusExecutionResult(
+                output_state={},
+                emitted_events=[],
+                memory_writes=[],
+                status="failure",
+                error=f"Nodus script exceeded {max_execution_ms}ms wall-clock timeout",
+            )
+        except Exception as exc:
+            logger.error("[NodusRuntimeAdapter] Pooled worker failed for '%s': %s", filename, exc)
+            return NodusExecutionResult(
+                output_state={},
+                emitted_events=[],
+                memory_writes=[],
+                status="failure",
+                error=str(exc),
+            )
+        return self._apply_worker_result(result, context, max_execution_ms)
+
+    def _apply_worker_result(
+        self,
+        result: dict[str, Any],
+        context: NodusExecutionContext,
+        max_execution_ms: int,
+    ) -> NodusExecutionResult:
         output_state = dict(result.get("output_state") or {})
         emitted_events = list(result.get("emitted_events") or [])
         memory_writes = list(result.get("memory_writes") or [])
@@ -4,6 +4,7 @@ import contextlib
 import io
 import json
 import os
+import struct
 import sys
 import uuid
 from typing import Any, Optional
@@ -100,10 +101,12 @@ def _remember_factory(memory: DeferredMemoryBuiltins) -> Any:
     return _remember
 
 
-def main() -> int:
-    raw = sys.stdin.read()
-    payload = json.loads(raw or "{}")
+def execute_payload(payload: dict[str, Any]) -> dict[str, Any]:
+    """Run one script request and return the result payload.
 
+    Every call builds a fresh VM, state dict and memory bridge, so nothing
+    from one script is visible to the next when the process is reused.
+    """
     script = str(payload.get("script") or "")
     state = dict(payload.get("state") or {})
     memory_context = dict(payload.get("memory_context") or {})
@@ -251,9 +254,83 @@ def main() -> int:
                 "stdout_log": stdout_buffer.getvalue(),
             }
 
-    sys.stdout.write(json.dumps(result_payload))
+    return result_payload
+
+
+# ── Pool protocol ─────────────────────────────────────────────────────────────
+#
+# ``nodus_worker.py --serve`` keeps the interpreter and the Nodus VM imports
+# warm and answers requests until stdin closes. Each frame is a 4-byte
+# big-endian length followed by that many bytes of UTF-8 JSON.
+
+FRAME_HEADER = struct.Struct(">I")
+MAX_FRAME_BYTES = 256 * 1024 * 1024
+
+
+def read_frame(stream) -> Optional[bytes]:
+    header = stream.read(FRAME_HEADER.size)
+    if not header:
+        return None
+    if len(header) < FRAME_HEADER.size:
+        raise EOFError("truncated frame header")
+    (length,) = FRAME_HEADER.unpack(header)
+    if length > MAX_FRAME_BYTES:
+        raise ValueError(f"frame of {length} bytes exceeds {MAX_FRAME_BYTES}")
+    body = stream.read(length)
+    if len(body) < length:
+        raise EOFError("truncated frame body")
+    return body
+
+
+def write_frame(stream, body: bytes) -> None:
+    stream.write(FRAME_HEADER.pack(len(body)) + body)
+    stream.flush()
+
+
+def _peak_rss_kb() -> Optional[int]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return int(peak // 1024) if sys.platform == "darwin" else int(peak)
+
+
+def serve() -> int:
+    # Keep the protocol channel private: anything else that writes to fd 1
+    # (C extensions, stray prints outside redirect_stdout) goes to stderr.
+    channel = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    requests = sys.stdin.buffer
+
+    from AINDY.nodus.runtime.embedding import AINDYNodusRuntime  # noqa: F401  (warm import)
+    from AINDY.nodus.runtime.memory_bridge import AINDYMemoryBridge  # noqa: F401
+
+    while True:
+        body = read_frame(requests)
+        if body is None:
+            return 0
+        try:
+            result = execute_payload(json.loads(body.decode("utf-8") or "{}"))
+        except Exception as exc:
+            result = {
+                "status": "failure",
+                "output_state": {},
+                "emitted_events": [],
+                "memory_writes": [],
+                "error": str(exc),
+                "stdout_log": "",
+            }
+        result["worker_rss_kb"] = _peak_rss_kb()
+        write_frame(channel, json.dumps(result).encode("utf-8"))
+
+
+def main() -> int:
+    raw = sys.stdin.read()
+    sys.stdout.write(json.dumps(execute_payload(json.loads(raw or "{}"))))
     return 0
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(serve() if "--serve" in sys.argv[1:] else main())
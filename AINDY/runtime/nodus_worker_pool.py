@@ -0,0 +1,343 @@
+"""
+Pre-forked pool of warm Nodus worker processes.
+
+Each worker is ``nodus_worker.py --serve``: a separate interpreter that has
+already imported the Nodus VM and answers length-prefixed JSON requests
+over its stdin/stdout pipes (see ``nodus_worker.read_frame``). Scripts keep
+running out of process, and every request gets a fresh VM and state inside
+the worker, while interpreter start-up and imports are paid once per worker.
+
+A worker is pinned to the tenant (the requesting user) of its first
+request and only serves that tenant afterwards; process-level leftovers
+(module globals, caches, native state) therefore never cross tenants. A
+request prefers an idle worker of its own tenant, then a fresh one, and
+otherwise recycles another tenant's idle worker into a fresh process.
+
+Worker stderr (crash tracebacks, native warnings, stray writes to fd 1) is
+drained into this module's logger, and the last lines are attached to the
+error when a worker dies mid-request.
+
+A worker is retired after ``AINDY_NODUS_WORKER_MAX_EXECUTIONS`` requests,
+when its peak RSS passes ``AINDY_NODUS_WORKER_MAX_RSS_MB``, or when it
+breaks the protocol. A request that overruns its timeout kills the worker
+outright; a replacement is spawned in its place.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Optional
+
+from AINDY.config import settings
+from AINDY.runtime.nodus_worker import read_frame, write_frame
+
+logger = logging.getLogger(__name__)
+
+WORKER_PATH = Path(__file__).parent / "nodus_worker.py"
+_STDERR_TAIL_LINES = 20
+
+
+class NodusWorkerError(RuntimeError):
+    """The worker died or broke the protocol before answering."""
+
+
+class NodusWorkerTimeout(NodusWorkerError):
+    """The request overran its wall-clock budget; the worker was killed."""
+
+
+class _Worker:
+    def __init__(self, python: str, worker_path: Path) -> None:
+        self.proc = subprocess.Popen(
+            [python, str(worker_path), "--serve"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        self.executions = 0
+        self.rss_kb: Optional[int] = None
+        self.tenant: Optional[str] = None
+        self.stderr_tail: deque[str] = deque(maxlen=_STDERR_TAIL_LINES)
+        self._stderr_reader = threading.Thread(
+            target=self._drain_stderr,
+            name=f"nodus-worker-stderr-{self.proc.pid}",
+            daemon=True,
+        )
+        self._stderr_reader.start()
+
+    def _drain_stderr(self) -> None:
+        for raw in iter(self.proc.stderr.readline, b""):
+            line = raw.decode("utf-8", "replace").rstrip()
+            if line:
+                self.stderr_tail.append(line)
+                logger.warning("[NodusWorker pid=%s] %s", self.proc.pid, line)
+        self.proc.stderr.close()
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def request(self, payload: dict[str, Any], timeout_s: float) -> dict[str, Any]:
+        timed_out = threading.Event()
+
+        def _kill() -> None:
+            timed_out.set()
+            self.kill()
+
+        timer = threading.Timer(timeout_s, _kill)
+        timer.daemon = True
+        timer.start()
+        try:
+            write_frame(self.proc.stdin, json.dumps(payload).encode("utf-8"))
+            body = read_frame(self.proc.stdout)
+        except (OSError, EOFError, ValueError) as exc:
+            if timed_out.is_set():
+                raise NodusWorkerTimeout("worker killed on timeout") from exc
+            raise NodusWorkerError(f"Nodus worker failed: {exc}") from exc
+        finally:
+            timer.cancel()
+        if body is None:
+            if timed_out.is_set():
+                raise NodusWorkerTimeout("worker killed on timeout")
+            code = self.proc.wait(timeout=5)
+            self._stderr_reader.join(timeout=1)
+            tail = "\n".join(self.stderr_tail)
+            raise NodusWorkerError(
+                f"Nodus worker exited unexpectedly (code {code})" + (f": {tail}" if tail else "")
+            )
+        self.executions += 1
+        result = json.loads(body.decode("utf-8"))
+        self.rss_kb = result.pop("worker_rss_kb", None)
+        return result
+
+    def close(self, timeout: float = 2.0) -> None:
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(timeout=timeout)
+        except Exception:
+            self.kill()
+
+    def kill(self) -> None:
+        try:
+            self.proc.kill()
+            self.proc.wait(timeout=5)
+        except Exception:
+            pass
+
+
+class NodusWorkerPool:
+    """Fixed-size pool of warm ``nodus_worker.py --serve`` processes."""
+
+    def __init__(
+        self,
+        *,
+        size: int | None = None,
+        max_executions: int | None = None,
+        max_rss_mb: int | None = None,
+        python: str | None = None,
+        worker_path: Path | None = None,
+    ) -> None:
+        self.size = max(1, int(size if size is not None else settings.AINDY_NODUS_WORKER_POOL_SIZE))
+        self.max_executions = max(
+            1,
+            int(max_executions if max_executions is not None else settings.AINDY_NODUS_WORKER_MAX_EXECUTIONS),
+        )
+        self.max_rss_kb = (
+            int(max_rss_mb if max_rss_mb is not None else settings.AINDY_NODUS_WORKER_MAX_RSS_MB) * 1024
+        )
+        self._python = python or sys.executable
+        self._worker_path = worker_path or WORKER_PATH
+        self._idle: list[_Worker] = []
+        self._live = 0
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._closed = False
+        self._recycled: dict[str, int] = {}
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        """Pre-fork workers up to the pool size."""
+        with self._lock:
+            missing = self.size - self._live
+            self._live += max(0, missing)
+        for _ in range(max(0, missing)):
+            self._release(self._spawn())
+        logger.info("[NodusWorkerPool] %d warm worker(s) started.", self.size)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        self._closed = True
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self._live -= len(idle)
+            self._available.notify_all()
+        for worker in idle:
+            worker.close(timeout=timeout)
+        logger.info("[NodusWorkerPool] Workers stopped.")
+
+    # ── Execution ─────────────────────────────────────────────────────────────
+
+    def execute(self, payload: dict[str, Any], timeout_s: float) -> dict[str, Any]:
+        """Run one worker request; raises NodusWorkerTimeout / NodusWorkerError."""
+        if self._closed:
+            raise NodusWorkerError("Nodus worker pool is shut down")
+        tenant = str((payload.get("context") or {}).get("user_id") or "")
+        worker = self._acquire(tenant, timeout_s)
+        try:
+            result = worker.request(payload, timeout_s)
+        except NodusWorkerTimeout:
+            self._retire(worker, "timeout", kill=True)
+            raise
+        except Exception:
+            self._retire(worker, "error", kill=True)
+            raise
+        reason = self._recycle_reason(worker)
+        if reason:
+            self._retire(worker, reason)
+        else:
+            self._release(worker)
+        return result
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            live = self._live
+            idle = len(self._idle)
+        return {
+            "size": self.size,
+            "live": live,
+            "idle": idle,
+            "recycled": dict(self._recycled),
+        }
+
+    def _take_idle_locked(self, tenant: str) -> Optional[_Worker]:
+        """Pop the best idle worker: same tenant, then fresh, then any."""
+        if not self._idle:
+            return None
+        for wanted in (tenant, None):
+            for index, worker in enumerate(self._idle):
+                if worker.tenant == wanted:
+                    return self._idle.pop(index)
+        return self._idle.pop(0)
+
+    def _acquire(self, tenant: str, timeout_s: float) -> _Worker:
+        deadline = time.monotonic() + timeout_s
+        with self._available:
+            while True:
+                if self._closed:
+                    raise NodusWorkerError("Nodus worker pool is shut down")
+                worker = self._take_idle_locked(tenant)
+                if worker is not None:
+                    break
+                if self._live < self.size:
+                    self._live += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise NodusWorkerTimeout("no Nodus worker became available in time")
+                self._available.wait(remaining)
+        if worker is not None:
+            reason = None
+            if not worker.alive:
+                reason = "died"
+            elif worker.tenant not in (None, tenant):
+                reason = "tenant_switch"
+            if reason is None:
+                worker.tenant = tenant
+                return worker
+            self._retire(worker, reason, replace=False)
+            with self._lock:
+                self._live += 1
+        worker = self._spawn()
+        worker.tenant = tenant
+        return worker
+
+    def _release(self, worker: _Worker) -> None:
+        with self._available:
+            if not self._closed:
+                self._idle.append(worker)
+                self._available.notify()
+                return
+            self._live -= 1
+        worker.close()
+
+    def _recycle_reason(self, worker: _Worker) -> Optional[str]:
+        if not worker.alive:
+            return "died"
+        if worker.executions >= self.max_executions:
+            return "max_executions"
+        if self.max_rss_kb > 0 and worker.rss_kb and worker.rss_kb > self.max_rss_kb:
+            return "memory"
+        return None
+
+    def _retire(self, worker: _Worker, reason: str, *, kill: bool = False, replace: bool = True) -> None:
+        if kill:
+            worker.kill()
+        else:
+            threading.Thread(target=worker.close, daemon=True).start()
+        with self._lock:
+            self._live -= 1
+            self._recycled[reason] = self._recycled.get(reason, 0) + 1
+        _record_recycle(reason)
+        logger.debug(
+            "[NodusWorkerPool] retired worker pid=%s after %d execution(s): %s",
+            worker.proc.pid,
+            worker.executions,
+            reason,
+        )
+        if replace and not self._closed:
+            with self._lock:
+                if self._live >= self.size:
+                    return
+                self._live += 1
+            try:
+                self._release(self._spawn())
+            except Exception as exc:
+                logger.warning("[NodusWorkerPool] replacement spawn failed: %s", exc)
+
+    def _spawn(self) -> _Worker:
+        try:
+            return _Worker(self._python, self._worker_path)
+        except Exception:
+            with self._lock:
+                self._live -= 1
+            raise
+
+
+def _record_recycle(reason: str) -> None:
+    try:
+        from AINDY.platform_layer.metrics import nodus_worker_recycled_total
+
+        nodus_worker_recycled_total.labels(reason=reason).inc()
+    except Exception:
+        pass
+
+
+_pool: Optional[NodusWorkerPool] = None
+_pool_lock = threading.Lock()
+
+
+def worker_pool_enabled() -> bool:
+    return bool(settings.AINDY_NODUS_WORKER_POOL_ENABLED)
+
+
+def get_nodus_worker_pool() -> NodusWorkerPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = NodusWorkerPool()
+                _pool.start()
+    return _pool
+
+
+def shutdown_nodus_worker_pool(timeout: float = 5.0) -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(timeout=timeout)
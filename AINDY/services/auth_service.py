@@ -197,6 +197,15 @@ def _resolve_authenticated_jwt_user(payload: dict, db: Session | None) -> dict:
     if not isinstance(db, Session):
         return resolved
 
+    from AINDY.auth.principal_cache import USER, get_principal_cache
+
+    cache = get_principal_cache()
+    token_tv = int(payload.get("tv", 0))
+    cached = cache.get(USER, str(user_uuid))
+    if cached is not None and cached["token_version"] == token_tv:
+        resolved.update(cached["claims"])
+        return resolved
+
     try:
         user = db.query(User).filter(User.id == user_uuid).first()
     except Exception:
@@ -210,7 +219,6 @@ def _resolve_authenticated_jwt_user(payload: dict, db: Session | None) -> dict:
             headers={"WWW-Authenticate": "Bearer"},
         )
     user_tv = int(getattr(user, "token_version", 0))
-    token_tv = int(payload.get("tv", 0))
     if token_tv != user_tv:
         raise HTTPException(
             status_code=401,
@@ -224,11 +232,15 @@ def _resolve_authenticated_jwt_user(payload: dict, db: Session | None) -> dict:
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    resolved["sub"] = str(user.id)
-    resolved["user_id"] = str(user.id)
-    resolved["email"] = user.email
-    resolved["username"] = user.username
-    resolved["is_admin"] = bool(getattr(user, "is_admin", False))
+    claims = {
+        "sub": str(user.id),
+        "user_id": str(user.id),
+        "email": user.email,
+        "username": user.username,
+        "is_admin": bool(getattr(user, "is_admin", False)),
+    }
+    cache.put(USER, str(user_uuid), {"token_version": user_tv, "claims": claims})
+    resolved.update(claims)
     return resolved
 
 
@@ -294,7 +306,16 @@ def _resolve_platform_key_as_user(raw_key: str, db: Session) -> dict:
     from sqlalchemy import text as _text
     from AINDY.db.models.api_key import PlatformAPIKey
 
+    from AINDY.auth.principal_cache import API_KEY_USER, get_principal_cache
+
     key_hash = hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
+    cache = get_principal_cache()
+    cached = cache.get(API_KEY_USER, key_hash)
+    if cached is not None and (
+        cached["expires_at"] is None or datetime.now(timezone.utc) <= cached["expires_at"]
+    ):
+        return dict(cached["user"])
+
     record = db.query(PlatformAPIKey).filter(PlatformAPIKey.key_hash == key_hash).first()
 
     if record is None or not record.is_valid():
@@ -322,13 +343,15 @@ def _resolve_platform_key_as_user(raw_key: str, db: Session) -> dict:
     else:
         scopes = []
 
-    return {
+    user = {
         "sub": str(record.user_id),
         "user_id": str(record.user_id),
         "auth_type": "api_key",
         "api_key_id": str(record.id),
         "api_key_scopes": list(scopes),
     }
+    cache.put(API_KEY_USER, key_hash, {"expires_at": record.expires_at, "user": user})
+    return dict(user)
 
 
 def get_optional_user(
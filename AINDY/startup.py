@@ -877,6 +877,13 @@ def _start_background_services(db_factory) -> bool:
         from AINDY.core.request_metric_writer import get_writer as get_metric_writer
 
         get_metric_writer().start()
+    try:
+        from AINDY.runtime.nodus_worker_pool import get_nodus_worker_pool, worker_pool_enabled
+
+        if worker_pool_enabled():
+            get_nodus_worker_pool()
+    except Exception as exc:
+        logger.warning("Nodus worker pool startup failed: %s", exc)
     try:
         from AINDY.platform_layer.async_job_service import start_async_job_service
         from AINDY.memory.memory_ingest_service import configure_memory_ingest_queue
@@ -966,6 +973,12 @@ async def _restore_dynamic_registry(db_factory) -> None:
                 )
         finally:
             _restore_verify_db.close()
+        if settings.AINDY_WEBHOOK_OUTBOX_ENABLED:
+            # Subscriptions are loaded; start the engine so outbox recovery
+            # retries deliveries left pending by a previous process.
+            from AINDY.platform_layer.webhook_delivery import get_webhook_delivery_engine
+
+            get_webhook_delivery_engine().start()
 
 
 def _validate_router_boundary() -> None:
@@ -1203,6 +1216,42 @@ async def lifespan(app: FastAPI):
         get_metric_writer().stop(timeout=_remaining_shutdown_budget(shutdown_deadline))
     except Exception as exc:
         logger.warning("Request metric writer shutdown failed: %s", exc)
+    try:
+        from AINDY.core.system_event_buffer import flush_system_events, get_system_event_buffer, write_behind_enabled
+
+        if write_behind_enabled():
+            get_system_event_buffer().stop(timeout=_remaining_shutdown_budget(shutdown_deadline))
+        else:
+            flush_system_events()
+    except Exception as exc:
+        logger.warning("System event buffer shutdown failed: %s", exc)
+    try:
+        from AINDY.platform_layer.webhook_delivery import shutdown_webhook_delivery
+
+        shutdown_webhook_delivery(timeout=_remaining_shutdown_budget(shutdown_deadline))
+    except Exception as exc:
+        logger.warning("Webhook delivery engine shutdown failed: %s", exc)
+    try:
+        from AINDY.platform_layer.api_key_service import flush_last_used, get_last_used_buffer, last_used_coalescing_enabled
+
+        if last_used_coalescing_enabled():
+            get_last_used_buffer().stop(timeout=_remaining_shutdown_budget(shutdown_deadline))
+        else:
+            flush_last_used()
+    except Exception as exc:
+        logger.warning("API key last_used buffer shutdown failed: %s", exc)
+    try:
+        from AINDY.runtime.nodus_worker_pool import shutdown_nodus_worker_pool
+
+        shutdown_nodus_worker_pool(timeout=_remaining_shutdown_budget(shutdown_deadline))
+    except Exception as exc:
+        logger.warning("Nodus worker pool shutdown failed: %s", exc)
+    try:
+        from AINDY.core.execution_loop import shutdown_handler_executor
+
+        shutdown_handler_executor(wait=False)
+    except Exception as exc:
+        logger.warning("Pipeline handler executor shutdown failed: %s", exc)
     try:
         scheduler_service.stop(
             timeout_seconds=_remaining_shutdown_budget(shutdown_deadline)
@@ -0,0 +1,60 @@
+"""webhook delivery outbox
+
+Adds webhook_deliveries, the durable outbox used by the webhook delivery
+engine so pending deliveries survive restarts.
+
+Revision ID: a7c3e5f9b2d1
+Revises: d8e9f0a1b2c3
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "a7c3e5f9b2d1"
+down_revision: Union[str, Sequence[str], None] = "d8e9f0a1b2c3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "webhook_deliveries",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("subscription_id", sa.String(64), nullable=False),
+        sa.Column("event_id", sa.String(64), nullable=True),
+        sa.Column("event_type", sa.String(256), nullable=False),
+        sa.Column("body", sa.Text(), nullable=False),
+        sa.Column("status", sa.String(16), nullable=False, server_default="pending"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("next_attempt_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("generation", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_status_code", sa.Integer(), nullable=True),
+        sa.Column("last_error", sa.String(512), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        sa.Column("delivered_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "ix_webhook_deliveries_subscription_id",
+        "webhook_deliveries",
+        ["subscription_id"],
+    )
+    op.create_index(
+        "ix_webhook_deliveries_status_next_attempt",
+        "webhook_deliveries",
+        ["status", "next_attempt_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_webhook_deliveries_status_next_attempt", table_name="webhook_deliveries")
+    op.drop_index("ix_webhook_deliveries_subscription_id", table_name="webhook_deliveries")
+    op.drop_table("webhook_deliveries")
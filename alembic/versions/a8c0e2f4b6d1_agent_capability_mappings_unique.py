@@ -0,0 +1,87 @@
+"""agent_capability_mappings partial unique indexes
+
+Adds one partial unique index per mapping kind so capability mappings can
+be written with INSERT ... ON CONFLICT DO NOTHING instead of loading the
+whole table to check for existing keys:
+
+  ux_agent_capability_mappings_type_capability
+      (agent_type, capability_id) WHERE agent_run_id IS NULL
+  ux_agent_capability_mappings_run_capability
+      (agent_run_id, capability_id) WHERE agent_run_id IS NOT NULL
+
+Duplicate rows left by concurrent writers under the old read-then-insert
+code are removed first, keeping one row per key.
+
+Revision ID: a8c0e2f4b6d1
+Revises: d3f5a7c9e1b4
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "a8c0e2f4b6d1"
+down_revision: Union[str, Sequence[str], None] = "d3f5a7c9e1b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE_NAME = "agent_capability_mappings"
+_INDEXES = (
+    ("ux_agent_capability_mappings_type_capability", ["agent_type", "capability_id"], "agent_run_id IS NULL"),
+    ("ux_agent_capability_mappings_run_capability", ["agent_run_id", "capability_id"], "agent_run_id IS NOT NULL"),
+)
+
+
+def _delete_duplicates(bind) -> None:
+    if bind.dialect.name == "postgresql":
+        op.execute(
+            sa.text(
+                f"""
+                DELETE FROM {TABLE_NAME} a
+                USING {TABLE_NAME} b
+                WHERE a.capability_id = b.capability_id
+                  AND a.id::text > b.id::text
+                  AND (
+                    (a.agent_run_id IS NULL AND b.agent_run_id IS NULL AND a.agent_type = b.agent_type)
+                    OR (a.agent_run_id IS NOT NULL AND a.agent_run_id = b.agent_run_id)
+                  )
+                """
+            )
+        )
+        return
+    for columns, predicate in (
+        ("agent_type, capability_id", "agent_run_id IS NULL"),
+        ("agent_run_id, capability_id", "agent_run_id IS NOT NULL"),
+    ):
+        op.execute(
+            sa.text(
+                f"""
+                DELETE FROM {TABLE_NAME}
+                WHERE {predicate}
+                  AND rowid NOT IN (
+                    SELECT MIN(rowid) FROM {TABLE_NAME} WHERE {predicate} GROUP BY {columns}
+                  )
+                """
+            )
+        )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    _delete_duplicates(bind)
+    for name, columns, predicate in _INDEXES:
+        op.create_index(
+            name,
+            TABLE_NAME,
+            columns,
+            unique=True,
+            postgresql_where=sa.text(predicate),
+            sqlite_where=sa.text(predicate),
+        )
+
+
+def downgrade() -> None:
+    for name, _, _ in reversed(_INDEXES):
+        op.drop_index(name, table_name=TABLE_NAME)
@@ -0,0 +1,47 @@
+"""webhook delivery leases
+
+Adds claimed_by / lease_until to webhook_deliveries. The instance that owns
+a pending delivery (queued behind a per-host limit, in flight, or waiting on
+a retry timer) keeps renewing its lease, and recovery only claims rows
+whose lease has lapsed. Also indexes (status, created_at) for the
+retention sweep of delivered and failed rows.
+
+Revision ID: b4d6f8a0c2e5
+Revises: a8c0e2f4b6d1
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "b4d6f8a0c2e5"
+down_revision: Union[str, Sequence[str], None] = "a8c0e2f4b6d1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("webhook_deliveries", sa.Column("claimed_by", sa.String(64), nullable=True))
+    op.add_column(
+        "webhook_deliveries",
+        sa.Column("lease_until", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "ix_webhook_deliveries_status_lease",
+        "webhook_deliveries",
+        ["status", "lease_until"],
+    )
+    op.create_index(
+        "ix_webhook_deliveries_status_created",
+        "webhook_deliveries",
+        ["status", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_webhook_deliveries_status_created", table_name="webhook_deliveries")
+    op.drop_index("ix_webhook_deliveries_status_lease", table_name="webhook_deliveries")
+    op.drop_column("webhook_deliveries", "lease_until")
+    op.drop_column("webhook_deliveries", "claimed_by")
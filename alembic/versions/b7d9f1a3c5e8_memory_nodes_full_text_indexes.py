@@ -0,0 +1,55 @@
+"""memory_nodes full-text indexes
+
+Adds a GIN index on to_tsvector('english', coalesce(content, '')) for ranked
+full-text recall, and a pg_trgm GIN index on content so substring (ILIKE)
+matches stop scanning the table. Both are expression/operator-class indexes
+maintained by Postgres itself, so no tsvector column or trigger is needed
+(the old content_tsv column was dropped as model drift in edc8c8d84cbb).
+The trigram index is skipped when pg_trgm is not available. No-op on other
+dialects.
+
+Revision ID: b7d9f1a3c5e8
+Revises: e4f6a8c0d2b5
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "b7d9f1a3c5e8"
+down_revision: Union[str, Sequence[str], None] = "e4f6a8c0d2b5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    op.execute(
+        sa.text(
+            "CREATE INDEX IF NOT EXISTS ix_memory_nodes_content_fts ON memory_nodes "
+            "USING gin (to_tsvector('english'::regconfig, coalesce(content, '')))"
+        )
+    )
+    trgm_available = bind.execute(
+        sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    ).scalar()
+    if trgm_available:
+        op.execute(sa.text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        op.execute(
+            sa.text(
+                "CREATE INDEX IF NOT EXISTS ix_memory_nodes_content_trgm ON memory_nodes "
+                "USING gin (content gin_trgm_ops)"
+            )
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute(sa.text("DROP INDEX IF EXISTS ix_memory_nodes_content_trgm"))
+    op.execute(sa.text("DROP INDEX IF EXISTS ix_memory_nodes_content_fts"))
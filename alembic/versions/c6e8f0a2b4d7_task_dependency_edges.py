@@ -0,0 +1,98 @@
+"""task dependency edges
+
+Adds task_dependencies, a reverse-dependency index over tasks.depends_on and
+tasks.parent_task_id, and backfills it from existing tasks.
+
+Revision ID: c6e8f0a2b4d7
+Revises: a7c3e5f9b2d1
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "c6e8f0a2b4d7"
+down_revision: Union[str, Sequence[str], None] = "a7c3e5f9b2d1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _edges(rows):
+    for task_id, user_id, depends_on, parent_task_id in rows:
+        seen = set()
+        for dependency in depends_on or []:
+            if not isinstance(dependency, dict) or dependency.get("task_id") is None:
+                continue
+            dependency_id = int(dependency["task_id"])
+            if dependency_id in seen:
+                continue
+            seen.add(dependency_id)
+            yield {
+                "task_id": task_id,
+                "depends_on_task_id": dependency_id,
+                "user_id": user_id,
+                "dependency_type": dependency.get("dependency_type") or "hard",
+            }
+        if parent_task_id is not None and int(parent_task_id) not in seen:
+            yield {
+                "task_id": task_id,
+                "depends_on_task_id": int(parent_task_id),
+                "user_id": user_id,
+                "dependency_type": "parent",
+            }
+
+
+def upgrade() -> None:
+    edges = op.create_table(
+        "task_dependencies",
+        sa.Column(
+            "task_id",
+            sa.Integer(),
+            sa.ForeignKey("tasks.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column(
+            "depends_on_task_id",
+            sa.Integer(),
+            sa.ForeignKey("tasks.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("dependency_type", sa.String(), nullable=False, server_default="hard"),
+    )
+    op.create_index(
+        "ix_task_dependencies_depends_on",
+        "task_dependencies",
+        ["depends_on_task_id", "task_id"],
+    )
+
+    bind = op.get_bind()
+    tasks = sa.table(
+        "tasks",
+        sa.column("id", sa.Integer()),
+        sa.column("user_id", postgresql.UUID(as_uuid=True)),
+        sa.column("depends_on", sa.JSON()),
+        sa.column("parent_task_id", sa.Integer()),
+    )
+    rows = bind.execute(
+        sa.select(tasks.c.id, tasks.c.user_id, tasks.c.depends_on, tasks.c.parent_task_id)
+    ).all()
+    existing = {row[0] for row in rows}
+    batch = []
+    for edge in _edges(rows):
+        if edge["depends_on_task_id"] not in existing:
+            continue
+        batch.append(edge)
+        if len(batch) >= 1000:
+            op.bulk_insert(edges, batch)
+            batch = []
+    if batch:
+        op.bulk_insert(edges, batch)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_task_dependencies_depends_on", table_name="task_dependencies")
+    op.drop_table("task_dependencies")
@@ -0,0 +1,67 @@
+"""tune memory_nodes embedding ann index
+
+Rebuilds the HNSW index on memory_nodes.embedding with explicit build
+parameters. Query-time breadth (hnsw.ef_search / ivfflat.probes) is set per
+query by MemoryNodeDAO.find_similar from the requested search_mode.
+
+Set MEMORY_ANN_INDEX=ivfflat before upgrading to build an IVFFlat index
+instead (faster to build, lower recall); the list count is derived from the
+current row count, so build it once the table is populated.
+
+Revision ID: c7d8e9f0a1b2
+Revises: ee244b96f4ff
+Create Date: 2026-10-18
+"""
+
+import math
+import os
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "c7d8e9f0a1b2"
+down_revision: Union[str, Sequence[str], None] = "ee244b96f4ff"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 128
+
+
+def _is_postgres() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def upgrade() -> None:
+    if not _is_postgres():
+        return
+    op.execute("DROP INDEX IF EXISTS ix_memory_nodes_embedding_hnsw;")
+    op.execute("DROP INDEX IF EXISTS ix_memory_nodes_embedding_ivfflat;")
+    if os.getenv("MEMORY_ANN_INDEX", "hnsw").strip().lower() == "ivfflat":
+        rows = op.get_bind().execute(
+            sa.text("SELECT count(*) FROM memory_nodes WHERE embedding IS NOT NULL")
+        ).scalar() or 0
+        lists = max(100, int(math.sqrt(rows)))
+        op.execute(
+            "CREATE INDEX ix_memory_nodes_embedding_ivfflat ON memory_nodes "
+            f"USING ivfflat (embedding vector_cosine_ops) WITH (lists = {lists});"
+        )
+        return
+    op.execute(
+        "CREATE INDEX ix_memory_nodes_embedding_hnsw ON memory_nodes "
+        "USING hnsw (embedding vector_cosine_ops) "
+        f"WITH (m = {HNSW_M}, ef_construction = {HNSW_EF_CONSTRUCTION});"
+    )
+
+
+def downgrade() -> None:
+    if not _is_postgres():
+        return
+    op.execute("DROP INDEX IF EXISTS ix_memory_nodes_embedding_ivfflat;")
+    op.execute("DROP INDEX IF EXISTS ix_memory_nodes_embedding_hnsw;")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_memory_nodes_embedding_hnsw ON memory_nodes "
+        "USING hnsw (embedding vector_cosine_ops);"
+    )
@@ -0,0 +1,68 @@
+"""memory_nodes content fingerprints
+
+Adds content_hash (sha256 of the whitespace-collapsed, lower-cased content)
+and content_simhash to memory_nodes, an index on (user_id, content_hash) for
+exact capture dedup and one on (user_id, created_at) for the near-duplicate
+index's incremental refresh. content_hash is backfilled in batches;
+content_simhash is only set for nodes written from now on.
+
+The (user_id, content_hash) index is not unique: DAO.save and the MAS path
+writers may store the same text twice on purpose, and existing rows already
+do.
+
+Revision ID: d3f5a7c9e1b4
+Revises: b7d9f1a3c5e8
+Create Date: 2026-10-18
+"""
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "d3f5a7c9e1b4"
+down_revision: Union[str, Sequence[str], None] = "b7d9f1a3c5e8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_BATCH = 5000
+
+
+def _content_hash(content):
+    # Must match AINDY.memory.content_fingerprint.content_hash.
+    normalized = " ".join((content or "").split()).lower()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def upgrade() -> None:
+    op.add_column("memory_nodes", sa.Column("content_hash", sa.String(length=64), nullable=True))
+    op.add_column("memory_nodes", sa.Column("content_simhash", sa.BigInteger(), nullable=True))
+
+    bind = op.get_bind()
+    nodes = sa.table(
+        "memory_nodes",
+        sa.column("id"),
+        sa.column("content", sa.Text()),
+        sa.column("content_hash", sa.String()),
+    )
+    while True:
+        rows = bind.execute(
+            sa.select(nodes.c.id, nodes.c.content).where(nodes.c.content_hash.is_(None)).limit(_BATCH)
+        ).fetchall()
+        if not rows:
+            break
+        bind.execute(
+            nodes.update().where(nodes.c.id == sa.bindparam("node_id")).values(content_hash=sa.bindparam("hash")),
+            [{"node_id": row.id, "hash": _content_hash(row.content)} for row in rows],
+        )
+
+    op.create_index("ix_memory_nodes_user_content_hash", "memory_nodes", ["user_id", "content_hash"])
+    op.create_index("ix_memory_nodes_user_created_at", "memory_nodes", ["user_id", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_memory_nodes_user_created_at", table_name="memory_nodes")
+    op.drop_index("ix_memory_nodes_user_content_hash", table_name="memory_nodes")
+    op.drop_column("memory_nodes", "content_simhash")
+    op.drop_column("memory_nodes", "content_hash")
@@ -0,0 +1,45 @@
+"""flow run delta checkpoints
+
+Adds the bookkeeping for delta-checkpointed flow state:
+flow_runs.node_seq / checkpoint_seq and flow_history.seq. FlowRun.state is
+the snapshot as of checkpoint_seq; FlowHistory rows with a higher seq carry
+the patches applied since.
+
+Revision ID: d8e9f0a1b2c3
+Revises: c7d8e9f0a1b2
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "d8e9f0a1b2c3"
+down_revision: Union[str, Sequence[str], None] = "c7d8e9f0a1b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "flow_runs",
+        sa.Column("node_seq", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "flow_runs",
+        sa.Column("checkpoint_seq", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column("flow_history", sa.Column("seq", sa.Integer(), nullable=True))
+    op.create_index(
+        "ix_flow_history_flow_run_id_seq",
+        "flow_history",
+        ["flow_run_id", "seq"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_flow_history_flow_run_id_seq", table_name="flow_history")
+    op.drop_column("flow_history", "seq")
+    op.drop_column("flow_runs", "checkpoint_seq")
+    op.drop_column("flow_runs", "node_seq")
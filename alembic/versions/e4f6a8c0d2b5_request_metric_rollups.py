@@ -0,0 +1,65 @@
+"""request metric rollups
+
+Adds request_metric_rollups, per-minute request aggregates by path, status
+class and user written alongside the raw request_metrics rows.
+
+Revision ID: e4f6a8c0d2b5
+Revises: c6e8f0a2b4d7
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "e4f6a8c0d2b5"
+down_revision: Union[str, Sequence[str], None] = "c6e8f0a2b4d7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "request_metric_rollups",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("bucket_start", sa.DateTime(), nullable=False),
+        sa.Column("path", sa.String(), nullable=False),
+        sa.Column("status_class", sa.Integer(), nullable=False),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("request_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("duration_sum_ms", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("duration_max_ms", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("latency_le_5", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("latency_le_10", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("latency_le_25", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("latency_le_50", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("latency_le_100", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("latency_le_250", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("latency_le_500", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("latency_le_1000", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("latency_le_2500", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("latency_le_5000", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("latency_le_10000", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("latency_le_30000", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("latency_gt_30000", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.create_index("ix_request_metric_rollups_bucket_start", "request_metric_rollups", ["bucket_start"])
+    op.create_index(
+        "ix_request_metric_rollups_user_bucket",
+        "request_metric_rollups",
+        ["user_id", "bucket_start"],
+    )
+    op.create_index(
+        "ix_request_metric_rollups_path_bucket",
+        "request_metric_rollups",
+        ["path", "bucket_start"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_request_metric_rollups_path_bucket", table_name="request_metric_rollups")
+    op.drop_index("ix_request_metric_rollups_user_bucket", table_name="request_metric_rollups")
+    op.drop_index("ix_request_metric_rollups_bucket_start", table_name="request_metric_rollups")
+    op.drop_table("request_metric_rollups")
@@ -0,0 +1,120 @@
+"""
+Per-chunk ARM analysis results, keyed by content hash.
+
+Large files are analyzed chunk by chunk (see ``DeepSeekCodeAnalyzer``). Each
+chunk's parsed result is stored under a SHA-256 of the requesting user, the
+chunk text and everything else that shapes the answer to it: model,
+temperature, file type and the caller's additional context. Re-analyzing an
+edited file therefore only sends the chunks whose text changed, even when
+an insert or append shifts the others to a new position.
+
+Each chunk prompt carries the user's recalled memory and identity context,
+so a result may reflect or quote them; keying on the user keeps it from
+being served to anyone else. The ``part i of n`` note and the exact
+memory/identity text are left out of the key: they change between runs of
+the same file, and a chunk result computed for another position or against
+the same user's slightly older context is still a valid analysis of that
+code. Findings are tagged with their chunk number when results are merged,
+not cached.
+Entries expire after ``AINDY_ARM_CHUNK_CACHE_TTL_SECONDS`` and the cache
+holds at most ``AINDY_ARM_CHUNK_CACHE_MAX_ENTRIES`` results (LRU).
+"""
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from AINDY.config import settings
+
+
+def chunk_cache_key(
+    *,
+    user_id: Any,
+    chunk: str,
+    model: str,
+    temperature: float,
+    file_type: str,
+    additional_context: str = "",
+) -> str:
+    header = json.dumps(
+        [str(user_id or ""), model, temperature, file_type, additional_context],
+        default=str,
+    )
+    digest = hashlib.sha256(header.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(chunk.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ChunkResultCache:
+    """Entry-bounded LRU of chunk analysis results with a per-entry TTL."""
+
+    def __init__(self, *, max_entries: int, ttl_seconds: float):
+        self.max_entries = int(max_entries)
+        self.ttl_seconds = float(ttl_seconds)
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Return a copy of the cached chunk result, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return copy.deepcopy(entry[1])
+            if entry is not None:
+                del self._entries[key]
+            self._misses += 1
+            return None
+
+    def put(self, key: str, value: dict[str, Any]) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self._hits, "misses": self._misses}
+
+
+_cache: ChunkResultCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_chunk_result_cache() -> ChunkResultCache | None:
+    """Return the process-wide cache, or None when it is disabled."""
+    global _cache
+    if not settings.AINDY_ARM_CHUNK_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ChunkResultCache(
+                    max_entries=settings.AINDY_ARM_CHUNK_CACHE_MAX_ENTRIES,
+                    ttl_seconds=settings.AINDY_ARM_CHUNK_CACHE_TTL_SECONDS,
+                )
+    return _cache
+
+
+def reset_chunk_result_cache() -> None:
+    global _cache
+    with _cache_lock:
+        _cache = None
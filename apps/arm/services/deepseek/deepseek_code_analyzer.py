@@ -14,10 +14,12 @@ Every operation is:
 - Tagged with an Infinity Algorithm Task Priority score
 - Fully traceable and auditable
 """
+import contextvars
 import json
 import logging
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 from AINDY.core.execution_signal_helper import queue_memory_capture
@@ -31,9 +33,10 @@ from sqlalchemy.orm import Session
 from apps.arm.services.deepseek.security_deepseek import SecurityValidator
 from apps.arm.services.deepseek.file_processor_deepseek import FileProcessor
 from apps.arm.services.deepseek.config_manager_deepseek import ConfigManager, DEFAULT_CONFIG
+from apps.arm.services.deepseek.chunk_result_cache import chunk_cache_key, get_chunk_result_cache
 from apps.arm.models import AnalysisResult, CodeGeneration
 from AINDY.config import settings
-from AINDY.platform_layer.external_call_service import perform_external_call
+from AINDY.platform_layer.external_call_service import external_call_key, perform_external_call
 
 OpenAI = None
 
@@ -156,6 +159,21 @@ class DeepSeekCodeAnalyzer:
         retry_delay = self.config.get("retry_delay_seconds", 2)
         max_tokens = self.config.get("max_output_tokens", 2000)
 
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ]
+        response_format = {"type": "json_object"}
+        # Identical in-flight analyses share one request; temperature 0 is
+        # deterministic enough to also serve repeats from the call cache.
+        dedupe_key = external_call_key(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            response_format=response_format,
+        )
+
         last_exc = None
         for attempt in range(retry_limit):
             try:
@@ -167,16 +185,15 @@ class DeepSeekCodeAnalyzer:
                     model=model,
                     method="deepseek.chat",
                     extra={"purpose": "arm_openai_call", "attempt": attempt + 1},
+                    dedupe_key=dedupe_key,
+                    cache=temperature == 0,
                     operation=lambda: chat_completion_deepseek(
                         self.client,
                         model=model,
-                        messages=[
-                            {"role": "system", "content": system_prompt},
-                            {"role": "user", "content": user_prompt},
-                        ],
+                        messages=messages,
                         temperature=temperature,
                         max_tokens=max_tokens,
-                        response_format={"type": "json_object"},
+                        response_format=response_format,
                         timeout=settings.OPENAI_CHAT_TIMEOUT_SECONDS,
                     ),
                 )
@@ -191,6 +208,154 @@ class DeepSeekCodeAnalyzer:
                     time.sleep(retry_delay)
         raise last_exc
 
+    # ── Analysis context and map step ────────────────────────────────────────
+
+    def _recall_prior_memories(self, path, user_id, db: Session) -> list:
+        if not user_id:
+            return []
+        try:
+            from AINDY.db.dao.memory_node_dao import MemoryNodeDAO
+            from AINDY.runtime.memory import MemoryOrchestrator
+
+            orchestrator = MemoryOrchestrator(MemoryNodeDAO)
+            context = orchestrator.get_context(
+                user_id=user_id,
+                query=path.name,
+                task_type="analysis",
+                db=db,
+                max_tokens=800,
+                metadata={
+                    "tags": ["arm", "analysis"],
+                    "limit": 3,
+                },
+            )
+            return context.items
+        except Exception as _mem_exc:
+            logger.debug("[ARM] Memory recall skipped: %s", _mem_exc)
+            return []
+
+    def _identity_context(self, path, user_id) -> str:
+        """Fetch identity context and record the observation (non-blocking on failure)."""
+        try:
+            from AINDY.kernel.syscall_dispatcher import get_dispatcher
+            from AINDY.kernel.syscall_registry import SyscallContext
+
+            _identity_ctx = SyscallContext(
+                execution_unit_id=str(uuid.uuid4()),
+                user_id=str(user_id) if user_id else "",
+                capabilities=["identity.read", "identity.write"],
+                trace_id=str(uuid.uuid4()),
+            )
+            _ctx_result = get_dispatcher().dispatch(
+                "sys.v1.identity.get_context",
+                {"user_id": str(user_id) if user_id else ""},
+                _identity_ctx,
+            )
+            identity_context = (_ctx_result.get("data") or {}).get("context", "")
+            get_dispatcher().dispatch(
+                "sys.v1.identity.observe",
+                {
+                    "user_id": str(user_id) if user_id else "",
+                    "event_type": "arm_analysis_complete",
+                    "context": {
+                        "language": path.suffix.lstrip("."),
+                        "file_type": path.suffix,
+                    },
+                },
+                _identity_ctx,
+            )
+            return identity_context
+        except Exception:
+            logger.warning("[ARM] Identity context injection failed")
+            return ""
+
+    def _gather_context(self, path, user_id, db: Session) -> tuple[list, str]:
+        """
+        Recall prior memory and fetch identity context concurrently.
+
+        The identity syscalls open their own sessions, so they run on a
+        worker thread while memory recall keeps the caller's session on
+        this one (a Session must not be shared across threads).
+        """
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="arm-context") as executor:
+            identity_future = executor.submit(
+                contextvars.copy_context().run, self._identity_context, path, user_id
+            )
+            prior_memories = self._recall_prior_memories(path, user_id, db)
+            identity_context = identity_future.result()
+        return prior_memories, identity_context
+
+    def _analyze_chunks(
+        self,
+        path,
+        chunks: list,
+        prompts: list,
+        *,
+        user_id: str,
+        additional_context: str = "",
+    ) -> list[dict]:
+        """
+        Map step: analyze every chunk of a multi-chunk file.
+
+        Chunks whose result is cached for this user (same text and
+        settings, at any position) are not sent again. The rest are analyzed concurrently, at
+        most AINDY_ARM_ANALYSIS_MAX_CONCURRENCY at a time. Workers pass no DB
+        session to the call layer, which opens its own when it needs one.
+        Returns one ``{"result", "input_tokens", "output_tokens", "cached"}``
+        dict per chunk, in chunk order.
+        """
+        model = self.config.get("analysis_model", "gpt-4o")
+        temperature = self.config.get("temperature", 0.2)
+        cache = get_chunk_result_cache()
+        keys = [
+            chunk_cache_key(
+                user_id=user_id,
+                chunk=chunk,
+                model=model,
+                temperature=temperature,
+                file_type=path.suffix,
+                additional_context=additional_context or "",
+            )
+            for chunk in chunks
+        ]
+        outcomes: list[dict | None] = [None] * len(chunks)
+        pending = []
+        for index, key in enumerate(keys):
+            cached = cache.get(key) if cache is not None else None
+            if cached is None:
+                pending.append(index)
+            else:
+                outcomes[index] = {**cached, "input_tokens": 0, "output_tokens": 0, "cached": True}
+
+        def _analyze(index: int) -> dict:
+            result_text, input_tokens, output_tokens = self._call_openai(
+                system_prompt=ANALYSIS_SYSTEM_PROMPT,
+                user_prompt=prompts[index],
+                db=None,
+                user_id=user_id,
+                model=model,
+                temperature=temperature,
+            )
+            outcome = {
+                "result": _parse_analysis(result_text),
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+            }
+            if cache is not None:
+                cache.put(keys[index], outcome)
+            return {**outcome, "cached": False}
+
+        if pending:
+            workers = max(1, min(int(settings.AINDY_ARM_ANALYSIS_MAX_CONCURRENCY), len(pending)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="arm-chunk") as executor:
+                futures = {
+                    index: executor.submit(contextvars.copy_context().run, _analyze, index)
+                    for index in pending
+                }
+                for index, future in futures.items():
+                    outcomes[index] = future.result()
+        return outcomes
+
     # ── Analysis ─────────────────────────────────────────────────────────────
 
     def run_analysis(
@@ -209,7 +374,8 @@ class DeepSeekCodeAnalyzer:
         1. Security validation (path, content, size)
         2. File reading and chunking
         3. Task Priority calculation (Infinity Algorithm)
-        4. OpenAI GPT-4o analysis
+        4. OpenAI GPT-4o analysis; multi-chunk files are analyzed chunk by
+           chunk (concurrently, cached per chunk) and the results merged
         5. Persist to analysis_results table
         6. Return enriched result dict
         """
@@ -227,71 +393,14 @@ class DeepSeekCodeAnalyzer:
             # Step 2 — Chunk if needed
             chunks = self.file_processor.chunk_content(content)
 
-            # Step 2b — Recall prior memory context for this file/user
-            prior_memories = []
-            if user_id:
-                try:
-                    from AINDY.db.dao.memory_node_dao import MemoryNodeDAO
-                    from AINDY.runtime.memory import MemoryOrchestrator
+            # Step 2b — Recall prior memory and identity context (concurrently)
+            prior_memories, identity_context = self._gather_context(path, user_id, db)
 
-                    orchestrator = MemoryOrchestrator(MemoryNodeDAO)
-                    context = orchestrator.get_context(
-                        user_id=user_id,
-                        query=path.name,
-                        task_type="analysis",
-                        db=db,
-                        max_tokens=800,
-                        metadata={
-                            "tags": ["arm", "analysis"],
-                            "limit": 3,
-                        },
-                    )
-                    prior_memories = context.items
-                except Exception as _mem_exc:
-                    logger.debug("[ARM] Memory recall skipped: %s", _mem_exc)
-
-            # Step 2c — Inject identity context (non-blocking)
-            identity_context = ""
-            try:
-                from AINDY.kernel.syscall_dispatcher import get_dispatcher
-                from AINDY.kernel.syscall_registry import SyscallContext
-
-                _identity_ctx = SyscallContext(
-                    execution_unit_id=str(uuid.uuid4()),
-                    user_id=str(user_id) if user_id else "",
-                    capabilities=["identity.read", "identity.write"],
-                    trace_id=str(uuid.uuid4()),
-                )
-                _ctx_result = get_dispatcher().dispatch(
-                    "sys.v1.identity.get_context",
-                    {"user_id": str(user_id) if user_id else ""},
-                    _identity_ctx,
-                )
-                identity_context = (_ctx_result.get("data") or {}).get("context", "")
-                get_dispatcher().dispatch(
-                    "sys.v1.identity.observe",
-                    {
-                        "user_id": str(user_id) if user_id else "",
-                        "event_type": "arm_analysis_complete",
-                        "context": {
-                            "language": path.suffix.lstrip("."),
-                            "file_type": path.suffix,
-                        },
-                    },
-                    _identity_ctx,
-                )
-            except Exception:
-                logger.warning("[ARM] Identity context injection failed")
-
-            # Step 3 — Build prompt
+            # Step 3 — Build prompts (one per chunk)
             context_section = (
                 f"\nAdditional context: {additional_context}\n"
                 if additional_context else ""
             )
-            truncation_note = (
-                f"\n(File truncated — showing chunk 1 of {len(chunks)})"
-                if len(chunks) > 1 else ""
-            )
             prior_context_section = ""
             if prior_memories:
                 snippets = "\n".join(
@@ -299,33 +408,43 @@ class DeepSeekCodeAnalyzer:
                     for m in prior_memories
                 )
                 prior_context_section = f"\nPrior analysis memory:\n{snippets}\n"
-            user_prompt = (
-                f"Analyze this {path.suffix} file:\n\n"
-                f"File: {path.name}\n"
-                f"{context_section}"
-                f"{prior_context_section}"
-                f"{identity_context}"
-                f"```{path.suffix.lstrip('.')}\n"
-                f"{chunks[0]}\n"
-                f"```"
-                f"{truncation_note}"
-            )
-
-            # Step 4 — Call OpenAI
-            result_text, input_tokens, output_tokens = self._call_openai(
-                system_prompt=ANALYSIS_SYSTEM_PROMPT,
-                user_prompt=user_prompt,
-                db=db,
-                user_id=user_id,
-                model=self.config.get("analysis_model", "gpt-4o"),
-                temperature=self.config.get("temperature", 0.2),
-            )
-
-            # Step 5 — Parse JSON response
-            try:
-                result = json.loads(result_text)
-            except json.JSONDecodeError:
-                result = {"summary": result_text, "findings": []}
+            prompts = [
+                _analysis_prompt(
+                    path,
+                    chunk,
+                    part=part,
+                    parts=len(chunks),
+                    context_section=context_section,
+                    prior_context_section=prior_context_section,
+                    identity_context=identity_context,
+                )
+                for part, chunk in enumerate(chunks, start=1)
+            ]
+            user_prompt = prompts[0]
+
+            # Step 4 — Call OpenAI: one call, or map over chunks and reduce
+            if len(chunks) == 1:
+                result_text, input_tokens, output_tokens = self._call_openai(
+                    system_prompt=ANALYSIS_SYSTEM_PROMPT,
+                    user_prompt=user_prompt,
+                    db=db,
+                    user_id=user_id,
+                    model=self.config.get("analysis_model", "gpt-4o"),
+                    temperature=self.config.get("temperature", 0.2),
+                )
+                result = _parse_analysis(result_text)
+            else:
+                outcomes = self._analyze_chunks(
+                    path,
+                    chunks,
+                    prompts,
+                    user_id=user_id,
+                    additional_context=additional_context,
+                )
+                result = _reduce_chunk_results(outcomes, chunks)
+                result_text = json.dumps(result)
+                input_tokens = sum(outcome["input_tokens"] for outcome in outcomes)
+                output_tokens = sum(outcome["output_tokens"] for outcome in outcomes)
 
             execution_seconds = time.time() - start_time
             arch_score = result.get("architecture_score", 5)
@@ -568,6 +687,88 @@ class DeepSeekCodeAnalyzer:
             raise
 
 
+_SEVERITY_ORDER = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+_SCORE_KEYS = ("architecture_score", "performance_score", "integrity_score")
+
+
+def _analysis_prompt(
+    path,
+    chunk: str,
+    *,
+    part: int,
+    parts: int,
+    context_section: str,
+    prior_context_section: str,
+    identity_context: str,
+) -> str:
+    part_note = f" (part {part} of {parts}; analyze this part on its own)" if parts > 1 else ""
+    return (
+        f"Analyze this {path.suffix} file:\n\n"
+        f"File: {path.name}{part_note}\n"
+        f"{context_section}"
+        f"{prior_context_section}"
+        f"{identity_context}"
+        f"```{path.suffix.lstrip('.')}\n"
+        f"{chunk}\n"
+        f"```"
+    )
+
+
+def _parse_analysis(result_text: str) -> dict:
+    try:
+        result = json.loads(result_text)
+    except (json.JSONDecodeError, TypeError):
+        return {"summary": result_text, "findings": []}
+    return result if isinstance(result, dict) else {"summary": result_text, "findings": []}
+
+
+def _reduce_chunk_results(outcomes: list[dict], chunks: list) -> dict:
+    """
+    Reduce step: merge per-chunk analyses into one result.
+
+    Scores are averaged weighted by chunk length, findings are concatenated
+    (tagged with their chunk, most severe first), summaries are joined in
+    file order and the overall recommendation comes from the weakest chunk.
+    """
+    weights = [max(len(chunk), 1) for chunk in chunks]
+    merged: dict[str, Any] = {}
+    for key in _SCORE_KEYS:
+        scored = [
+            (outcome["result"][key], weight)
+            for outcome, weight in zip(outcomes, weights)
+            if isinstance(outcome["result"].get(key), (int, float))
+        ]
+        merged[key] = (
+            round(sum(score * weight for score, weight in scored) / sum(weight for _, weight in scored), 1)
+            if scored else 5
+        )
+
+    findings = [
+        {**finding, "chunk": part}
+        for part, outcome in enumerate(outcomes, start=1)
+        for finding in outcome["result"].get("findings") or []
+        if isinstance(finding, dict)
+    ]
+    findings.sort(key=lambda finding: _SEVERITY_ORDER.get(str(finding.get("severity", "")).lower(), len(_SEVERITY_ORDER)))
+
+    def _chunk_score(outcome: dict) -> float:
+        scores = [outcome["result"].get(key) for key in _SCORE_KEYS]
+        scores = [score for score in scores if isinstance(score, (int, float))]
+        return sum(scores) / len(scores) if scores else 5
+
+    weakest = min(outcomes, key=_chunk_score)
+    merged["summary"] = " ".join(
+        f"[Part {part}/{len(outcomes)}] {outcome['result']['summary']}"
+        for part, outcome in enumerate(outcomes, start=1)
+        if outcome["result"].get("summary")
+    )
+    merged["findings"] = findings
+    merged["overall_recommendation"] = weakest["result"].get("overall_recommendation", "")
+    merged["chunks"] = len(outcomes)
+    merged["chunks_cached"] = sum(1 for outcome in outcomes if outcome["cached"])
+    return merged
+
+
 def _build_deepseek_client() -> Any:
     if callable(OpenAI):
         try:
@@ -9,6 +9,7 @@ from AINDY.db.dao.memory_node_dao import MemoryNodeDAO
 from AINDY.db.models.flow_run import FlowRun
 from AINDY.memory.memory_persistence import MemoryNodeModel
 from AINDY.platform_layer.user_ids import parse_user_id
+from AINDY.runtime.flow_engine import load_run_state
 
 
 _BOOT_MEMORY_LIMIT = 20
@@ -163,7 +164,8 @@ def get_active_flows(
             "trace_id": row.trace_id,
             "current_node": row.current_node,
             "waiting_for": row.waiting_for,
-            "state": row.state,
+            # Running rows only hold the last snapshot; replay the newer patches.
+            "state": load_run_state(db, row),
             "error_message": row.error_message,
             "created_at": row.created_at.isoformat() if row.created_at else None,
             "updated_at": row.updated_at.isoformat() if row.updated_at else None,
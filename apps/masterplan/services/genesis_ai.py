@@ -3,7 +3,7 @@ import logging
 from AINDY.core.execution_signal_helper import queue_memory_capture
 # Genesis memory capture is routed through a MemoryCaptureEngine-backed helper.
 from AINDY.kernel.circuit_breaker import CircuitOpenError
-from AINDY.platform_layer.external_call_service import perform_external_call
+from AINDY.platform_layer.external_call_service import external_call_key, perform_external_call
 from AINDY.core.system_event_service import emit_error_event
 from AINDY.platform_layer.openai_client import get_openai_client, chat_completion
 from AINDY.config import settings
@@ -271,6 +271,19 @@ def call_genesis_synthesis_llm(
         )
 
     system_prompt = SYNTHESIS_SYSTEM_PROMPT + arm_insights
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {
+            "role": "user",
+            "content": f"""
+Session State:
+{json.dumps(current_state, indent=2)}
+
+Synthesize this into a complete MasterPlan draft.
+Return only valid JSON.
+"""
+        }
+    ]
     response = perform_external_call(
         service_name="openai",
         db=db,
@@ -279,22 +292,12 @@ def call_genesis_synthesis_llm(
         model="gpt-4o",
         method="openai.chat",
         extra={"purpose": "genesis_synthesis"},
+        # Double-submitted syntheses of the same session share one request.
+        dedupe_key=external_call_key(model="gpt-4o", messages=messages, temperature=0.3),
         operation=lambda: chat_completion(
             get_openai_client(),
             model="gpt-4o",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {
-                    "role": "user",
-                    "content": f"""
-Session State:
-{json.dumps(current_state, indent=2)}
-
-Synthesize this into a complete MasterPlan draft.
-Return only valid JSON.
-"""
-                }
-            ],
+            messages=messages,
             temperature=0.3,
             response_format={"type": "json_object"},
             timeout=settings.OPENAI_CHAT_TIMEOUT_SECONDS,
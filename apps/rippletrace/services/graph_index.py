@@ -0,0 +1,374 @@
+"""
+Inverted-index engine behind the RippleTrace influence and causal graphs.
+
+Drops are indexed by theme, entity, day bucket and (ping platform, day
+bucket). Two drops can only be linked if they share a theme or entity, or
+were dropped within a day of each other (shared platform for influence,
+shared momentum for causality), so a drop's candidate neighbours come from
+those postings alone instead of a scan over every other drop.
+
+A process-wide index (get_ripple_graph) is kept in step with the database
+by a fingerprint query per call; new drops and ping platforms are applied
+incrementally and only the neighbourhoods they touch are recomputed. Drop
+themes, entities and dates are treated as immutable once inserted.
+"""
+from __future__ import annotations
+
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from apps.rippletrace.models import DropPointDB, PingDB
+
+_DAY_SECONDS = 86400
+_WEEK_SECONDS = 604800
+_LOAD_CHUNK = 500
+
+
+def split_terms(value: Optional[str]) -> Set[str]:
+    if not value:
+        return set()
+    return {term.strip().lower() for term in value.split(",") if term.strip()}
+
+
+@dataclass
+class _Drop:
+    id: str
+    seq: int
+    themes: frozenset
+    entities: frozenset
+    date: Optional[datetime]
+    platforms: Set[str] = field(default_factory=set)
+
+
+def _seconds_apart(a: _Drop, b: _Drop) -> Optional[float]:
+    if a.date and b.date:
+        return abs((a.date - b.date).total_seconds())
+    return None
+
+
+def _temporal_weight(a: _Drop, b: _Drop) -> int:
+    diff = _seconds_apart(a, b)
+    if diff is None:
+        return 0
+    if diff < _DAY_SECONDS:
+        return 2
+    if diff < _WEEK_SECONDS:
+        return 1
+    return 0
+
+
+def influence_link(a: _Drop, b: _Drop) -> Optional[Tuple[float, str]]:
+    """Return (strength, edge_type) for a pair, or None below threshold."""
+    overlap_count = len(a.themes & b.themes)
+    entity_overlap = len(a.entities & b.entities)
+    ping_similarity = 1 if a.platforms & b.platforms else 0
+    score = overlap_count * 2 + entity_overlap * 3 + _temporal_weight(a, b) + ping_similarity
+    strength = min(1.0, score / 10)
+    if strength <= 0.2:
+        return None
+    if entity_overlap > 0:
+        edge_type = "entity_link"
+    elif overlap_count > 0:
+        edge_type = "semantic_link"
+    else:
+        edge_type = "temporal_link"
+    return round(strength, 3), edge_type
+
+
+def causal_link(a: _Drop, b: _Drop, velocity: Callable[[str], float]) -> Optional[Dict]:
+    """Return the causal edge between two drops, or None below threshold.
+
+    The earlier drop is the cause; ties (and undated pairs) go to the drop
+    loaded first, matching the pairwise scan this replaces.
+    """
+    first, second = (a, b) if a.seq < b.seq else (b, a)
+    if first.date and second.date:
+        cause, effect = (first, second) if first.date <= second.date else (second, first)
+    else:
+        cause, effect = (first, second) if first.id < second.id else (second, first)
+
+    temporal_weight = _temporal_weight(cause, effect)
+    theme_overlap = len(cause.themes & effect.themes)
+    entity_overlap = len(cause.entities & effect.entities)
+    momentum_alignment = 2 if velocity(cause.id) > 0 and velocity(effect.id) > 0 else 0
+
+    causal_score = temporal_weight + momentum_alignment + theme_overlap + entity_overlap
+    confidence = min(1.0, causal_score / 10)
+    if confidence <= 0.3:
+        return None
+
+    reasons: List[str] = []
+    if temporal_weight:
+        reasons.append("temporal_order")
+    if momentum_alignment:
+        reasons.append("momentum_alignment")
+    if entity_overlap:
+        reasons.append("shared_entities")
+    if theme_overlap:
+        reasons.append("shared_themes")
+    return {
+        "source": cause.id,
+        "target": effect.id,
+        "confidence": round(confidence, 3),
+        "reason": reasons or ["signal_continuity"],
+    }
+
+
+class RippleGraphIndex:
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._drops: Dict[str, _Drop] = {}
+        self._next_seq = 0
+        self._themes: Dict[str, Set[str]] = defaultdict(set)
+        self._entities: Dict[str, Set[str]] = defaultdict(set)
+        self._days: Dict[int, Set[str]] = defaultdict(set)
+        self._platform_days: Dict[Tuple[str, int], Set[str]] = defaultdict(set)
+        # drop id -> [(neighbour id, strength, edge_type)] in load order,
+        # filled lazily and dropped when the neighbourhood changes.
+        self._influence: Dict[str, List[Tuple[str, float, str]]] = {}
+        self._fingerprint: Optional[tuple] = None
+
+    @classmethod
+    def from_drops(
+        cls,
+        drops: Iterable[DropPointDB],
+        platforms: Optional[Dict[str, Set[str]]] = None,
+    ) -> "RippleGraphIndex":
+        index = cls()
+        for drop in drops:
+            index.add_drop(drop)
+        for drop_id, names in (platforms or {}).items():
+            for name in names:
+                index.add_platform(drop_id, name)
+        return index
+
+    def __contains__(self, drop_id: str) -> bool:
+        return drop_id in self._drops
+
+    def __len__(self) -> int:
+        return len(self._drops)
+
+    # ── Maintenance ───────────────────────────────────────────────────────────
+
+    def add_drop(self, drop: DropPointDB) -> None:
+        with self._lock:
+            if drop.id in self._drops:
+                return
+            node = _Drop(
+                id=drop.id,
+                seq=self._next_seq,
+                themes=frozenset(split_terms(drop.core_themes)),
+                entities=frozenset(split_terms(drop.tagged_entities)),
+                date=drop.date_dropped,
+            )
+            self._next_seq += 1
+            self._drops[node.id] = node
+            for theme in node.themes:
+                self._themes[theme].add(node.id)
+            for entity in node.entities:
+                self._entities[entity].add(node.id)
+            if node.date:
+                self._days[node.date.toordinal()].add(node.id)
+            self._invalidate_around(node)
+
+    def add_platform(self, drop_id: str, platform: Optional[str]) -> None:
+        if not platform:
+            return
+        name = platform.lower()
+        with self._lock:
+            node = self._drops.get(drop_id)
+            if node is None or name in node.platforms:
+                return
+            node.platforms.add(name)
+            if node.date:
+                self._platform_days[(name, node.date.toordinal())].add(node.id)
+            self._invalidate_around(node)
+
+    def remove_drop(self, drop_id: str) -> None:
+        with self._lock:
+            node = self._drops.get(drop_id)
+            if node is None:
+                return
+            self._invalidate_around(node)
+            del self._drops[drop_id]
+            for theme in node.themes:
+                self._discard(self._themes, theme, drop_id)
+            for entity in node.entities:
+                self._discard(self._entities, entity, drop_id)
+            if node.date:
+                day = node.date.toordinal()
+                self._discard(self._days, day, drop_id)
+                for name in node.platforms:
+                    self._discard(self._platform_days, (name, day), drop_id)
+
+    @staticmethod
+    def _discard(postings: Dict, key, drop_id: str) -> None:
+        bucket = postings.get(key)
+        if bucket is not None:
+            bucket.discard(drop_id)
+            if not bucket:
+                del postings[key]
+
+    def _invalidate_around(self, node: _Drop) -> None:
+        if not self._influence:
+            return
+        self._influence.pop(node.id, None)
+        for other in self._candidates(node, same_day=self._days):
+            self._influence.pop(other, None)
+
+    def sync(self, db: Session) -> "RippleGraphIndex":
+        """Bring the index up to date with drop_points / pings in *db*."""
+        fingerprint = _fingerprint(db)
+        with self._lock:
+            if fingerprint == self._fingerprint:
+                return self
+            previous = self._fingerprint
+            ids = [row[0] for row in db.query(DropPointDB.id).all()]
+            present = set(ids)
+            for drop_id in [drop_id for drop_id in self._drops if drop_id not in present]:
+                self.remove_drop(drop_id)
+            added = [drop_id for drop_id in ids if drop_id not in self._drops]
+            loaded: Dict[str, DropPointDB] = {}
+            for start in range(0, len(added), _LOAD_CHUNK):
+                chunk = added[start : start + _LOAD_CHUNK]
+                for drop in db.query(DropPointDB).filter(DropPointDB.id.in_(chunk)).all():
+                    loaded[drop.id] = drop
+            for drop_id in added:
+                if drop_id in loaded:
+                    self.add_drop(loaded[drop_id])
+            if added or previous is None or previous[2] != fingerprint[2]:
+                for drop_id, platform in db.query(PingDB.drop_point_id, PingDB.source_platform).distinct():
+                    self.add_platform(drop_id, platform)
+            self._fingerprint = fingerprint
+        return self
+
+    # ── Queries ───────────────────────────────────────────────────────────────
+
+    def _candidates(self, node: _Drop, *, same_day) -> Set[str]:
+        """Drops sharing a posting with *node*; *same_day* adds drops within
+        a day from the given day-bucket index (None to skip)."""
+        found: Set[str] = set()
+        for theme in node.themes:
+            found |= self._themes.get(theme, ())
+        for entity in node.entities:
+            found |= self._entities.get(entity, ())
+        if node.date and same_day is not None:
+            day = node.date.toordinal()
+            keys = (
+                [day - 1, day, day + 1]
+                if same_day is self._days
+                else [(name, d) for name in node.platforms for d in (day - 1, day, day + 1)]
+            )
+            for key in keys:
+                for other in same_day.get(key, ()):
+                    diff = _seconds_apart(node, self._drops[other])
+                    if diff is not None and diff < _DAY_SECONDS:
+                        found.add(other)
+        found.discard(node.id)
+        return found
+
+    def _ordered(self, ids: Iterable[str]) -> List[_Drop]:
+        return sorted((self._drops[i] for i in ids), key=lambda d: d.seq)
+
+    def influence_neighbours(self, drop_id: str) -> List[Tuple[str, float, str]]:
+        with self._lock:
+            cached = self._influence.get(drop_id)
+            if cached is not None:
+                return cached
+            node = self._drops[drop_id]
+            neighbours = []
+            for other in self._ordered(self._candidates(node, same_day=self._platform_days)):
+                link = influence_link(node, other)
+                if link is not None:
+                    neighbours.append((other.id, link[0], link[1]))
+            self._influence[drop_id] = neighbours
+            return neighbours
+
+    def influence_edges(self, drop_id: str) -> Optional[List[Dict]]:
+        """Edges touching *drop_id*, in the order the full graph lists them."""
+        with self._lock:
+            node = self._drops.get(drop_id)
+            if node is None:
+                return None
+            edges: List[Dict] = []
+            for other_id, strength, edge_type in self.influence_neighbours(drop_id):
+                pair = [
+                    {"source": node.id, "target": other_id, "strength": strength, "type": edge_type},
+                    {"source": other_id, "target": node.id, "strength": strength, "type": edge_type},
+                ]
+                if self._drops[other_id].seq < node.seq:
+                    pair.reverse()
+                edges.extend(pair)
+            return edges
+
+    def all_influence_edges(self) -> List[Dict]:
+        with self._lock:
+            edges: List[Dict] = []
+            for node in self._ordered(self._drops):
+                for other_id, strength, edge_type in self.influence_neighbours(node.id):
+                    if self._drops[other_id].seq < node.seq:
+                        continue
+                    edges.append({"source": node.id, "target": other_id, "strength": strength, "type": edge_type})
+                    edges.append({"source": other_id, "target": node.id, "strength": strength, "type": edge_type})
+            return edges
+
+    def causal_edges(self, drop_id: str, velocity: Callable[[str], float]) -> Tuple[List[Dict], List[Dict]]:
+        """Return (incoming, outgoing) causal edges of one drop."""
+        with self._lock:
+            node = self._drops.get(drop_id)
+            if node is None:
+                return [], []
+            # Drops with no shared posting only qualify through momentum,
+            # which needs this drop's own velocity to be positive.
+            same_day = self._days if velocity(drop_id) > 0 else None
+            incoming: List[Dict] = []
+            outgoing: List[Dict] = []
+            for other in self._ordered(self._candidates(node, same_day=same_day)):
+                edge = causal_link(node, other, velocity)
+                if edge is not None:
+                    (outgoing if edge["source"] == drop_id else incoming).append(edge)
+            return incoming, outgoing
+
+    def all_causal_edges(self, velocity: Callable[[str], float]) -> List[Dict]:
+        with self._lock:
+            edges: List[Dict] = []
+            for node in self._ordered(self._drops):
+                for other in self._ordered(self._candidates(node, same_day=self._days)):
+                    if other.seq < node.seq:
+                        continue
+                    edge = causal_link(node, other, velocity)
+                    if edge is not None:
+                        edges.append(edge)
+            return edges
+
+
+def _fingerprint(db: Session) -> tuple:
+    drop_count, latest_drop = db.query(func.count(DropPointDB.id), func.max(DropPointDB.date_dropped)).one()
+    ping_count = db.query(func.count(PingDB.id)).scalar()
+    return int(drop_count or 0), latest_drop, int(ping_count or 0)
+
+
+_GRAPH: Optional[RippleGraphIndex] = None
+_GRAPH_LOCK = threading.Lock()
+
+
+def get_ripple_graph(db: Session) -> RippleGraphIndex:
+    """Return the process-wide index, synced with *db*."""
+    global _GRAPH
+    if _GRAPH is None:
+        with _GRAPH_LOCK:
+            if _GRAPH is None:
+                _GRAPH = RippleGraphIndex()
+    return _GRAPH.sync(db)
+
+
+def reset_ripple_graph() -> None:
+    global _GRAPH
+    with _GRAPH_LOCK:
+        _GRAPH = None
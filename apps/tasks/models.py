@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, JSON, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from AINDY.db.database import Base
@@ -49,5 +49,26 @@ class Task(Base):
     parent_task = relationship("Task", remote_side=[id], backref="child_tasks")
 
 
+class TaskDependency(Base):
+    """
+    One edge of the task dependency DAG: ``task_id`` waits on
+    ``depends_on_task_id``. Mirrors ``Task.depends_on`` plus
+    ``parent_task_id`` so dependents of a task can be found by index
+    instead of decoding every task's JSON list.
+    """
+    __tablename__ = "task_dependencies"
+
+    task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True)
+    depends_on_task_id = Column(
+        Integer, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True
+    )
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+    dependency_type = Column(String, nullable=False, default="hard")
+
+    __table_args__ = (
+        Index("ix_task_dependencies_depends_on", "depends_on_task_id", "task_id"),
+    )
+
+
 def register_models() -> None:
     return None
@@ -9,6 +9,7 @@ from sqlalchemy.orm import Session
 
 from apps.tasks.models import Task
 from apps.tasks.services.task_service import (
+    _note_task_statuses,
     get_task_by_id as _get_task_by_id,
     queue_task_automation as _queue_task_automation,
 )
@@ -65,6 +66,7 @@ def update_task_status(
         return None
     task.status = status
     db.commit()
+    _note_task_statuses(user_id, [(task.id, status)])
     db.refresh(task)
     return _task_to_dict(task)
 
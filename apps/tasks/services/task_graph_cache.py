@@ -0,0 +1,284 @@
+"""
+Per-user cached task dependency DAGs.
+
+``get_task_graph_context`` used to load every task for the user and re-run
+the topological sort and critical-weight pass on each call. This module
+keeps one ``TaskGraph`` per user and updates it in place when tasks are
+created or change status:
+
+  remaining    per-task count of dependencies not yet completed, so
+               completing a task touches only its direct dependents; a
+               dependency on a missing or deleted task never completes and
+               keeps the task blocked, as _dependencies_complete does
+  weight       critical weight (1 + heaviest dependent), raised along the
+               ancestors of a newly created task
+  ready heap   (-weight, priority rank, task_id) with lazy deletion, so the
+               next ready task is a heap peek
+
+Coherence across processes: each cached graph carries a fingerprint of the
+user's tasks (row count per (status, priority) and the max task id). Reads
+compare it with one aggregate query and rebuild on mismatch, and entries
+expire after AINDY_TASK_GRAPH_CACHE_TTL_SECONDS as a backstop for changes
+the fingerprint cannot see (a name edit, or two changes that cancel out).
+"""
+from __future__ import annotations
+
+import heapq
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Iterable
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from AINDY.config import settings
+from apps.tasks.models import Task
+
+READY_STATUSES = frozenset({"pending", "paused", "in_progress"})
+
+_Fingerprint = tuple[dict[tuple[str | None, str | None], int], int]
+
+
+def priority_rank(priority: str | None) -> int:
+    return 0 if priority == "high" else 1 if priority == "medium" else 2
+
+
+def task_graph_fingerprint(db: Session, owner_user_id: uuid.UUID) -> _Fingerprint:
+    rows = (
+        db.query(Task.status, Task.priority, func.count(Task.id), func.max(Task.id))
+        .filter(Task.user_id == owner_user_id)
+        .group_by(Task.status, Task.priority)
+        .all()
+    )
+    counts = {(status, priority): int(count) for status, priority, count, _ in rows}
+    max_id = max((int(top) for *_, top in rows if top is not None), default=0)
+    return counts, max_id
+
+
+class TaskGraph:
+    """Incrementally maintained dependency DAG for one user's tasks."""
+
+    def __init__(self, graph: dict[str, Any], fingerprint: _Fingerprint):
+        self.nodes: dict[int, dict[str, Any]] = graph["nodes"]
+        self.downstream: dict[int, list[int]] = graph["downstream"]
+        self.weight: dict[int, int] = graph["critical_weight"]
+        self.position = {task_id: index for index, task_id in enumerate(graph["topological_order"])}
+        self.remaining = {
+            task_id: sum(
+                1
+                for dependency_id in node["depends_on"]
+                if dependency_id not in self.nodes or self.nodes[dependency_id]["status"] != "completed"
+            )
+            for task_id, node in self.nodes.items()
+        }
+        self.ready: set[int] = set()
+        self._heap: list[tuple[int, int, int]] = []
+        self.counts, self.max_id = dict(fingerprint[0]), fingerprint[1]
+        self.loaded_at = time.monotonic()
+        for task_id in self.position:
+            self._refresh(task_id)
+
+    @property
+    def fingerprint(self) -> _Fingerprint:
+        return {key: count for key, count in self.counts.items() if count}, self.max_id
+
+    def _key(self, task_id: int) -> tuple[int, int, int]:
+        return (-self.weight[task_id], priority_rank(self.nodes[task_id]["priority"]), task_id)
+
+    def _refresh(self, task_id: int) -> None:
+        is_ready = self.nodes[task_id]["status"] in READY_STATUSES and self.remaining[task_id] == 0
+        if is_ready:
+            if task_id not in self.ready:
+                self.ready.add(task_id)
+                heapq.heappush(self._heap, self._key(task_id))
+        else:
+            self.ready.discard(task_id)
+        if len(self._heap) > 2 * len(self.ready) + 64:
+            self._heap = [self._key(task_id) for task_id in self.ready]
+            heapq.heapify(self._heap)
+
+    def _count(self, node: dict[str, Any], delta: int) -> None:
+        key = (node["status"], node["priority"])
+        self.counts[key] = self.counts.get(key, 0) + delta
+
+    def add_task(self, node: dict[str, Any]) -> None:
+        """Insert a new task; its dependencies must already be in the graph."""
+        task_id = node["task_id"]
+        self.nodes[task_id] = node
+        self.downstream[task_id] = []
+        self.weight[task_id] = 1
+        self.position[task_id] = len(self.position)
+        self.remaining[task_id] = 0
+        for dependency_id in node["depends_on"]:
+            if dependency_id not in self.nodes:
+                self.remaining[task_id] += 1
+                continue
+            self.downstream[dependency_id].append(task_id)
+            if self.nodes[dependency_id]["status"] != "completed":
+                self.remaining[task_id] += 1
+        self._count(node, 1)
+        self.max_id = max(self.max_id, task_id)
+        self._raise_ancestors(task_id)
+        self._refresh(task_id)
+
+    def _raise_ancestors(self, task_id: int) -> None:
+        stack = [task_id]
+        while stack:
+            current = stack.pop()
+            for dependency_id in self.nodes[current]["depends_on"]:
+                if dependency_id not in self.nodes or dependency_id == current:
+                    continue
+                if self.weight[dependency_id] >= self.weight[current] + 1:
+                    continue
+                self.weight[dependency_id] = self.weight[current] + 1
+                if dependency_id in self.ready:
+                    heapq.heappush(self._heap, self._key(dependency_id))
+                stack.append(dependency_id)
+
+    def set_status(self, task_id: int, status: str) -> None:
+        node = self.nodes.get(task_id)
+        if node is None or node["status"] == status:
+            return
+        previous = node["status"]
+        self._count(node, -1)
+        node["status"] = status
+        self._count(node, 1)
+        if (previous == "completed") != (status == "completed"):
+            delta = 1 if previous == "completed" else -1
+            for child_id in self.downstream[task_id]:
+                self.remaining[child_id] += delta
+                self._refresh(child_id)
+        self._refresh(task_id)
+
+    def next_ready(self) -> int | None:
+        while self._heap:
+            entry = self._heap[0]
+            task_id = entry[2]
+            if task_id in self.ready and entry == self._key(task_id):
+                return task_id
+            heapq.heappop(self._heap)
+        return None
+
+    def context(self) -> dict[str, Any]:
+        critical_path = sorted(self.ready, key=self._key)
+        blocked = sorted(
+            (
+                task_id
+                for task_id, node in self.nodes.items()
+                if node["status"] != "completed" and task_id not in self.ready
+            ),
+            key=self.position.__getitem__,
+        )
+        return {
+            "nodes": {task_id: dict(node) for task_id, node in self.nodes.items()},
+            "ready": critical_path,
+            "blocked": blocked,
+            "critical_path": list(critical_path),
+            "critical_weight": dict(self.weight),
+        }
+
+
+class TaskGraphCache:
+    """LRU of per-user ``TaskGraph`` objects validated by fingerprint."""
+
+    def __init__(self, *, ttl_seconds: float, max_users: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_users = max_users
+        self._graphs: OrderedDict[uuid.UUID, TaskGraph] = OrderedDict()
+        self._lock = threading.RLock()
+
+    def context(
+        self,
+        db: Session,
+        owner_user_id: uuid.UUID,
+        build: Callable[[list[Task]], dict[str, Any]],
+    ) -> dict[str, Any] | None:
+        """Graph context for the user (see get_task_graph_context); None if no tasks."""
+        return self._read(db, owner_user_id, build, TaskGraph.context)
+
+    def next_ready(
+        self,
+        db: Session,
+        owner_user_id: uuid.UUID,
+        build: Callable[[list[Task]], dict[str, Any]],
+    ) -> dict[str, Any] | None:
+        """Node of the highest-priority ready task plus its critical weight."""
+
+        def _peek(graph: TaskGraph) -> dict[str, Any] | None:
+            task_id = graph.next_ready()
+            if task_id is None:
+                return None
+            return {**graph.nodes[task_id], "critical_weight": graph.weight[task_id]}
+
+        return self._read(db, owner_user_id, build, _peek)
+
+    def _read(self, db, owner_user_id, build, read):
+        fingerprint = task_graph_fingerprint(db, owner_user_id)
+        if not fingerprint[0]:
+            self.invalidate(owner_user_id)
+            return None
+        with self._lock:
+            graph = self._graphs.get(owner_user_id)
+            if (
+                graph is not None
+                and graph.fingerprint == fingerprint
+                and time.monotonic() - graph.loaded_at < self.ttl_seconds
+            ):
+                self._graphs.move_to_end(owner_user_id)
+                return read(graph)
+        tasks = db.query(Task).filter(Task.user_id == owner_user_id).order_by(Task.id.asc()).all()
+        graph = TaskGraph(build(tasks), fingerprint)
+        with self._lock:
+            self._graphs[owner_user_id] = graph
+            self._graphs.move_to_end(owner_user_id)
+            while len(self._graphs) > self.max_users:
+                self._graphs.popitem(last=False)
+            return read(graph)
+
+    def task_created(self, owner_user_id: uuid.UUID, node: dict[str, Any]) -> None:
+        with self._lock:
+            graph = self._graphs.get(owner_user_id)
+            if graph is not None and node["task_id"] not in graph.nodes:
+                graph.add_task(node)
+
+    def statuses_changed(self, owner_user_id: uuid.UUID, changes: Iterable[tuple[int, str]]) -> None:
+        with self._lock:
+            graph = self._graphs.get(owner_user_id)
+            if graph is None:
+                return
+            for task_id, status in changes:
+                graph.set_status(int(task_id), status)
+
+    def invalidate(self, owner_user_id: uuid.UUID | None = None) -> None:
+        with self._lock:
+            if owner_user_id is None:
+                self._graphs.clear()
+            else:
+                self._graphs.pop(owner_user_id, None)
+
+
+_cache: TaskGraphCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_task_graph_cache() -> TaskGraphCache | None:
+    """Return the process-wide cache, or None when it is disabled."""
+    global _cache
+    if not settings.AINDY_TASK_GRAPH_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = TaskGraphCache(
+                    ttl_seconds=settings.AINDY_TASK_GRAPH_CACHE_TTL_SECONDS,
+                    max_users=settings.AINDY_TASK_GRAPH_CACHE_MAX_USERS,
+                )
+    return _cache
+
+
+def reset_task_graph_cache() -> None:
+    global _cache
+    with _cache_lock:
+        _cache = None
@@ -7,11 +7,12 @@ from collections import deque
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
-from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.orm import Session, aliased
 
 from AINDY.db.database import SessionLocal
 from AINDY.db.models.background_task_lease import BackgroundTaskLease
-from apps.tasks.models import Task
+from apps.tasks.models import Task, TaskDependency
 from AINDY.core.system_event_service import emit_system_event
 from apps.tasks.events import TaskEventTypes as SystemEventTypes
 from apps.tasks.services.analytics_bridge import (
@@ -23,6 +24,7 @@ from apps.tasks.services.masterplan_bridge import (
     get_active_masterplan_via_syscall,
     get_eta_via_syscall,
 )
+from apps.tasks.services.task_graph_cache import get_task_graph_cache, priority_rank
 
 logger = logging.getLogger(__name__)
 
@@ -149,19 +151,45 @@ def _recompute_task_status(db: Session, task: Task, user_id: str | uuid.UUID | N
     return task.status
 
 
-def build_task_graph(tasks: list[Task]) -> dict[str, Any]:
-    nodes = {
-        int(task.id): {
-            "task_id": int(task.id),
-            "name": task.name,
-            "priority": task.priority,
-            "status": task.status,
-            "depends_on": _dependency_ids(task),
-            "automation_type": getattr(task, "automation_type", None),
-            "masterplan_id": getattr(task, "masterplan_id", None),
-        }
-        for task in tasks
+def _dependency_edges(task: Task) -> list[TaskDependency]:
+    types = {
+        int(dependency["task_id"]): dependency.get("dependency_type") or "hard"
+        for dependency in task.depends_on or []
+        if isinstance(dependency, dict) and dependency.get("task_id") is not None
+    }
+    return [
+        TaskDependency(
+            task_id=task.id,
+            depends_on_task_id=dependency_id,
+            user_id=task.user_id,
+            dependency_type=types.get(dependency_id, "parent"),
+        )
+        for dependency_id in _dependency_ids(task)
+    ]
+
+
+def _graph_node(task: Task) -> dict[str, Any]:
+    return {
+        "task_id": int(task.id),
+        "name": task.name,
+        "priority": task.priority,
+        "status": task.status,
+        "depends_on": _dependency_ids(task),
+        "automation_type": getattr(task, "automation_type", None),
+        "masterplan_id": getattr(task, "masterplan_id", None),
     }
+
+
+def _note_task_statuses(user_id: str | uuid.UUID | None, changes: list[tuple[int, str]]) -> None:
+    """Apply committed (task_id, status) changes to the cached dependency graph."""
+    cache = get_task_graph_cache()
+    owner_user_id = _user_uuid(user_id)
+    if cache is not None and owner_user_id:
+        cache.statuses_changed(owner_user_id, changes)
+
+
+def build_task_graph(tasks: list[Task]) -> dict[str, Any]:
+    nodes = {int(task.id): _graph_node(task) for task in tasks}
     downstream = {task_id: [] for task_id in nodes}
     indegree = {task_id: 0 for task_id in nodes}
     for task_id, node in nodes.items():
@@ -195,9 +223,8 @@ def build_task_graph(tasks: list[Task]) -> dict[str, Any]:
         for task_id in topo_order
         if nodes[task_id]["status"] in {"pending", "paused", "in_progress"}
         and all(
-            nodes[dependency_id]["status"] == "completed"
+            dependency_id in nodes and nodes[dependency_id]["status"] == "completed"
             for dependency_id in nodes[task_id]["depends_on"]
-            if dependency_id in nodes
         )
     ]
     blocked = [
@@ -219,6 +246,10 @@ def get_task_graph_context(db: Session, user_id: str | uuid.UUID | None) -> dict
     owner_user_id = _user_uuid(user_id)
     if not owner_user_id:
         return {"nodes": {}, "ready": [], "blocked": [], "critical_path": []}
+    cache = get_task_graph_cache()
+    if cache is not None:
+        context = cache.context(db, owner_user_id, build_task_graph)
+        return context or {"nodes": {}, "ready": [], "blocked": [], "critical_path": []}
     tasks = db.query(Task).filter(Task.user_id == owner_user_id).order_by(Task.id.asc()).all()
     if not tasks:
         return {"nodes": {}, "ready": [], "blocked": [], "critical_path": []}
@@ -227,7 +258,7 @@ def get_task_graph_context(db: Session, user_id: str | uuid.UUID | None) -> dict
         graph["ready"],
         key=lambda task_id: (
             -graph["critical_weight"].get(task_id, 0),
-            0 if graph["nodes"][task_id]["priority"] == "high" else 1 if graph["nodes"][task_id]["priority"] == "medium" else 2,
+            priority_rank(graph["nodes"][task_id]["priority"]),
             task_id,
         ),
     )
@@ -241,6 +272,19 @@ def get_task_graph_context(db: Session, user_id: str | uuid.UUID | None) -> dict
 
 
 def get_next_ready_task(db: Session, user_id: str | uuid.UUID | None) -> dict[str, Any] | None:
+    cache = get_task_graph_cache()
+    owner_user_id = _user_uuid(user_id)
+    if cache is not None and owner_user_id:
+        node = cache.next_ready(db, owner_user_id, build_task_graph)
+        if node is None:
+            return None
+        return {
+            "task_id": node["task_id"],
+            "name": node["name"],
+            "priority": node["priority"],
+            "status": node["status"],
+            "critical_weight": node["critical_weight"],
+        }
     context = get_task_graph_context(db, user_id)
     task_id = next(iter(context.get("critical_path") or []), None)
     if task_id is None:
@@ -262,16 +306,60 @@ def _unlock_downstream_tasks(db: Session, task: Task, user_id: str | uuid.UUID |
     unlocked: list[dict[str, Any]] = []
     candidates = (
         db.query(Task)
-        .filter(Task.user_id == owner_user_id, Task.status.in_(["blocked", "pending", "paused"]))
+        .join(TaskDependency, TaskDependency.task_id == Task.id)
+        .filter(
+            TaskDependency.depends_on_task_id == task.id,
+            Task.user_id == owner_user_id,
+            Task.status.in_(["blocked", "pending", "paused"]),
+        )
+        .all()
+    )
+    if not candidates:
+        return unlocked
+    # One grouped count of each dependent's other unfinished dependencies
+    # replaces a COUNT per candidate; the edge index keeps this O(out-degree).
+    dependency = aliased(Task)
+    outstanding = dict(
+        db.query(TaskDependency.task_id, func.count(TaskDependency.depends_on_task_id))
+        .outerjoin(
+            dependency,
+            (dependency.id == TaskDependency.depends_on_task_id)
+            & (dependency.user_id == owner_user_id),
+        )
+        .filter(
+            TaskDependency.task_id.in_([candidate.id for candidate in candidates]),
+            TaskDependency.depends_on_task_id != task.id,
+            (dependency.id.is_(None)) | (dependency.status != "completed"),
+        )
+        .group_by(TaskDependency.task_id)
         .all()
     )
+    # Edges to deleted tasks are cascaded away, so a depends_on id with no
+    # task row never shows up above; it still blocks, as in
+    # _dependencies_complete and the cached graph.
+    referenced = {
+        candidate.id: set(_dependency_ids(candidate)) - {int(task.id)}
+        for candidate in candidates
+    }
+    all_referenced = set().union(*referenced.values())
+    existing = {
+        task_id
+        for (task_id,) in db.query(Task.id).filter(
+            Task.user_id == owner_user_id,
+            Task.id.in_(all_referenced),
+        ).all()
+    } if all_referenced else set()
+    for candidate_id, dependency_ids in referenced.items():
+        missing = len(dependency_ids - existing)
+        if missing:
+            outstanding[candidate_id] = outstanding.get(candidate_id, 0) + missing
     for candidate in candidates:
-        if task.id not in _dependency_ids(candidate):
-            continue
-        previous_status = candidate.status
-        new_status = _recompute_task_status(db, candidate, user_id=user_id)
-        if previous_status == "blocked" and new_status == "pending":
-            unlocked.append({"task_id": candidate.id, "name": candidate.name, "status": candidate.status})
+        if outstanding.get(candidate.id, 0) == 0:
+            if candidate.status == "blocked":
+                candidate.status = "pending"
+                unlocked.append({"task_id": candidate.id, "name": candidate.name, "status": candidate.status})
+        elif candidate.status in {"pending", "paused"}:
+            candidate.status = "blocked"
     return unlocked
 
 
@@ -443,8 +531,13 @@ def create_task(
     )
     _recompute_task_status(db, task, user_id=owner_user_id)
     db.add(task)
+    db.flush()
+    db.add_all(_dependency_edges(task))
     db.commit()
     db.refresh(task)
+    cache = get_task_graph_cache()
+    if cache is not None:
+        cache.task_created(owner_user_id, _graph_node(task))
     logger.info("Created task: %s", task.name)
     _emit_task_event(
         db,
@@ -482,12 +575,14 @@ def start_task(db: Session, name: str, user_id: str | uuid.UUID | None):
     if not _dependencies_complete(db, task, user_id=user_id):
         _recompute_task_status(db, task, user_id=user_id)
         db.commit()
+        _note_task_statuses(user_id, [(task.id, task.status)])
         return f"Task '{name}' is blocked until dependencies complete."
 
     if not getattr(task, "start_time", None):
         task.start_time = datetime.now()
         task.status = "in_progress"
         db.commit()
+        _note_task_statuses(user_id, [(task.id, task.status)])
         _emit_task_event(
             db,
             event_type=SystemEventTypes.TASK_STARTED,
@@ -518,6 +613,7 @@ def pause_task(db: Session, name: str, user_id: str | uuid.UUID | None):
         task.time_spent += duration
         task.status = "paused"
         db.commit()
+        _note_task_statuses(user_id, [(task.id, task.status)])
         _emit_task_event(
             db,
             event_type=SystemEventTypes.TASK_PAUSED,
@@ -547,6 +643,7 @@ def complete_task(db: Session, name: str, user_id: str = None):
     if not _dependencies_complete(db, task, user_id=user_id):
         _recompute_task_status(db, task, user_id=user_id)
         db.commit()
+        _note_task_statuses(user_id, [(task.id, task.status)])
         raise ValueError(f"task_blocked:{task.name}")
 
     now = datetime.now()
@@ -557,6 +654,10 @@ def complete_task(db: Session, name: str, user_id: str = None):
     task.end_time = now
     unlocked_tasks = _unlock_downstream_tasks(db, task, user_id=user_id)
     db.commit()
+    _note_task_statuses(
+        user_id,
+        [(task.id, task.status), *((item["task_id"], item["status"]) for item in unlocked_tasks)],
+    )
     _emit_task_event(
         db,
         event_type=SystemEventTypes.TASK_COMPLETED,
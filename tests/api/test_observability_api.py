@@ -175,3 +175,27 @@ def test_observability_dashboard_returns_real_db_sections(
     assert data["system_health"]["latest"]["status"] == "healthy"
     assert data["flows"]["status_counts"]["running"] == 1
     assert data["flows"]["recent"][0]["trace_id"] == trace_id
+
+
+def test_observability_dashboard_polling_writes_no_execution_rows(
+    client,
+    db_session,
+    test_user,
+    auth_headers,
+):
+    from AINDY.db.models.execution_unit import ExecutionUnit
+
+    def _rows():
+        db_session.expire_all()
+        return (
+            db_session.query(FlowRun).filter(FlowRun.user_id == test_user.id).count(),
+            db_session.query(SystemEvent).filter(SystemEvent.user_id == test_user.id).count(),
+            db_session.query(ExecutionUnit).filter(ExecutionUnit.user_id == test_user.id).count(),
+        )
+
+    before = _rows()
+    for path in ("/platform/observability/dashboard", "/platform/observability/requests"):
+        for _ in range(3):
+            assert client.get(path, headers=auth_headers).status_code == 200
+
+    assert _rows() == before
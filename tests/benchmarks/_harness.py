@@ -0,0 +1,85 @@
+"""
+Shared helpers for the standalone benchmarks in this package.
+
+Benchmarks are plain scripts (``bench_*.py``) so pytest does not collect them.
+Run them from the repo root, e.g. ``python -m tests.benchmarks.bench_memory_recall``.
+"""
+from __future__ import annotations
+
+import os
+import statistics
+import time
+from contextlib import contextmanager
+from typing import Callable
+
+os.environ.setdefault("TEST_MODE", "true")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("AINDY_ALLOW_SQLITE", "true")
+os.environ.setdefault("AINDY_SKIP_MONGO_PING", "true")
+os.environ.setdefault("SKIP_MONGO_PING", "true")
+os.environ.setdefault("MONGO_URL", "")
+os.environ.setdefault("OPENAI_API_KEY", "sk-test-key-for-benchmarks-only")
+
+
+def sqlite_session():
+    """Return a Session bound to a fresh in-memory SQLite schema."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+
+    # Importing the fixture module registers the SQLite type shims
+    # (UUID/JSONB/ARRAY/Vector) used by the test harness.
+    from tests.fixtures import db as db_fixtures
+
+    db_fixtures._import_model_registry()
+    from AINDY.db.database import Base
+
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autoflush=False, expire_on_commit=False, bind=engine)()
+
+
+@contextmanager
+def count_statements(bind):
+    """Count SQL statements executed on *bind* inside the block."""
+    from sqlalchemy import event
+
+    counter = {"statements": 0}
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        counter["statements"] += 1
+
+    event.listen(bind, "before_cursor_execute", _before)
+    try:
+        yield counter
+    finally:
+        event.remove(bind, "before_cursor_execute", _before)
+
+
+def measure(fn: Callable[[], object], *, iterations: int, warmup: int = 3) -> dict:
+    """Run *fn* and return latency percentiles in milliseconds."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000.0)
+    samples.sort()
+    return {
+        "iterations": iterations,
+        "p50_ms": round(statistics.median(samples), 3),
+        "p99_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))], 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+    }
+
+
+def print_table(title: str, rows: list[tuple[str, dict]]) -> None:
+    print(title)
+    for label, result in rows:
+        fields = "  ".join(f"{key}={value}" for key, value in result.items())
+        print(f"  {label:<28} {fields}")
@@ -0,0 +1,94 @@
+"""
+ARM analysis of a multi-chunk file: sequential vs concurrent map, and re-analysis.
+
+Builds a --chunks chunk file and runs DeepSeekCodeAnalyzer.run_analysis with
+a fake provider that sleeps --latency-ms per call. "sequential" analyzes
+the chunks one at a time (concurrency 1, no chunk cache); "concurrent" uses
+AINDY_ARM_ANALYSIS_MAX_CONCURRENCY workers; "re-analysis" edits one chunk
+between runs, so the chunk cache serves the others. The previous
+implementation sent only chunk 1, so it was fast but incomplete.
+
+    python -m tests.benchmarks.bench_arm_map_reduce --chunks 12
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import time
+from unittest.mock import MagicMock
+
+from tests.benchmarks._harness import measure, print_table
+
+
+def _analyzer(latency_ms: float, calls: dict):
+    from apps.arm.services.deepseek.deepseek_code_analyzer import DeepSeekCodeAnalyzer
+
+    analyzer = DeepSeekCodeAnalyzer.__new__(DeepSeekCodeAnalyzer)
+    analyzer.config = {"analysis_model": "gpt-4o", "temperature": 0.2}
+    analyzer.config_manager = MagicMock()
+    analyzer.config_manager.calculate_task_priority.return_value = 5.0
+    analyzer.validator = MagicMock()
+    analyzer.file_processor = MagicMock()
+    analyzer._refresh_runtime_config = lambda db=None: None
+    analyzer._gather_context = lambda path, user_id, db: ([], "")
+
+    def _call_openai(**kwargs):
+        calls["count"] += 1
+        time.sleep(latency_ms / 1000.0)
+        result = {"summary": "ok", "architecture_score": 7, "integrity_score": 7, "findings": []}
+        return json.dumps(result), 1000, 200
+
+    analyzer._call_openai = _call_openai
+    return analyzer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--chunks", type=int, default=12)
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    from AINDY.config import settings
+    from apps.arm.services.deepseek.chunk_result_cache import reset_chunk_result_cache
+
+    path = MagicMock()
+    path.name = "big.py"
+    path.suffix = ".py"
+    chunks = [f"def f{index}():\n    return {index}\n" * 200 for index in range(args.chunks)]
+    edits = {"n": 0}
+    calls = {"count": 0}
+    analyzer = _analyzer(args.latency_ms, calls)
+    analyzer.validator.full_file_validation.return_value = (path, "")
+
+    def _analyze(edit: bool):
+        def _run():
+            if edit:
+                edits["n"] += 1
+                chunks[0] = f"# edit {edits['n']}\n" + chunks[0]
+            analyzer.file_processor.chunk_content.return_value = list(chunks)
+            analyzer.run_analysis(file_path="/fake/big.py", user_id=None, db=MagicMock())
+        return _run
+
+    rows = []
+    for name, concurrency, cache, edit in (
+        ("sequential", 1, False, False),
+        ("concurrent", settings.AINDY_ARM_ANALYSIS_MAX_CONCURRENCY, False, False),
+        ("re-analysis (1 chunk edited)", settings.AINDY_ARM_ANALYSIS_MAX_CONCURRENCY, True, True),
+    ):
+        settings.AINDY_ARM_ANALYSIS_MAX_CONCURRENCY = concurrency
+        settings.AINDY_ARM_CHUNK_CACHE_ENABLED = cache
+        reset_chunk_result_cache()
+        if cache:
+            _analyze(edit=False)()
+        calls["count"] = 0
+        stats = measure(_analyze(edit), iterations=args.iterations, warmup=0)
+        stats["provider calls/run"] = round(calls["count"] / args.iterations, 1)
+        rows.append((name, stats))
+    print_table(f"run_analysis, {args.chunks} chunks, {args.latency_ms:g} ms provider", rows)
+
+
+if __name__ == "__main__":
+    main()
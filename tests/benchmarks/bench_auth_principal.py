@@ -0,0 +1,93 @@
+"""
+Per-request auth cost: database resolution vs the principal cache.
+
+Resolves one platform API key (api_key_auth._resolve_api_key) and one JWT
+user (auth_service._resolve_authenticated_jwt_user) --requests times and
+counts SQL statements and commits per request. "uncached" is the original
+path: a SELECT per request, plus an inline last_used_at UPDATE + commit for
+API keys. "cached" enables AINDY_AUTH_PRINCIPAL_CACHE_TTL_SECONDS and
+AINDY_API_KEY_LAST_USED_FLUSH_SECONDS (flushes are excluded from the count).
+
+    python -m tests.benchmarks.bench_auth_principal --requests 500
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sqlite3
+import uuid
+
+from tests.benchmarks._harness import count_statements, measure, print_table
+
+
+def _commits(bind):
+    from sqlalchemy import event
+
+    counter = {"commits": 0}
+
+    def _commit(conn):
+        counter["commits"] += 1
+
+    event.listen(bind, "commit", _commit)
+    return counter, lambda: event.remove(bind, "commit", _commit)
+
+
+def _run(label: str, fn, bind, requests: int) -> tuple[str, dict]:
+    commits, stop = _commits(bind)
+    try:
+        with count_statements(bind) as counter:
+            timing = measure(fn, iterations=requests, warmup=0)
+    finally:
+        stop()
+    return label, {
+        "statements_per_req": round(counter["statements"] / requests, 2),
+        "commits_per_req": round(commits["commits"] / requests, 2),
+        "p50_ms": timing["p50_ms"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    from tests.benchmarks._harness import sqlite_session
+
+    from AINDY.auth import principal_cache
+    from AINDY.auth.api_key_auth import _resolve_api_key
+    from AINDY.config import settings
+    from AINDY.db.models.user import User
+    from AINDY.platform_layer import api_key_service
+    from AINDY.services.auth_service import _resolve_authenticated_jwt_user
+
+    # Same ARRAY binding shim as tests/unit/conftest.py.
+    sqlite3.register_adapter(list, lambda v: json.dumps(v))
+    db = sqlite_session()
+    bind = db.get_bind()
+    user = User(id=uuid.uuid4(), email="bench@example.com", username="bench", hashed_password="x")
+    db.add(user)
+    db.commit()
+    _, raw_key = api_key_service.create_api_key(str(user.id), "bench", ["memory.read"], db)
+    payload = {"sub": str(user.id), "tv": 0}
+    api_key_service.LastUsedBuffer.start = lambda self: None
+
+    rows = []
+    for label, ttl, flush in (("uncached", 0.0, 0.0), ("cached", 60.0, 60.0)):
+        settings.AINDY_AUTH_PRINCIPAL_CACHE_TTL_SECONDS = ttl
+        settings.AINDY_API_KEY_LAST_USED_FLUSH_SECONDS = flush
+        principal_cache._CACHE = None
+        api_key_service._last_used_buffer = None
+        rows.append(_run(f"api key, {label}", lambda: _resolve_api_key(raw_key, db), bind, args.requests))
+        rows.append(
+            _run(f"jwt, {label}", lambda: _resolve_authenticated_jwt_user(dict(payload), db), bind, args.requests)
+        )
+    api_key_service.flush_last_used()
+    settings.AINDY_AUTH_PRINCIPAL_CACHE_TTL_SECONDS = 0.0
+    settings.AINDY_API_KEY_LAST_USED_FLUSH_SECONDS = 0.0
+    print_table("Auth resolution per request (SQLite)", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Agent run capability mappings against a growing mapping history.
+
+Seeds --history run mappings (historical runs) and times persisting the
+mappings for one new run. "full read" is the previous approach (load the
+whole agent_capability_mappings table and the capability catalogue, then
+add the missing rows); "upsert" is create_run_capability_mappings with the
+cached catalogue and INSERT ... ON CONFLICT DO NOTHING. Statements are
+counted per run.
+
+    python -m tests.benchmarks.bench_capability_mappings --history 100000
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import uuid
+
+from tests.benchmarks._harness import count_statements, measure, print_table
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--history", type=int, default=100_000)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    from sqlalchemy import insert
+
+    from tests.benchmarks._harness import sqlite_session
+
+    from AINDY.agents.capability_service import (
+        _get_capability_definitions,
+        create_run_capability_mappings,
+        sync_capability_catalog,
+    )
+    from AINDY.db.models.capability import AgentCapabilityMapping, Capability
+
+    db = sqlite_session()
+    sync_capability_catalog(db)
+    capabilities = db.query(Capability).all()
+    names = sorted(_get_capability_definitions())[:3]
+    # Historical mappings; agent_runs rows are not needed with SQLite FKs off.
+    db.execute(
+        insert(AgentCapabilityMapping),
+        [
+            {
+                "id": uuid.uuid4(),
+                "capability_id": capabilities[index % len(capabilities)].id,
+                "agent_run_id": uuid.uuid4(),
+            }
+            for index in range(args.history)
+        ],
+    )
+    db.commit()
+
+    def _full_read():
+        rows = {row.name: row for row in db.query(Capability).all()}
+        existing = {
+            (str(row.capability_id), str(row.agent_type or ""), str(row.agent_run_id or ""))
+            for row in db.query(AgentCapabilityMapping).all()
+        }
+        run_id = uuid.uuid4()
+        for name in names:
+            key = (str(rows[name].id), "", str(run_id))
+            if key not in existing:
+                db.add(AgentCapabilityMapping(capability_id=rows[name].id, agent_run_id=run_id))
+        db.flush()
+        db.expunge_all()
+
+    def _upsert():
+        create_run_capability_mappings(str(uuid.uuid4()), "default", names, db)
+
+    rows = []
+    for name, fn in (("full read", _full_read), ("upsert", _upsert)):
+        stats = measure(fn, iterations=args.iterations, warmup=1)
+        with count_statements(db.get_bind()) as counter:
+            fn()
+        stats["statements/run"] = counter["statements"]
+        rows.append((name, stats))
+        db.rollback()
+    print_table(f"capability mappings for one run ({args.history} historical mappings)", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Pending-embedding backlog drain: per-node jobs vs the batched sweep.
+
+Both paths drain the same backlog against a fake embeddings endpoint that
+sleeps for a fixed per-request latency plus a small per-input cost, which is
+the shape of the real API. "per-node" runs process_embedding_job for every
+pending row (the old sweep body); "batched" calls process_pending_embeddings
+until nothing is left.
+
+    python -m tests.benchmarks.bench_embedding_sweep --nodes 500 --request-ms 150
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+import uuid
+from types import SimpleNamespace
+
+from tests.benchmarks._harness import count_statements, print_table, sqlite_session
+
+
+class _SlowEmbeddings:
+    def __init__(self, request_ms: float, per_input_ms: float):
+        self.request_s = request_ms / 1000.0
+        self.per_input_s = per_input_ms / 1000.0
+        self.requests = 0
+        self.embeddings = self
+
+    def create(self, *, input, model, timeout=None, **kwargs):
+        inputs = [input] if isinstance(input, str) else list(input)
+        self.requests += 1
+        time.sleep(self.request_s + self.per_input_s * len(inputs))
+        return SimpleNamespace(
+            data=[SimpleNamespace(index=i, embedding=[0.01 * (i + 1)] * 1536) for i in range(len(inputs))]
+        )
+
+
+def _seed(db, nodes: int) -> None:
+    from AINDY.memory.memory_persistence import MemoryNodeModel
+
+    user_id = uuid.uuid4()
+    db.add_all(
+        MemoryNodeModel(
+            id=uuid.uuid4(),
+            content=f"ingest burst memory {i} " + "context " * 40,
+            node_type="insight",
+            memory_type="insight",
+            user_id=user_id,
+            embedding_pending=True,
+            embedding_status="pending",
+            extra={},
+        )
+        for i in range(nodes)
+    )
+    db.commit()
+
+
+def _drain(label: str, nodes: int, fake: _SlowEmbeddings, run) -> tuple[str, dict]:
+    from AINDY.memory import embedding_service
+
+    db = sqlite_session()
+    _seed(db, nodes)
+    embedding_service._client = fake
+    try:
+        with count_statements(db.get_bind()) as counter:
+            started = time.perf_counter()
+            run(db)
+            elapsed = time.perf_counter() - started
+    finally:
+        embedding_service._client = None
+    return label, {
+        "nodes": nodes,
+        "drain_s": round(elapsed, 3),
+        "api_requests": fake.requests,
+        "sql_statements": counter["statements"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=500)
+    parser.add_argument("--request-ms", type=float, default=150.0)
+    parser.add_argument("--per-input-ms", type=float, default=0.5)
+    args = parser.parse_args()
+    # External-call audit events target the app database, which this
+    # script does not create; keep those write failures out of the output.
+    logging.disable(logging.ERROR)
+
+    from AINDY.memory.embedding_jobs import process_embedding_job, process_pending_embeddings
+    from AINDY.memory.memory_persistence import MemoryNodeModel
+
+    def _per_node(db):
+        pending = db.query(MemoryNodeModel.id).filter(MemoryNodeModel.embedding_pending.is_(True)).all()
+        for (node_id,) in pending:
+            process_embedding_job({"memory_id": str(node_id)}, db)
+
+    def _batched(db):
+        while process_pending_embeddings(db=db)["processed"]:
+            pass
+
+    rows = [
+        _drain("per-node", args.nodes, _SlowEmbeddings(args.request_ms, args.per_input_ms), _per_node),
+        _drain("batched", args.nodes, _SlowEmbeddings(args.request_ms, args.per_input_ms), _batched),
+    ]
+    print_table("pending-embedding backlog drain", rows)
+
+
+if __name__ == "__main__":
+    main()
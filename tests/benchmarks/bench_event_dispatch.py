@@ -0,0 +1,93 @@
+"""
+Event matching cost: linear _matches scan vs the compiled dispatch index.
+
+Registers --subscriptions webhook subscriptions (a mix of exact types,
+"prefix.*" wildcards at one and two segments, and a few "*") and resolves
+the matching set for a stream of event types. "linear" is the previous
+path (every pattern checked with _matches on every emit); "indexed" is
+event_service._webhook_index().match, which also backs internal handlers;
+"recompile" is the copy-on-write rebuild paid once per subscribe/unsubscribe.
+
+    python -m tests.benchmarks.bench_event_dispatch --subscriptions 10000
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+
+from tests.benchmarks._harness import measure, print_table
+
+_DOMAINS = ["execution", "flow", "memory", "agent", "task", "webhook", "arm", "score"]
+_ACTIONS = ["started", "completed", "failed", "waiting", "resumed", "created", "deleted"]
+
+
+def _pattern(rng: random.Random, index: int) -> str:
+    domain = rng.choice(_DOMAINS)
+    roll = rng.random()
+    if roll < 0.001:
+        return "*"
+    if roll < 0.2:
+        return f"{domain}.*"
+    if roll < 0.4:
+        return f"{domain}.tenant{index % 500}.*"
+    return f"{domain}.tenant{index % 500}.{rng.choice(_ACTIONS)}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--subscriptions", type=int, default=10_000)
+    parser.add_argument("--events", type=int, default=2_000)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    from AINDY.platform_layer import event_service
+    from AINDY.platform_layer.event_service import _matches
+
+    rng = random.Random(11)
+    event_service._SUBSCRIPTIONS.clear()
+    for index in range(args.subscriptions):
+        event_service._load_subscription(
+            f"sub-{index}",
+            _pattern(rng, index),
+            "https://example.test/hook",
+            secret=None,
+            user_id=None,
+            created_at="",
+        )
+    events = [
+        f"{rng.choice(_DOMAINS)}.tenant{rng.randrange(500)}.{rng.choice(_ACTIONS)}"
+        for _ in range(args.events)
+    ]
+    stream = iter(events * 1000)
+
+    def _linear():
+        event_type = next(stream)
+        return [
+            sub for sub in list(event_service._SUBSCRIPTIONS.values())
+            if _matches(sub["event_type"], event_type)
+        ]
+
+    def _indexed():
+        return event_service._webhook_index().match(next(stream))
+
+    for event_type in events[:50]:
+        assert [s["id"] for s in event_service._webhook_index().match(event_type)] == [
+            s["id"] for s in event_service._SUBSCRIPTIONS.values() if _matches(s["event_type"], event_type)
+        ]
+
+    def _recompile():
+        event_service._INDEXES.clear()
+        event_service._webhook_index()
+
+    rows = [
+        ("linear", measure(_linear, iterations=args.events)),
+        ("indexed", measure(_indexed, iterations=args.events)),
+        ("recompile (per change)", measure(_recompile, iterations=20)),
+    ]
+    event_service._SUBSCRIPTIONS.clear()
+    print_table(f"Webhook matching per emit ({args.subscriptions} subscriptions)", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Bursts of identical provider calls through perform_external_call.
+
+Each burst fires --callers threads at once, spread over --prompts distinct
+prompts, against a fake provider that sleeps --latency-ms per request.
+"no key" is the previous behaviour (every caller hits the provider);
+"singleflight" passes a dedupe_key so identical in-flight calls share one
+request; "cached" also sets cache=True, as temperature-0 callers do, so
+repeat bursts are served from the call cache. SystemEvent emission is
+stubbed out so only the call layer is timed.
+
+    python -m tests.benchmarks.bench_external_call_coalescing --callers 32
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import threading
+import time
+
+from tests.benchmarks._harness import measure, print_table
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--callers", type=int, default=32)
+    parser.add_argument("--prompts", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--iterations", type=int, default=10)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    from AINDY.platform_layer import external_call_service
+    from AINDY.platform_layer.external_call_service import (
+        external_call_key,
+        get_external_call_cache,
+        perform_external_call,
+    )
+
+    external_call_service.emit_system_event = lambda **kwargs: None
+    external_call_service.emit_error_event = lambda **kwargs: None
+    provider_calls = {"count": 0}
+    counter_lock = threading.Lock()
+
+    def _provider():
+        with counter_lock:
+            provider_calls["count"] += 1
+        time.sleep(args.latency_ms / 1000.0)
+        return {"choices": []}
+
+    def _burst(*, dedupe: bool, cache: bool):
+        def _run():
+            def _caller(index: int):
+                prompt = f"analyze module {index % args.prompts}"
+                perform_external_call(
+                    service_name="deepseek",
+                    db=object(),
+                    dedupe_key=external_call_key(model="deepseek-chat", prompt=prompt) if dedupe else None,
+                    cache=cache,
+                    operation=_provider,
+                )
+
+            threads = [threading.Thread(target=_caller, args=(index,)) for index in range(args.callers)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        return _run
+
+    rows = []
+    for name, dedupe, cache in (
+        ("no key", False, False),
+        ("singleflight", True, False),
+        ("cached", True, True),
+    ):
+        get_external_call_cache().clear()
+        provider_calls["count"] = 0
+        stats = measure(_burst(dedupe=dedupe, cache=cache), iterations=args.iterations, warmup=0)
+        stats["provider calls/burst"] = round(provider_calls["count"] / args.iterations, 1)
+        rows.append((name, stats))
+    print_table(
+        f"{args.callers} concurrent callers, {args.prompts} prompts, {args.latency_ms:g} ms provider",
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
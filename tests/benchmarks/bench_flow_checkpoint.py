@@ -0,0 +1,112 @@
+"""
+FlowRun checkpoint cost: full state per node vs delta checkpoints.
+
+Runs a --steps node agent-style flow where each step appends a tool result
+of --output-kb to the state, once with AINDY_FLOW_CHECKPOINT_INTERVAL=1
+(full FlowRun.state rewritten every node) and once with the delta interval
+(the default). Reports the parameter bytes sent to the database per node
+and the wall time per node.
+
+    python -m tests.benchmarks.bench_flow_checkpoint --steps 50 --output-kb 4
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+import uuid
+
+from tests.benchmarks._harness import print_table, sqlite_session
+
+
+def _param_bytes(parameters) -> int:
+    if isinstance(parameters, dict):
+        parameters = parameters.values()
+    elif parameters and isinstance(parameters[0], (list, tuple, dict)):
+        return sum(_param_bytes(row) for row in parameters)
+    return sum(len(value) if isinstance(value, (str, bytes)) else 8 for value in parameters or ())
+
+
+def _run(label: str, steps: int, output_kb: int, interval: int) -> tuple[str, dict]:
+    from sqlalchemy import event
+
+    from AINDY.config import settings
+    from AINDY.db.models.flow_run import FlowRun
+    from AINDY.runtime.flow_engine import PersistentFlowRunner, register_node
+    from AINDY.runtime.flow_engine.checkpoint import load_run_state
+
+    db = sqlite_session()
+    bind = db.get_bind()
+    previous_interval = settings.AINDY_FLOW_CHECKPOINT_INTERVAL
+    settings.AINDY_FLOW_CHECKPOINT_INTERVAL = interval
+
+    names = [f"bench_agent_step_{i}" for i in range(steps)]
+    payload = "x" * (output_kb * 1024)
+    for index, name in enumerate(names):
+        register_node(name)(
+            lambda state, context, index=index: {
+                "status": "SUCCESS",
+                "output_patch": {f"tool_result_{index}": payload, "step": index},
+            }
+        )
+    flow = {
+        "start": names[0],
+        "edges": {a: [b] for a, b in zip(names, names[1:])},
+        "end": [names[-1]],
+    }
+    run = FlowRun(
+        id=str(uuid.uuid4()),
+        flow_name="bench_checkpoint",
+        workflow_type="bench",
+        state={"goal": "benchmark"},
+        current_node=names[0],
+        status="running",
+        trace_id=str(uuid.uuid4()),
+    )
+    db.add(run)
+    db.commit()
+
+    counter = {"bytes": 0}
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        if "flow_runs" in statement or "flow_history" in statement:
+            counter["bytes"] += _param_bytes(parameters)
+
+    event.listen(bind, "before_cursor_execute", _count)
+    try:
+        started = time.perf_counter()
+        result = PersistentFlowRunner(flow=flow, db=db, workflow_type="bench").resume(run.id)
+        elapsed = time.perf_counter() - started
+    finally:
+        event.remove(bind, "before_cursor_execute", _count)
+        settings.AINDY_FLOW_CHECKPOINT_INTERVAL = previous_interval
+
+    assert result["status"] == "SUCCESS", result
+    db.expire_all()
+    stored = db.get(FlowRun, run.id)
+    assert load_run_state(db, stored)["step"] == steps - 1
+    return label, {
+        "steps": steps,
+        "interval": interval,
+        "kb_written_per_node": round(counter["bytes"] / 1024 / steps, 1),
+        "ms_per_node": round(elapsed * 1000 / steps, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--steps", type=int, default=50)
+    parser.add_argument("--output-kb", type=int, default=4)
+    parser.add_argument("--interval", type=int, default=10)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    rows = [
+        _run("full state per node", args.steps, args.output_kb, interval=1),
+        _run("delta checkpoints", args.steps, args.output_kb, interval=args.interval),
+    ]
+    print_table("flow checkpoint write cost", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+SystemEvent cost per flow node: inline persistence vs write-behind.
+
+Runs a linear flow of --nodes no-op nodes through PersistentFlowRunner.resume
+twice, once with AINDY_SYSTEM_EVENT_WRITE_BEHIND off and once on, and counts
+the SQL statements that touch system_events / event_edges (including the
+final buffer flush), divided by the number of nodes.
+
+    python -m tests.benchmarks.bench_flow_event_overhead --nodes 200
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+import uuid
+
+from tests.benchmarks._harness import print_table, sqlite_session
+
+
+def _run(label: str, nodes: int, write_behind: bool) -> tuple[str, dict]:
+    from sqlalchemy import event
+    from sqlalchemy.orm import sessionmaker
+
+    from AINDY.config import settings
+    from AINDY.core import system_event_buffer
+    from AINDY.db.models.flow_run import FlowRun
+    from AINDY.db.models.system_event import SystemEvent
+    from AINDY.runtime.flow_engine import PersistentFlowRunner, register_node
+
+    db = sqlite_session()
+    bind = db.get_bind()
+    settings.AINDY_SYSTEM_EVENT_WRITE_BEHIND = write_behind
+    system_event_buffer._buffer = system_event_buffer.SystemEventBuffer(
+        max_events=200,
+        flush_interval_seconds=3600,
+        session_factory=sessionmaker(autoflush=False, expire_on_commit=False, bind=bind),
+    )
+
+    names = [f"bench_event_node_{i}" for i in range(nodes)]
+    for name in names:
+        register_node(name)(lambda state, context: {"status": "SUCCESS", "output_patch": {}})
+    flow = {
+        "start": names[0],
+        "edges": {a: [b] for a, b in zip(names, names[1:])},
+        "end": [names[-1]],
+    }
+    run = FlowRun(
+        id=str(uuid.uuid4()),
+        flow_name="bench_events",
+        workflow_type="bench",
+        state={},
+        current_node=names[0],
+        status="running",
+        trace_id=str(uuid.uuid4()),
+    )
+    db.add(run)
+    db.commit()
+
+    counter = {"event_statements": 0, "statements": 0}
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        counter["statements"] += 1
+        if "system_events" in statement or "event_edges" in statement:
+            counter["event_statements"] += 1
+
+    event.listen(bind, "before_cursor_execute", _count)
+    try:
+        started = time.perf_counter()
+        result = PersistentFlowRunner(flow=flow, db=db, workflow_type="bench").resume(run.id)
+        system_event_buffer.flush_system_events()
+        elapsed = time.perf_counter() - started
+    finally:
+        event.remove(bind, "before_cursor_execute", _count)
+        system_event_buffer._buffer = None
+        settings.AINDY_SYSTEM_EVENT_WRITE_BEHIND = False
+
+    assert result["status"] == "SUCCESS", result
+    return label, {
+        "nodes": nodes,
+        "events": db.query(SystemEvent).count(),
+        "event_stmts_per_node": round(counter["event_statements"] / nodes, 2),
+        "stmts_per_node": round(counter["statements"] / nodes, 2),
+        "ms_per_node": round(elapsed * 1000 / nodes, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=200)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    rows = [
+        _run("inline", args.nodes, write_behind=False),
+        _run("write-behind", args.nodes, write_behind=True),
+    ]
+    print_table("flow node SystemEvent overhead", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Approximate vs exact semantic top-k on the in-process embedding matrix.
+
+Reports recall@k of each search mode against exact search over the same
+partition, with per-query latency. Rows are drawn around random centres so
+the data has the cluster structure real embeddings have; uniform noise has
+no neighbourhoods for any ANN index to exploit.
+
+    python -m tests.benchmarks.bench_memory_ann --nodes 100000 --k 10
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from tests.benchmarks._harness import measure, print_table
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--clusters", type=int, default=1000)
+    parser.add_argument("--spread", type=float, default=1.5)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    from AINDY.memory.vector_index import ANN_PROFILES, MemoryVectorIndex
+
+    rng = np.random.default_rng(7)
+    centres = rng.standard_normal((args.clusters, 1536), dtype=np.float32)
+    labels = rng.integers(0, args.clusters, size=args.nodes)
+    vectors = centres[labels] + args.spread * rng.standard_normal((args.nodes, 1536), dtype=np.float32)
+    rows = [(f"node-{i}", "insight", vectors[i]) for i in range(args.nodes)]
+    query_labels = rng.integers(0, args.clusters, size=args.queries)
+    queries = centres[query_labels] + args.spread * rng.standard_normal((args.queries, 1536), dtype=np.float32)
+    user_id = "00000000-0000-0000-0000-000000000001"
+
+    index = MemoryVectorIndex(max_bytes=1 << 34, ttl_seconds=3600)
+    index._load_rows = lambda db, user_key: rows
+
+    def _search(query, profile):
+        return index.search(None, user_id=user_id, query_embedding=query, limit=args.k, profile=profile)
+
+    exact_hits = [{node_id for node_id, _ in _search(query, None)} for query in queries]
+    started = time.perf_counter()
+    _search(queries[0], ANN_PROFILES["balanced"])
+    build_ms = round((time.perf_counter() - started) * 1000.0, 3)
+
+    results = []
+    for name, profile in [("exact", None)] + list(ANN_PROFILES.items()):
+        found = 0
+        for query, expected in zip(queries, exact_hits):
+            found += len(expected & {node_id for node_id, _ in _search(query, profile)})
+        cursor = iter(range(10**9))
+        stats = measure(
+            lambda: _search(queries[next(cursor) % args.queries], profile),
+            iterations=args.iterations,
+        )
+        stats[f"recall@{args.k}"] = round(found / (args.k * args.queries), 4)
+        if profile is not None:
+            stats["probe_fraction"] = profile.probe_fraction
+        results.append((name, stats))
+    results[0][1]["rows"] = args.nodes
+    results[0][1]["ivf_build_ms"] = build_ms
+
+    print_table(f"top-{args.k} search modes", results)
+
+
+if __name__ == "__main__":
+    main()
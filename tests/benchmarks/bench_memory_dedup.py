@@ -0,0 +1,104 @@
+"""
+Memory capture dedup: content equality scan vs content hash and SimHash bands.
+
+Seeds --nodes memory nodes for one user and times the capture-time duplicate
+check for new (non-duplicate) content, the common case. "content scan" is the
+previous ``WHERE user_id = :uid AND content = :content`` query; "hash" is
+MemoryCaptureEngine._is_duplicate with exact dedup only; "hash + near" also
+consults the near-duplicate band index (its one-off load is reported
+separately).
+
+    python -m tests.benchmarks.bench_memory_dedup --nodes 100000
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from tests.benchmarks._harness import measure, print_table
+
+
+def _seed(db, user_id: uuid.UUID, nodes: int, rng: random.Random) -> None:
+    from sqlalchemy import insert
+
+    from AINDY.db.models.user import User
+    from AINDY.memory.content_fingerprint import content_hash, simhash
+    from AINDY.memory.memory_persistence import MemoryNodeModel
+
+    db.add(User(id=user_id, email="bench@aindy.test", username="bench", hashed_password="x"))
+    started = datetime.now(timezone.utc).replace(tzinfo=None)
+    rows = []
+    for index in range(nodes):
+        content = (
+            f"Execution {index} of flow flow_{rng.randrange(200)} failed at step step_{rng.randrange(30)}: "
+            f"upstream service_{rng.randrange(50)} returned {rng.choice((500, 502, 503, 504))}"
+        )
+        rows.append(
+            {
+                "id": uuid.uuid4(),
+                "content": content,
+                "content_hash": content_hash(content),
+                "content_simhash": simhash(content),
+                "tags": [],
+                "node_type": "outcome",
+                "memory_type": "failure",
+                "user_id": user_id,
+                "extra": {},
+                "created_at": started - timedelta(seconds=nodes - index),
+            }
+        )
+    db.execute(insert(MemoryNodeModel), rows)
+    db.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--checks", type=int, default=50)
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    from sqlalchemy import text
+
+    from tests.benchmarks._harness import sqlite_session
+
+    from AINDY.config import settings
+    from AINDY.memory.content_fingerprint import get_near_duplicate_index, simhash
+    from AINDY.memory.memory_capture_engine import MemoryCaptureEngine
+
+    rng = random.Random(9)
+    db = sqlite_session()
+    user_id = uuid.uuid4()
+    _seed(db, user_id, args.nodes, rng)
+    engine = MemoryCaptureEngine(db=db, user_id=str(user_id))
+    contents = [f"Weekly review {uuid.uuid4().hex} produced {index} follow-up items" for index in range(args.checks)]
+
+    def _scan():
+        for content in contents:
+            db.execute(
+                text("SELECT id FROM memory_nodes WHERE user_id = :uid AND content = :content LIMIT 1"),
+                {"uid": str(user_id).replace("-", ""), "content": content},
+            ).fetchone()
+
+    def _dedup():
+        for content in contents:
+            assert not engine._is_duplicate(content)
+
+    rows = [("content scan", measure(_scan, iterations=args.iterations, warmup=1))]
+    settings.AINDY_MEMORY_NEAR_DUPLICATE_ENABLED = False
+    rows.append(("hash", measure(_dedup, iterations=args.iterations, warmup=1)))
+    settings.AINDY_MEMORY_NEAR_DUPLICATE_ENABLED = True
+    started = time.perf_counter()
+    get_near_duplicate_index().find(db, user_id=user_id, simhash_value=simhash("warmup"), max_distance=6)
+    rows.append(("near index load (once)", {"ms": round((time.perf_counter() - started) * 1000.0, 1)}))
+    rows.append(("hash + near", measure(_dedup, iterations=args.iterations, warmup=1)))
+    print_table(f"Duplicate checks x{len(contents)} ({args.nodes} nodes)", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Recall latency: per-candidate resonance scoring vs the batched path.
+
+The "per-candidate" variant reproduces the old scoring loop (two COUNT
+queries plus a node reload per candidate) so both paths run against the
+same data.
+
+    python -m tests.benchmarks.bench_memory_recall --nodes 2000 --limits 5 15 50
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import uuid
+
+from tests.benchmarks._harness import count_statements, measure, print_table, sqlite_session
+
+
+def _seed(db, user_id: str, nodes: int) -> None:
+    from AINDY.memory.memory_persistence import MemoryLinkModel, MemoryNodeModel
+
+    rows = [
+        MemoryNodeModel(
+            id=uuid.uuid4(),
+            content=f"bench memory {i}",
+            tags=["bench", f"t{i % 7}"],
+            node_type="insight",
+            memory_type="insight",
+            user_id=uuid.UUID(user_id),
+            success_count=random.randint(0, 5),
+            failure_count=random.randint(0, 5),
+            usage_count=random.randint(0, 50),
+            extra={},
+        )
+        for i in range(nodes)
+    ]
+    db.add_all(rows)
+    db.flush()
+    links = set()
+    for _ in range(nodes * 2):
+        source, target = random.sample(rows, 2)
+        links.add((source.id, target.id))
+    db.add_all(
+        MemoryLinkModel(source_node_id=s, target_node_id=t, link_type="related")
+        for s, t in links
+    )
+    db.commit()
+
+
+def _per_candidate_score(dao, candidates, tags=None):
+    """The pre-batching scoring loop: O(candidates) round-trips."""
+    now = dao._now_utc()
+    for c in candidates:
+        graph_score = dao.get_graph_connectivity_score(c["id"])
+        recency_score = dao._recency_score(c.get("created_at"), now)
+        success_rate, adaptive_weight, usage_freq = 0.5, 1.0, 0.0
+        node_obj = dao._get_model_by_id(c["id"])
+        if node_obj:
+            success_rate = dao.get_success_rate(node_obj)
+            adaptive_weight = node_obj.weight or 1.0
+            usage_freq = dao.get_usage_frequency_score(node_obj)
+        c["resonance_score"] = min(
+            1.0,
+            (
+                c.get("semantic_score", 0.0) * 0.40
+                + graph_score * 0.15
+                + recency_score * 0.15
+                + success_rate * 0.20
+                + usage_freq * 0.10
+            )
+            * adaptive_weight,
+        )
+    return list(candidates)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=2000)
+    parser.add_argument("--limits", type=int, nargs="*", default=[5, 15, 50])
+    parser.add_argument("--iterations", type=int, default=100)
+    args = parser.parse_args()
+
+    from AINDY.db.dao.memory_node_dao import MemoryNodeDAO
+
+    random.seed(7)
+    db = sqlite_session()
+    user_id = str(uuid.uuid4())
+    _seed(db, user_id, args.nodes)
+
+    batched = MemoryNodeDAO(db)
+    per_candidate = MemoryNodeDAO(db)
+    per_candidate._score_candidates = lambda candidates, tags=None: _per_candidate_score(
+        per_candidate, candidates, tags
+    )
+
+    rows = []
+    for limit in args.limits:
+        for label, dao in (("per-candidate", per_candidate), ("batched", batched)):
+            def _run(dao=dao, limit=limit):
+                return dao.recall(tags=["bench"], limit=limit, user_id=user_id)
+
+            with count_statements(db.get_bind()) as counter:
+                _run()
+            result = measure(_run, iterations=args.iterations)
+            result["queries"] = counter["statements"]
+            rows.append((f"{label} limit={limit}", result))
+
+    print_table(f"recall() over {args.nodes} nodes", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Semantic top-k without pgvector: per-row Python cosine vs the embedding matrix.
+
+The per-row variant is the old find_similar fallback (one Python cosine per
+embedded row). It is measured on a smaller row count because it is linear
+and slow; the matrix variant runs at the full size.
+
+    python -m tests.benchmarks.bench_memory_similarity --nodes 100000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from tests.benchmarks._harness import measure, print_table
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--legacy-nodes", type=int, default=5_000)
+    parser.add_argument("--limit", type=int, default=15)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    from AINDY.memory.embedding_service import cosine_similarity_python
+    from AINDY.memory.vector_index import MemoryVectorIndex
+
+    rng = np.random.default_rng(7)
+    vectors = rng.standard_normal((args.nodes, 1536), dtype=np.float32)
+    rows = [(f"node-{i}", "insight", vectors[i]) for i in range(args.nodes)]
+    query = rng.standard_normal(1536).astype(np.float32).tolist()
+    user_id = "00000000-0000-0000-0000-000000000001"
+
+    index = MemoryVectorIndex(max_bytes=1 << 34, ttl_seconds=3600)
+    index._load_rows = lambda db, user_key: rows
+    started = time.perf_counter()
+    index.search(None, user_id=user_id, query_embedding=query, limit=args.limit)
+    load_ms = round((time.perf_counter() - started) * 1000.0, 3)
+
+    legacy_rows = [vector.tolist() for vector in vectors[: args.legacy_nodes]]
+
+    def _legacy():
+        scored = [(cosine_similarity_python(query, row), i) for i, row in enumerate(legacy_rows)]
+        scored.sort(reverse=True)
+        return scored[: args.limit]
+
+    def _matrix():
+        return index.search(None, user_id=user_id, query_embedding=query, limit=args.limit)
+
+    legacy = measure(_legacy, iterations=3, warmup=1)
+    legacy["rows"] = args.legacy_nodes
+    legacy["projected_full_ms"] = round(legacy["p50_ms"] * args.nodes / args.legacy_nodes, 1)
+    matrix = measure(_matrix, iterations=args.iterations)
+    matrix["rows"] = args.nodes
+    matrix["initial_load_ms"] = load_ms
+
+    print_table(f"top-{args.limit} similarity", [("per-row python", legacy), ("embedding matrix", matrix)])
+
+
+if __name__ == "__main__":
+    main()
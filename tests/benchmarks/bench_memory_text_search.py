@@ -0,0 +1,103 @@
+"""
+Text recall without embeddings: ILIKE substring scan vs the BM25 index.
+
+Seeds --nodes memory nodes for one user with synthetic vocabulary and times
+_find_text_matches for two-word queries. "ilike" is the previous path
+(``content ILIKE '%query%'`` ordered by recency, which also misses every
+node that does not contain the exact phrase); "bm25" is the in-process
+inverted index once loaded (the load is reported separately). Hits are the
+mean number of nodes each path returns per query.
+
+    python -m tests.benchmarks.bench_memory_text_search --nodes 50000
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import time
+import uuid
+
+from tests.benchmarks._harness import measure, print_table
+
+
+def _vocabulary(rng: random.Random, size: int) -> list[str]:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(4, 9))) for _ in range(size)]
+
+
+def _seed(db, user_id: uuid.UUID, nodes: int, vocabulary: list[str], rng: random.Random) -> None:
+    from sqlalchemy import insert
+
+    from AINDY.db.models.user import User
+    from AINDY.memory.memory_persistence import MemoryNodeModel
+
+    db.add(User(id=user_id, email="bench@aindy.test", username="bench", hashed_password="x"))
+    # Zipf-like word frequencies, as in natural text.
+    weights = [1.0 / (rank + 1) for rank in range(len(vocabulary))]
+    db.execute(
+        insert(MemoryNodeModel),
+        [
+            {
+                "id": uuid.uuid4(),
+                "content": " ".join(rng.choices(vocabulary, weights=weights, k=rng.randint(12, 60))),
+                "tags": [],
+                "node_type": "insight",
+                "memory_type": "insight",
+                "user_id": user_id,
+                "extra": {},
+            }
+            for _ in range(nodes)
+        ],
+    )
+    db.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=50_000)
+    parser.add_argument("--vocabulary", type=int, default=5_000)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    from tests.benchmarks._harness import sqlite_session
+
+    from AINDY.config import settings
+    from AINDY.db.dao.memory_node_dao import MemoryNodeDAO
+    from AINDY.memory.lexical_index import get_memory_lexical_index
+
+    rng = random.Random(5)
+    vocabulary = _vocabulary(rng, args.vocabulary)
+    db = sqlite_session()
+    user_id = uuid.uuid4()
+    _seed(db, user_id, args.nodes, vocabulary, rng)
+    dao = MemoryNodeDAO(db)
+    # Mid-frequency words: common enough to match, rare enough to discriminate.
+    queries = [" ".join(rng.sample(vocabulary[50:500], 2)) for _ in range(args.queries)]
+    hits = {"ilike": 0, "bm25": 0}
+
+    def _run(name: str):
+        def _queries():
+            for query in queries:
+                hits[name] += len(dao._find_text_matches(query=query, limit=15, user_id=str(user_id), node_type=None))
+        return _queries
+
+    rows = []
+    settings.AINDY_MEMORY_LEXICAL_INDEX_ENABLED = False
+    rows.append(("ilike", measure(_run("ilike"), iterations=args.iterations, warmup=0)))
+
+    settings.AINDY_MEMORY_LEXICAL_INDEX_ENABLED = True
+    started = time.perf_counter()
+    get_memory_lexical_index().search(db, user_id=user_id, query="warmup", limit=1)
+    rows.append(("bm25 load (once)", {"ms": round((time.perf_counter() - started) * 1000.0, 1)}))
+    rows.append(("bm25", measure(_run("bm25"), iterations=args.iterations, warmup=0)))
+    for name, stats in rows:
+        if name in hits:
+            stats["hits/query"] = round(hits[name] / (args.iterations * len(queries)), 1)
+    print_table(f"_find_text_matches x{len(queries)} queries ({args.nodes} nodes)", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Nodus script overhead: one subprocess per script vs the warm worker pool.
+
+Runs --scripts small scripts through NodusRuntimeAdapter.run_script with
+AINDY_NODUS_WORKER_POOL_ENABLED off (subprocess.run per script) and on, and
+reports per-script latency plus throughput with --threads concurrent callers.
+
+    python -m tests.benchmarks.bench_nodus_worker_pool --scripts 50 --threads 4
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+from tests.benchmarks._harness import measure, print_table
+
+SCRIPT = 'let total = 0\nlet i = 0\nwhile (i < 100) { total = total + i\ni = i + 1 }\nset_state("total", total)'
+
+
+def _run_one() -> None:
+    from AINDY.runtime.nodus_runtime_adapter import NodusExecutionContext, NodusRuntimeAdapter
+
+    context = NodusExecutionContext(user_id="", execution_unit_id=str(uuid.uuid4()))
+    result = NodusRuntimeAdapter(db=MagicMock()).run_script(SCRIPT, context, max_execution_ms=10_000)
+    assert result.status == "success", result.error
+
+
+def _throughput(scripts: int, threads: int) -> float:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(lambda _: _run_one(), range(scripts)))
+    return scripts / (time.perf_counter() - started)
+
+
+def _bench(label: str, scripts: int, threads: int, pooled: bool) -> tuple[str, dict]:
+    from AINDY.config import settings
+    from AINDY.runtime import nodus_worker_pool
+
+    settings.AINDY_NODUS_WORKER_POOL_ENABLED = pooled
+    settings.AINDY_NODUS_WORKER_POOL_SIZE = threads
+    try:
+        if pooled:
+            nodus_worker_pool.get_nodus_worker_pool()
+            for _ in range(threads):
+                _run_one()  # wait for every worker to finish warming up
+        timing = measure(_run_one, iterations=scripts, warmup=1)
+        rate = _throughput(scripts, threads)
+    finally:
+        nodus_worker_pool.shutdown_nodus_worker_pool()
+        settings.AINDY_NODUS_WORKER_POOL_ENABLED = False
+    return label, {**timing, "scripts_per_s": round(rate, 1), "threads": threads}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scripts", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    rows = [
+        _bench("subprocess per script", args.scripts, args.threads, pooled=False),
+        _bench("warm worker pool", args.scripts, args.threads, pooled=True),
+    ]
+    print_table("Nodus script execution overhead", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Load test for execute_with_pipeline event-loop handling.
+
+Serves GET /observability/requests (a sync route: flow run + RequestMetric
+queries through ExecutionPipeline) and an async twin of it from a minimal
+app on a file-backed SQLite database, and drives both with --concurrency
+in-flight requests. While the load runs, a probe task measures how late a
+5 ms sleep on the same loop wakes up (loop lag, i.e. time the loop was blocked).
+Also reports the bare cost of asyncio.run() vs the reused thread loop.
+Modes:
+
+  sync, asyncio.run      the old execute_with_pipeline_sync (loop per request)
+  sync, thread loop      execute_with_pipeline_sync reusing a per-thread loop
+  async, inline handler  handler body blocks the server loop
+  async, offloaded       handler body runs on the bounded handler executor
+
+    python -m tests.benchmarks.bench_pipeline_loop --requests 400 --concurrency 16
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import logging
+import os
+import statistics
+import tempfile
+import time
+import uuid
+
+from fastapi import Request
+
+from tests.benchmarks._harness import measure, print_table
+
+
+def _build_app(db_url: str):
+    from fastapi import Depends, FastAPI
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import NullPool
+
+    from tests.fixtures import db as db_fixtures
+
+    db_fixtures._import_model_registry()
+    from AINDY.core.execution_helper import execute_with_pipeline
+    from AINDY.db import database
+    from AINDY.db.database import Base, get_db
+    from AINDY.platform_layer.rate_limiter import limiter
+    from AINDY.platform_layer.registry import register_flow_result
+    from AINDY.runtime import flow_definitions_observability
+    from AINDY.services.auth_service import get_current_user, require_platform_admin_access
+
+    observability_router = importlib.import_module("AINDY.routes.observability_router")
+
+    # NullPool: with a bounded pool, inline handlers on the shared loop can
+    # deadlock waiting for connections held by requests parked on that loop.
+    engine = create_engine(
+        db_url,
+        connect_args={"check_same_thread": False, "timeout": 30},
+        poolclass=NullPool,
+    )
+
+    @event.listens_for(engine, "connect")
+    def _pragmas(dbapi_connection, _record):
+        dbapi_connection.execute("PRAGMA journal_mode=WAL")
+        dbapi_connection.execute("PRAGMA synchronous=OFF")
+
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autoflush=False, bind=engine)
+    database.SessionLocal = factory
+    flow_definitions_observability.register()
+    register_flow_result("observability_requests", result_key="observability_requests_result")
+    limiter.enabled = False
+
+    user_id = str(uuid.uuid4())
+    app = FastAPI()
+    app.include_router(observability_router.router)
+
+    @app.get("/bench/requests-async")
+    async def requests_async(request: Request, db=Depends(get_db)):
+        def handler(ctx):
+            return observability_router._run_flow_observability(
+                "observability_requests",
+                {"limit": 50, "error_limit": 25, "window_hours": 24},
+                db,
+                user_id,
+            )
+
+        return await execute_with_pipeline(request, "observability_requests", handler, user_id=user_id)
+
+    def _get_db():
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = _get_db
+    app.dependency_overrides[get_current_user] = lambda: {"sub": user_id}
+    app.dependency_overrides[require_platform_admin_access] = lambda: None
+    return app
+
+
+async def _load(app, path: str, total: int, concurrency: int) -> dict:
+    import httpx
+
+    latencies: list[float] = []
+    statuses: dict[int, int] = {}
+    remaining = iter(range(total))
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+
+        async def _worker() -> None:
+            for _ in remaining:
+                started = time.perf_counter()
+                response = await client.get(path)
+                latencies.append((time.perf_counter() - started) * 1000)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        probes: list[float] = []
+        done = asyncio.Event()
+
+        async def _probe() -> None:
+            while not done.is_set():
+                started = time.perf_counter()
+                await asyncio.sleep(0.005)
+                probes.append((time.perf_counter() - started) * 1000 - 5)
+
+        probe_task = asyncio.create_task(_probe())
+        started = time.perf_counter()
+        await asyncio.gather(*(_worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await probe_task
+
+    return {
+        "rps": round(total / elapsed, 1),
+        "p50_ms": _percentile(latencies, 0.5),
+        "p99_ms": _percentile(latencies, 0.99),
+        "loop_lag_p99_ms": _percentile(probes, 0.99),
+        "statuses": statuses,
+    }
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    samples = sorted(samples)
+    if q == 0.5:
+        return round(statistics.median(samples), 1)
+    return round(samples[min(len(samples) - 1, int(len(samples) * q))], 1)
+
+
+async def _noop() -> None:
+    return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    from AINDY.config import settings
+    from AINDY.core import execution_helper
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = _build_app(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        reuse_loop = execution_helper.run_on_thread_loop
+        modes = [
+            ("sync, asyncio.run", "/observability/requests", asyncio.run, False),
+            ("sync, thread loop", "/observability/requests", reuse_loop, False),
+            ("async, inline handler", "/bench/requests-async", reuse_loop, False),
+            ("async, offloaded", "/bench/requests-async", reuse_loop, True),
+        ]
+        rows = []
+        offload_default = settings.AINDY_PIPELINE_OFFLOAD_HANDLERS
+        for label, path, runner, offload in modes:
+            execution_helper.run_on_thread_loop = runner
+            settings.AINDY_PIPELINE_OFFLOAD_HANDLERS = offload
+            asyncio.run(_load(app, path, min(20, args.requests), args.concurrency))
+            rows.append((label, asyncio.run(_load(app, path, args.requests, args.concurrency))))
+        execution_helper.run_on_thread_loop = reuse_loop
+        settings.AINDY_PIPELINE_OFFLOAD_HANDLERS = offload_default
+    print_table("/observability/requests under load", rows)
+    print_table(
+        "event loop per sync call",
+        [
+            ("asyncio.run", measure(lambda: asyncio.run(_noop()), iterations=2000)),
+            ("run_on_thread_loop", measure(lambda: reuse_loop(_noop()), iterations=2000)),
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
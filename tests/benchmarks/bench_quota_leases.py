@@ -0,0 +1,148 @@
+"""
+Per-syscall quota overhead: Redis round-trips per call vs leased budget.
+
+Drives the SyscallDispatcher quota path (check_quota + record_usage) for
+--syscalls calls per EU from --threads threads against an in-process backend
+that sleeps --rtt-ms per Redis round-trip. "per-call" is the original mode;
+"leased" reserves budget in AINDY_QUOTA_LEASE_* slices and spends it locally.
+
+    python -m tests.benchmarks.bench_quota_leases --syscalls 90 --threads 8
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from tests.benchmarks._harness import print_table
+
+
+class _SlowBackend:
+    """Mirror of RedisResourceBackend's scripts with a fixed round-trip delay."""
+
+    def __init__(self, rtt_ms: float) -> None:
+        self.rtt = rtt_ms / 1000.0
+        self.values: dict[str, int] = {}
+        self.round_trips = 0
+        self._lock = threading.Lock()
+
+    def _trip(self) -> None:
+        with self._lock:
+            self.round_trips += 1
+        time.sleep(self.rtt)
+
+    def _add(self, key: str, delta: int) -> int:
+        self._trip()
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + delta
+            return self.values[key]
+
+    def get_tenant_active(self, tenant_id):
+        return self._add(f"tenant:{tenant_id}", 0)
+
+    def add_cpu_ms(self, eu_id, ms):
+        return self._add(f"cpu:{eu_id}", ms)
+
+    def get_cpu_ms(self, eu_id):
+        return self._add(f"cpu:{eu_id}", 0)
+
+    def increment_syscalls(self, eu_id):
+        return self._add(f"syscalls:{eu_id}", 1)
+
+    def get_syscalls(self, eu_id):
+        return self._add(f"syscalls:{eu_id}", 0)
+
+    def set_memory_if_greater(self, eu_id, bytes_used):
+        self._trip()
+
+    def lease(self, resource, eu_id, *, charge, want, limit):
+        self._trip()
+        key = f"{resource}:{eu_id}"
+        with self._lock:
+            reserved = self.values.get(key, 0) + charge
+            grant = max(0, min(want, limit - reserved))
+            self.values[key] = reserved + grant
+            return grant, reserved + grant
+
+    def refund(self, resource, eu_id, amount):
+        return self._add(f"{resource}:{eu_id}", -amount)
+
+    def delete_eu(self, eu_id):
+        self._trip()
+
+
+class _SlowRedis:
+    """Tenant concurrency client (ResourceManager._get_redis) with the same delay."""
+
+    def __init__(self, backend: _SlowBackend) -> None:
+        self._backend = backend
+
+    def get(self, key):
+        return self._backend._add(key, 0)
+
+    def incr(self, key):
+        return self._backend._add(key, 1)
+
+    def decr(self, key):
+        return self._backend._add(key, -1)
+
+
+def _bench(label: str, leased: bool, syscalls: int, threads: int, rtt_ms: float) -> tuple[str, dict]:
+    from AINDY.config import settings
+    from AINDY.kernel import resource_manager
+
+    backend = _SlowBackend(rtt_ms)
+    redis_client = _SlowRedis(backend)
+    rm = resource_manager.ResourceManager()
+    rm._backend = backend
+    rm._get_redis = lambda: redis_client
+    rm.MAX_CONCURRENT_PER_TENANT = threads + 1
+    settings.AINDY_QUOTA_LEASE_ENABLED = leased
+    # check_quota short-circuits under TESTING; the harness sets it.
+    is_testing = type(settings).is_testing
+    type(settings).is_testing = property(lambda self: False)
+
+    def _run_eu(index: int) -> None:
+        eu_id = f"eu-{index}"
+        rm.mark_started(f"tenant-{index}", eu_id)
+        for _ in range(syscalls):
+            ok, reason = rm.check_quota(eu_id)
+            assert ok, reason
+            rm.record_usage(eu_id, {"syscall_count": 1, "cpu_time_ms": 1})
+        rm.mark_completed(f"tenant-{index}", eu_id)
+
+    try:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(_run_eu, range(threads)))
+        elapsed = time.perf_counter() - started
+    finally:
+        type(settings).is_testing = is_testing
+        settings.AINDY_QUOTA_LEASE_ENABLED = False
+    total = syscalls * threads
+    return label, {
+        "us_per_syscall": round(elapsed / syscalls * 1e6, 1),
+        "round_trips_per_syscall": round(backend.round_trips / total, 2),
+        "syscalls": total,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--syscalls", type=int, default=90)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--rtt-ms", type=float, default=0.3)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    rows = [
+        _bench("per-call", False, args.syscalls, args.threads, args.rtt_ms),
+        _bench("leased", True, args.syscalls, args.threads, args.rtt_ms),
+    ]
+    print_table(f"quota path per syscall (rtt {args.rtt_ms} ms)", rows)
+
+
+if __name__ == "__main__":
+    main()
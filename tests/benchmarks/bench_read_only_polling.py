@@ -0,0 +1,77 @@
+"""
+Write traffic of dashboard polling: durable vs read-only executions.
+
+Polls GET /observability/dashboard and /observability/requests on the
+minimal app from bench_pipeline_loop and counts INSERT/UPDATE/DELETE
+statements and commits per request. "durable" forces every read-only
+execution to be sampled (AINDY_READ_ONLY_TRACE_SAMPLE_RATE=1.0), which is
+what every GET did before the read-only execution class existed.
+
+    python -m tests.benchmarks.bench_read_only_polling --requests 100
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+
+from tests.benchmarks._harness import print_table
+from tests.benchmarks.bench_pipeline_loop import _build_app, _load
+
+_WRITE_PREFIXES = ("INSERT", "UPDATE", "DELETE")
+
+
+def _poll(app, bind, path: str, total: int) -> dict:
+    from sqlalchemy import event
+
+    counts = {"writes": 0, "commits": 0}
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(_WRITE_PREFIXES):
+            counts["writes"] += 1
+
+    def _commit(conn):
+        counts["commits"] += 1
+
+    event.listen(bind, "before_cursor_execute", _before)
+    event.listen(bind, "commit", _commit)
+    try:
+        timing = asyncio.run(_load(app, path, total, concurrency=1))
+    finally:
+        event.remove(bind, "before_cursor_execute", _before)
+        event.remove(bind, "commit", _commit)
+    return {
+        "writes_per_req": round(counts["writes"] / total, 2),
+        "commits_per_req": round(counts["commits"] / total, 2),
+        "p50_ms": timing["p50_ms"],
+        "p99_ms": timing["p99_ms"],
+        "statuses": timing["statuses"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=100)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    from AINDY.config import settings
+    from AINDY.db import database
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        app = _build_app(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        bind = database.SessionLocal.kw["bind"]
+        for path in ("/observability/dashboard", "/observability/requests"):
+            for label, rate in (("durable", 1.0), ("read-only", 0.0)):
+                settings.AINDY_READ_ONLY_TRACE_SAMPLE_RATE = rate
+                _poll(app, bind, path, 5)
+                rows.append((f"{path.rsplit('/', 1)[1]}, {label}", _poll(app, bind, path, args.requests)))
+        settings.AINDY_READ_ONLY_TRACE_SAMPLE_RATE = 0.0
+    print_table("Observability polling write traffic", rows)
+
+
+if __name__ == "__main__":
+    main()
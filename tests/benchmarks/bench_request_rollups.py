@@ -0,0 +1,115 @@
+"""
+Observability request summary: raw request_metrics scans vs rollups.
+
+Seeds --requests request metrics for one user over the last 24 hours on 20
+routes, plus the per-minute rollups the writer would have produced, and
+times the observability_requests summary queries (totals, window counts,
+error counts, mean latency). "raw" is the previous set of COUNT/AVG queries
+over request_metrics; "rollups" is two summarize_request_rollups calls,
+which also return p50/p95/p99.
+
+    python -m tests.benchmarks.bench_request_rollups --requests 300000
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from tests.benchmarks._harness import measure, print_table
+
+
+def _seed(db, user_id: uuid.UUID, count: int) -> None:
+    from sqlalchemy import insert
+
+    from AINDY.core.request_metric_rollups import RollupAccumulator
+    from AINDY.db.models.request_metric import RequestMetric, RequestMetricRollup
+    from AINDY.db.models.user import User
+
+    rng = random.Random(11)
+    now = datetime.now(timezone.utc)
+    db.add(User(id=user_id, email="bench@aindy.test", username="bench", hashed_password="x"))
+    metrics = [
+        SimpleNamespace(
+            user_id=user_id,
+            route=f"/api/route_{rng.randrange(20)}/{{id}}",
+            path="/api/x",
+            status_code=503 if rng.random() < 0.02 else 200,
+            duration_ms=rng.lognormvariate(3.5, 1.0),
+            created_at=now - timedelta(seconds=rng.randrange(86400)),
+        )
+        for _ in range(count)
+    ]
+    db.execute(
+        insert(RequestMetric),
+        [
+            {
+                "request_id": str(index),
+                "trace_id": str(index),
+                "user_id": metric.user_id,
+                "method": "GET",
+                "path": metric.route,
+                "status_code": metric.status_code,
+                "duration_ms": metric.duration_ms,
+                "created_at": metric.created_at.replace(tzinfo=None),
+            }
+            for index, metric in enumerate(metrics)
+        ],
+    )
+    accumulator = RollupAccumulator()
+    accumulator.add(metrics)
+    rollups = accumulator.drain()
+    db.execute(insert(RequestMetricRollup), rollups)
+    db.commit()
+    return len(rollups)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=300_000)
+    parser.add_argument("--iterations", type=int, default=10)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    from sqlalchemy import func
+
+    from tests.benchmarks._harness import sqlite_session
+
+    from AINDY.core.request_metric_rollups import summarize_request_rollups
+    from AINDY.db.models.request_metric import RequestMetric
+
+    db = sqlite_session()
+    user_id = uuid.uuid4()
+    rollup_rows = _seed(db, user_id, args.requests)
+    window_start = datetime.now(timezone.utc) - timedelta(hours=6)
+
+    def _raw():
+        base = db.query(RequestMetric).filter(RequestMetric.user_id == user_id)
+        return (
+            base.count(),
+            base.filter(RequestMetric.created_at >= window_start).count(),
+            base.filter(RequestMetric.status_code >= 500).count(),
+            base.filter(RequestMetric.created_at >= window_start, RequestMetric.status_code >= 500).count(),
+            db.query(func.avg(RequestMetric.duration_ms)).filter(RequestMetric.user_id == user_id).scalar(),
+        )
+
+    def _rollups():
+        return (
+            summarize_request_rollups(db, user_id=user_id),
+            summarize_request_rollups(db, user_id=user_id, since=window_start),
+        )
+
+    print_table(
+        f"Request summary ({args.requests} raw rows, {rollup_rows} rollup rows)",
+        [
+            ("raw", measure(_raw, iterations=args.iterations)),
+            ("rollups", measure(_rollups, iterations=args.iterations)),
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
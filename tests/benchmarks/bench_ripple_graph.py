@@ -0,0 +1,125 @@
+"""
+RippleTrace graph cost: pairwise scan vs the inverted-index graph engine.
+
+Generates --sizes synthetic drops (3 themes from a 20k vocabulary, 1-2
+entities from 50k, dates over two years, a ping platform on 60% of drops)
+and measures, per size:
+
+  index build      RippleGraphIndex.from_drops (postings only)
+  full influence   every edge of the influence graph, cold
+  chain            one influence_edges + causal_edges neighbourhood, cold
+  incremental add  add one drop and re-query its neighbourhood
+
+"pairwise" is the previous build_influence_graph loop (which influence_chain
+and get_causal_chain re-ran per query); it is quadratic, so it is only run
+up to --pairwise-max drops.
+
+    python -m tests.benchmarks.bench_ripple_graph --sizes 10000 100000
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import time
+from datetime import datetime, timedelta
+
+from tests.benchmarks._harness import print_table
+
+
+def _drops(count: int, seed: int):
+    from apps.rippletrace.models import DropPointDB
+
+    rng = random.Random(seed)
+    base = datetime(2024, 1, 1)
+    drops = [
+        DropPointDB(
+            id=f"dp-{i}",
+            date_dropped=base + timedelta(minutes=rng.randrange(60 * 24 * 730)),
+            core_themes=",".join(f"t{rng.randrange(20_000)}" for _ in range(3)),
+            tagged_entities=",".join(f"e{rng.randrange(50_000)}" for _ in range(rng.randint(1, 2))),
+        )
+        for i in range(count)
+    ]
+    platforms = {
+        drop.id: {rng.choice(["x", "linkedin", "substack", "youtube", "reddit", "threads"])}
+        for drop in drops
+        if rng.random() < 0.6
+    }
+    return drops, platforms
+
+
+def _pairwise(drops, platforms) -> int:
+    from apps.rippletrace.services.graph_index import split_terms
+
+    edges = 0
+    for i, a in enumerate(drops):
+        themes_a = split_terms(a.core_themes)
+        entities_a = split_terms(a.tagged_entities)
+        platforms_a = platforms.get(a.id, set())
+        for b in drops[i + 1 :]:
+            overlap = len(themes_a & split_terms(b.core_themes))
+            entity = len(entities_a & split_terms(b.tagged_entities))
+            days = abs((a.date_dropped - b.date_dropped).total_seconds()) / 86400
+            temporal = 2 if days < 1 else 1 if days < 7 else 0
+            ping = 1 if platforms_a & platforms.get(b.id, set()) else 0
+            if min(1.0, (overlap * 2 + entity * 3 + temporal + ping) / 10) > 0.2:
+                edges += 2
+    return edges
+
+
+def _timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, round((time.perf_counter() - started) * 1000.0, 2)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--pairwise-max", type=int, default=2_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    from apps.rippletrace.models import DropPointDB
+    from apps.rippletrace.services.graph_index import RippleGraphIndex
+
+    def rising(drop_id):
+        return 1.0 if drop_id.endswith(("0", "3", "6")) else 0.0
+
+    rows = []
+    for size in sorted({*args.sizes, min(args.pairwise_max, min(args.sizes))}):
+        drops, platforms = _drops(size, seed=size)
+        if size <= args.pairwise_max:
+            edges, ms = _timed(lambda: _pairwise(drops, platforms))
+            rows.append((f"pairwise n={size}", {"full_graph_ms": ms, "chain_ms": ms, "edges": edges}))
+
+        index, build_ms = _timed(lambda: RippleGraphIndex.from_drops(drops, platforms))
+        edges, full_ms = _timed(lambda: len(index.all_influence_edges()))
+
+        cold = RippleGraphIndex.from_drops(drops, platforms)
+        sample = random.Random(1).sample(drops, min(args.queries, size))
+        _, chain_total = _timed(
+            lambda: [(cold.influence_edges(d.id), cold.causal_edges(d.id, rising)) for d in sample]
+        )
+
+        extra = DropPointDB(
+            id="dp-new",
+            date_dropped=drops[0].date_dropped,
+            core_themes=drops[0].core_themes,
+            tagged_entities="",
+        )
+        _, add_ms = _timed(lambda: (index.add_drop(extra), index.influence_edges("dp-new")))
+        rows.append((f"indexed n={size}", {
+            "build_ms": build_ms,
+            "full_graph_ms": full_ms,
+            "chain_ms": round(chain_total / len(sample), 3),
+            "add_ms": add_ms,
+            "edges": edges,
+        }))
+    print_table("RippleTrace influence/causal graph", rows)
+
+
+if __name__ == "__main__":
+    main()
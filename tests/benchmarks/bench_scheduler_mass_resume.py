@@ -0,0 +1,139 @@
+"""
+Mass resume: per-run wait cleanup vs pipelined/bulk cleanup.
+
+Parks --fanout runs on one event (each with a Redis wait key and a
+waiting_flow_runs backup row), then times the notify_event that wakes them
+all. Redis round-trips are simulated with --redis-rtt-ms per command (a
+pipeline costs one round-trip). "per-run" swaps in the old cleanup: one
+DEL per run inside the scheduler lock and one DELETE + commit per run.
+
+    python -m tests.benchmarks.bench_scheduler_mass_resume --fanout 100 1000 5000
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+from unittest.mock import patch
+
+import fakeredis
+
+from tests.benchmarks._harness import count_statements, print_table, sqlite_session
+
+
+class _SlowRedis(fakeredis.FakeRedis):
+    """FakeRedis that sleeps one round-trip per command or pipeline."""
+
+    rtt_s = 0.0
+
+    def execute_command(self, *args, **kwargs):
+        time.sleep(self.rtt_s)
+        return super().execute_command(*args, **kwargs)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        pipe = super().pipeline(transaction=transaction, shard_hint=shard_hint)
+        execute = pipe.execute
+
+        def _execute(raise_on_error=True):
+            time.sleep(self.rtt_s)
+            return execute(raise_on_error=raise_on_error)
+
+        pipe.execute = _execute
+        return pipe
+
+
+def _legacy_cleanup(engine, redis_client, session_factory):
+    from AINDY.db.models.waiting_flow_run import WaitingFlowRun
+    from AINDY.kernel.redis_wait_registry import RedisWaitRegistry
+
+    def _unregister(run_ids):
+        # The old code held the scheduler lock across these round-trips.
+        with engine._lock:
+            for run_id in run_ids:
+                RedisWaitRegistry(redis_client).unregister(run_id)
+
+    def _delete(run_ids):
+        for run_id in run_ids:
+            db = session_factory()
+            db.query(WaitingFlowRun).filter(WaitingFlowRun.run_id == run_id).delete(synchronize_session=False)
+            db.commit()
+            db.close()
+
+    engine._unregister_redis_waits = _unregister
+    engine._delete_wait_backups = _delete
+
+
+def _resume(label: str, fanout: int, rtt_ms: float, legacy: bool) -> tuple[str, dict]:
+    from sqlalchemy.orm import sessionmaker
+
+    from AINDY.db.models.waiting_flow_run import WaitingFlowRun
+    from AINDY.kernel.scheduler.engine import SchedulerEngine
+
+    db = sqlite_session()
+    bind = db.get_bind()
+    session_factory = sessionmaker(autoflush=False, expire_on_commit=False, bind=bind)
+    redis_client = _SlowRedis()
+    redis_client.rtt_s = 0.0
+
+    engine = SchedulerEngine()
+    engine.mark_rehydration_complete()
+    run_ids = [f"run-{index}" for index in range(fanout)]
+    with engine._lock:
+        for run_id in run_ids:
+            engine._add_wait_locked(
+                run_id,
+                {
+                    "wait_for": "batch.completed",
+                    "tenant_id": "bench",
+                    "eu_id": run_id,
+                    "callback": lambda: None,
+                    "priority": "normal",
+                    "correlation_id": None,
+                    "eu_type": "flow",
+                    "wait_condition": {"type": "event", "event_name": "batch.completed"},
+                },
+            )
+    db.add_all(WaitingFlowRun(run_id=run_id, event_type="batch.completed") for run_id in run_ids)
+    db.commit()
+    for run_id in run_ids:
+        redis_client.set(f"aindy:wait:{run_id}", "{}")
+    if legacy:
+        _legacy_cleanup(engine, redis_client, session_factory)
+
+    redis_client.rtt_s = rtt_ms / 1000.0
+    with patch("AINDY.kernel.event_bus.get_redis_client", return_value=redis_client), patch(
+        "AINDY.kernel.scheduler.persistence._get_session_factory", return_value=session_factory
+    ), patch("AINDY.kernel.scheduler_engine._cross_instance_resume", return_value=0):
+        with count_statements(bind) as counter:
+            started = time.perf_counter()
+            resumed = engine.notify_event("batch.completed", broadcast=False)
+            elapsed = time.perf_counter() - started
+
+    assert resumed == fanout
+    assert db.query(WaitingFlowRun).count() == 0
+    redis_client.rtt_s = 0.0
+    assert not redis_client.keys("aindy:wait:*")
+    return label, {
+        "fanout": fanout,
+        "resume_ms": round(elapsed * 1000, 1),
+        "per_run_us": round(elapsed * 1e6 / fanout, 1),
+        "sql_statements": counter["statements"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--fanout", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--redis-rtt-ms", type=float, default=0.2)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    rows = []
+    for fanout in args.fanout:
+        rows.append(_resume("per-run", fanout, args.redis_rtt_ms, legacy=True))
+        rows.append(_resume("bulk", fanout, args.redis_rtt_ms, legacy=False))
+    print_table("mass resume wait cleanup", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Scheduler wait matching with many parked runs: linear scan vs the indexes.
+
+Seeds the engine with --waiters parked runs spread over --events event
+names (a third correlated, a tenth time-based), then measures one
+notify_event that resumes a single correlated run and one tick_time_waits with
+nothing due. "linear scan" replays the old loop over every _waiting entry
+against the same registry.
+
+    python -m tests.benchmarks.bench_scheduler_waits --waiters 100000
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+from datetime import datetime, timedelta, timezone
+
+from tests.benchmarks._harness import measure, print_table
+
+
+def _legacy_match(engine, event_type: str, correlation_id: str | None) -> list[str]:
+    matched = []
+    for run_id, entry in list(engine._waiting.items()):
+        wc = entry.get("wait_condition") or {}
+        wc_type = wc.get("type")
+        wc_event = wc.get("event_name")
+        if wc_type == "time":
+            continue
+        if wc_event:
+            if wc_type not in ("event", "external") or wc_event != event_type:
+                continue
+        elif entry.get("wait_for") != event_type:
+            continue
+        entry_corr = entry.get("correlation_id") or None
+        if entry_corr and correlation_id and entry_corr != correlation_id:
+            continue
+        matched.append(run_id)
+    return matched
+
+
+def _legacy_due(engine, now: datetime) -> list[str]:
+    due = []
+    for run_id, entry in list(engine._waiting.items()):
+        wc = entry.get("wait_condition") or {}
+        if wc.get("type") != "time" or wc.get("trigger_at") is None:
+            continue
+        if datetime.fromisoformat(wc["trigger_at"]) <= now:
+            due.append(run_id)
+    return due
+
+
+def _entry(index: int, events: int, future: str) -> dict:
+    if index % 10 == 0:
+        return {
+            "wait_for": "timer",
+            "tenant_id": "bench",
+            "eu_id": f"eu-{index}",
+            "callback": lambda: None,
+            "priority": "normal",
+            "correlation_id": None,
+            "eu_type": "flow",
+            "wait_condition": {"type": "time", "event_name": None, "trigger_at": future, "correlation_id": None},
+        }
+    correlation_id = f"corr-{index}" if index % 3 == 0 else None
+    prefix = "correlated" if correlation_id else "event"
+    event_name = f"{prefix}.{index % events}"
+    return {
+        "wait_for": event_name,
+        "tenant_id": "bench",
+        "eu_id": f"eu-{index}",
+        "callback": lambda: None,
+        "priority": "normal",
+        "correlation_id": correlation_id,
+        "eu_type": "flow",
+        "wait_condition": {
+            "type": "event",
+            "event_name": event_name,
+            "trigger_at": None,
+            "correlation_id": correlation_id,
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--waiters", type=int, default=100_000)
+    parser.add_argument("--events", type=int, default=5_000)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    from AINDY.kernel.scheduler.engine import SchedulerEngine
+
+    engine = SchedulerEngine()
+    engine._delete_wait_backups = lambda run_ids: None
+    engine._unregister_redis_waits = lambda run_ids: None
+    engine.mark_rehydration_complete()
+    future = (datetime.now(timezone.utc) + timedelta(days=1)).isoformat()
+    with engine._lock:
+        for index in range(args.waiters):
+            engine._add_wait_locked(f"run-{index}", _entry(index, args.events, future))
+
+    # Each notify resumes the correlated run it targets; re-park it so the
+    # registry size stays constant across iterations.
+    targets = [index for index in range(args.waiters) if index % 3 == 0 and index % 10 != 0]
+    cursor = iter(range(10**9))
+
+    def _notify():
+        index = targets[next(cursor) % len(targets)]
+        entry = _entry(index, args.events, future)
+        engine.notify_event(entry["wait_for"], correlation_id=f"corr-{index}", broadcast=False)
+        with engine._lock:
+            engine._add_wait_locked(f"run-{index}", entry)
+        engine._queues["normal"].clear()
+
+    now = datetime.now(timezone.utc)
+    rows = [
+        ("notify linear scan", measure(lambda: _legacy_match(engine, "correlated.3", "corr-3"), iterations=20)),
+        ("notify indexed", measure(_notify, iterations=args.iterations)),
+        ("tick linear scan", measure(lambda: _legacy_due(engine, now), iterations=20)),
+        ("tick indexed", measure(engine.tick_time_waits, iterations=args.iterations)),
+    ]
+    for _, stats in rows:
+        stats["waiters"] = len(engine._waiting)
+    print_table("scheduler wait registry", rows)
+
+
+if __name__ == "__main__":
+    main()
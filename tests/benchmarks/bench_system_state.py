@@ -0,0 +1,99 @@
+"""
+compute_current_state refresh cost: hour-of-rows scan vs streaming buckets.
+
+Seeds --events SystemEvents and --requests RequestMetrics spread over the
+last two hours and times one forced refresh. "scan" is the previous path
+(every event and request row of the last hour loaded as ORM objects);
+"streaming" enables AINDY_SYSTEM_STATE_STREAMING after the window has
+seeded itself once (the seed is reported separately).
+
+    python -m tests.benchmarks.bench_system_state --events 200000
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from tests.benchmarks._harness import count_statements, measure, print_table
+
+
+def _seed(db, events: int, requests: int) -> None:
+    from sqlalchemy import insert
+
+    from AINDY.db.models.request_metric import RequestMetric
+    from AINDY.db.models.system_event import SystemEvent
+
+    rng = random.Random(3)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    types = [f"flow.step_{i}.completed" for i in range(40)] + ["execution.failed", "error.timeout"]
+    db.execute(
+        insert(SystemEvent),
+        [
+            {"type": rng.choice(types), "source": "bench", "timestamp": now - timedelta(seconds=rng.randrange(7200))}
+            for _ in range(events)
+        ],
+    )
+    db.execute(
+        insert(RequestMetric),
+        [
+            {
+                "request_id": f"r{i}",
+                "trace_id": f"t{i}",
+                "method": "GET",
+                "path": "/bench",
+                "status_code": 200,
+                "duration_ms": rng.lognormvariate(3.5, 1.0),
+                "created_at": now - timedelta(seconds=rng.randrange(3600)),
+            }
+            for i in range(requests)
+        ],
+    )
+    db.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--requests", type=int, default=50_000)
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    from tests.benchmarks._harness import sqlite_session
+
+    from AINDY.config import settings
+    from AINDY.platform_layer import system_state_window
+    from AINDY.platform_layer.system_state_service import compute_current_state
+
+    db = sqlite_session()
+    _seed(db, args.events, args.requests)
+    bind = db.get_bind()
+
+    def refresh():
+        return compute_current_state(db, force_refresh=True, persist_snapshot=False)
+
+    rows = []
+    settings.AINDY_SYSTEM_STATE_STREAMING = False
+    with count_statements(bind) as counter:
+        scan = measure(refresh, iterations=args.iterations, warmup=1)
+    rows.append(("scan", {**scan, "statements": counter["statements"] // (args.iterations + 1)}))
+
+    settings.AINDY_SYSTEM_STATE_STREAMING = True
+    system_state_window.reset_system_state_window()
+    started = time.perf_counter()
+    system_state_window.get_system_state_window().seed(db)
+    rows.append(("streaming seed (once)", {"ms": round((time.perf_counter() - started) * 1000.0, 1)}))
+    with count_statements(bind) as counter:
+        streaming = measure(refresh, iterations=args.iterations * 10, warmup=1)
+    rows.append(("streaming", {**streaming, "statements": counter["statements"] // (args.iterations * 10 + 1)}))
+    print_table(
+        f"compute_current_state ({args.events} events, {args.requests} request metrics)",
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
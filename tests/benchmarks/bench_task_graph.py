@@ -0,0 +1,126 @@
+"""
+Task dependency graph: full rebuild per call vs the cached incremental DAG.
+
+Seeds --tasks tasks for one user (each depends on up to two of the previous
+50, about a third already completed) and measures:
+
+  context      get_task_graph_context (the infinity loop's read)
+  next ready   get_next_ready_task
+  unlock       _unlock_downstream_tasks for a task with dependents
+
+"rebuild" disables AINDY_TASK_GRAPH_CACHE_ENABLED, i.e. the previous path
+(load every task, topological sort, sort the ready set). "legacy unlock" is
+the previous candidate scan: every blocked/pending/paused task, its JSON
+dependency list decoded, and a COUNT query per dependent.
+
+    python -m tests.benchmarks.bench_task_graph --tasks 20000
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import uuid
+
+from tests.benchmarks._harness import count_statements, measure, print_table
+
+
+def _seed(db, user_id: uuid.UUID, count: int) -> int:
+    from AINDY.db.models.user import User
+    from apps.tasks.models import Task, TaskDependency
+
+    rng = random.Random(7)
+    db.add(User(id=user_id, email="bench@aindy.test", username="bench", hashed_password="x"))
+    tasks, edges = [], []
+    for task_id in range(1, count + 1):
+        deps = sorted(set(rng.sample(range(max(1, task_id - 50), task_id), min(task_id - 1, rng.randint(0, 2)))))
+        status = "completed" if task_id < count * 0.33 else "pending" if rng.random() < 0.5 else "blocked"
+        tasks.append(Task(
+            id=task_id,
+            name=f"task-{task_id}",
+            priority=rng.choice(["high", "medium", "low"]),
+            status=status,
+            depends_on=[{"task_id": dep, "dependency_type": "hard"} for dep in deps],
+            user_id=user_id,
+        ))
+        edges.extend(TaskDependency(task_id=task_id, depends_on_task_id=dep, user_id=user_id) for dep in deps)
+    db.add_all(tasks)
+    db.add_all(edges)
+    db.commit()
+    counts = {}
+    for edge in edges:
+        counts[edge.depends_on_task_id] = counts.get(edge.depends_on_task_id, 0) + 1
+    return max((task_id for task_id in counts if task_id > count * 0.33), key=counts.get)
+
+
+def _legacy_unlock(db, task, user_id):
+    from apps.tasks.models import Task
+    from apps.tasks.services.task_service import _dependency_ids, _recompute_task_status
+
+    unlocked = []
+    candidates = (
+        db.query(Task)
+        .filter(Task.user_id == user_id, Task.status.in_(["blocked", "pending", "paused"]))
+        .all()
+    )
+    for candidate in candidates:
+        if task.id not in _dependency_ids(candidate):
+            continue
+        previous_status = candidate.status
+        if _recompute_task_status(db, candidate, user_id=user_id) == "pending" and previous_status == "blocked":
+            unlocked.append(candidate.id)
+    return unlocked
+
+
+def _row(fn, bind, iterations: int) -> dict:
+    with count_statements(bind) as counter:
+        timing = measure(fn, iterations=iterations)
+    return {
+        "p50_ms": timing["p50_ms"],
+        "p99_ms": timing["p99_ms"],
+        "statements_per_call": round(counter["statements"] / (iterations + 3), 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=20_000)
+    parser.add_argument("--iterations", type=int, default=10)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    from tests.benchmarks._harness import sqlite_session
+
+    from AINDY.config import settings
+    from apps.tasks.models import Task
+    from apps.tasks.services import task_graph_cache, task_service
+
+    db = sqlite_session()
+    bind = db.get_bind()
+    user_id = uuid.uuid4()
+    hub_id = _seed(db, user_id, args.tasks)
+    hub = db.get(Task, hub_id)
+    hub.status = "completed"
+
+    def _unlock(fn):
+        def _run():
+            db.begin_nested()
+            fn(db, hub, user_id)
+            db.rollback()
+        return _run
+
+    rows = []
+    settings.AINDY_TASK_GRAPH_CACHE_ENABLED = False
+    rows.append(("rebuild context", _row(lambda: task_service.get_task_graph_context(db, user_id), bind, args.iterations)))
+    rows.append(("rebuild next ready", _row(lambda: task_service.get_next_ready_task(db, user_id), bind, args.iterations)))
+    settings.AINDY_TASK_GRAPH_CACHE_ENABLED = True
+    task_graph_cache.reset_task_graph_cache()
+    rows.append(("cached context", _row(lambda: task_service.get_task_graph_context(db, user_id), bind, args.iterations)))
+    rows.append(("cached next ready", _row(lambda: task_service.get_next_ready_task(db, user_id), bind, args.iterations)))
+    rows.append(("legacy unlock", _row(_unlock(_legacy_unlock), bind, args.iterations)))
+    rows.append(("indexed unlock", _row(_unlock(task_service._unlock_downstream_tasks), bind, args.iterations)))
+    print_table(f"Task dependency graph ({args.tasks} tasks)", rows)
+
+
+if __name__ == "__main__":
+    main()
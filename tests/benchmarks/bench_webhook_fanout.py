@@ -0,0 +1,134 @@
+"""
+Webhook fan-out: sequential urllib delivery vs the pooled async engine.
+
+Dispatches --events events to --subscribers subscriptions on a local HTTP
+stub, --slow of which take --slow-ms to answer, and reports how long it
+takes until every fast subscriber has received every event. "threaded" is
+the previous delivery path (one dispatch per event on an 8-thread pool,
+subscribers sequential, urllib, a new connection per request); "engine" is
+WebhookDeliveryEngine without the outbox.
+
+    python -m tests.benchmarks.bench_webhook_fanout --subscribers 300 --slow 5
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from tests.benchmarks._harness import print_table
+
+
+class _Stub(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, slow_seconds: float):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.slow_seconds = slow_seconds
+        self.fast_received = 0
+        self.lock = threading.Lock()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.path.startswith("/slow"):
+            time.sleep(self.server.slow_seconds)
+        else:
+            with self.server.lock:
+                self.server.fast_received += 1
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+def _threaded(urls: list[str], events: int) -> None:
+    executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="aindy-webhook")
+
+    def _dispatch():
+        for url in urls:
+            request = urllib.request.Request(url, data=b"{}", method="POST")
+            with urllib.request.urlopen(request, timeout=10) as response:
+                response.read()
+
+    for _ in range(events):
+        executor.submit(_dispatch)
+    executor.shutdown(wait=False)
+
+
+def _engine_factory():
+    from AINDY.platform_layer.webhook_delivery import PendingDelivery, WebhookDeliveryEngine
+
+    engine = WebhookDeliveryEngine(resolve_target=lambda _sub: None, outbox=None)
+
+    def _run(urls: list[str], events: int) -> None:
+        for event in range(events):
+            engine.submit([
+                PendingDelivery(
+                    subscription_id=str(index),
+                    url=url,
+                    secret=None,
+                    body=b"{}",
+                    event_type="execution.completed",
+                    event_id=str(event),
+                )
+                for index, url in enumerate(urls)
+            ])
+
+    return engine, _run
+
+
+def _measure(label: str, run, args) -> tuple[str, dict]:
+    stub = _Stub(args.slow_ms / 1000.0)
+    thread = threading.Thread(target=stub.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{stub.server_address[1]}"
+    urls = [f"{base}/slow/{i}" for i in range(args.slow)]
+    urls += [f"{base}/ok/{i}" for i in range(args.subscribers - args.slow)]
+    expected = (args.subscribers - args.slow) * args.events
+    started = time.perf_counter()
+    run(urls, args.events)
+    while stub.fast_received < expected and time.perf_counter() - started < 120:
+        time.sleep(0.005)
+    elapsed = time.perf_counter() - started
+    stub.shutdown()
+    stub.server_close()
+    return label, {
+        "fast_delivered": f"{stub.fast_received}/{expected}",
+        "seconds_to_fast_complete": round(elapsed, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--subscribers", type=int, default=300)
+    parser.add_argument("--slow", type=int, default=5)
+    parser.add_argument("--slow-ms", type=int, default=500)
+    parser.add_argument("--events", type=int, default=4)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    engine, run_engine = _engine_factory()
+    rows = [
+        _measure("threaded", _threaded, args),
+        _measure("engine", run_engine, args),
+    ]
+    engine.stop(timeout=5.0)
+    print_table(
+        f"Webhook fan-out ({args.subscribers} subscribers, {args.slow} slow, {args.events} events)",
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -142,6 +142,134 @@ def reset_resource_manager():
         pass
 
 
+@pytest.fixture(autouse=True)
+def reset_query_embedding_cache():
+    """Forget cached query embeddings so per-test embedding stubs take effect."""
+    try:
+        from AINDY.memory.query_embedding_cache import get_query_embedding_cache
+        get_query_embedding_cache().clear()
+    except Exception:
+        pass
+    yield
+    try:
+        from AINDY.memory.query_embedding_cache import get_query_embedding_cache
+        get_query_embedding_cache().clear()
+    except Exception:
+        pass
+
+
+@pytest.fixture(autouse=True)
+def reset_task_graph_cache():
+    """Drop cached task graphs so rolled-back rows never leak between tests."""
+    try:
+        from apps.tasks.services.task_graph_cache import reset_task_graph_cache
+        reset_task_graph_cache()
+    except Exception:
+        pass
+    yield
+    try:
+        from apps.tasks.services.task_graph_cache import reset_task_graph_cache
+        reset_task_graph_cache()
+    except Exception:
+        pass
+
+
+@pytest.fixture(autouse=True)
+def reset_memory_lexical_index():
+    """Drop cached BM25 postings so rolled-back rows never leak between tests."""
+    try:
+        from AINDY.memory.lexical_index import get_memory_lexical_index
+        get_memory_lexical_index().reset()
+    except Exception:
+        pass
+    yield
+    try:
+        from AINDY.memory.lexical_index import get_memory_lexical_index
+        get_memory_lexical_index().reset()
+    except Exception:
+        pass
+
+
+@pytest.fixture(autouse=True)
+def reset_near_duplicate_index():
+    """Drop cached SimHash arrays so rolled-back rows never leak between tests."""
+    try:
+        from AINDY.memory.content_fingerprint import get_near_duplicate_index
+        get_near_duplicate_index().reset()
+    except Exception:
+        pass
+    yield
+    try:
+        from AINDY.memory.content_fingerprint import get_near_duplicate_index
+        get_near_duplicate_index().reset()
+    except Exception:
+        pass
+
+
+@pytest.fixture(autouse=True)
+def reset_external_call_cache():
+    """Forget cached provider responses so per-test operation stubs take effect."""
+    try:
+        from AINDY.platform_layer.external_call_service import get_external_call_cache
+        get_external_call_cache().clear()
+    except Exception:
+        pass
+    yield
+    try:
+        from AINDY.platform_layer.external_call_service import get_external_call_cache
+        get_external_call_cache().clear()
+    except Exception:
+        pass
+
+
+@pytest.fixture(autouse=True)
+def reset_arm_chunk_cache():
+    """Forget cached ARM chunk analyses so per-test LLM stubs take effect."""
+    try:
+        from apps.arm.services.deepseek.chunk_result_cache import reset_chunk_result_cache
+        reset_chunk_result_cache()
+    except Exception:
+        pass
+    yield
+    try:
+        from apps.arm.services.deepseek.chunk_result_cache import reset_chunk_result_cache
+        reset_chunk_result_cache()
+    except Exception:
+        pass
+
+
+@pytest.fixture(autouse=True)
+def reset_capability_catalog_cache():
+    """Drop the cached capability catalogue so rolled-back rows never leak between tests."""
+    try:
+        from AINDY.agents.capability_service import get_capability_catalog_cache
+        get_capability_catalog_cache().reset()
+    except Exception:
+        pass
+    yield
+    try:
+        from AINDY.agents.capability_service import get_capability_catalog_cache
+        get_capability_catalog_cache().reset()
+    except Exception:
+        pass
+
+
+@pytest.fixture(autouse=True)
+def reset_memory_vector_index():
+    """Drop cached embedding matrices so rolled-back rows never leak between tests."""
+    try:
+        from AINDY.memory.vector_index import get_memory_vector_index
+        get_memory_vector_index().reset()
+    except Exception:
+        pass
+    yield
+    try:
+        from AINDY.memory.vector_index import get_memory_vector_index
+        get_memory_vector_index().reset()
+    except Exception:
+        pass
+
+
 @pytest.fixture(autouse=True)
 def clear_global_app_dependency_overrides():
     """Prevent override leakage across tests that import the global FastAPI app.
@@ -5,6 +5,7 @@ Covers:
 - SecurityValidator: path traversal, extension block, sensitive content, size limit
 - ConfigManager: defaults, Task Priority formula, persistence, key filtering
 - FileProcessor: chunking logic, session ID generation
+- Map-reduce analysis: per-chunk calls, merge, per-chunk result cache
 - ARM API routes: auth enforcement, mocked OpenAI calls, config endpoints
 """
 import uuid
@@ -369,6 +370,109 @@ class TestFileProcessor:
         assert "hello" in content
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Map-reduce analysis
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestMapReduceAnalysis:
+
+    def _analyzer(self, calls):
+        import json
+        import threading
+
+        from apps.arm.services.deepseek.deepseek_code_analyzer import DeepSeekCodeAnalyzer
+
+        analyzer = DeepSeekCodeAnalyzer.__new__(DeepSeekCodeAnalyzer)
+        analyzer.config = {"analysis_model": "gpt-4o", "temperature": 0.2}
+        analyzer.config_manager = MagicMock()
+        analyzer.config_manager.calculate_task_priority.return_value = 5.0
+        analyzer.validator = MagicMock()
+        analyzer.file_processor = MagicMock()
+        analyzer._refresh_runtime_config = lambda db=None: None
+        analyzer._gather_context = lambda path, user_id, db: ([], "")
+        lock = threading.Lock()
+
+        def _call_openai(*, system_prompt, user_prompt, db, user_id, model, temperature):
+            part = int(user_prompt.split("(part ", 1)[1].split(" ", 1)[0])
+            with lock:
+                calls.append((part, db))
+            scores = {1: 9, 2: 3, 3: 6}[part]
+            return (
+                json.dumps({
+                    "summary": f"summary {part}",
+                    "architecture_score": scores,
+                    "performance_score": scores,
+                    "integrity_score": scores,
+                    "findings": [{"title": f"finding {part}", "severity": "critical" if part == 2 else "low"}],
+                    "overall_recommendation": f"fix part {part}",
+                }),
+                100,
+                20,
+            )
+
+        analyzer._call_openai = _call_openai
+        return analyzer
+
+    def _run(self, analyzer, chunks, user_id=None):
+        path = MagicMock()
+        path.name = "big.py"
+        path.suffix = ".py"
+        analyzer.validator.full_file_validation.return_value = (path, "\n".join(chunks))
+        analyzer.file_processor.chunk_content.return_value = chunks
+        return analyzer.run_analysis(file_path="/fake/big.py", user_id=user_id, db=MagicMock())
+
+    def test_all_chunks_analyzed_and_merged(self):
+        calls = []
+        chunks = ["a = 1" * 10, "b = 2" * 10, "c = 3" * 10]
+        result = self._run(self._analyzer(calls), chunks)
+
+        assert sorted(part for part, _ in calls) == [1, 2, 3]
+        # Chunk workers never share the caller's session.
+        assert all(db is None for _, db in calls)
+        assert result["chunks"] == 3 and result["chunks_cached"] == 0
+        assert result["architecture_score"] == 6.0
+        assert [f["chunk"] for f in result["findings"]][0] == 2
+        assert result["overall_recommendation"] == "fix part 2"
+        assert result["summary"].startswith("[Part 1/3] summary 1")
+        assert result["input_tokens"] == 300
+
+    def test_reanalysis_only_sends_changed_chunks(self):
+        calls = []
+        analyzer = self._analyzer(calls)
+        self._run(analyzer, ["a = 1", "b = 2", "c = 3"])
+        calls.clear()
+
+        result = self._run(analyzer, ["a = 1", "b = 22", "c = 3"])
+
+        assert [part for part, _ in calls] == [2]
+        assert result["chunks_cached"] == 2
+        assert result["input_tokens"] == 100
+        assert len(result["findings"]) == 3
+
+    def test_inserted_chunk_does_not_invalidate_shifted_ones(self):
+        calls = []
+        analyzer = self._analyzer(calls)
+        self._run(analyzer, ["a = 1", "b = 2", "c = 3"])
+        calls.clear()
+
+        result = self._run(analyzer, ["z = 0", "a = 1", "b = 2"])
+
+        assert [part for part, _ in calls] == [1]
+        assert result["chunks_cached"] == 2
+        assert [f["chunk"] for f in result["findings"] if f["title"] == "finding 1"] == [1, 2]
+
+    def test_cached_chunks_are_not_shared_between_users(self):
+        calls = []
+        analyzer = self._analyzer(calls)
+        self._run(analyzer, ["a = 1", "b = 2", "c = 3"], user_id="user-a")
+        calls.clear()
+
+        result = self._run(analyzer, ["a = 1", "b = 2", "c = 3"], user_id="user-b")
+
+        assert sorted(part for part, _ in calls) == [1, 2, 3]
+        assert result["chunks_cached"] == 0
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # ARM API Routes
 # ─────────────────────────────────────────────────────────────────────────────
@@ -76,6 +76,8 @@ def test_perform_external_call_raises_when_required_event_emission_fails(monkeyp
     def _emit_system_event(**kwargs):
         raise SystemEventEmissionError("missing event")
 
+    monkeypatch.setattr("AINDY.config.settings.AINDY_EXTERNAL_CALL_EVENTS_REQUIRED", True)
+
     monkeypatch.setattr("AINDY.platform_layer.external_call_service.emit_system_event", _emit_system_event)
     monkeypatch.setattr("AINDY.platform_layer.external_call_service.emit_error_event", lambda **kwargs: None)
 
@@ -90,6 +92,128 @@ def test_perform_external_call_raises_when_required_event_emission_fails(monkeyp
         )
 
 
+
+def test_perform_external_call_coalesces_identical_in_flight_calls(monkeypatch):
+    import threading
+    import time
+
+    from AINDY.platform_layer import external_call_service
+    from AINDY.platform_layer.external_call_service import external_call_key, perform_external_call
+
+    events = []
+    monkeypatch.setattr(
+        "AINDY.platform_layer.external_call_service.emit_system_event",
+        lambda **kwargs: events.append((kwargs["payload"]["status"], kwargs["required"])),
+    )
+    key = external_call_key(model="gpt-4o", messages=[{"role": "user", "content": "same prompt"}])
+    calls = []
+
+    def _operation():
+        calls.append(1)
+        # Hold the leader until the other three callers are waiting on it.
+        in_flight = external_call_service._SINGLE_FLIGHT._calls[f"openai:{key}"]
+        deadline = time.monotonic() + 5
+        while in_flight.waiters < 3 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        return {"ok": True}
+
+    results = []
+
+    def _call():
+        results.append(
+            perform_external_call(
+                service_name="openai",
+                db=_FakeDB(),
+                model="gpt-4o",
+                dedupe_key=key,
+                operation=_operation,
+            )
+        )
+
+    threads = [threading.Thread(target=_call) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert results == [{"ok": True}] * 4
+    assert len(calls) == 1
+    assert sorted(status for status, _ in events) == ["coalesced"] * 3 + ["started", "success"]
+    # Write-behind is off by default, so telemetry stays required.
+    assert all(required is True for _, required in events)
+    assert external_call_service._SINGLE_FLIGHT.in_flight() == 0
+
+
+def test_perform_external_call_batches_telemetry_only_with_write_behind(monkeypatch):
+    from AINDY.platform_layer.external_call_service import perform_external_call
+
+    events = []
+    monkeypatch.setattr(
+        "AINDY.platform_layer.external_call_service.emit_system_event",
+        lambda **kwargs: events.append((kwargs["db"], kwargs["required"])),
+    )
+    opened = []
+    monkeypatch.setattr("AINDY.db.database.SessionLocal", lambda: opened.append(_FakeDB()) or opened[-1])
+
+    perform_external_call(service_name="openai", operation=lambda: {"ok": True})
+    assert [required for _, required in events] == [True, True]
+    assert len(opened) == 1 and all(db is opened[0] for db, _ in events)
+
+    events.clear()
+    monkeypatch.setattr("AINDY.config.settings.AINDY_SYSTEM_EVENT_WRITE_BEHIND", True)
+    perform_external_call(service_name="openai", operation=lambda: {"ok": True})
+    assert events == [(None, False), (None, False)]
+    assert len(opened) == 1
+
+    events.clear()
+    monkeypatch.setattr("AINDY.config.settings.AINDY_EXTERNAL_CALL_EVENTS_REQUIRED", True)
+    perform_external_call(service_name="openai", operation=lambda: {"ok": True})
+    assert [required for _, required in events] == [True, True]
+
+
+def test_perform_external_call_caches_opted_in_responses(monkeypatch):
+    from AINDY.platform_layer.external_call_service import (
+        external_call_key,
+        get_external_call_cache,
+        perform_external_call,
+    )
+
+    events = []
+    monkeypatch.setattr(
+        "AINDY.platform_layer.external_call_service.emit_system_event",
+        lambda **kwargs: events.append(kwargs["payload"]["status"]),
+    )
+    calls = []
+
+    def _call(prompt: str, cache: bool):
+        return perform_external_call(
+            service_name="deepseek",
+            db=_FakeDB(),
+            dedupe_key=external_call_key(model="deepseek-chat", prompt=prompt, temperature=0),
+            cache=cache,
+            operation=lambda: calls.append(prompt) or {"prompt": prompt},
+        )
+
+    assert _call("analyze a.py", cache=True) == {"prompt": "analyze a.py"}
+    assert _call("analyze a.py", cache=True) == {"prompt": "analyze a.py"}
+    assert _call("analyze b.py", cache=True) == {"prompt": "analyze b.py"}
+    assert _call("analyze b.py", cache=False) == {"prompt": "analyze b.py"}
+    assert calls == ["analyze a.py", "analyze b.py", "analyze b.py"]
+    assert events.count("cache_hit") == 1
+    assert get_external_call_cache().stats() == {"entries": 2}
+
+    # Failures are never cached and are raised to the caller.
+    with pytest.raises(RuntimeError, match="provider down"):
+        perform_external_call(
+            service_name="deepseek",
+            db=_FakeDB(),
+            dedupe_key="failing",
+            cache=True,
+            operation=lambda: (_ for _ in ()).throw(RuntimeError("provider down")),
+        )
+    assert get_external_call_cache().stats() == {"entries": 2}
+
+
 def test_generate_embedding_routes_through_external_call_wrapper(monkeypatch):
     from AINDY.memory import embedding_service
     captured = {}
@@ -405,3 +405,79 @@ class TestSuggestBridgeExport:
         )
         assert "suggestions" in result
         assert result["suggestions"] == []
+
+
+class TestBatchedResonance:
+
+    @staticmethod
+    def _seed(dao, user_id, count):
+        nodes = [
+            dao.save(
+                content=f"batched resonance node {i}",
+                tags=["batch"],
+                user_id=user_id,
+                node_type="insight",
+                generate_embedding=False,
+            )
+            for i in range(count)
+        ]
+        for left, right in zip(nodes, nodes[1:]):
+            dao.create_link(left["id"], right["id"], user_id=user_id)
+        dao.record_feedback(nodes[0]["id"], "success", user_id=user_id)
+        dao.record_feedback(nodes[1]["id"], "failure", user_id=user_id)
+        return nodes
+
+    @staticmethod
+    def _count_statements(db_session, fn):
+        from sqlalchemy import event
+
+        bind = db_session.get_bind()
+        statements = []
+
+        def _before(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(bind, "before_cursor_execute", _before)
+        try:
+            result = fn()
+        finally:
+            event.remove(bind, "before_cursor_execute", _before)
+        return result, len(statements)
+
+    def test_batched_scores_match_per_node_helpers(self, db_session, test_user):
+        from AINDY.db.dao.memory_node_dao import MemoryNodeDAO
+
+        dao = MemoryNodeDAO(db_session)
+        nodes = self._seed(dao, str(test_user.id), 4)
+        ids = [n["id"] for n in nodes]
+
+        graph = dao.get_graph_connectivity_scores(ids + ["not-a-uuid"])
+        for node_id in ids:
+            assert graph.get(node_id, 0.0) == dao.get_graph_connectivity_score(node_id)
+
+        scored = dao._score_candidates([dict(n) for n in nodes], tags=["batch"])
+        by_id = {item["id"]: item for item in scored}
+        assert by_id[ids[0]]["success_rate"] == 1.0
+        assert by_id[ids[1]]["success_rate"] == 0.0
+        assert by_id[ids[2]]["success_rate"] == 0.5
+        assert by_id[ids[0]]["adaptive_weight"] == 1.1
+        assert by_id[ids[0]]["tag_score"] == 1.0
+        assert by_id[ids[0]]["resonance_score"] > by_id[ids[1]]["resonance_score"]
+
+    def test_recall_query_count_is_independent_of_limit(self, db_session, test_user):
+        from AINDY.db.dao.memory_node_dao import MemoryNodeDAO
+
+        dao = MemoryNodeDAO(db_session)
+        self._seed(dao, str(test_user.id), 12)
+        user_id = str(test_user.id)
+
+        small, small_count = self._count_statements(
+            db_session, lambda: dao.recall(tags=["batch"], limit=2, user_id=user_id)
+        )
+        large, large_count = self._count_statements(
+            db_session, lambda: dao.recall(tags=["batch"], limit=10, user_id=user_id)
+        )
+
+        assert len(small) == 2
+        assert len(large) == 10
+        assert small_count == large_count
@@ -203,3 +203,56 @@ def test_agent_execute_step_denial_persists_failed_step_and_events(db_session, t
     assert system_event.payload["tool_name"] == "arm.generate"
     assert system_event.payload["status"] == "failed"
 
+
+
+def test_run_capability_mappings_are_upserted_without_duplicates(db_session, test_user):
+    from AINDY.agents.capability_service import (
+        create_run_capability_mappings,
+        get_capability_catalog_cache,
+    )
+    from AINDY.db.models.capability import AgentCapabilityMapping
+
+    run = _make_run(db_session, test_user)
+    other = _make_run(db_session, test_user)
+    agent_type = f"agent-{uuid.uuid4().hex[:8]}"
+    capabilities = ["manage_tasks", "external_api_call", "manage_tasks"]
+
+    for run_id in (run.id, run.id, other.id):
+        create_run_capability_mappings(str(run_id), agent_type, capabilities, db_session)
+    db_session.commit()
+
+    type_rows = db_session.query(AgentCapabilityMapping).filter(AgentCapabilityMapping.agent_type == agent_type).all()
+    run_rows = (
+        db_session.query(AgentCapabilityMapping)
+        .filter(AgentCapabilityMapping.agent_run_id.in_([run.id, other.id]))
+        .all()
+    )
+    assert len(type_rows) == 2
+    assert len(run_rows) == 4
+    assert all(row.agent_run_id is None for row in type_rows)
+    # The catalogue is read once, not on every run.
+    assert get_capability_catalog_cache().stats()["loads"] == 1
+
+
+def test_sync_capability_catalog_invalidates_cached_catalog(db_session, test_user):
+    from AINDY.agents.capability_service import (
+        create_run_capability_mappings,
+        get_capability_catalog_cache,
+        sync_capability_catalog,
+    )
+    from AINDY.db.models.capability import Capability
+
+    run = _make_run(db_session, test_user)
+    create_run_capability_mappings(str(run.id), "default", ["manage_tasks"], db_session)
+    sync_capability_catalog(db_session)
+    assert get_capability_catalog_cache().stats()["loads"] == 1
+
+    row = db_session.query(Capability).filter(Capability.name == "manage_tasks").one()
+    row.description = "drifted"
+    db_session.commit()
+    sync_capability_catalog(db_session)
+    assert get_capability_catalog_cache().stats()["capabilities"] == 0
+
+    create_run_capability_mappings(str(run.id), "default", ["manage_tasks"], db_session)
+    assert get_capability_catalog_cache().stats()["loads"] == 2
+    assert db_session.query(Capability).filter(Capability.name == "manage_tasks").one().description != "drifted"
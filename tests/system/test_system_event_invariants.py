@@ -46,6 +46,14 @@ class _FakeQuery:
             return self.db.agent_run
         return None
 
+    def update(self, values, synchronize_session=None):
+        name = getattr(self.model, "__name__", str(self.model))
+        if name != "FlowRun" or self.db.flow_run is None:
+            return 0
+        for key, value in values.items():
+            setattr(self.db.flow_run, getattr(key, "key", key), value)
+        return 1
+
 
 class _FakeDB:
     def __init__(self):
@@ -89,6 +97,9 @@ class _FakeDB:
     def refresh(self, obj):
         return None
 
+    def expire(self, obj, attribute_names=None):
+        return None
+
     def query(self, model):
         name = getattr(model, "__name__", str(model))
         if name == "AutomationLog":
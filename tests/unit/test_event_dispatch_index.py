@@ -0,0 +1,79 @@
+"""
+Tests for the compiled dispatch index in platform_layer.event_service —
+equivalence with _matches, registration order and copy-on-write refresh.
+"""
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from AINDY.platform_layer import event_service
+from AINDY.platform_layer.event_service import _DispatchIndex, _matches
+
+
+@pytest.fixture
+def subscriptions():
+    original = dict(event_service._SUBSCRIPTIONS)
+    event_service._SUBSCRIPTIONS.clear()
+    try:
+        yield event_service._SUBSCRIPTIONS
+    finally:
+        event_service._SUBSCRIPTIONS.clear()
+        event_service._SUBSCRIPTIONS.update(original)
+
+
+def test_index_agrees_with_linear_matching():
+    rng = random.Random(7)
+    words = ["execution", "flow", "memory", "a", "b", ""]
+    patterns = ["*"]
+    for _ in range(300):
+        segments = [rng.choice(words) for _ in range(rng.randint(1, 3))]
+        pattern = ".".join(segments)
+        patterns.append(pattern + ".*" if rng.random() < 0.5 else pattern)
+    index = _DispatchIndex({}, 0, [(pattern, i) for i, pattern in enumerate(patterns)])
+
+    for _ in range(500):
+        event_type = ".".join(rng.choice(words) for _ in range(rng.randint(1, 4)))
+        expected = [i for i, pattern in enumerate(patterns) if _matches(pattern, event_type)]
+        assert index.match(event_type) == expected, event_type
+
+
+def test_handlers_dispatch_in_registration_order(monkeypatch):
+    calls: list[str] = []
+    monkeypatch.setattr(event_service, "_INTERNAL_HANDLERS", event_service._VersionedRegistry())
+    event_service.register_event_handler("flow.completed", lambda event: calls.append("exact"))
+    event_service.register_event_handler("*", lambda event: calls.append("global"))
+    event_service.register_event_handler("flow.*", lambda event: calls.append("prefix"))
+
+    dispatched = event_service.dispatch_internal_event_handlers(
+        db=None,
+        event_type="flow.completed",
+        event_id="evt-1",
+        payload={},
+        user_id=None,
+        trace_id=None,
+        source="test",
+    )
+
+    assert dispatched == 3
+    assert calls == ["exact", "global", "prefix"]
+
+
+def test_webhook_index_is_republished_on_change(subscriptions):
+    first = event_service.subscribe_webhook("execution.*", "https://example.test/a")["id"]
+    index = event_service._webhook_index()
+    assert [sub["id"] for sub in index.match("execution.completed")] == [first]
+    assert event_service._webhook_index() is index
+
+    second = event_service.subscribe_webhook("execution.completed", "https://example.test/b")["id"]
+    assert [sub["id"] for sub in event_service._webhook_index().match("execution.completed")] == [
+        first,
+        second,
+    ]
+    # The published snapshot is immutable; callers holding it are unaffected.
+    assert [sub["id"] for sub in index.match("execution.completed")] == [first]
+
+    event_service.unsubscribe_webhook(first)
+    subscriptions.clear()
+    assert event_service._webhook_index().match("execution.completed") == []
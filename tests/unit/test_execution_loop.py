@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import threading
+
+from AINDY.core.execution_loop import run_blocking_handler, should_offload_handler
+
+_request_tag: contextvars.ContextVar[str] = contextvars.ContextVar("test_request_tag", default="unset")
+
+
+def test_offload_is_opt_in():
+    def handler(ctx):
+        return ctx
+
+    async def _check():
+        return should_offload_handler(handler)
+
+    assert asyncio.run(_check()) is False
+
+
+def test_offloaded_handler_context_changes_reach_the_caller():
+    caller_thread = threading.get_ident()
+    seen = {}
+
+    def handler(value):
+        seen["tag"] = _request_tag.get()
+        seen["thread"] = threading.get_ident()
+        _request_tag.set(value)
+        return value
+
+    async def _run():
+        _request_tag.set("from-caller")
+        result = await run_blocking_handler(handler, "from-handler")
+        return result, _request_tag.get()
+
+    result, tag_after = asyncio.run(_run())
+
+    assert seen == {"tag": "from-caller", "thread": seen["thread"]}
+    assert seen["thread"] != caller_thread
+    assert (result, tag_after) == ("from-handler", "from-handler")
+
+
+def test_context_changes_are_copied_back_when_the_handler_raises():
+    def handler():
+        _request_tag.set("before-error")
+        raise RuntimeError("boom")
+
+    async def _run():
+        try:
+            await run_blocking_handler(handler)
+        except RuntimeError:
+            pass
+        return _request_tag.get()
+
+    assert asyncio.run(_run()) == "before-error"
@@ -0,0 +1,110 @@
+"""Read-only (ephemeral) execution class in ExecutionPipeline and run_flow."""
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from AINDY.core.execution_pipeline import READ_ONLY_EXECUTION, ExecutionContext, ExecutionPipeline
+
+
+def _ctx() -> ExecutionContext:
+    ctx = ExecutionContext(request_id="trace-read-only", route_name="observability_dashboard", user_id="user-1")
+    ctx.metadata.update({"db": MagicMock(), "execution_class": READ_ONLY_EXECUTION})
+    return ctx
+
+
+@pytest.fixture
+def durable_writes():
+    rm = MagicMock()
+    rm.can_execute.return_value = (True, None)
+    with patch(
+        "AINDY.core.execution_gate.require_execution_unit",
+        return_value=SimpleNamespace(id="eu-1"),
+    ) as require_eu, patch(
+        "AINDY.core.system_event_service.emit_system_event",
+        return_value="event-1",
+    ) as emit, patch(
+        "AINDY.kernel.resource_manager.get_resource_manager",
+        return_value=rm,
+    ), patch(
+        "AINDY.core.execution_pipeline.ExecutionPipeline._safe_recall_memory_count",
+        return_value=0,
+    ):
+        yield SimpleNamespace(require_eu=require_eu, emit=emit, rm=rm)
+
+
+def test_read_only_success_writes_nothing_but_keeps_quota(durable_writes):
+    result = asyncio.run(ExecutionPipeline().run(_ctx(), lambda ctx: {"ok": True}))
+
+    assert result.success is True
+    assert result.metadata["ephemeral"] is True
+    durable_writes.require_eu.assert_not_called()
+    durable_writes.emit.assert_not_called()
+    durable_writes.rm.can_execute.assert_called_once()
+    durable_writes.rm.mark_started.assert_called_once_with("user-1", None)
+    durable_writes.rm.mark_completed.assert_called_once_with("user-1", None)
+    durable_writes.rm.record_usage.assert_not_called()
+
+
+def test_read_only_failure_persists_failed_event(durable_writes):
+    def handler(ctx):
+        raise RuntimeError("dashboard query failed")
+
+    result = asyncio.run(ExecutionPipeline().run(_ctx(), handler))
+
+    assert result.success is False
+    assert [call.kwargs["event_type"] for call in durable_writes.emit.call_args_list] == ["execution.failed"]
+    durable_writes.require_eu.assert_not_called()
+
+
+def test_sampled_read_only_execution_is_durable(durable_writes, monkeypatch):
+    monkeypatch.setattr("AINDY.config.settings.AINDY_READ_ONLY_TRACE_SAMPLE_RATE", 1.0)
+
+    result = asyncio.run(ExecutionPipeline().run(_ctx(), lambda ctx: {"ok": True}))
+
+    assert result.metadata["ephemeral"] is False
+    assert result.metadata["eu_id"] == "eu-1"
+    assert [call.kwargs["event_type"] for call in durable_writes.emit.call_args_list] == [
+        "execution.started",
+        "execution.completed",
+    ]
+
+
+def test_run_flow_is_in_memory_inside_ephemeral_execution(db_session, test_user):
+    from AINDY.db.models.flow_run import FlowRun
+    from AINDY.platform_layer.trace_context import (
+        reset_current_execution_context,
+        set_current_execution_context,
+    )
+    from AINDY.runtime.flow_engine import FLOW_REGISTRY, NODE_REGISTRY, register_flow, run_flow
+
+    calls = []
+
+    def read_node(state, context):
+        calls.append(context.get("ephemeral"))
+        return {"status": "SUCCESS", "output_patch": {"count": state["count"] + 1}}
+
+    NODE_REGISTRY["read_only_test_node"] = read_node
+    register_flow(
+        "read_only_test_flow",
+        {"start": "read_only_test_node", "edges": {}, "end": ["read_only_test_node"]},
+    )
+    ctx = _ctx()
+    ctx.metadata["ephemeral"] = True
+    token = set_current_execution_context(ctx)
+    try:
+        result = run_flow("read_only_test_flow", {"count": 1}, db=db_session, user_id=str(test_user.id))
+    finally:
+        reset_current_execution_context(token)
+        NODE_REGISTRY.pop("read_only_test_node", None)
+        FLOW_REGISTRY.pop("read_only_test_flow", None)
+
+    assert result["status"] == "SUCCESS"
+    assert result["state"]["count"] == 2
+    assert result["run_id"] is None
+    assert [event["node"] for event in result["events"]] == ["read_only_test_node"]
+    assert calls == [True]
+    assert db_session.query(FlowRun).filter(FlowRun.flow_name == "read_only_test_flow").count() == 0
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import uuid
+
+import pytest
+
+from AINDY.config import settings
+from AINDY.db.models.flow_run import FlowHistory, FlowRun
+from AINDY.runtime.flow_engine import PersistentFlowRunner, register_node
+from AINDY.runtime.flow_engine.checkpoint import load_run_state
+
+
+def _linear_flow(prefix: str, successes: int, *, fail_last: bool) -> dict:
+    names = [f"{prefix}_{index}" for index in range(successes)]
+    for index, name in enumerate(names):
+        register_node(name)(
+            lambda state, context, index=index: {
+                "status": "SUCCESS",
+                "output_patch": {f"step_{index}": index, "last": index},
+            }
+        )
+    if fail_last:
+        names.append(f"{prefix}_fail")
+        register_node(names[-1])(lambda state, context: {"status": "FAILURE", "error": "stop"})
+    return {
+        "start": names[0],
+        "edges": {a: [b] for a, b in zip(names, names[1:])},
+        "end": [names[-1]],
+    }
+
+
+def _run(db_session, flow: dict) -> tuple[dict, FlowRun]:
+    run = FlowRun(
+        id=str(uuid.uuid4()),
+        flow_name="checkpoint_test",
+        workflow_type="test",
+        state={"seed": True},
+        current_node=flow["start"],
+        status="running",
+        trace_id=str(uuid.uuid4()),
+    )
+    db_session.add(run)
+    db_session.commit()
+    run_id = run.id
+    result = PersistentFlowRunner(flow=flow, db=db_session, workflow_type="test").resume(run_id)
+    db_session.expire_all()
+    return result, db_session.get(FlowRun, run_id)
+
+
+def test_state_is_rebuilt_from_snapshot_and_patches(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "AINDY_FLOW_CHECKPOINT_INTERVAL", 4)
+    result, run = _run(db_session, _linear_flow("ckpt_delta", 5, fail_last=True))
+
+    assert result["status"] == "FAILED"
+    assert (run.node_seq, run.checkpoint_seq) == (6, 4)
+    assert "step_4" not in run.state
+
+    expected = {"seed": True, "last": 4, **{f"step_{index}": index for index in range(5)}}
+    rebuilt = load_run_state(db_session, run)
+    assert {key: rebuilt[key] for key in expected} == expected
+
+    history = (
+        db_session.query(FlowHistory)
+        .filter(FlowHistory.flow_run_id == run.id)
+        .order_by(FlowHistory.seq)
+        .all()
+    )
+    assert [row.seq for row in history] == [1, 2, 3, 4, 5, 6]
+    assert all(row.input_state is None for row in history)
+
+
+@pytest.mark.parametrize("interval", [1, 3])
+def test_completed_run_holds_a_full_snapshot(db_session, monkeypatch, interval):
+    monkeypatch.setattr(settings, "AINDY_FLOW_CHECKPOINT_INTERVAL", interval)
+    result, run = _run(db_session, _linear_flow(f"ckpt_done_{interval}", 5, fail_last=False))
+
+    assert result["status"] == "SUCCESS"
+    assert run.node_seq == run.checkpoint_seq == 5
+    assert run.state["step_4"] == 4
+    assert load_run_state(db_session, run) == run.state
+    history = db_session.query(FlowHistory).filter(FlowHistory.flow_run_id == run.id).all()
+    assert all(row.input_state is None for row in history)
+
+
+def test_in_place_state_edit_lands_in_the_next_snapshot(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "AINDY_FLOW_CHECKPOINT_INTERVAL", 10)
+    session_flags = []
+
+    def _mutate(state, context):
+        session_flags.append(context["db"].expire_on_commit)
+        state["edited"] = True
+        return {"status": "SUCCESS", "output_patch": {"patched": 1}}
+
+    register_node("ckpt_mutate")(_mutate)
+    flow = _linear_flow("ckpt_mutate_tail", 3, fail_last=False)
+    flow["edges"]["ckpt_mutate"] = [flow["start"]]
+    flow["start"] = "ckpt_mutate"
+    db_session.expire_on_commit = True
+    result, run = _run(db_session, flow)
+
+    assert result["status"] == "SUCCESS"
+    assert session_flags == [True]
+    assert run.checkpoint_seq == run.node_seq == 4
+    assert run.state["edited"] is True and run.state["patched"] == 1
+
+
+def test_run_deleted_between_nodes_stops_execution(db_session, monkeypatch):
+    from AINDY.runtime.flow_engine.checkpoint import RunCheckpoint
+
+    original_write = RunCheckpoint.write
+
+    def _write(self, **values):
+        if "current_node" in values:
+            self.db.query(FlowRun).filter(FlowRun.id == self.run_id).delete(
+                synchronize_session=False
+            )
+        return original_write(self, **values)
+
+    monkeypatch.setattr(RunCheckpoint, "write", _write)
+    executed = []
+    register_node("ckpt_gone_first")(
+        lambda state, context: executed.append(1) or {"status": "SUCCESS", "output_patch": {}}
+    )
+    register_node("ckpt_gone_second")(
+        lambda state, context: executed.append(2) or {"status": "SUCCESS", "output_patch": {}}
+    )
+    flow = {
+        "start": "ckpt_gone_first",
+        "edges": {"ckpt_gone_first": ["ckpt_gone_second"]},
+        "end": ["ckpt_gone_second"],
+    }
+    result, _ = _run(db_session, flow)
+
+    assert result["status"] == "FAILED"
+    assert "disappeared" in result["result"]["error"]
+    assert executed == [1]
+
+
+def test_runner_does_not_reload_the_run_after_each_commit(db_session):
+    from sqlalchemy import event
+
+    flow_run_selects = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM flow_runs" in statement:
+            flow_run_selects.append(statement)
+
+    bind = db_session.get_bind()
+    db_session.expire_on_commit = True
+    counts = []
+    event.listen(bind, "before_cursor_execute", _count)
+    try:
+        for steps in (2, 6):
+            flow_run_selects.clear()
+            result, run = _run(db_session, _linear_flow(f"ckpt_reload_{steps}", steps, fail_last=False))
+            assert result["status"] == "SUCCESS"
+            assert run.state[f"step_{steps - 1}"] == steps - 1
+            counts.append(len(flow_run_selects))
+    finally:
+        event.remove(bind, "before_cursor_execute", _count)
+
+    assert db_session.expire_on_commit is True
+    # Lookups and completion only; nothing per node.
+    assert counts[0] == counts[1]
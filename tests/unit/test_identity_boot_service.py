@@ -52,3 +52,36 @@ def test_get_user_metrics_uses_registered_kpi_snapshot(monkeypatch):
             "calculated_at": None,
         },
     }
+
+
+def test_active_flows_report_state_past_the_last_snapshot(db_session, test_user):
+    from AINDY.db.models.flow_run import FlowHistory, FlowRun
+    from apps.identity.services.identity_boot_service import get_active_flows
+
+    run = FlowRun(
+        id=str(uuid4()),
+        flow_name="boot_flow",
+        workflow_type="test",
+        state={"seed": True},
+        current_node="third",
+        status="running",
+        user_id=test_user.id,
+        node_seq=2,
+        checkpoint_seq=0,
+    )
+    db_session.add(run)
+    db_session.add_all(
+        [
+            FlowHistory(
+                flow_run_id=run.id, seq=1, node_name="first", status="SUCCESS", output_patch={"a": 1}
+            ),
+            FlowHistory(
+                flow_run_id=run.id, seq=2, node_name="second", status="SUCCESS", output_patch={"b": 2}
+            ),
+        ]
+    )
+    db_session.commit()
+
+    flows = get_active_flows(test_user.id, db_session)
+
+    assert [flow["state"] for flow in flows] == [{"seed": True, "a": 1, "b": 2}]
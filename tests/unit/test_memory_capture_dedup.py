@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import threading
+import uuid
+from datetime import datetime
+
+import pytest
+
+from AINDY.config import settings
+from AINDY.memory.content_fingerprint import (
+    NearDuplicateIndex,
+    content_hash,
+    hamming_distance,
+    simhash,
+)
+from AINDY.memory.memory_capture_engine import MemoryCaptureEngine
+from AINDY.memory.memory_persistence import MemoryNodeModel
+
+
+def test_fingerprints_ignore_case_and_whitespace_and_track_small_edits():
+    assert content_hash("Deploy  FAILED\n") == content_hash("deploy failed")
+    assert content_hash("deploy failed") != content_hash("deploy succeeded")
+    base = "Execution of flow nightly_sync failed after retries: upstream API returned 503 for the orders endpoint"
+    near = base.replace("retries", "several retries")
+    other = "Weekly planning session produced three new goals for the marketing pipeline review"
+    assert hamming_distance(simhash(base), simhash(base)) == 0
+    assert hamming_distance(simhash(base), simhash(near)) < hamming_distance(simhash(base), simhash(other))
+    assert simhash("   ") is None
+
+
+def test_saved_nodes_get_fingerprints_and_edits_refresh_them(db_session, test_user):
+    from AINDY.db.dao.memory_node_dao import MemoryNodeDAO
+
+    dao = MemoryNodeDAO(db_session)
+    created = dao.save(
+        content="Cache hit ratio dropped",
+        user_id=str(test_user.id),
+        node_type="insight",
+        generate_embedding=False,
+    )
+    row = db_session.get(MemoryNodeModel, uuid.UUID(created["id"]))
+    assert row.content_hash == content_hash("cache hit ratio dropped")
+    assert row.content_simhash == simhash("Cache hit ratio dropped")
+
+    dao.update(
+        created["id"],
+        content="Cache hit ratio recovered",
+        user_id=str(test_user.id),
+        regenerate_embedding=False,
+    )
+    db_session.refresh(row)
+    assert row.content_hash == content_hash("cache hit ratio recovered")
+
+
+@pytest.fixture
+def capture_engine(db_session, test_user, monkeypatch):
+    monkeypatch.setattr(MemoryCaptureEngine, "_auto_link", lambda self, node, tags: None)
+    monkeypatch.setattr("AINDY.memory.memory_capture_engine.emit_system_event", lambda **kwargs: None)
+    return MemoryCaptureEngine(db=db_session, user_id=str(test_user.id))
+
+
+def _capture(engine, content):
+    return engine.evaluate_and_capture(
+        event_type="execution.failed",
+        content=content,
+        source="test",
+        force=True,
+    )
+
+
+def test_exact_duplicate_capture_is_merged(db_session, capture_engine):
+    tag = uuid.uuid4().hex
+    first = _capture(capture_engine, f"Flow {tag} failed on step fetch_orders")
+    assert first is not None
+    assert _capture(capture_engine, f"  flow {tag} FAILED on step fetch_orders ") is None
+
+    row = db_session.get(MemoryNodeModel, uuid.UUID(first["id"]))
+    db_session.refresh(row)
+    assert row.extra["duplicate_count"] == 1
+
+
+def test_duplicate_merge_is_left_to_the_callers_commit(db_session, capture_engine, monkeypatch):
+    content = f"Flow {uuid.uuid4().hex} failed on step fetch_orders"
+    first = _capture(capture_engine, content)
+    row = db_session.get(MemoryNodeModel, uuid.UUID(first["id"]))
+    commits = []
+    monkeypatch.setattr(db_session, "commit", lambda: commits.append(1))
+
+    assert capture_engine._is_duplicate(content)
+    assert row.extra["duplicate_count"] == 1
+    assert commits == []
+
+    def _fail(node):
+        node.extra = {**node.extra, "duplicate_count": 99}
+        db_session.flush()
+        raise RuntimeError("merge failed")
+
+    monkeypatch.setattr(capture_engine, "_merge_duplicate", _fail)
+    assert not capture_engine._is_duplicate(content)
+    assert commits == []
+    db_session.refresh(row)
+    assert row.extra["duplicate_count"] == 1
+
+
+def test_near_duplicate_capture_is_merged_when_enabled(db_session, capture_engine, monkeypatch):
+    base = (
+        f"Execution {uuid.uuid4().hex} of flow nightly_sync failed after three retries because the "
+        "upstream inventory API kept returning 503 responses for the orders endpoint during the window"
+    )
+    near = base.replace("window", "maintenance window")
+    # The random id moves the hashes around; stay well clear of unrelated texts (~32 bits).
+    monkeypatch.setattr(settings, "AINDY_MEMORY_NEAR_DUPLICATE_MAX_DISTANCE", 16)
+    assert hamming_distance(simhash(base), simhash(near)) <= 16
+    first = _capture(capture_engine, base)
+
+    stored = _capture(capture_engine, near)
+    assert stored is not None  # disabled by default: stored again
+    db_session.delete(db_session.get(MemoryNodeModel, uuid.UUID(stored["id"])))
+    db_session.commit()
+
+    monkeypatch.setattr(settings, "AINDY_MEMORY_NEAR_DUPLICATE_ENABLED", True)
+    assert _capture(capture_engine, near) is None
+    row = db_session.get(MemoryNodeModel, uuid.UUID(first["id"]))
+    db_session.refresh(row)
+    assert row.extra["duplicate_count"] == 1
+
+
+def test_near_duplicate_index_picks_up_new_rows(db_session, test_user):
+    from AINDY.db.dao.memory_node_dao import MemoryNodeDAO
+
+    dao = MemoryNodeDAO(db_session)
+    index = NearDuplicateIndex(max_users=4, ttl_seconds=300)
+    content = f"Nightly export {uuid.uuid4().hex} finished with warnings about missing invoice rows"
+    value = simhash(content)
+    assert index.find(db_session, user_id=test_user.id, simhash_value=value, max_distance=3) is None
+
+    created = dao.save(
+        content=content,
+        user_id=str(test_user.id),
+        node_type="insight",
+        generate_embedding=False,
+    )
+    assert index.find(db_session, user_id=test_user.id, simhash_value=value, max_distance=3) == (created["id"], 0)
+    assert index.stats()["loads"] == 1
+
+
+def test_cold_load_runs_outside_the_index_lock():
+    index = NearDuplicateIndex(max_users=4, ttl_seconds=300)
+    slow_user, warm_user = str(uuid.uuid4()), str(uuid.uuid4())
+    release = threading.Event()
+    loads = []
+
+    def _fetch(db, user_id, since):
+        if since is None:
+            loads.append(user_id)
+            if user_id == slow_user:
+                assert release.wait(5)
+            return [(f"{user_id}-1", 5, datetime(2026, 1, 1))]
+        return []
+
+    index._fetch = _fetch
+    index.find(None, user_id=warm_user, simhash_value=5, max_distance=0)
+    slow_hits = []
+
+    def _find_slow():
+        slow_hits.append(index.find(None, user_id=slow_user, simhash_value=5, max_distance=0))
+
+    lookups = [threading.Thread(target=_find_slow) for _ in range(3)]
+    for thread in lookups:
+        thread.start()
+
+    # The slow user's load is parked; the warm user is still served.
+    assert index.find(None, user_id=warm_user, simhash_value=5, max_distance=0) == (f"{warm_user}-1", 0)
+    release.set()
+    for thread in lookups:
+        thread.join(5)
+    assert slow_hits == [(f"{slow_user}-1", 0)] * 3
+    assert loads.count(slow_user) == 1
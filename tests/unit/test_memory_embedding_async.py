@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import hashlib
 import uuid
+from types import SimpleNamespace
 
 from AINDY.db.dao.memory_node_dao import MemoryNodeDAO
 from AINDY.memory.embedding_jobs import process_pending_embeddings
+from AINDY.memory.embedding_service import EmbeddingFailedError, token_budget_batches
 from AINDY.memory.memory_persistence import MemoryNodeModel
 
 
@@ -52,8 +55,8 @@ def test_embedding_worker_marks_nodes_complete_after_success(
         generate_embedding=False,
     )
     monkeypatch.setattr(
-        "AINDY.memory.embedding_jobs.generate_embedding",
-        lambda text: [0.4] * 1536,
+        "AINDY.memory.embedding_jobs.generate_embeddings",
+        lambda texts: [[0.4] * 1536 for _ in texts],
     )
 
     result = process_pending_embeddings(db=db_session, limit=100000)
@@ -83,8 +86,8 @@ def test_embedding_worker_leaves_nodes_pending_when_openai_fails(
         generate_embedding=False,
     )
     monkeypatch.setattr(
-        "AINDY.memory.embedding_jobs.generate_embedding",
-        lambda text: (_ for _ in ()).throw(RuntimeError("openai timeout")),
+        "AINDY.memory.embedding_jobs.generate_embeddings",
+        lambda texts: [EmbeddingFailedError("openai timeout") for _ in texts],
     )
 
     result = process_pending_embeddings(db=db_session, limit=100000)
@@ -141,3 +144,100 @@ def test_similarity_search_excludes_pending_nodes(db_session, test_user):
     )
 
     assert [item["id"] for item in results] == [complete["id"]]
+
+
+class _FakeOpenAIEmbeddings:
+    """Local stand-in for the OpenAI client's embeddings endpoint."""
+
+    def __init__(self, *, reject=()):
+        self.reject = set(reject)
+        self.calls = []
+        self.embeddings = self
+
+    @staticmethod
+    def vector_for(text):
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        return [float(digest[index % len(digest)] + 1) for index in range(1536)]
+
+    def create(self, *, input, model, timeout=None, **kwargs):
+        inputs = [input] if isinstance(input, str) else list(input)
+        self.calls.append(inputs)
+        if self.reject & set(inputs):
+            # The real endpoint rejects the whole request for one bad input.
+            raise ValueError("invalid input in batch")
+        return SimpleNamespace(
+            data=[
+                SimpleNamespace(index=index, embedding=self.vector_for(text))
+                for index, text in reversed(list(enumerate(inputs)))
+            ]
+        )
+
+
+def _pending_nodes(dao, user_id, contents):
+    # The sweep is global; keep pending rows left by other tests out of it.
+    dao.db.query(MemoryNodeModel).filter(MemoryNodeModel.embedding_pending.is_(True)).update(
+        {MemoryNodeModel.embedding_pending: False},
+        synchronize_session=False,
+    )
+    return [
+        dao.save(
+            content=content,
+            source="pytest",
+            user_id=user_id,
+            node_type="insight",
+            generate_embedding=False,
+        )["id"]
+        for content in contents
+    ]
+
+
+def test_token_budget_batches_respect_tokens_and_input_cap():
+    texts = ["a" * 400, "b" * 400, "c" * 400, "d" * 4000, "e" * 40]
+    assert token_budget_batches(texts, max_tokens=250, max_inputs=10) == [[0, 1], [2], [3], [4]]
+    assert token_budget_batches(texts, max_tokens=10_000, max_inputs=2) == [[0, 1], [2, 3], [4]]
+
+
+def test_sweep_batches_requests_and_writes_vectors(db_session, test_user, monkeypatch):
+    fake = _FakeOpenAIEmbeddings()
+    monkeypatch.setattr("AINDY.memory.embedding_service._client", fake)
+    monkeypatch.setattr("AINDY.memory.embedding_service.time.sleep", lambda seconds: None)
+    monkeypatch.setattr("AINDY.config.settings.AINDY_EMBEDDING_BATCH_MAX_INPUTS", 16)
+    dao = MemoryNodeDAO(db_session)
+    contents = [f"sweep memory {index}" for index in range(40)]
+    ids = _pending_nodes(dao, str(test_user.id), contents)
+
+    result = process_pending_embeddings(db=db_session, limit=100)
+
+    assert result == {"job": "memory.embedding_sweep", "processed": 40, "completed": 40, "deferred": 0}
+    assert [len(call) for call in fake.calls] == [16, 16, 8]
+    db_session.expire_all()
+    for node_id, content in zip(ids, contents):
+        node = db_session.get(MemoryNodeModel, uuid.UUID(node_id))
+        assert node.embedding_pending is False
+        assert node.embedding_status == "complete"
+        assert list(node.embedding) == fake.vector_for(content)
+
+
+def test_sweep_leaves_only_rejected_nodes_pending(db_session, test_user, monkeypatch):
+    fake = _FakeOpenAIEmbeddings(reject={"poison memory"})
+    monkeypatch.setattr("AINDY.memory.embedding_service._client", fake)
+    monkeypatch.setattr("AINDY.memory.embedding_service.time.sleep", lambda seconds: None)
+    monkeypatch.setattr("AINDY.config.settings.OPENAI_MAX_RETRIES", 1)
+    dao = MemoryNodeDAO(db_session)
+    contents = [f"healthy memory {index}" for index in range(7)]
+    contents.insert(3, "poison memory")
+    ids = _pending_nodes(dao, str(test_user.id), contents)
+
+    result = process_pending_embeddings(db=db_session, limit=100)
+
+    assert result["completed"] == 7
+    assert result["deferred"] == 1
+    # One rejected request of 8, then halving isolates the bad input.
+    assert len(fake.calls) == 7
+    db_session.expire_all()
+    statuses = {
+        content: db_session.get(MemoryNodeModel, uuid.UUID(node_id)).embedding_pending
+        for node_id, content in zip(ids, contents)
+    }
+    assert statuses.pop("poison memory") is True
+    assert not any(statuses.values())
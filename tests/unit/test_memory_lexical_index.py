@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import uuid
+
+from AINDY.db.dao.memory_node_dao import MemoryNodeDAO
+from AINDY.memory.lexical_index import (
+    MemoryLexicalIndex,
+    get_memory_lexical_index,
+    rank_documents,
+    tokenize,
+)
+
+
+def test_tokenize_drops_stopwords_and_folds_plurals():
+    assert tokenize("The Deploys of the queries, and a class!") == ["deploy", "query", "class"]
+    assert tokenize("Deploys", fold=False) == ["deploys"]
+
+
+def test_rank_documents_prefers_rare_and_repeated_terms():
+    documents = [
+        "weekly status meeting notes",
+        "rollback the deploy after the failed deploy",
+        "deploy finished",
+        None,
+    ]
+    ranked = rank_documents("deploy rollback", documents)
+    assert [index for index, _ in ranked] == [1, 2]
+    assert ranked[0][1] == 1.0
+    assert 0.0 < ranked[1][1] < 1.0
+
+
+def test_search_requires_owner_and_tracks_writes(db_session, test_user):
+    dao = MemoryNodeDAO(db_session)
+    index = MemoryLexicalIndex(max_documents=10_000, ttl_seconds=300)
+    tag = uuid.uuid4().hex[:8]
+    first = dao.save(
+        content=f"{tag} cache eviction policy",
+        user_id=str(test_user.id),
+        node_type="insight",
+        generate_embedding=False,
+    )
+
+    assert index.search(db_session, user_id=None, query=tag, limit=5) is None
+    hits = index.search(db_session, user_id=test_user.id, query=tag, limit=5)
+    assert [node_id for node_id, _ in hits] == [first["id"]]
+
+    index.upsert(user_id=test_user.id, node_id=first["id"], node_type="insight", content="renamed entirely")
+    assert index.search(db_session, user_id=test_user.id, query=tag, limit=5) == []
+    assert index.search(db_session, user_id=test_user.id, query="renamed", limit=5, node_type="outcome") == []
+    index.discard(user_id=test_user.id, node_id=first["id"])
+    assert index.stats()["loads"] == 1
+
+    # A row count that no longer matches the partition reloads it.
+    hits = index.search(db_session, user_id=test_user.id, query=tag, limit=5, expected_rows=1)
+    assert [node_id for node_id, _ in hits] == [first["id"]]
+    assert index.stats()["loads"] == 2
+
+
+def test_recall_without_embeddings_ranks_text_matches(db_session, monkeypatch):
+    from AINDY.db.models.user import User
+
+    user = User(
+        id=uuid.uuid4(),
+        email=f"{uuid.uuid4().hex[:8]}@aindy.test",
+        username=uuid.uuid4().hex[:12],
+        hashed_password="x",
+    )
+    db_session.add(user)
+    db_session.commit()
+    monkeypatch.setattr("AINDY.memory.embedding_service.generate_query_embedding", lambda query: [0.0] * 1536)
+
+    dao = MemoryNodeDAO(db_session)
+    user_id = str(user.id)
+
+    def save(content):
+        return dao.save(content=content, user_id=user_id, node_type="insight", generate_embedding=False)
+
+    noise = save("quarterly planning retro")
+    weak = save("postgres upgrade checklist")
+    results = dao.recall(query="postgres vacuum", user_id=user_id, limit=5)
+    assert [item["id"] for item in results] == [weak["id"]]
+
+    # Written after the partition loaded: applied incrementally, not reloaded.
+    strong = save("postgres vacuum tuning for postgres")
+    loads = get_memory_lexical_index().stats()["loads"]
+    results = dao.recall(query="postgres vacuum", user_id=user_id, limit=5)
+    assert [item["id"] for item in results] == [strong["id"], weak["id"]]
+    assert results[0]["lexical_score"] == 1.0
+    assert get_memory_lexical_index().stats()["loads"] == loads
+
+    dao.update(strong["id"], content="unrelated", user_id=user_id, regenerate_embedding=False)
+    assert [item["id"] for item in dao.recall(query="vacuum", user_id=user_id, limit=5)] == []
+    assert noise["id"] not in {item["id"] for item in dao.query_path(query="postgres", user_id=user_id)}
+
+
+def test_hybrid_weight_blends_lexical_into_relevance(db_session):
+    dao = MemoryNodeDAO(db_session)
+    candidates = [
+        {"id": str(uuid.uuid4()), "semantic_score": 0.9, "lexical_score": 0.0},
+        {"id": str(uuid.uuid4()), "semantic_score": 0.5, "lexical_score": 1.0},
+    ]
+    semantic_only = dao._score_candidates([dict(c) for c in candidates])
+    assert semantic_only[0]["resonance_score"] > semantic_only[1]["resonance_score"]
+
+    hybrid = dao._score_candidates([dict(c) for c in candidates], lexical_weight=0.5)
+    assert hybrid[1]["resonance_score"] > hybrid[0]["resonance_score"]
+    assert hybrid[1]["lexical_score"] == 1.0
+
+
+def test_text_matches_keep_substring_hits_bm25_misses(db_session, test_user):
+    dao = MemoryNodeDAO(db_session)
+    user_id = str(test_user.id)
+
+    def save(content):
+        return dao.save(content=content, user_id=user_id, node_type="insight", generate_embedding=False)
+
+    partial = save("deployment pipeline finished")
+
+    assert rank_documents("deploy", ["deployment pipeline finished"]) == []
+    matches = dao._find_text_matches(query="deploy", limit=5, user_id=user_id, node_type=None)
+    assert [(item["id"], item["lexical_score"]) for item in matches] == [(partial["id"], 0.0)]
+
+    exact = save("rollback the deploy")
+    matches = dao._find_text_matches(query="deploy", limit=5, user_id=user_id, node_type=None)
+    assert [item["id"] for item in matches] == [exact["id"], partial["id"]]
+    assert [item["id"] for item in dao._find_text_matches(query="deploy", limit=1, user_id=user_id, node_type=None)] == [exact["id"]]
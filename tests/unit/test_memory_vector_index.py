@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import threading
+import uuid
+
+import numpy as np
+import pytest
+
+from AINDY.db.dao.memory_node_dao import MemoryNodeDAO
+from AINDY.memory.embedding_jobs import process_embedding_job
+from AINDY.memory.embedding_service import cosine_similarity, cosine_similarity_python
+from AINDY.memory.memory_persistence import MemoryNodeModel
+from AINDY.memory.vector_index import (
+    ANN_PROFILES,
+    MemoryVectorIndex,
+    get_memory_vector_index,
+    resolve_search_mode,
+    top_k,
+)
+
+
+def _axis(index: int, scale: float = 1.0) -> list[float]:
+    vector = [0.0] * 1536
+    vector[index] = scale
+    return vector
+
+
+def _embedded_node(dao, db_session, user_id, vector, *, node_type="insight"):
+    created = dao.save(
+        content=f"vector node {uuid.uuid4()}",
+        user_id=user_id,
+        node_type=node_type,
+        generate_embedding=False,
+    )
+    row = db_session.query(MemoryNodeModel).filter(
+        MemoryNodeModel.id == uuid.UUID(created["id"])
+    ).one()
+    row.embedding = vector
+    row.embedding_pending = False
+    row.embedding_status = "complete"
+    db_session.commit()
+    return created["id"]
+
+
+def test_top_k_orders_best_first():
+    scores = np.array([0.1, 0.9, 0.5, 0.7, 0.3])
+    assert top_k(scores, 3).tolist() == [1, 3, 2]
+    assert top_k(scores, 10).tolist() == [1, 3, 2, 4, 0]
+    assert top_k(scores, 0).tolist() == []
+
+
+def test_numpy_cosine_matches_python_fallback():
+    a = [0.3, -1.2, 2.5, 0.0]
+    b = [1.0, 0.4, -0.7, 2.2]
+    assert abs(cosine_similarity(a, b) - cosine_similarity_python(a, b)) < 1e-9
+    assert cosine_similarity([0.0, 0.0], [1.0, 0.0]) == 0.0
+    assert cosine_similarity([1.0], [1.0, 0.0]) == 0.0
+
+
+def test_search_returns_none_without_owner_or_usable_query(db_session):
+    index = MemoryVectorIndex(max_bytes=1 << 30, ttl_seconds=300)
+    assert index.search(db_session, user_id=None, query_embedding=_axis(0), limit=3) is None
+    assert index.search(db_session, user_id=str(uuid.uuid4()), query_embedding=[0.0] * 1536, limit=3) is None
+
+
+def test_find_similar_uses_index_and_filters_node_type(db_session, test_user):
+    dao = MemoryNodeDAO(db_session)
+    user_id = str(test_user.id)
+    best = _embedded_node(dao, db_session, user_id, _axis(0))
+    second = _embedded_node(dao, db_session, user_id, [0.8, 0.6] + [0.0] * 1534)
+    other_type = _embedded_node(dao, db_session, user_id, _axis(0, 2.0), node_type="decision")
+
+    results = dao.find_similar(_axis(0), limit=2, user_id=user_id, node_type="insight")
+
+    assert [item["id"] for item in results] == [best, second]
+    assert results[0]["similarity"] == 1.0
+    assert results[1]["similarity"] == 0.8
+    assert get_memory_vector_index().stats()["partitions"] == 1
+
+    everything = dao.find_similar(_axis(0), limit=5, user_id=user_id)
+    assert {item["id"] for item in everything[:2]} == {best, other_type}
+
+
+def test_embedding_job_updates_loaded_partition_incrementally(db_session, test_user, monkeypatch):
+    dao = MemoryNodeDAO(db_session)
+    user_id = str(test_user.id)
+    _embedded_node(dao, db_session, user_id, _axis(1))
+    dao.find_similar(_axis(1), limit=1, user_id=user_id)
+    index = get_memory_vector_index()
+    loads_before = index.stats()["loads"]
+
+    created = dao.save(
+        content="fresh memory",
+        user_id=user_id,
+        node_type="insight",
+        generate_embedding=False,
+    )
+    monkeypatch.setattr("AINDY.memory.embedding_jobs.generate_embedding", lambda text: _axis(2))
+    process_embedding_job({"memory_id": created["id"]}, db_session)
+
+    results = dao.find_similar(_axis(2), limit=1, user_id=user_id)
+
+    assert results[0]["id"] == created["id"]
+    assert index.stats()["loads"] == loads_before
+
+
+def test_index_reloads_when_rows_change_behind_its_back(db_session, test_user):
+    dao = MemoryNodeDAO(db_session)
+    user_id = str(test_user.id)
+    _embedded_node(dao, db_session, user_id, _axis(3))
+    dao.find_similar(_axis(3), limit=1, user_id=user_id)
+
+    # Written directly, as another worker process would.
+    newcomer = _embedded_node(dao, db_session, user_id, _axis(4))
+    results = dao.find_similar(_axis(4), limit=1, user_id=user_id)
+
+    assert results[0]["id"] == newcomer
+
+
+def test_discard_removes_rows_and_eviction_respects_budget():
+    index = MemoryVectorIndex(max_bytes=1 << 30, ttl_seconds=300, dimensions=4)
+    user_a, user_b = str(uuid.uuid4()), str(uuid.uuid4())
+
+    class _Db:
+        def __init__(self, rows):
+            self.rows = rows
+
+    def _load(db, user_key):
+        return db.rows
+
+    index._load_rows = _load
+    index.search(_Db([("a1", "insight", [1, 0, 0, 0]), ("a2", "insight", [0, 1, 0, 0])]),
+                 user_id=user_a, query_embedding=[1, 0, 0, 0], limit=1)
+    index.discard(user_id=user_a, node_id="a1")
+    hits = index.search(_Db([]), user_id=user_a, query_embedding=[1, 0, 0, 0], limit=2)
+    assert [node_id for node_id, _ in hits] == ["a2"]
+
+    index.max_bytes = index.stats()["bytes"]
+    index.search(_Db([("b1", "insight", [0, 0, 1, 0])]), user_id=user_b, query_embedding=[0, 0, 1, 0], limit=1)
+    assert index.stats()["partitions"] == 1
+
+
+def test_cold_load_runs_outside_the_index_lock():
+    index = MemoryVectorIndex(max_bytes=1 << 30, ttl_seconds=300, dimensions=4)
+    slow_user, warm_user = str(uuid.uuid4()), str(uuid.uuid4())
+    release = threading.Event()
+    loads = []
+
+    def _load(db, user_key):
+        loads.append(user_key)
+        if user_key == slow_user:
+            assert release.wait(5)
+        return [(f"{user_key}-1", "insight", [1, 0, 0, 0])]
+
+    index._load_rows = _load
+    index.search(None, user_id=warm_user, query_embedding=[1, 0, 0, 0], limit=1)
+    slow_hits = []
+    searches = [
+        threading.Thread(
+            target=lambda: slow_hits.append(
+                index.search(None, user_id=slow_user, query_embedding=[1, 0, 0, 0], limit=1)
+            )
+        )
+        for _ in range(3)
+    ]
+    for thread in searches:
+        thread.start()
+
+    # The slow user's load is parked; the warm user is still served.
+    hits = index.search(None, user_id=warm_user, query_embedding=[1, 0, 0, 0], limit=1)
+    assert hits[0][0] == f"{warm_user}-1"
+    release.set()
+    for thread in searches:
+        thread.join(5)
+    assert [hits[0][0] for hits in slow_hits] == [f"{slow_user}-1"] * 3
+    assert loads.count(slow_user) == 1
+
+
+class _RowsDb:
+    def __init__(self, rows):
+        self.rows = rows
+
+
+def _clustered_rows(count, dimensions=32, clusters=40, seed=7):
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(clusters, dimensions))
+    labels = rng.integers(0, clusters, size=count)
+    vectors = centres[labels] + 0.15 * rng.normal(size=(count, dimensions))
+    node_types = ["decision" if index % 50 == 0 else "insight" for index in range(count)]
+    return [(f"n{index}", node_types[index], vectors[index]) for index in range(count)], centres
+
+
+def _ivf_index(rows, dimensions=32):
+    index = MemoryVectorIndex(max_bytes=1 << 30, ttl_seconds=300, dimensions=dimensions)
+    index._load_rows = lambda db, user_key: db.rows
+    return index
+
+
+def test_resolve_search_mode(monkeypatch):
+    monkeypatch.setattr("AINDY.memory.vector_index.settings.AINDY_MEMORY_SEARCH_MODE", "auto")
+    monkeypatch.setattr("AINDY.memory.vector_index.settings.AINDY_MEMORY_ANN_MIN_ROWS", 1000)
+    assert resolve_search_mode("exact", 10**6) is None
+    assert resolve_search_mode(None, 999) is None
+    assert resolve_search_mode(None, 1000) is ANN_PROFILES["balanced"]
+    assert resolve_search_mode("FAST", 1) is ANN_PROFILES["fast"]
+    with pytest.raises(ValueError):
+        resolve_search_mode("sloppy", 1)
+
+
+def test_ivf_search_matches_exact_on_clustered_rows():
+    rows, centres = _clustered_rows(6000)
+    index = _ivf_index(rows)
+    user_id = str(uuid.uuid4())
+    db = _RowsDb(rows)
+    matches = 0
+    for centre in centres[:20]:
+        exact = index.search(db, user_id=user_id, query_embedding=centre, limit=5)
+        approx = index.search(
+            db, user_id=user_id, query_embedding=centre, limit=5, profile=ANN_PROFILES["balanced"],
+        )
+        assert len(approx) == 5
+        matches += len({node_id for node_id, _ in exact} & {node_id for node_id, _ in approx})
+    assert matches / (20 * 5) >= 0.9
+    assert index.stats()["ivf_partitions"] == 1
+
+
+def test_ivf_assigns_upserts_and_falls_back_for_selective_filters():
+    rows, centres = _clustered_rows(6000)
+    index = _ivf_index(rows)
+    user_id = str(uuid.uuid4())
+    db = _RowsDb(rows)
+    profile = ANN_PROFILES["fast"]
+    index.search(db, user_id=user_id, query_embedding=centres[0], limit=1, profile=profile)
+
+    index.upsert(user_id=user_id, node_id="fresh", node_type="insight", embedding=centres[3] * 10)
+    hits = index.search(db, user_id=user_id, query_embedding=centres[3], limit=1, profile=profile)
+    assert hits[0][0] == "fresh"
+
+    # 120 "decision" rows spread over every list: probing a few lists alone
+    # cannot fill the limit, so the partition answers exactly.
+    decisions = index.search(
+        db,
+        user_id=user_id,
+        query_embedding=centres[0],
+        limit=100,
+        node_type="decision",
+        min_similarity=-1.0,
+        profile=profile,
+        expected_rows=120,
+    )
+    assert len(decisions) == 100
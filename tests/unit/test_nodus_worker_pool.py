@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import uuid
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from AINDY.runtime.nodus_runtime_adapter import NodusExecutionContext, NodusRuntimeAdapter
+from AINDY.runtime.nodus_worker_pool import NodusWorkerError, NodusWorkerPool, NodusWorkerTimeout
+
+
+def _request(script: str, state: dict | None = None, *, user_id: str = "") -> dict:
+    return {
+        "script": script,
+        "state": state or {},
+        "memory_context": {},
+        "input_payload": {},
+        "max_execution_ms": 5_000,
+        "context": {"user_id": user_id, "execution_unit_id": str(uuid.uuid4())},
+    }
+
+
+def _idle_pids(pool: NodusWorkerPool) -> set[int]:
+    return {worker.proc.pid for worker in list(pool._idle)}
+
+
+@pytest.fixture
+def pool():
+    pool = NodusWorkerPool(size=1, max_executions=3, max_rss_mb=0)
+    pool.start()
+    yield pool
+    pool.shutdown()
+
+
+def test_worker_is_reused_and_state_does_not_leak(pool):
+    first = pool.execute(_request('set_state("secret", 42)'), timeout_s=10)
+    pid = _idle_pids(pool)
+    second = pool.execute(_request('set_state("other", 1)'), timeout_s=10)
+
+    assert first["status"] == "success" and first["output_state"] == {"secret": 42}
+    assert second["output_state"] == {"other": 1}
+    assert _idle_pids(pool) == pid
+
+
+def test_worker_is_recycled_after_max_executions(pool):
+    pool.execute(_request('set_state("n", 1)'), timeout_s=10)
+    original = _idle_pids(pool)
+    for _ in range(2):
+        pool.execute(_request('set_state("n", 1)'), timeout_s=10)
+
+    assert _idle_pids(pool).isdisjoint(original)
+    assert pool.snapshot()["recycled"] == {"max_executions": 1}
+
+
+def test_timeout_kills_the_worker_and_spawns_a_replacement(pool):
+    pool.execute(_request('set_state("n", 1)'), timeout_s=10)
+    original = _idle_pids(pool)
+
+    with pytest.raises(NodusWorkerTimeout):
+        pool.execute(_request("let i = 0\nwhile (true) { i = i + 1 }"), timeout_s=0.5)
+
+    assert pool.snapshot()["live"] == 1
+    assert _idle_pids(pool).isdisjoint(original)
+    assert pool.execute(_request('set_state("n", 2)'), timeout_s=10)["output_state"] == {"n": 2}
+
+
+def test_worker_is_not_reused_across_tenants():
+    pool = NodusWorkerPool(size=2, max_executions=100, max_rss_mb=0)
+    pool.start()
+    try:
+        pool.execute(_request('set_state("n", 1)', user_id="tenant-a"), timeout_s=10)
+        pool.execute(_request('set_state("n", 1)', user_id="tenant-b"), timeout_s=10)
+        pinned = {worker.tenant: worker.proc.pid for worker in pool._idle}
+        assert set(pinned) == {"tenant-a", "tenant-b"}
+
+        pool.execute(_request('set_state("n", 2)', user_id="tenant-a"), timeout_s=10)
+        assert {worker.tenant: worker.proc.pid for worker in pool._idle} == pinned
+
+        pool.execute(_request('set_state("n", 3)', user_id="tenant-c"), timeout_s=10)
+        assert pool.snapshot()["recycled"] == {"tenant_switch": 1}
+        assert {worker.tenant for worker in pool._idle} >= {"tenant-c"}
+        assert pool.snapshot()["live"] == 2
+    finally:
+        pool.shutdown()
+
+
+def test_worker_crash_reports_its_stderr(tmp_path):
+    crashing = tmp_path / "crashing_worker.py"
+    crashing.write_text("import sys\nsys.stderr.write('worker exploded\\n')\nsys.exit(3)\n")
+    pool = NodusWorkerPool(size=1, max_executions=10, max_rss_mb=0, worker_path=crashing)
+    try:
+        with pytest.raises(NodusWorkerError, match="worker exploded"):
+            pool.execute(_request('set_state("n", 1)'), timeout_s=10)
+    finally:
+        pool.shutdown()
+
+
+def test_adapter_uses_pool_when_enabled(monkeypatch):
+    fake_pool = MagicMock()
+    fake_pool.execute.return_value = {
+        "status": "success",
+        "output_state": {"counter": 5},
+        "emitted_events": [],
+        "memory_writes": [],
+        "error": None,
+    }
+    monkeypatch.setattr("AINDY.config.settings.AINDY_NODUS_WORKER_POOL_ENABLED", True)
+    monkeypatch.setattr("AINDY.runtime.nodus_worker_pool.get_nodus_worker_pool", lambda: fake_pool)
+    ctx = NodusExecutionContext(user_id="u1", execution_unit_id="eu1", state={"counter": 0})
+
+    with patch("AINDY.runtime.nodus_runtime_adapter.subprocess.run") as mock_run:
+        result = NodusRuntimeAdapter(db=MagicMock()).run_script("set_state('counter', 5)", ctx)
+
+    assert result.status == "success"
+    assert ctx.state == {"counter": 5}
+    mock_run.assert_not_called()
+    assert fake_pool.execute.call_args.args[1] == 30.0
@@ -0,0 +1,189 @@
+"""
+Tests for auth.principal_cache — cached principals, cross-instance
+invalidation and coalesced API key last_used_at writes.
+"""
+from __future__ import annotations
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from AINDY.auth import principal_cache
+from AINDY.auth.api_key_auth import _resolve_api_key
+from AINDY.platform_layer import api_key_service
+from AINDY.platform_layer.api_key_service import LastUsedBuffer, create_api_key, revoke_api_key
+from AINDY.services.auth_service import _resolve_authenticated_jwt_user
+
+
+@pytest.fixture
+def cached_principals(monkeypatch):
+    monkeypatch.setattr("AINDY.config.settings.AINDY_AUTH_PRINCIPAL_CACHE_TTL_SECONDS", 60.0)
+    cache = principal_cache.PrincipalCache(ttl_seconds=60.0, max_entries=100)
+    monkeypatch.setattr(principal_cache, "_CACHE", cache)
+    # The cache turns on last_used_at coalescing; keep stamps in an unstarted buffer.
+    monkeypatch.setattr(api_key_service, "_last_used_buffer", LastUsedBuffer(flush_interval_seconds=60))
+    bus = MagicMock()
+    with patch("AINDY.kernel.event_bus.get_event_bus", return_value=bus):
+        yield cache, bus
+
+
+def _count_selects(db_session, table: str):
+    from sqlalchemy import event
+
+    seen = []
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and table in statement:
+            seen.append(statement)
+
+    bind = db_session.get_bind()
+    event.listen(bind, "before_cursor_execute", _before)
+    return seen, lambda: event.remove(bind, "before_cursor_execute", _before)
+
+
+def test_api_key_served_from_cache_until_revoked(db_session, test_user, cached_principals):
+    cache, bus = cached_principals
+    record, raw_key = create_api_key(str(test_user.id), "cached", ["memory.read"], db_session)
+
+    seen, stop = _count_selects(db_session, "platform_api_keys")
+    try:
+        first = _resolve_api_key(raw_key, db_session)
+        second = _resolve_api_key(raw_key, db_session)
+    finally:
+        stop()
+    assert first == second
+    assert len(seen) == 1
+    assert cache.get(principal_cache.API_KEY, record.key_hash) is not None
+
+    assert revoke_api_key(str(record.id), str(test_user.id), db_session) is True
+    bus.publish.assert_called_once_with(
+        principal_cache.INVALIDATION_EVENT,
+        correlation_id=f"api_key:{record.key_hash}",
+    )
+    assert cache.get(principal_cache.API_KEY, record.key_hash) is None
+    with pytest.raises(HTTPException) as exc_info:
+        _resolve_api_key(raw_key, db_session)
+    assert exc_info.value.status_code == 401
+
+
+def test_jwt_user_cache_respects_token_version(db_session, test_user, cached_principals):
+    cache, _ = cached_principals
+    payload = {"sub": str(test_user.id), "tv": int(test_user.token_version or 0)}
+
+    seen, stop = _count_selects(db_session, "users")
+    try:
+        first = _resolve_authenticated_jwt_user(dict(payload), db_session)
+        second = _resolve_authenticated_jwt_user(dict(payload), db_session)
+    finally:
+        stop()
+    assert first == second
+    assert second["email"] == test_user.email
+    assert len(seen) == 1
+
+    # A token newer than the cached entry is re-checked against the database.
+    with pytest.raises(HTTPException):
+        _resolve_authenticated_jwt_user({**payload, "tv": payload["tv"] + 1}, db_session)
+
+    principal_cache.invalidate_user(test_user.id)
+    assert cache.get(principal_cache.USER, str(test_user.id)) is None
+
+
+def test_cached_api_key_hit_does_not_write_last_used(db_session, test_user, cached_principals):
+    from sqlalchemy import event
+
+    record, raw_key = create_api_key(str(test_user.id), "stamped", ["memory.read"], db_session)
+    updates = []
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("UPDATE") and "platform_api_keys" in statement:
+            updates.append(statement)
+
+    bind = db_session.get_bind()
+    event.listen(bind, "before_cursor_execute", _before)
+    try:
+        for _ in range(3):
+            _resolve_api_key(raw_key, db_session)
+    finally:
+        event.remove(bind, "before_cursor_execute", _before)
+
+    assert updates == []
+    assert set(api_key_service._last_used_buffer._pending) == {record.id}
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda user: setattr(user, "is_active", False),
+        lambda user: setattr(user, "is_admin", not user.is_admin),
+    ],
+    ids=["deactivated", "role_changed"],
+)
+def test_user_changes_evict_the_cached_principal(db_session, test_user, cached_principals, change):
+    from AINDY.db.models.user import User
+
+    cache, bus = cached_principals
+    payload = {"sub": str(test_user.id), "tv": int(test_user.token_version or 0)}
+    _resolve_authenticated_jwt_user(dict(payload), db_session)
+    assert cache.get(principal_cache.USER, str(test_user.id)) is not None
+
+    user = db_session.get(User, test_user.id)
+    user.username = user.username
+    db_session.commit()
+    assert cache.get(principal_cache.USER, str(test_user.id)) is not None
+
+    change(user)
+    db_session.flush()
+    assert cache.get(principal_cache.USER, str(test_user.id)) is not None
+    db_session.commit()
+
+    assert cache.get(principal_cache.USER, str(test_user.id)) is None
+    bus.publish.assert_called_once_with(
+        principal_cache.INVALIDATION_EVENT,
+        correlation_id=f"user:{test_user.id}",
+    )
+
+
+def test_remote_invalidation_reaches_listener_not_scheduler(cached_principals):
+    from AINDY.kernel.event_bus import EventBus
+
+    cache, _ = cached_principals
+    cache.put(principal_cache.API_KEY, "abc", {"key_id": "k"})
+    cache.put(principal_cache.API_KEY_USER, "abc", {"user": {}})
+    bus = EventBus()
+    bus.add_listener(principal_cache.INVALIDATION_EVENT, principal_cache._drop)
+
+    with patch("AINDY.kernel.scheduler_engine.get_scheduler_engine") as engine:
+        bus._handle_message(json.dumps({
+            "event_type": principal_cache.INVALIDATION_EVENT,
+            "correlation_id": "api_key:abc",
+            "source_instance_id": "other-instance",
+        }))
+
+    engine.assert_not_called()
+    assert len(cache) == 0
+
+
+def test_last_used_buffer_coalesces_into_one_update(db_session, test_user):
+    from AINDY.db.models.api_key import PlatformAPIKey
+
+    first, _ = create_api_key(str(test_user.id), "busy", [], db_session)
+    second, _ = create_api_key(str(test_user.id), "quiet", [], db_session)
+    session = MagicMock(wraps=db_session)
+    session.close = MagicMock()
+    buffer = LastUsedBuffer(flush_interval_seconds=60, session_factory=lambda: session)
+
+    for _ in range(5):
+        buffer.touch(first.id)
+    buffer.touch(str(second.id))
+
+    assert buffer.flush() == 2
+    assert session.execute.call_count == 1
+    db_session.expire_all()
+    stamps = [
+        row.last_used_at
+        for row in db_session.query(PlatformAPIKey).filter(PlatformAPIKey.id.in_([first.id, second.id]))
+    ]
+    assert all(stamp is not None for stamp in stamps)
+    assert buffer.flush() == 0
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import fakeredis
+import numpy as np
+
+from AINDY.memory import embedding_service
+from AINDY.memory.query_embedding_cache import QueryEmbeddingCache
+from AINDY.platform_layer.metrics import (
+    query_embedding_cache_evictions_total,
+    query_embedding_cache_hits_total,
+    query_embedding_cache_misses_total,
+)
+
+MODEL = "text-embedding-ada-002"
+
+
+def _vector(seed: int) -> list[float]:
+    return np.random.default_rng(seed).standard_normal(1536).astype(np.float32).tolist()
+
+
+def _local_cache(**kwargs) -> QueryEmbeddingCache:
+    kwargs.setdefault("max_bytes", 1 << 20)
+    kwargs.setdefault("ttl_seconds", 60)
+    return QueryEmbeddingCache(redis_enabled=False, **kwargs)
+
+
+def test_hit_miss_and_zero_vectors_are_not_cached():
+    cache = _local_cache()
+    hits = query_embedding_cache_hits_total.labels(tier="memory")._value.get()
+    misses = query_embedding_cache_misses_total._value.get()
+
+    assert cache.get(MODEL, "plan the launch") is None
+    cache.put(MODEL, "plan the launch", _vector(1))
+    cache.put(MODEL, "offline", [0.0] * 1536)
+
+    assert cache.get(MODEL, "plan the launch") == _vector(1)
+    assert cache.get(MODEL, "offline") is None
+    assert cache.get("other-model", "plan the launch") is None
+    assert query_embedding_cache_hits_total.labels(tier="memory")._value.get() == hits + 1
+    assert query_embedding_cache_misses_total._value.get() == misses + 3
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("AINDY.memory.query_embedding_cache.time.monotonic", lambda: clock[0])
+    cache = _local_cache(ttl_seconds=30)
+    expired = query_embedding_cache_evictions_total.labels(reason="expired")._value.get()
+
+    cache.put(MODEL, "q", _vector(2))
+    clock[0] += 29
+    assert cache.get(MODEL, "q") is not None
+    clock[0] += 2
+    assert cache.get(MODEL, "q") is None
+    assert cache.stats() == {"entries": 0, "bytes": 0}
+    assert query_embedding_cache_evictions_total.labels(reason="expired")._value.get() == expired + 1
+
+
+def test_lru_eviction_respects_byte_budget():
+    entry_bytes = 1536 * 4 + 200
+    cache = _local_cache(max_bytes=entry_bytes * 2)
+    cache.put(MODEL, "a", _vector(3))
+    cache.put(MODEL, "b", _vector(4))
+    cache.get(MODEL, "a")
+    cache.put(MODEL, "c", _vector(5))
+
+    assert cache.get(MODEL, "b") is None
+    assert cache.get(MODEL, "a") is not None
+    assert cache.get(MODEL, "c") is not None
+    assert cache.stats()["bytes"] <= entry_bytes * 2
+
+
+def test_redis_tier_is_shared_between_instances(monkeypatch):
+    server = fakeredis.FakeRedis()
+    writer = QueryEmbeddingCache(max_bytes=1 << 20, ttl_seconds=60, redis_enabled=True)
+    reader = QueryEmbeddingCache(max_bytes=1 << 20, ttl_seconds=60, redis_enabled=True)
+    for cache in (writer, reader):
+        monkeypatch.setattr(cache, "_get_redis", lambda: server)
+    redis_hits = query_embedding_cache_hits_total.labels(tier="redis")._value.get()
+
+    writer.put(MODEL, "shared prompt", _vector(6))
+
+    assert reader.get(MODEL, "shared prompt") == _vector(6)
+    assert reader.stats()["entries"] == 1
+    assert query_embedding_cache_hits_total.labels(tier="redis")._value.get() == redis_hits + 1
+    assert 0 < server.ttl(next(iter(server.keys()))) <= 60
+
+
+def test_generate_query_embedding_reuses_cached_vector(monkeypatch):
+    calls = []
+
+    def _fake_generate(text):
+        calls.append(text)
+        return _vector(7)
+
+    monkeypatch.setattr(embedding_service, "generate_embedding", _fake_generate)
+
+    first = embedding_service.generate_query_embedding("what did we decide about pricing?")
+    second = embedding_service.generate_query_embedding("what did we decide about pricing?")
+
+    assert calls == ["what did we decide about pricing?"]
+    assert first == second == _vector(7)
+
+
+def test_failed_query_embeddings_are_retried(monkeypatch):
+    calls = []
+
+    def _failing(text):
+        calls.append(text)
+        raise embedding_service.EmbeddingFailedError("openai down")
+
+    monkeypatch.setattr(embedding_service, "generate_embedding", _failing)
+
+    assert embedding_service.generate_query_embedding("q") == [0.0] * 1536
+    assert embedding_service.generate_query_embedding("q") == [0.0] * 1536
+    assert len(calls) == 2
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import fakeredis
+
 from AINDY.kernel.redis_wait_registry import RedisWaitRegistry
 from AINDY.kernel.resume_spec import RESUME_HANDLER_EU, ResumeSpec, spec_from_json
 
@@ -80,6 +82,29 @@ def test_unregister_removes_key():
     assert redis.get("aindy:wait:run-1") is None
 
 
+def test_unregister_many_pipelines_deletes():
+    redis = fakeredis.FakeRedis(decode_responses=True)
+    registry = RedisWaitRegistry(redis)
+    for index in range(1200):
+        registry.register(f"run-{index}", _spec(f"run-{index}"))
+
+    deleted = registry.unregister_many([f"run-{index}" for index in range(1100)] + ["run-0", "missing"])
+
+    assert deleted == 1100
+    assert sorted(redis.keys("aindy:wait:*")) == sorted(f"aindy:wait:run-{index}" for index in range(1100, 1200))
+
+
+def test_unregister_many_falls_back_without_pipeline():
+    redis = _FakeRedis()
+    registry = RedisWaitRegistry(redis)
+    registry.register("run-1", _spec("run-1"))
+    registry.register("run-2", _spec("run-2"))
+
+    assert registry.unregister_many(["run-1", "run-2"]) == 2
+    assert redis.get("aindy:wait:run-1") is None
+    assert redis.get("aindy:wait:run-2") is None
+
+
 def test_get_all_specs_returns_all_registered():
     redis = _FakeRedis()
     registry = RedisWaitRegistry(redis)
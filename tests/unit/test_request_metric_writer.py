@@ -83,3 +83,125 @@ async def test_log_requests_middleware_does_not_open_session_per_request(monkeyp
 
     assert response.status_code == 200
     assert sessions_opened == []
+
+
+def test_flush_writes_closed_minute_rollups(monkeypatch, testing_session_factory):
+    import uuid
+    from datetime import datetime, timedelta, timezone
+
+    from AINDY.config import settings
+    from AINDY.core.request_metric_rollups import summarize_request_rollups
+    from AINDY.core.request_metric_writer import PendingMetric, RequestMetricWriter
+    from AINDY.db import database as db_module
+    from AINDY.db.models.request_metric import RequestMetricRollup
+
+    monkeypatch.setattr(db_module, "SessionLocal", testing_session_factory, raising=False)
+    monkeypatch.setattr(settings, "AINDY_REQUEST_METRIC_ROLLUPS_ENABLED", True)
+    route = f"/rollup/{uuid.uuid4().hex[:8]}/{{item_id}}"
+    closed = datetime.now(timezone.utc) - timedelta(minutes=2)
+    writer = RequestMetricWriter()
+    for index, (status, duration, created_at) in enumerate(
+        [(200, 4.0, closed), (200, 40.0, closed), (503, 900.0, closed), (200, 8.0, datetime.now(timezone.utc))]
+    ):
+        writer.enqueue(PendingMetric(
+            request_id=f"{route}-{index}",
+            trace_id="t",
+            user_id=None,
+            method="GET",
+            path=route.replace("{item_id}", str(index)),
+            status_code=status,
+            duration_ms=duration,
+            created_at=created_at,
+            route=route,
+        ))
+    writer._flush()
+
+    db = testing_session_factory()
+    try:
+        rows = db.query(RequestMetricRollup).filter(RequestMetricRollup.path == route).all()
+        assert sorted((row.status_class, row.request_count) for row in rows) == [(2, 2), (5, 1)]
+        summary = summarize_request_rollups(db, path=route)
+        assert summary["requests"] == 3
+        assert summary["errors"] == 1
+        assert summary["avg_latency_ms"] == pytest.approx(314.67)
+        assert summary["p50_latency_ms"] == 50.0
+        assert summary["p99_latency_ms"] == 1000.0
+
+        # The open minute is held back until it closes (or the writer stops).
+        writer._flush(drain_rollups=True)
+        assert summarize_request_rollups(db, path=route)["requests"] == 4
+    finally:
+        db.close()
+
+
+def test_rollup_summary_reads_raw_rows_from_before_rollups(monkeypatch, testing_session_factory):
+    import uuid
+    from datetime import datetime, timedelta, timezone
+
+    from AINDY.config import settings
+    from AINDY.core.request_metric_rollups import summarize_request_rollups
+    from AINDY.core.request_metric_writer import PendingMetric, RequestMetricWriter
+    from AINDY.db import database as db_module
+    from AINDY.db.models.request_metric import RequestMetric
+
+    monkeypatch.setattr(db_module, "SessionLocal", testing_session_factory, raising=False)
+    path = f"/history/{uuid.uuid4().hex[:8]}"
+    now = datetime.now(timezone.utc)
+    db = testing_session_factory()
+    try:
+        # Written while the flag was off: raw rows only.
+        db.add_all([
+            RequestMetric(request_id=f"{path}-{index}", method="GET", path=path, status_code=status,
+                          duration_ms=duration, created_at=(now - timedelta(hours=3)).replace(tzinfo=None))
+            for index, (status, duration) in enumerate([(200, 20.0), (500, 700.0)])
+        ])
+        db.commit()
+
+        monkeypatch.setattr(settings, "AINDY_REQUEST_METRIC_ROLLUPS_ENABLED", True)
+        assert summarize_request_rollups(db, path=path)["requests"] == 2
+
+        writer = RequestMetricWriter()
+        writer.enqueue(PendingMetric(
+            request_id=f"{path}-new", trace_id="t", user_id=None, method="GET", path=path,
+            status_code=200, duration_ms=4.0, created_at=now - timedelta(minutes=2), route=path,
+        ))
+        writer._flush()
+
+        summary = summarize_request_rollups(db, path=path)
+        assert (summary["requests"], summary["errors"]) == (3, 1)
+        assert summary["max_latency_ms"] == 700.0
+        assert summarize_request_rollups(db, path=path, since=now - timedelta(hours=1))["requests"] == 1
+    finally:
+        db.close()
+
+
+def test_prune_request_metrics_applies_retention(monkeypatch, testing_session_factory):
+    import uuid
+    from datetime import datetime, timedelta
+
+    from AINDY.config import settings
+    from AINDY.core.request_metric_rollups import prune_request_metrics
+    from AINDY.db.models.request_metric import RequestMetric
+
+    monkeypatch.setattr(settings, "AINDY_REQUEST_METRIC_RETENTION_HOURS", 24)
+    monkeypatch.setattr(settings, "AINDY_REQUEST_METRIC_ROLLUP_RETENTION_DAYS", 0)
+    tag = uuid.uuid4().hex[:8]
+    now = datetime.utcnow()
+    db = testing_session_factory()
+    try:
+        db.add_all([
+            RequestMetric(request_id=f"{tag}-old", method="GET", path="/p", status_code=200, duration_ms=1.0,
+                          created_at=now - timedelta(hours=30)),
+            RequestMetric(request_id=f"{tag}-new", method="GET", path="/p", status_code=200, duration_ms=1.0,
+                          created_at=now - timedelta(hours=1)),
+        ])
+        db.commit()
+
+        assert prune_request_metrics(db, now=now)["raw_deleted"] >= 1
+        remaining = {
+            row.request_id
+            for row in db.query(RequestMetric).filter(RequestMetric.request_id.like(f"{tag}-%"))
+        }
+        assert remaining == {f"{tag}-new"}
+    finally:
+        db.close()
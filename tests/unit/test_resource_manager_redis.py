@@ -23,6 +23,7 @@ def _production_quota():
     """Disable the test-mode bypass so quota enforcement tests exercise real limits."""
     with patch("AINDY.kernel.resource_manager.settings") as mock_s:
         mock_s.is_testing = False
+        mock_s.AINDY_QUOTA_LEASE_ENABLED = False
         yield mock_s
 
 
@@ -253,3 +254,121 @@ def test_record_cpu_swallows_backend_redis_error_and_keeps_local_snapshot(monkey
     rm.record_cpu("eu-1", 7)
 
     assert rm.get_usage("eu-1")["cpu_time_ms"] == 7
+
+
+class _LeaseBackend:
+    """In-process stand-in for RedisResourceBackend's lease/refund scripts."""
+
+    def __init__(self) -> None:
+        self.reserved: dict[tuple[str, str], int] = {}
+        self.calls = 0
+
+    def lease(self, resource, eu_id, *, charge, want, limit):
+        self.calls += 1
+        reserved = self.reserved.get((resource, eu_id), 0) + charge
+        grant = max(0, min(want, limit - reserved))
+        self.reserved[(resource, eu_id)] = reserved + grant
+        return grant, reserved + grant
+
+    def refund(self, resource, eu_id, amount):
+        self.calls += 1
+        value = max(0, self.reserved.get((resource, eu_id), 0) - amount)
+        self.reserved[(resource, eu_id)] = value
+        return value
+
+    def __getattr__(self, name):
+        # Per-call mirroring (add_cpu_ms, increment_syscalls, ...) must not happen.
+        raise AssertionError(f"unexpected backend call {name}")
+
+
+@contextmanager
+def _leased_quota():
+    with _production_quota() as mock_s:
+        mock_s.AINDY_QUOTA_LEASE_ENABLED = True
+        mock_s.AINDY_QUOTA_LEASE_SYSCALLS = 10
+        mock_s.AINDY_QUOTA_LEASE_CPU_MS = 2000
+        mock_s.AINDY_QUOTA_TENANT_REFRESH_MS = 500
+        yield mock_s
+
+
+def _leased_rm(monkeypatch, backend, tenant="tenant-a", eu_id="eu-1") -> ResourceManager:
+    rm = ResourceManager()
+    rm._backend = backend
+    monkeypatch.setattr(rm, "_get_redis", lambda: None)
+    rm.mark_started(tenant, eu_id)
+    return rm
+
+
+def _syscalls_until_blocked(rm: ResourceManager, eu_id: str = "eu-1", cap: int = 1000) -> int:
+    allowed = 0
+    while allowed < cap:
+        ok, _reason = rm.check_quota(eu_id)
+        if not ok:
+            break
+        rm.record_syscall(eu_id)
+        allowed += 1
+    return allowed
+
+
+def test_leased_syscall_quota_is_exact_and_touches_redis_once_per_slice(monkeypatch):
+    from AINDY.kernel.resource_manager import MAX_SYSCALLS_PER_EXECUTION
+
+    backend = _LeaseBackend()
+    rm = _leased_rm(monkeypatch, backend)
+
+    with _leased_quota():
+        allowed = _syscalls_until_blocked(rm)
+        ok, reason = rm.check_quota("eu-1")
+
+    # Same boundary as the per-call path: blocked once the count exceeds the limit.
+    assert allowed == MAX_SYSCALLS_PER_EXECUTION + 1
+    assert ok is False and "syscall_count limit" in reason
+    assert backend.calls <= MAX_SYSCALLS_PER_EXECUTION // 10 + 3
+
+
+def test_leases_share_one_budget_across_processes_and_refund_on_release(monkeypatch):
+    from AINDY.kernel.resource_manager import MAX_SYSCALLS_PER_EXECUTION
+
+    backend = _LeaseBackend()
+    first = _leased_rm(monkeypatch, backend)
+    second = _leased_rm(monkeypatch, backend)
+
+    with _leased_quota():
+        assert first.check_quota("eu-1") == (True, None)
+        first.record_syscall("eu-1", 3)
+        first.mark_completed("tenant-a", "eu-1")
+        assert backend.reserved[("syscalls", "eu-1")] == 3
+
+        allowed = _syscalls_until_blocked(second)
+
+    assert allowed == MAX_SYSCALLS_PER_EXECUTION + 1 - 3
+
+
+def test_leased_cpu_overrun_is_charged_and_blocks(monkeypatch):
+    from AINDY.kernel.resource_manager import MAX_CPU_TIME_MS
+
+    backend = _LeaseBackend()
+    rm = _leased_rm(monkeypatch, backend)
+
+    with _leased_quota():
+        rm.record_cpu("eu-1", MAX_CPU_TIME_MS)
+        assert rm.check_quota("eu-1") == (True, None)
+        rm.record_cpu("eu-1", 1)
+        ok, reason = rm.check_quota("eu-1")
+
+    assert backend.reserved[("cpu_ms", "eu-1")] == MAX_CPU_TIME_MS + 1
+    assert ok is False and "cpu_time_ms limit" in reason
+
+
+def test_leased_check_drains_pending_purges(monkeypatch):
+    backend = _LeaseBackend()
+    rm = _leased_rm(monkeypatch, backend)
+    rm.mark_started("tenant-a", "eu-2")
+
+    with _leased_quota():
+        rm.record_syscall("eu-1")
+        rm.mark_completed("tenant-a", "eu-1")
+        assert rm.check_quota("eu-2") == (True, None)
+
+    assert rm.get_usage("eu-1")["syscall_count"] == 0
+    assert "eu-1" not in rm._eu_tenant
@@ -0,0 +1,171 @@
+"""
+Tests for rippletrace.services.graph_index — parity with the pairwise
+influence/causal scans and incremental sync of the shared index.
+"""
+from __future__ import annotations
+
+import random
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from apps.rippletrace.models import DropPointDB, PingDB
+from apps.rippletrace.services import causal_engine, graph_index, influence_graph
+from apps.rippletrace.services.graph_index import RippleGraphIndex, split_terms
+
+
+def _random_drops(rng: random.Random, count: int) -> list[DropPointDB]:
+    base = datetime(2026, 1, 1)
+    themes = [f"theme{i}" for i in range(12)]
+    entities = [f"entity{i}" for i in range(8)]
+    return [
+        DropPointDB(
+            id=f"dp-{i:03d}",
+            title=f"Drop {i}",
+            platform="linkedin",
+            date_dropped=None if rng.random() < 0.1 else base + timedelta(hours=rng.randint(0, 24 * 20)),
+            core_themes=",".join(rng.sample(themes, rng.randint(0, 2))),
+            tagged_entities=",".join(rng.sample(entities, rng.randint(0, 1))),
+        )
+        for i in range(count)
+    ]
+
+
+def _pairwise_influence(drops, platforms):
+    """The O(n^2) scan build_influence_graph used before the index."""
+    edges = []
+    for i, a in enumerate(drops):
+        for b in drops[i + 1 :]:
+            overlap = len(split_terms(a.core_themes) & split_terms(b.core_themes))
+            entity = len(split_terms(a.tagged_entities) & split_terms(b.tagged_entities))
+            temporal = 0
+            if a.date_dropped and b.date_dropped:
+                days = abs((a.date_dropped - b.date_dropped).total_seconds()) / 86400
+                temporal = 2 if days < 1 else 1 if days < 7 else 0
+            ping = 1 if platforms.get(a.id, set()) & platforms.get(b.id, set()) else 0
+            strength = min(1.0, (overlap * 2 + entity * 3 + temporal + ping) / 10)
+            if strength <= 0.2:
+                continue
+            kind = "entity_link" if entity else "semantic_link" if overlap else "temporal_link"
+            edges.append({"source": a.id, "target": b.id, "strength": round(strength, 3), "type": kind})
+            edges.append({"source": b.id, "target": a.id, "strength": round(strength, 3), "type": kind})
+    return edges
+
+
+def _pairwise_causal(drops, velocity):
+    """The O(n^2) scan build_causal_graph used before the index."""
+    edges = []
+    for i, a in enumerate(drops):
+        for b in drops[i + 1 :]:
+            temporal = 0
+            if a.date_dropped and b.date_dropped:
+                diff = abs((a.date_dropped - b.date_dropped).total_seconds())
+                temporal = 2 if diff < 86400 else 1 if diff < 604800 else 0
+                cause, effect = (a, b) if a.date_dropped <= b.date_dropped else (b, a)
+            else:
+                cause, effect = (a, b) if a.id < b.id else (b, a)
+            themes = len(split_terms(cause.core_themes) & split_terms(effect.core_themes))
+            entities = len(split_terms(cause.tagged_entities) & split_terms(effect.tagged_entities))
+            momentum = 2 if velocity(cause.id) > 0 and velocity(effect.id) > 0 else 0
+            confidence = min(1.0, (temporal + momentum + themes + entities) / 10)
+            if confidence <= 0.3:
+                continue
+            reasons = [
+                reason
+                for reason, present in (
+                    ("temporal_order", temporal),
+                    ("momentum_alignment", momentum),
+                    ("shared_entities", entities),
+                    ("shared_themes", themes),
+                )
+                if present
+            ]
+            edges.append({
+                "source": cause.id,
+                "target": effect.id,
+                "confidence": round(confidence, 3),
+                "reason": reasons or ["signal_continuity"],
+            })
+    return edges
+
+
+def test_index_matches_pairwise_scans():
+    rng = random.Random(5)
+    drops = _random_drops(rng, 160)
+    platforms = {
+        drop.id: {rng.choice(["x", "linkedin", "substack"])}
+        for drop in drops
+        if rng.random() < 0.6
+    }
+    rising = {drop.id for drop in drops if rng.random() < 0.4}
+
+    def velocity(drop_id):
+        return 1.0 if drop_id in rising else 0.0
+
+    index = RippleGraphIndex.from_drops(drops, platforms)
+
+    assert index.all_influence_edges() == _pairwise_influence(drops, platforms)
+    assert index.all_causal_edges(velocity) == _pairwise_causal(drops, velocity)
+    full = _pairwise_causal(drops, velocity)
+    for drop in drops[:20]:
+        incoming, outgoing = index.causal_edges(drop.id, velocity)
+        assert incoming == [edge for edge in full if edge["target"] == drop.id]
+        assert outgoing == [edge for edge in full if edge["source"] == drop.id]
+
+
+@pytest.fixture
+def ripple_graph():
+    graph_index.reset_ripple_graph()
+    yield
+    graph_index.reset_ripple_graph()
+
+
+def _drop(drop_id: str, when: datetime, themes: str, entities: str = "") -> DropPointDB:
+    return DropPointDB(
+        id=drop_id,
+        title=drop_id,
+        platform="x",
+        date_dropped=when,
+        core_themes=themes,
+        tagged_entities=entities,
+        narrative_score=1.0,
+    )
+
+
+def test_chain_queries_follow_new_drops_and_pings(db_session, ripple_graph, monkeypatch):
+    tag = uuid.uuid4().hex[:8]
+    when = datetime(2020, 3, 1, 12, 0)
+    ids = [f"{tag}-a", f"{tag}-b", f"{tag}-c"]
+    db_session.add_all([
+        _drop(ids[0], when, f"{tag}-ai,{tag}-vision", f"{tag}-team"),
+        _drop(ids[1], when + timedelta(days=2), f"{tag}-ai", f"{tag}-team"),
+        _drop(ids[2], when + timedelta(days=30), f"{tag}-other"),
+    ])
+    db_session.commit()
+    monkeypatch.setattr(causal_engine, "compute_deltas", lambda *_: {"rates": {"velocity_rate": 0.5}})
+
+    chain = influence_graph.influence_chain(ids[0], db_session)
+    assert [node["id"] for node in chain["connected_nodes"]] == [ids[1]]
+    assert chain["strongest_edges"][0]["type"] == "entity_link"
+    causal = causal_engine.get_causal_chain(ids[1], db_session)
+    assert [entry["drop_point_id"] for entry in causal["upstream_causes"]] == [ids[0]]
+
+    # A same-day drop on a shared ping platform links in without any shared term.
+    late = f"{tag}-d"
+    db_session.add(_drop(late, when + timedelta(days=30, hours=3), f"{tag}-unrelated"))
+    db_session.flush()
+    db_session.add_all([
+        PingDB(id=f"{tag}-p1", drop_point_id=ids[2], source_platform="Reddit", date_detected=when),
+        PingDB(id=f"{tag}-p2", drop_point_id=late, source_platform="reddit", date_detected=when),
+    ])
+    db_session.commit()
+
+    chain = influence_graph.influence_chain(ids[2], db_session)
+    assert chain["strongest_edges"] == [
+        {"source": ids[2], "target": late, "strength": 0.3, "type": "temporal_link"},
+        {"source": late, "target": ids[2], "strength": 0.3, "type": "temporal_link"},
+    ]
+    causal = causal_engine.get_causal_chain(late, db_session)
+    assert [entry["drop_point_id"] for entry in causal["upstream_causes"]] == [ids[2]]
+    assert causal["upstream_causes"][0]["reason"] == ["temporal_order", "momentum_alignment"]
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from AINDY.kernel.scheduler_engine import SchedulerEngine
+
+
+@pytest.fixture
+def engine():
+    engine = SchedulerEngine()
+    with patch("AINDY.kernel.event_bus.get_redis_client", return_value=None):
+        engine.mark_rehydration_complete()
+        yield engine
+
+
+def _register(engine, run_id, event="order.completed", correlation_id=None, wait_condition=None):
+    engine.register_wait(
+        run_id=run_id,
+        wait_for_event=event,
+        tenant_id="tenant-1",
+        eu_id=f"eu-{run_id}",
+        resume_callback=lambda: None,
+        correlation_id=correlation_id,
+        wait_condition=wait_condition,
+    )
+
+
+def _time_wait(seconds: float) -> dict:
+    trigger_at = datetime.now(timezone.utc) + timedelta(seconds=seconds)
+    return {"type": "time", "event_name": None, "trigger_at": trigger_at.isoformat(), "correlation_id": None}
+
+
+def _drain(engine) -> list[str]:
+    run_ids = []
+    while (item := engine.dequeue_next()) is not None:
+        run_ids.append(item.run_id)
+    return run_ids
+
+
+def test_correlated_waits_only_match_their_correlation_id(engine):
+    _register(engine, "run-a", correlation_id="corr-1")
+    _register(engine, "run-b", correlation_id="corr-2")
+    _register(engine, "run-any")
+    _register(engine, "run-other", event="order.cancelled")
+
+    assert engine.peek_matching_run_ids("order.completed", correlation_id="corr-1") == ["run-a", "run-any"]
+    assert engine.peek_matching_run_ids("order.completed") == ["run-a", "run-b", "run-any"]
+
+    assert engine.notify_event("order.completed", correlation_id="corr-2", broadcast=False) == 2
+    assert _drain(engine) == ["run-b", "run-any"]
+    assert set(engine._waiting) == {"run-a", "run-other"}
+    assert set(engine._event_index["order.completed"]) == {"corr-1"}
+
+
+def test_reregistering_moves_run_between_indexes(engine):
+    _register(engine, "run-1", event="order.completed")
+    _register(engine, "run-1", event="order.shipped")
+
+    assert engine.notify_event("order.completed", broadcast=False) == 0
+    assert engine.notify_event("order.shipped", broadcast=False) == 1
+    assert engine._event_index == {}
+
+
+def test_time_waits_fire_in_trigger_order_without_touching_future_waits(engine):
+    _register(engine, "run-late", event="timer", wait_condition=_time_wait(-1))
+    _register(engine, "run-early", event="timer", wait_condition=_time_wait(-5))
+    _register(engine, "run-future", event="timer", wait_condition=_time_wait(3600))
+
+    assert engine.tick_time_waits() == 2
+    assert _drain(engine) == ["run-early", "run-late"]
+    assert list(engine._waiting) == ["run-future"]
+    assert engine.tick_time_waits() == 0
+
+
+def test_replaced_time_wait_does_not_fire_from_stale_heap_entry(engine):
+    _register(engine, "run-1", event="timer", wait_condition=_time_wait(-1))
+    _register(engine, "run-1", event="timer", wait_condition=_time_wait(3600))
+
+    assert engine.tick_time_waits() == 0
+    assert "run-1" in engine._waiting
+
+
+def test_removed_waits_leave_no_index_entries(engine):
+    for index in range(200):
+        _register(engine, f"run-{index}", event="timer", wait_condition=_time_wait(3600))
+        _register(engine, f"evt-{index}", correlation_id=f"corr-{index}")
+    with engine._lock:
+        for index in range(200):
+            engine._remove_wait_locked(f"run-{index}")
+            engine._remove_wait_locked(f"evt-{index}")
+
+    assert engine._waiting == {}
+    assert engine._event_index == {}
+    assert engine._time_wait_seq == {}
+    assert len(engine._time_heap) <= 64
+
+
+def test_mass_resume_cleans_up_waits_in_one_bulk_call(engine):
+    for index in range(5):
+        _register(engine, f"run-{index}")
+    unregister_calls, delete_calls = [], []
+    engine._unregister_redis_waits = lambda run_ids: unregister_calls.append(list(run_ids))
+    engine._delete_wait_backups = lambda run_ids: delete_calls.append(list(run_ids))
+
+    assert engine.notify_event("order.completed", broadcast=False) == 5
+
+    expected = [f"run-{index}" for index in range(5)]
+    assert unregister_calls == [expected]
+    assert delete_calls == [expected]
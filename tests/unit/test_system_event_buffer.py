@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import uuid
+
+import pytest
+
+from AINDY.config import settings
+from AINDY.core import system_event_buffer
+from AINDY.core.system_event_buffer import SystemEventBuffer
+from AINDY.core.system_event_service import _system_event_row, emit_system_event
+from AINDY.db.models.event_edge import EventEdge
+from AINDY.db.models.system_event import SystemEvent
+
+
+@pytest.fixture
+def write_behind(monkeypatch, db_session_factory):
+    buffer = SystemEventBuffer(
+        max_events=100,
+        flush_interval_seconds=3600,
+        session_factory=db_session_factory,
+    )
+    monkeypatch.setattr(settings, "AINDY_SYSTEM_EVENT_WRITE_BEHIND", True)
+    monkeypatch.setattr(system_event_buffer, "_buffer", buffer)
+    monkeypatch.setattr("AINDY.core.system_event_service._notify_scheduler_of_event", lambda *a, **k: None)
+    return buffer
+
+
+def _emit(db, event_type, *, parent=None, required=False, user_id=None):
+    return emit_system_event(
+        db=db,
+        event_type=event_type,
+        user_id=user_id,
+        trace_id="trace-wb",
+        parent_event_id=parent,
+        source="flow",
+        payload={"node": event_type},
+        required=required,
+        skip_memory_capture=True,
+    )
+
+
+def test_non_required_events_are_written_in_one_batch(db_session, write_behind):
+    root = _emit(db_session, "flow.root", required=True)
+    started = _emit(db_session, "flow.node.started", parent=root)
+    completed = _emit(db_session, "flow.node.completed", parent=started)
+
+    ids = [root, started, completed]
+    assert db_session.query(SystemEvent).filter(SystemEvent.id.in_(ids)).count() == 1
+    assert write_behind.contains(started) and write_behind.contains(completed)
+
+    assert write_behind.flush() == 2
+
+    db_session.expire_all()
+    rows = {row.id: row for row in db_session.query(SystemEvent).filter(SystemEvent.id.in_(ids)).all()}
+    assert rows[started].parent_event_id == root
+    assert rows[completed].parent_event_id == started
+    edges = {
+        (edge.source_event_id, edge.target_event_id)
+        for edge in db_session.query(EventEdge).filter(EventEdge.target_event_id.in_(ids)).all()
+    }
+    assert edges == {(root, started), (started, completed)}
+    assert not write_behind.contains(completed)
+
+
+def test_unknown_parent_outside_batch_is_cleared(db_session, write_behind):
+    orphan = _emit(db_session, "flow.node.started", parent=uuid.uuid4())
+    write_behind.flush()
+
+    db_session.expire_all()
+    assert db_session.get(SystemEvent, orphan).parent_event_id is None
+    assert db_session.query(EventEdge).filter(EventEdge.target_event_id == orphan).count() == 0
+
+
+def test_required_child_flushes_buffered_parent_first(db_session, write_behind):
+    parent = _emit(db_session, "flow.node.started")
+    child = _emit(db_session, "flow.node.failed", parent=parent, required=True)
+
+    db_session.expire_all()
+    assert db_session.get(SystemEvent, child).parent_event_id == parent
+    assert write_behind.snapshot()["buffered"] == 0
+
+
+def test_auto_captured_events_bypass_the_buffer(db_session, write_behind, monkeypatch):
+    captured = []
+    monkeypatch.setattr(
+        "AINDY.memory.memory_capture_engine.capture_system_event_as_memory",
+        lambda db, event: captured.append(event.id),
+    )
+    event_id = emit_system_event(
+        db=db_session,
+        event_type="capability.denied",
+        trace_id="trace-wb",
+        source="flow",
+        payload={"message": "denied"},
+    )
+
+    assert not write_behind.contains(event_id)
+    assert db_session.get(SystemEvent, event_id) is not None
+    assert captured == [event_id]
+
+
+def test_size_threshold_triggers_flush(db_session, db_session_factory, monkeypatch):
+    buffer = SystemEventBuffer(max_events=3, flush_interval_seconds=3600, session_factory=db_session_factory)
+    prefix = f"batch.{uuid.uuid4().hex}"
+    for index in range(3):
+        buffer.add(
+            _system_event_row(
+                event_type=f"{prefix}.{index}",
+                user_id=None,
+                trace_id=None,
+                parent_event_id=None,
+                source="test",
+                agent_id=None,
+                payload={},
+            ),
+            "related_to",
+        )
+
+    assert db_session.query(SystemEvent).filter(SystemEvent.type.like(f"{prefix}.%")).count() == 3
+    assert buffer.snapshot()["buffered"] == 0
+
+
+def test_bad_row_does_not_drop_the_rest_of_the_batch(db_session, db_session_factory):
+    buffer = SystemEventBuffer(max_events=100, flush_interval_seconds=3600, session_factory=db_session_factory)
+    good = _system_event_row(
+        event_type=f"batch.good.{uuid.uuid4().hex}",
+        user_id=None,
+        trace_id=None,
+        parent_event_id=None,
+        source="test",
+        agent_id=None,
+        payload={},
+    )
+    bad = dict(good, id=uuid.uuid4(), payload={"unserializable": object()})
+    buffer.add(good, "related_to")
+    buffer.add(bad, "related_to")
+
+    assert buffer.flush() == 1
+    assert [row.id for row in db_session.query(SystemEvent).filter(SystemEvent.type == good["type"]).all()] == [good["id"]]
+    assert buffer.snapshot()["dropped_total"] == 1
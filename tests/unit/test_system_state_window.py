@@ -0,0 +1,121 @@
+"""
+Tests for platform_layer.system_state_window — rolling per-minute buckets
+and the streaming path of compute_current_state.
+"""
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from AINDY.config import settings
+from AINDY.db.models.system_event import SystemEvent
+from AINDY.platform_layer import system_state_service, system_state_window
+from AINDY.platform_layer.system_state_window import SystemStateWindow
+
+
+class _Clock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_window_rolls_buckets_and_summarizes_latency():
+    clock = _Clock(1_000_000 * 60.0)
+    window = SystemStateWindow(redis_enabled=False, clock=clock)
+
+    window.record_event("flow.completed", at=clock.now - 90 * 60)
+    window.record_event("flow.completed", at=clock.now - 5 * 60)
+    for _ in range(3):
+        window.record_event("execution.failed")
+    window.record_requests([(clock.now, 20.0)] * 19 + [(clock.now - 60, 800.0)])
+
+    summary = window.summary()
+    assert summary["event_counts"] == {"execution.failed": 3, "flow.completed": 1}
+    assert summary["event_total"] == 4
+    assert summary["previous_event_total"] == 1
+    assert summary["request_count"] == 20
+    assert summary["avg_request_ms"] == pytest.approx(59.0)
+    assert summary["request_p95_ms"] == 25.0
+
+    clock.now += 61 * 60
+    summary = window.summary()
+    assert summary["event_total"] == 0
+    assert summary["previous_event_total"] == 4
+    clock.now += 60 * 60
+    window.record_event("flow.completed")
+    assert window.summary()["previous_event_total"] == 0
+    assert len(window._buckets) == 1
+
+
+@pytest.fixture
+def streaming_window(monkeypatch):
+    monkeypatch.setattr(settings, "AINDY_SYSTEM_STATE_STREAMING", True)
+    monkeypatch.setattr(settings, "AINDY_SYSTEM_STATE_STREAMING_REDIS", False)
+    system_state_window.reset_system_state_window()
+    yield
+    system_state_window.reset_system_state_window()
+
+
+def test_compute_current_state_seeds_then_streams(db_session, streaming_window):
+    from AINDY.core.system_event_service import emit_system_event
+
+    tag = uuid.uuid4().hex[:8]
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    db_session.add_all(
+        [
+            SystemEvent(type=f"error.{tag}", source="test", timestamp=now - timedelta(minutes=minutes))
+            for minutes in (2, 4, 6)
+        ]
+        + [SystemEvent(type=f"seen.{tag}", source="test", timestamp=now - timedelta(minutes=90))]
+    )
+    db_session.commit()
+
+    state = system_state_service.compute_current_state(db_session, force_refresh=True, persist_snapshot=False)
+    summary = system_state_window.get_system_state_window().summary()
+    assert summary["event_counts"][f"error.{tag}"] == 3
+    assert f"seen.{tag}" not in summary["event_counts"]
+    assert summary["previous_event_total"] >= 1
+    assert state["recent_event_count"] == summary["event_total"]
+    assert len(state["recent_events"]) <= 20
+
+    emit_system_event(db=db_session, event_type=f"error.{tag}", source="test")
+    state = system_state_service.compute_current_state(db_session, force_refresh=True, persist_snapshot=False)
+    assert system_state_window.get_system_state_window().summary()["event_counts"][f"error.{tag}"] == 4
+    assert state["repeated_failure_count"] >= 4
+
+
+def test_shared_window_is_seeded_once_while_it_streams(db_session):
+    import fakeredis
+
+    client = fakeredis.FakeRedis()
+    clock = _Clock(datetime.now(timezone.utc).timestamp())
+
+    def _window():
+        window = SystemStateWindow(redis_enabled=True, clock=clock)
+        window._get_redis = lambda: client
+        return window
+
+    tag = uuid.uuid4().hex[:8]
+    now = datetime.fromtimestamp(clock.now, tz=timezone.utc).replace(tzinfo=None)
+    db_session.add(SystemEvent(type=f"old.{tag}", source="test", timestamp=now - timedelta(minutes=10)))
+    db_session.commit()
+
+    first = _window()
+    assert first.summary(db_session)["event_counts"][f"old.{tag}"] == 1
+
+    # Streaming keeps the seed marker alive alongside the buckets it covers.
+    client.expire(system_state_window._REDIS_META_KEY, 5)
+    clock.now += 30
+    first.record_event(f"new.{tag}")
+    db_session.add(SystemEvent(type=f"new.{tag}", source="test", timestamp=now + timedelta(seconds=30)))
+    db_session.commit()
+    assert client.ttl(system_state_window._REDIS_META_KEY) > 5
+
+    clock.now += 30 * 60
+    counts = _window().summary(db_session)["event_counts"]
+    assert counts[f"old.{tag}"] == 1
+    assert counts[f"new.{tag}"] == 1
@@ -1,7 +1,12 @@
+import uuid
 from types import SimpleNamespace
 
 import pytest
 
+from AINDY.config import settings
+from apps.tasks.models import TaskDependency
+from apps.tasks.services import task_service
+from apps.tasks.services.task_graph_cache import TaskGraph
 from apps.tasks.services.task_service import build_task_graph
 
 
@@ -28,6 +33,20 @@ def test_build_task_graph_orders_dependencies_before_children():
     assert 3 in graph["blocked"]
 
 
+def test_build_task_graph_keeps_tasks_with_missing_dependencies_blocked():
+    orphan = _task(2, "orphan", depends_on=[{"task_id": 99, "dependency_type": "hard"}])
+
+    graph = build_task_graph([orphan])
+
+    assert graph["ready"] == []
+    assert graph["blocked"] == [2]
+
+    cached = TaskGraph(graph, ({}, 0))
+    cached.add_task({**graph["nodes"][2], "task_id": 3, "depends_on": [98]})
+    assert cached.next_ready() is None
+    assert cached.context()["blocked"] == [2, 3]
+
+
 def test_build_task_graph_detects_cycles():
     a = _task(1, "a", depends_on=[{"task_id": 2, "dependency_type": "hard"}])
     b = _task(2, "b", depends_on=[{"task_id": 1, "dependency_type": "hard"}])
@@ -35,3 +54,100 @@ def test_build_task_graph_detects_cycles():
     with pytest.raises(ValueError, match="task_dependency_cycle_detected"):
         build_task_graph([a, b])
 
+
+
+@pytest.fixture
+def graph_owner(db_session):
+    from AINDY.db.models.user import User
+
+    user_id = uuid.uuid4()
+    db_session.add(User(id=user_id, email=f"{user_id.hex}@aindy.test", username=user_id.hex, hashed_password="x"))
+    db_session.commit()
+    return user_id
+
+
+def _uncached_context(db, user_id, monkeypatch):
+    with monkeypatch.context() as patch:
+        patch.setattr(settings, "AINDY_TASK_GRAPH_CACHE_ENABLED", False)
+        return task_service.get_task_graph_context(db, user_id)
+
+
+def test_cached_graph_updates_incrementally(db_session, graph_owner, monkeypatch):
+    builds = []
+    original_build = task_service.build_task_graph
+    monkeypatch.setattr(task_service, "build_task_graph", lambda tasks: builds.append(1) or original_build(tasks))
+
+    root = task_service.create_task(db_session, "root", user_id=graph_owner)
+    mid = task_service.create_task(db_session, "mid", dependencies=[{"task_id": root.id}], user_id=graph_owner)
+    leaf = task_service.create_task(db_session, "leaf", dependencies=[{"task_id": mid.id}], user_id=graph_owner)
+    context = task_service.get_task_graph_context(db_session, graph_owner)
+    assert context["critical_path"] == [root.id]
+    assert context["blocked"] == [mid.id, leaf.id]
+    assert len(builds) == 1
+
+    urgent = task_service.create_task(db_session, "urgent", priority="high", user_id=graph_owner)
+    side = task_service.create_task(db_session, "side", parent_task_id=root.id, user_id=graph_owner)
+    task_service.complete_task(db_session, "root", user_id=graph_owner)
+    context = task_service.get_task_graph_context(db_session, graph_owner)
+    assert len(builds) == 1
+    assert context["critical_path"] == [mid.id, urgent.id, side.id]
+    assert context["critical_weight"][root.id] == 3
+    assert task_service.get_next_ready_task(db_session, graph_owner)["task_id"] == mid.id
+    uncached = _uncached_context(db_session, graph_owner, monkeypatch)
+    assert context["critical_path"] == uncached["critical_path"]
+    assert context["critical_weight"] == uncached["critical_weight"]
+    assert sorted(context["blocked"]) == sorted(uncached["blocked"])
+
+    edges = db_session.query(TaskDependency).filter(TaskDependency.depends_on_task_id == root.id).all()
+    assert {(edge.task_id, edge.dependency_type) for edge in edges} == {(mid.id, "hard"), (side.id, "parent")}
+
+
+def test_cached_graph_rebuilds_after_external_change(db_session, graph_owner):
+    first = task_service.create_task(db_session, "first", user_id=graph_owner)
+    second = task_service.create_task(db_session, "second", user_id=graph_owner)
+    assert task_service.get_next_ready_task(db_session, graph_owner)["task_id"] == first.id
+
+    # Written outside task_service (as the infinity loop reprioritizes tasks).
+    second.priority = "high"
+    db_session.commit()
+
+    assert task_service.get_next_ready_task(db_session, graph_owner)["task_id"] == second.id
+
+
+def test_cached_graph_keeps_tasks_with_deleted_dependencies_blocked(db_session, graph_owner, monkeypatch):
+    root = task_service.create_task(db_session, "root", user_id=graph_owner)
+    child = task_service.create_task(db_session, "child", dependencies=[{"task_id": root.id}], user_id=graph_owner)
+    db_session.delete(root)
+    db_session.commit()
+
+    context = task_service.get_task_graph_context(db_session, graph_owner)
+    assert context["ready"] == []
+    assert context["blocked"] == [child.id]
+    assert task_service.get_next_ready_task(db_session, graph_owner) is None
+
+    assert _uncached_context(db_session, graph_owner, monkeypatch)["blocked"] == [child.id]
+
+    late = task_service.create_task(db_session, "late", parent_task_id=child.id, user_id=graph_owner)
+    context = task_service.get_task_graph_context(db_session, graph_owner)
+    assert context["blocked"] == [child.id, late.id]
+
+
+def test_completing_a_dependency_keeps_tasks_with_deleted_dependencies_blocked(db_session, graph_owner):
+    root = task_service.create_task(db_session, "root", user_id=graph_owner)
+    gone = task_service.create_task(db_session, "gone", user_id=graph_owner)
+    child = task_service.create_task(
+        db_session,
+        "child",
+        dependencies=[{"task_id": root.id}, {"task_id": gone.id}],
+        user_id=graph_owner,
+    )
+    # As the ON DELETE CASCADE on task_dependencies does on PostgreSQL.
+    db_session.query(TaskDependency).filter(TaskDependency.depends_on_task_id == gone.id).delete()
+    db_session.delete(gone)
+    db_session.commit()
+
+    task_service.complete_task(db_session, "root", user_id=graph_owner)
+
+    db_session.refresh(child)
+    assert child.status == "blocked"
+    assert task_service.get_next_ready_task(db_session, graph_owner) is None
@@ -0,0 +1,289 @@
+"""
+Tests for platform_layer.webhook_delivery — pooled async delivery against a
+local HTTP stub, timer-scheduled retries and the durable outbox.
+"""
+from __future__ import annotations
+
+import hashlib
+import hmac
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from AINDY.db.models.webhook_delivery import WebhookDelivery
+from AINDY.platform_layer import event_service, webhook_delivery
+from AINDY.platform_layer.webhook_delivery import WebhookDeliveryEngine, WebhookOutbox
+
+
+class _Stub(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 512
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+        self.lock = threading.Lock()
+        self.received: list[tuple[str, float, dict, bytes]] = []
+        self.hits: dict[str, int] = {}
+        self.release = threading.Event()
+
+    @property
+    def base(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        server: _Stub = self.server
+        with server.lock:
+            hits = server.hits[self.path] = server.hits.get(self.path, 0) + 1
+        if self.path.startswith("/slow"):
+            server.release.wait(timeout=10.0)
+        status = 200
+        if self.path == "/down" or (self.path == "/flaky" and hits == 1):
+            status = 503
+        with server.lock:
+            server.received.append((self.path, time.monotonic(), dict(self.headers), body))
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+@pytest.fixture
+def stub():
+    server = _Stub()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def subscriptions():
+    original = dict(event_service._SUBSCRIPTIONS)
+    event_service._SUBSCRIPTIONS.clear()
+    try:
+        yield event_service._SUBSCRIPTIONS
+    finally:
+        event_service._SUBSCRIPTIONS.clear()
+        event_service._SUBSCRIPTIONS.update(original)
+
+
+@pytest.fixture
+def engine(db_session_factory, monkeypatch):
+    engine = WebhookDeliveryEngine(
+        resolve_target=event_service.webhook_target,
+        on_result=event_service.record_delivery_result,
+        outbox=WebhookOutbox(session_factory=db_session_factory),
+        per_host_concurrency=16,
+        timeout_seconds=5.0,
+        max_attempts=3,
+        backoff_seconds=0.05,
+        flush_interval_seconds=60,
+        recovery_grace_seconds=60,
+    )
+    monkeypatch.setattr(webhook_delivery, "_engine", engine)
+    try:
+        yield engine
+    finally:
+        engine.stop(timeout=5.0)
+
+
+def _subscribe(url: str, *, secret: str | None = None) -> str:
+    return event_service.subscribe_webhook("execution.*", url, secret=secret)["id"]
+
+
+def _dispatch(event_id: str = "evt-1") -> int:
+    return event_service.dispatch_webhooks(
+        event_type="execution.completed",
+        event_id=event_id,
+        payload={"ok": True},
+        user_id=None,
+        trace_id="trace-webhook",
+        source="test",
+    )
+
+
+def _wait_for(predicate, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out waiting for webhook deliveries"
+        time.sleep(0.01)
+
+
+def test_fan_out_to_hundreds_of_subscribers_is_not_starved_by_slow_ones(
+    stub, subscriptions, engine, db_session
+):
+    # Eight subscribers that hang (the old thread pool's size) must not hold
+    # up the other 292.
+    slow_ids = [_subscribe(f"{stub.base}/slow/{i}") for i in range(8)]
+    fast_ids = [_subscribe(f"{stub.base}/ok/{i}", secret="s3cret") for i in range(292)]
+
+    assert _dispatch() == 300
+    _wait_for(lambda: len(stub.received) == 292)
+    assert all(path.startswith("/ok/") for path, _, _, _ in stub.received)
+    stub.release.set()
+    _wait_for(lambda: len(stub.received) == 300)
+    engine.stop(timeout=5.0)
+
+    _, _, headers, body = next(r for r in stub.received if r[0] == "/ok/0")
+    expected = hmac.new(b"s3cret", body, hashlib.sha256).hexdigest()
+    assert headers["X-AINDY-Signature"] == f"sha256={expected}"
+
+    rows = db_session.query(WebhookDelivery).filter(
+        WebhookDelivery.subscription_id.in_([*slow_ids, *fast_ids])
+    ).all()
+    assert len(rows) == 300
+    assert {row.status for row in rows} == {"delivered"}
+    assert subscriptions[slow_ids[0]]["delivery_successes"] == 1
+
+
+def test_retries_are_timer_scheduled_and_recorded(stub, subscriptions, engine, db_session):
+    flaky_id = _subscribe(f"{stub.base}/flaky")
+    down_id = _subscribe(f"{stub.base}/down")
+
+    _dispatch()
+    _wait_for(lambda: stub.hits.get("/down") == 3 and stub.hits.get("/flaky") == 2)
+    _wait_for(lambda: engine.snapshot()["scheduled"] == 0)
+    engine.stop(timeout=5.0)
+
+    rows = {
+        row.subscription_id: row
+        for row in db_session.query(WebhookDelivery).filter(
+            WebhookDelivery.subscription_id.in_([flaky_id, down_id])
+        )
+    }
+    assert (rows[flaky_id].status, rows[flaky_id].attempts) == ("delivered", 2)
+    assert (rows[down_id].status, rows[down_id].attempts) == ("failed", 3)
+    assert rows[down_id].last_status_code == 503
+    assert subscriptions[down_id]["last_status"] == "failed"
+
+
+def test_stale_pending_outbox_rows_are_recovered(stub, subscriptions, engine, db_session):
+    sub_id = _subscribe(f"{stub.base}/ok/recovered")
+    gone_id = str(uuid.uuid4())
+    stale = datetime.now(timezone.utc) - timedelta(hours=1)
+    for subscription_id in (sub_id, gone_id):
+        db_session.add(WebhookDelivery(
+            id=uuid.uuid4(),
+            subscription_id=subscription_id,
+            event_id="evt-before-restart",
+            event_type="execution.completed",
+            body='{"event_id": "evt-before-restart"}',
+            status="pending",
+            attempts=1,
+            next_attempt_at=stale,
+            generation=0,
+        ))
+    db_session.commit()
+
+    engine.start()
+    _wait_for(lambda: stub.hits.get("/ok/recovered") == 1)
+    _wait_for(lambda: engine.snapshot()["scheduled"] == 0)
+    engine.stop(timeout=5.0)
+
+    db_session.expire_all()
+    rows = {
+        row.subscription_id: row
+        for row in db_session.query(WebhookDelivery).filter(
+            WebhookDelivery.subscription_id.in_([sub_id, gone_id])
+        )
+    }
+    assert (rows[sub_id].status, rows[sub_id].attempts, rows[sub_id].generation) == ("delivered", 2, 1)
+    assert rows[gone_id].status == "failed"
+    assert rows[gone_id].last_error == "subscription removed"
+
+
+def _outbox_row(db_session, *, status="pending", claimed_by=None, lease_until=None, next_attempt_at=None, created_at=None):
+    now = datetime.now(timezone.utc)
+    row = WebhookDelivery(
+        id=uuid.uuid4(),
+        subscription_id=str(uuid.uuid4()),
+        event_id="evt-lease",
+        event_type="execution.completed",
+        body="{}",
+        status=status,
+        attempts=0,
+        next_attempt_at=next_attempt_at or now - timedelta(hours=1),
+        generation=0,
+        claimed_by=claimed_by,
+        lease_until=lease_until,
+        created_at=created_at or now,
+    )
+    db_session.add(row)
+    db_session.commit()
+    return row.id
+
+
+def test_recovery_only_claims_lapsed_leases_it_does_not_hold(db_session, db_session_factory):
+    outbox = WebhookOutbox(session_factory=db_session_factory)
+    now = datetime.now(timezone.utc)
+    live = _outbox_row(db_session, claimed_by="peer", lease_until=now + timedelta(minutes=5))
+    lapsed = _outbox_row(db_session, claimed_by="peer", lease_until=now - timedelta(seconds=1))
+    local = _outbox_row(db_session, claimed_by="me", lease_until=now - timedelta(seconds=1))
+
+    claimed = outbox.claim_stale(
+        now=now,
+        older_than=now - timedelta(seconds=60),
+        limit=10,
+        owner="me",
+        lease_until=now + timedelta(seconds=60),
+        exclude=frozenset({local}),
+    )
+
+    assert {row["id"] for row in claimed} & {live, lapsed, local} == {lapsed}
+    db_session.expire_all()
+    assert db_session.get(WebhookDelivery, lapsed).claimed_by == "me"
+    assert db_session.get(WebhookDelivery, live).claimed_by == "peer"
+
+
+def test_leases_are_renewed_and_released_by_their_owner_only(db_session, db_session_factory):
+    outbox = WebhookOutbox(session_factory=db_session_factory)
+    now = datetime.now(timezone.utc)
+    mine = _outbox_row(db_session, claimed_by="me", lease_until=now + timedelta(seconds=5))
+    theirs = _outbox_row(db_session, claimed_by="peer", lease_until=now + timedelta(seconds=5))
+    later = now + timedelta(minutes=10)
+
+    assert outbox.renew([mine, theirs], owner="me", lease_until=later) == 1
+    db_session.expire_all()
+    assert db_session.get(WebhookDelivery, mine).lease_until.replace(tzinfo=None) == later.replace(tzinfo=None)
+    assert db_session.get(WebhookDelivery, theirs).lease_until.replace(tzinfo=None) != later.replace(tzinfo=None)
+
+    assert outbox.release([mine], owner="me") == 1
+    db_session.expire_all()
+    released = db_session.get(WebhookDelivery, mine)
+    assert released.claimed_by is None
+    assert released.lease_until == released.next_attempt_at
+
+
+def test_retention_purges_only_old_finished_rows(db_session, db_session_factory):
+    outbox = WebhookOutbox(session_factory=db_session_factory)
+    old = datetime.now(timezone.utc) - timedelta(days=10)
+    old_delivered = _outbox_row(db_session, status="delivered", created_at=old)
+    old_failed = _outbox_row(db_session, status="failed", created_at=old)
+    old_pending = _outbox_row(db_session, status="pending", created_at=old)
+    recent = _outbox_row(db_session, status="delivered")
+
+    deleted = outbox.purge_finished(older_than=datetime.now(timezone.utc) - timedelta(days=3), batch_size=1)
+
+    assert deleted >= 2
+    db_session.expire_all()
+    remaining = {
+        row.id
+        for row in db_session.query(WebhookDelivery.id).filter(
+            WebhookDelivery.id.in_([old_delivered, old_failed, old_pending, recent])
+        )
+    }
+    assert remaining == {old_pending, recent}